@@ -1370,6 +1370,77 @@ def start_api_server(
         sys.exit(1)
 
 
+# Benchmark commands
+benchmark_app = typer.Typer(help="Offline performance benchmarks")
+app.add_typer(benchmark_app, name="benchmark")
+
+
+@benchmark_app.command("github")
+def benchmark_github(
+    scenarios: Optional[List[str]] = typer.Option(
+        None, "--scenario", "-s", help="Scenarios to run (default: all)"
+    ),
+    latency: float = typer.Option(
+        0.0, "--latency", help="Simulated seconds per GitHub request"
+    ),
+    jitter: float = typer.Option(
+        0.0, "--jitter", help="Extra random latency per request (seconds)"
+    ),
+    repositories: int = typer.Option(3, "--repos", help="Repositories to seed"),
+    files: int = typer.Option(20, "--files", help="Source files per repository"),
+    issues: int = typer.Option(20, "--issues", help="Issues per repository"),
+    request_spacing: bool = typer.Option(
+        False,
+        "--request-spacing",
+        help="Keep PyGithub's default delay between requests",
+    ),
+    output_json: bool = typer.Option(False, "--json", help="Print results as JSON"),
+    debug: bool = typer.Option(False, "--debug", help="Enable debug logging"),
+):
+    """Measure GitHub API calls and wall time per operation against a local fake."""
+
+    setup_logging(debug)
+
+    from src.storyteller.github_benchmark import run_benchmarks
+
+    try:
+        results = run_benchmarks(
+            scenarios=scenarios,
+            latency=latency,
+            latency_jitter=jitter,
+            repositories=repositories,
+            files_per_repository=files,
+            issues_per_repository=issues,
+            request_spacing=request_spacing,
+        )
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        sys.exit(1)
+
+    if output_json:
+        import json
+
+        console.print_json(json.dumps([result.to_dict() for result in results]))
+        return
+
+    table = Table(title="GitHub Benchmark")
+    table.add_column("Scenario", style="cyan")
+    table.add_column("API Calls", justify="right")
+    table.add_column("Wall Time", justify="right")
+    table.add_column("Calls by Route")
+    for result in results:
+        routes = ", ".join(
+            f"{route}={count}" for route, count in result.calls_by_route.items()
+        )
+        table.add_row(
+            result.name,
+            str(result.api_calls),
+            f"{result.wall_seconds * 1000:.0f} ms",
+            f"[red]{result.error}[/red]" if result.error else routes,
+        )
+    console.print(table)
+
+
 # Configuration and validation commands
 @app.command("validate")
 def validate_configuration(
@@ -82,6 +82,7 @@ class MCPStoryServer:
             "context/multi_repository": self._handle_get_multi_repository_context,
             "context/file_content": self._handle_get_file_content,
             "context/repository_structure": self._handle_get_repository_structure,
+            "context/api_endpoints": self._handle_get_api_endpoints,
             # System methods
             "system/health": self._handle_health_check,
             "system/capabilities": self._handle_capabilities,
@@ -925,6 +926,44 @@ class MCPStoryServer:
                 "error": "StructureError",
             }
 
+    async def _handle_get_api_endpoints(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle API endpoint map request."""
+        logger.info("[MCP] context/api_endpoints")
+
+        try:
+            repository_keys = params.get("repositories")
+            query = params.get("query")
+            limit = params.get("limit", 20)
+            include_code = params.get("include_code", True)
+
+            endpoint_map = await self.context_reader.get_api_endpoints(repository_keys)
+            endpoints = (
+                endpoint_map.search(query, limit)
+                if query
+                else endpoint_map.endpoints[:limit]
+            )
+
+            return {
+                "success": True,
+                "message": f"Retrieved {len(endpoints)} API endpoints",
+                "data": {
+                    "endpoints": [e.to_dict(include_code) for e in endpoints],
+                    "endpoint_count": len(endpoint_map.endpoints),
+                    "unmatched_calls": [
+                        c.to_dict(include_code=False)
+                        for c in endpoint_map.unmatched_calls[:limit]
+                    ],
+                },
+            }
+
+        except Exception as e:
+            logger.error(f"Error getting API endpoints: {e}")
+            return {
+                "success": False,
+                "message": f"Error getting API endpoints: {str(e)}",
+                "error": "ContextError",
+            }
+
     async def _handle_test_analyze(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle test analyze request."""
         import re
@@ -0,0 +1,453 @@
+"""Index of HTTP API routes and the client calls to them across repositories.
+
+Backend route declarations (Go net/http, gorilla/mux, gin, echo, chi and
+fiber registrations, FastAPI and Flask decorators, Express routers) and
+frontend call sites (fetch and axios with literal URLs) are extracted from
+source files with precompiled regular expressions. Symbols depend only on the
+content of a file, so they are stored per blob SHA and extracted again only
+for files a commit changed. Routes and calls are joined by HTTP method and
+normalized path into an endpoint map, which points story processing and MCP
+clients at the handler and client code of an endpoint instead of whole files.
+"""
+
+import bisect
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+# Bump when extraction changes, so symbols stored per blob are extracted again
+EXTRACTOR_VERSION = 1
+
+API_SOURCE_EXTENSIONS = [".go", ".py", ".js", ".jsx", ".mjs", ".ts", ".tsx", ".vue"]
+
+# Vendored, generated and test code is not indexed
+_SKIPPED_PATH = re.compile(
+    r"(^|/)(node_modules|vendor|dist|build|\.next|__tests__|tests?|testdata)/"
+    r"|_test\.go$|\.(test|spec)\.[jt]sx?$|\.min\.js$|(^|/)test_[^/]*\.py$"
+)
+
+# Lines of code kept from a route declaration or handler, and around a call
+ROUTE_CODE_LINES = 15
+CALL_CODE_LINES_BEFORE = 2
+CALL_CODE_LINES_AFTER = 4
+
+_HTTP_METHODS = {"GET", "POST", "PUT", "PATCH", "DELETE", "HEAD", "OPTIONS"}
+
+# Path parameters: {id}, <int:id>, :id, [id], *rest, ${id} and literal numbers
+_PATH_PARAMETER = re.compile(
+    r"\{[^}]*\}|<[^>]*>|^:\w+\??$|^\[[^\]]*\]$|^\*\w*$|\$\{[^}]*\}|^\d+$"
+)
+_URL_ORIGIN = re.compile(r"^[A-Za-z][A-Za-z0-9+.-]*://[^/]*")
+_BASE_URL_EXPRESSION = re.compile(r"^\$\{[^}]*\}(?=/|$)")
+
+# Python: FastAPI and Flask
+_PY_ROUTER = re.compile(r"(\w+)\s*=\s*(?:\w+\.)?(?:APIRouter|Blueprint)\(([^)]*)\)")
+_PY_PREFIX = re.compile(r"\b(?:url_)?prefix\s*=\s*[\"']([^\"']*)[\"']")
+_PY_ROUTE = re.compile(
+    r"^[ \t]*@(\w+)\.(get|post|put|patch|delete|head|options|route|api_route)"
+    r"\(\s*(?:path\s*=\s*)?[\"']([^\"']*)[\"']",
+    re.MULTILINE,
+)
+_PY_METHODS = re.compile(r"\bmethods\s*=\s*[\[(]([^\])]*)")
+_PY_DEF = re.compile(r"^[ \t]*(?:async[ \t]+)?def[ \t]+(\w+)", re.MULTILINE)
+
+# Go: net/http, gorilla/mux, gin, echo, chi and fiber
+_GO_GROUP = re.compile(r"(\w+)\s*:?=\s*(\w+)\.(?:Group|PathPrefix)\(\s*\"([^\"]*)\"")
+_GO_ROUTE = re.compile(
+    r"\b(\w+)\.(HandleFunc|Handle|GET|POST|PUT|PATCH|DELETE|HEAD|OPTIONS|Any"
+    r"|Get|Post|Put|Patch|Delete|Head|Options|All|Method)\(\s*"
+    r"(?:\"([A-Z]+)\"\s*,\s*)?\"([^\"]*)\"\s*(?:,\s*([\w.]+))?"
+)
+_GO_METHODS = re.compile(r"[^\n]*?\.Methods\(([^)]*)\)")
+_GO_HANDLER = re.compile(
+    r"^func[ \t]+(?:\([^)]*\)[ \t]*)?(\w+)[ \t]*\(([^)]*)\)", re.MULTILINE
+)
+_GO_HANDLER_PARAMETER = re.compile(
+    r"http\.ResponseWriter|gin\.Context|echo\.Context|fiber\.Ctx"
+)
+
+# JavaScript and TypeScript: Express, fetch and axios
+_JS_ROUTER = re.compile(r"(\w+)\s*=\s*(?:express\s*\(|(?:express\.)?Router\s*\()")
+_JS_CLIENT = re.compile(r"(\w+)\s*=\s*axios\.create\(")
+_JS_MEMBER_CALL = re.compile(
+    r"\b(\w+)\.(get|post|put|patch|delete|head|options|all)"
+    r"\(\s*(['\"`])((?:(?!\3)[^\n])*)\3"
+)
+_JS_FETCH = re.compile(r"\bfetch\(\s*(['\"`])((?:(?!\1)[^\n])*)\1")
+_JS_AXIOS_CONFIG = re.compile(r"\baxios(?:\.request)?\(\s*\{([^}]*)\}")
+_JS_URL_OPTION = re.compile(r"\burl\s*:\s*(['\"`])((?:(?!\1)[^\n])*)\1")
+_JS_METHOD_OPTION = re.compile(r"\bmethod\s*:\s*['\"`](\w+)['\"`]")
+
+
+def normalize_api_path(path: str) -> str:
+    """Normalize a URL or route path so routes and calls can be compared.
+
+    The origin, a leading base URL expression, the query string and trailing
+    slashes are dropped, and path parameters in any notation become ``{}``.
+    """
+    path = _BASE_URL_EXPRESSION.sub("", _URL_ORIGIN.sub("", path.strip()))
+    path = re.split(r"[?#]", path, maxsplit=1)[0]
+    segments = [
+        "{}" if _PATH_PARAMETER.search(segment) else segment.lower()
+        for segment in path.split("/")
+        if segment
+    ]
+    return "/" + "/".join(segments)
+
+
+def is_api_source(path: str) -> bool:
+    """Whether a file may declare routes or call them."""
+    return path.endswith(tuple(API_SOURCE_EXTENSIONS)) and not _SKIPPED_PATH.search(
+        path
+    )
+
+
+@dataclass
+class APISymbol:
+    """A route declaration, handler function or HTTP call in a source file."""
+
+    kind: str  # "route", "handler" or "call"
+    method: str  # HTTP method; "*" when any method is accepted
+    path: str  # URL path as written (empty for handlers)
+    line: int
+    framework: str
+    name: Optional[str] = None  # Handler function of a route, or of a handler
+    code: str = ""
+    repository: str = ""
+    file_path: str = ""
+
+    @property
+    def normalized_path(self) -> str:
+        return normalize_api_path(self.path)
+
+    def to_dict(self, include_code: bool = True) -> Dict[str, Any]:
+        data = asdict(self)
+        if not include_code:
+            del data["code"]
+        return data
+
+    def to_stored(self) -> Dict[str, Any]:
+        """Content-derived fields, as stored per blob SHA."""
+        data = asdict(self)
+        del data["repository"], data["file_path"]
+        return data
+
+
+class _Source:
+    """Line lookups in the content of a source file."""
+
+    def __init__(self, content: str):
+        self.content = content
+        self.lines = content.splitlines()
+        self._line_starts = [0] + [m.end() for m in re.finditer("\n", content)]
+
+    def line_of(self, offset: int) -> int:
+        return bisect.bisect_right(self._line_starts, offset)
+
+    def code(self, line: int, before: int = 0, after: int = ROUTE_CODE_LINES) -> str:
+        return "\n".join(self.lines[max(line - 1 - before, 0) : line - 1 + after])
+
+    def symbol(
+        self, kind: str, method: str, path: str, offset: int, framework: str, **kw
+    ) -> APISymbol:
+        line = self.line_of(offset)
+        if kind == "call":
+            code = self.code(line, CALL_CODE_LINES_BEFORE, CALL_CODE_LINES_AFTER)
+        else:
+            code = self.code(line)
+        return APISymbol(kind, method, path, line, framework, code=code, **kw)
+
+
+def _join_prefix(prefix: str, path: str) -> str:
+    if not prefix:
+        return path
+    return prefix.rstrip("/") + "/" + path.lstrip("/") if path else prefix
+
+
+def _extract_python(source: _Source) -> List[APISymbol]:
+    content = source.content
+    prefixes = {}
+    for m in _PY_ROUTER.finditer(content):
+        prefix = _PY_PREFIX.search(m.group(2))
+        if prefix:
+            prefixes[m.group(1)] = prefix.group(1)
+
+    framework = "fastapi" if re.search(r"\bfastapi\b", content) else "flask"
+    symbols = []
+    for m in _PY_ROUTE.finditer(content):
+        receiver, verb, path = m.groups()
+        if path and not path.startswith("/"):
+            continue
+        function = _PY_DEF.search(content, m.end())
+        arguments = content[m.end() : function.start() if function else None]
+        if verb in ("route", "api_route"):
+            methods = _PY_METHODS.search(arguments)
+            names = re.findall(r"\w+", methods.group(1)) if methods else ["GET"]
+        else:
+            names = [verb]
+        for method in names:
+            symbols.append(
+                source.symbol(
+                    "route",
+                    method.upper(),
+                    _join_prefix(prefixes.get(receiver, ""), path),
+                    m.start(),
+                    framework,
+                    name=function.group(1) if function else None,
+                )
+            )
+    return symbols
+
+
+def _extract_go(source: _Source) -> List[APISymbol]:
+    content = source.content
+    prefixes: Dict[str, str] = {}
+    for m in _GO_GROUP.finditer(content):
+        variable, parent, path = m.groups()
+        prefixes[variable] = _join_prefix(prefixes.get(parent, ""), path)
+
+    symbols = []
+    for m in _GO_ROUTE.finditer(content):
+        receiver, verb, method, path, handler = m.groups()
+        if verb in ("HandleFunc", "Handle"):
+            # Go 1.22 patterns carry the method: "GET /users/{id}"
+            pattern_method, _, pattern_path = path.partition(" ")
+            if pattern_path and pattern_method in _HTTP_METHODS:
+                method, path = pattern_method, pattern_path.strip()
+            else:
+                methods = _GO_METHODS.match(content, m.end())
+                names = re.findall(r"[A-Z]+", methods.group(1)) if methods else []
+                method = names[0] if len(names) == 1 else "*"
+        elif verb != "Method":
+            method = verb.upper() if verb.upper() in _HTTP_METHODS else "*"
+        if not path.startswith("/") or not method:
+            continue
+        symbols.append(
+            source.symbol(
+                "route",
+                method,
+                _join_prefix(prefixes.get(receiver, ""), path),
+                m.start(),
+                "go",
+                name=(
+                    handler.rsplit(".", 1)[-1]
+                    if handler and handler != "func"
+                    else None
+                ),
+            )
+        )
+
+    for m in _GO_HANDLER.finditer(content):
+        if _GO_HANDLER_PARAMETER.search(m.group(2)):
+            symbols.append(
+                source.symbol("handler", "", "", m.start(), "go", name=m.group(1))
+            )
+    return symbols
+
+
+def _is_url_literal(url: str) -> bool:
+    return url.startswith(("/", "http://", "https://", "${"))
+
+
+def _call_arguments(content: str, start: int, limit: int = 300) -> str:
+    """Rest of the arguments of a call whose parenthesis opened before start."""
+    depth = 1
+    for index in range(start, min(start + limit, len(content))):
+        if content[index] == "(":
+            depth += 1
+        elif content[index] == ")":
+            depth -= 1
+            if not depth:
+                return content[start:index]
+    return content[start : start + limit]
+
+
+def _extract_javascript(source: _Source) -> List[APISymbol]:
+    content = source.content
+    routers: Set[str] = {m.group(1) for m in _JS_ROUTER.finditer(content)}
+    clients: Set[str] = {"axios"} | {m.group(1) for m in _JS_CLIENT.finditer(content)}
+    if routers or re.search(r"\bexpress\b", content):
+        routers |= {"app", "router"}
+
+    symbols = []
+    for m in _JS_MEMBER_CALL.finditer(content):
+        receiver, verb, _, url = m.groups()
+        method = "*" if verb == "all" else verb.upper()
+        if receiver in routers:
+            if url.startswith("/"):
+                symbols.append(
+                    source.symbol("route", method, url, m.start(), "express")
+                )
+        elif verb != "all" and _is_url_literal(url):
+            # Outside Express files, get/post/... with a URL literal are calls
+            # through axios or an API client wrapping it
+            framework = "axios" if receiver in clients else "http-client"
+            symbols.append(source.symbol("call", method, url, m.start(), framework))
+
+    for m in _JS_FETCH.finditer(content):
+        url = m.group(2)
+        if not _is_url_literal(url):
+            continue
+        method = _JS_METHOD_OPTION.search(_call_arguments(content, m.end()))
+        symbols.append(
+            source.symbol(
+                "call",
+                method.group(1).upper() if method else "GET",
+                url,
+                m.start(),
+                "fetch",
+            )
+        )
+
+    for m in _JS_AXIOS_CONFIG.finditer(content):
+        url = _JS_URL_OPTION.search(m.group(1))
+        if not url or not _is_url_literal(url.group(2)):
+            continue
+        method = _JS_METHOD_OPTION.search(m.group(1))
+        symbols.append(
+            source.symbol(
+                "call",
+                method.group(1).upper() if method else "GET",
+                url.group(2),
+                m.start(),
+                "axios",
+            )
+        )
+    return sorted(symbols, key=lambda symbol: symbol.line)
+
+
+_EXTRACTORS: Dict[str, Callable[[_Source], List[APISymbol]]] = {
+    ".py": _extract_python,
+    ".go": _extract_go,
+    **{
+        extension: _extract_javascript
+        for extension in (".js", ".jsx", ".mjs", ".ts", ".tsx", ".vue")
+    },
+}
+
+
+def extract_api_symbols(file_path: str, content: str) -> List[APISymbol]:
+    """Extract route declarations, handlers and HTTP calls from a source file."""
+    extension = file_path[file_path.rfind(".") :]
+    extractor = _EXTRACTORS.get(extension)
+    if not extractor or not content:
+        return []
+    symbols = extractor(_Source(content))
+    for symbol in symbols:
+        symbol.file_path = file_path
+    return symbols
+
+
+def _terms(text: str) -> Set[str]:
+    """Lower-cased words of text and identifiers, without plural endings."""
+    words = re.findall(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+", text)
+    return {
+        word.lower().rstrip("s") if len(word) > 3 else word.lower()
+        for word in words
+        if len(word) > 2 and word.lower() not in _IGNORED_TERMS
+    }
+
+
+_IGNORED_TERMS = {"api", "and", "for", "the", "with", "handler", "handle", "http"}
+
+
+@dataclass
+class APIEndpoint:
+    """An API endpoint: its route declarations, handlers and client calls."""
+
+    method: str
+    path: str  # Normalized path
+    routes: List[APISymbol] = field(default_factory=list)
+    handlers: List[APISymbol] = field(default_factory=list)
+    calls: List[APISymbol] = field(default_factory=list)
+
+    @property
+    def repositories(self) -> List[str]:
+        symbols = self.routes + self.calls
+        return list(dict.fromkeys(symbol.repository for symbol in symbols))
+
+    def to_dict(self, include_code: bool = True) -> Dict[str, Any]:
+        return {
+            "method": self.method,
+            "path": self.path,
+            "repositories": self.repositories,
+            "routes": [s.to_dict(include_code) for s in self.routes],
+            "handlers": [s.to_dict(include_code) for s in self.handlers],
+            "calls": [s.to_dict(include_code) for s in self.calls],
+        }
+
+
+class APIEndpointMap:
+    """Routes of all repositories joined with the client calls to them.
+
+    A call matches a route with a compatible method and the same normalized
+    path, or, for routes mounted under a prefix elsewhere (``app.use``,
+    ``include_router``), a route path that the call path ends with.
+    """
+
+    def __init__(self, symbols: Iterable[APISymbol]):
+        symbols = list(symbols)
+        self.endpoints: List[APIEndpoint] = []
+        self.unmatched_calls: List[APISymbol] = []
+
+        handlers: Dict[tuple, List[APISymbol]] = {}
+        for symbol in symbols:
+            if symbol.kind == "handler":
+                handlers.setdefault((symbol.repository, symbol.name), []).append(symbol)
+
+        by_path: Dict[str, List[APIEndpoint]] = {}
+        endpoints: Dict[tuple, APIEndpoint] = {}
+        for symbol in symbols:
+            if symbol.kind != "route":
+                continue
+            key = (symbol.method, symbol.normalized_path)
+            if key not in endpoints:
+                endpoints[key] = APIEndpoint(*key)
+                by_path.setdefault(key[1], []).append(endpoints[key])
+            endpoint = endpoints[key]
+            endpoint.routes.append(symbol)
+            for handler in handlers.get((symbol.repository, symbol.name), []):
+                if handler not in endpoint.handlers:
+                    endpoint.handlers.append(handler)
+
+        for symbol in symbols:
+            if symbol.kind == "call" and not self._match_call(symbol, by_path):
+                self.unmatched_calls.append(symbol)
+        self.endpoints = sorted(
+            endpoints.values(), key=lambda e: (e.path, e.method != "*", e.method)
+        )
+
+    @staticmethod
+    def _match_call(call: APISymbol, by_path: Dict[str, List[APIEndpoint]]) -> bool:
+        segments = call.normalized_path.strip("/").split("/")
+        for start in range(len(segments)):
+            suffix = segments[start:]
+            if start and all(segment == "{}" for segment in suffix):
+                break
+            matched = [
+                endpoint
+                for endpoint in by_path.get("/" + "/".join(suffix), [])
+                if "*" in (endpoint.method, call.method)
+                or endpoint.method == call.method
+            ]
+            for endpoint in matched:
+                endpoint.calls.append(call)
+            if matched:
+                return True
+        return False
+
+    def search(self, text: str, limit: int = 10) -> List[APIEndpoint]:
+        """Endpoints whose paths and handler names share words with text."""
+        terms = _terms(text)
+        scored = []
+        for index, endpoint in enumerate(self.endpoints):
+            names = " ".join(
+                symbol.name or "" for symbol in endpoint.routes + endpoint.handlers
+            )
+            score = len(terms & _terms(f"{endpoint.path} {names}"))
+            if not score:
+                continue
+            if endpoint.method.lower() in terms:
+                score += 0.5
+            scored.append((-score, -len(endpoint.calls), index, endpoint))
+        return [endpoint for *_, endpoint in sorted(scored)[:limit]]
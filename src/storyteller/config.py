@@ -19,6 +19,11 @@ class RepositoryConfig:
     dependencies: List[str] = field(default_factory=list)
     story_labels: List[str] = field(default_factory=list)
     auto_assign: Dict[str, List[str]] = field(default_factory=dict)
+    # Local checkout or bare mirror to read context from instead of the API
+    local_path: Optional[str] = None
+    local_ref: str = "HEAD"
+    # git fetch before reading when the last fetch is older (0: never)
+    local_fetch_after_seconds: int = 0
 
 
 @dataclass
@@ -61,6 +66,77 @@ class EscalationConfig:
     cooldown_hours: int = 6  # Hours to wait before re-escalating same issue
 
 
+@dataclass
+class LLMReplayConfig:
+    """Configuration for the record/replay LLM provider."""
+
+    mode: Optional[str] = None  # "record", "replay" or "synthetic"
+    fixtures_dir: Path = field(
+        default_factory=lambda: Path(".storyteller/llm_fixtures")
+    )
+    upstream_provider: Optional[str] = None  # Provider wrapped in record mode
+    on_miss: str = "error"  # "error" or "synthetic" when replaying
+    latency_distribution: str = "none"  # none|fixed|uniform|normal|lognormal|recorded
+    latency_params: List[float] = field(default_factory=list)
+    seed: Optional[int] = None
+
+
+@dataclass
+class StoryReuseConfig:
+    """Configuration for reusing analyses of near-duplicate stories."""
+
+    enabled: bool = False
+    max_hamming_distance: int = 10  # SimHash bits that may differ (64-bit hash)
+    min_similarity: float = 0.8  # Jaccard similarity of word shingles
+
+
+@dataclass
+class GitHubCacheConfig:
+    """Configuration for the conditional-request (ETag) cache of GitHub reads."""
+
+    enabled: bool = False
+    path: Path = field(default_factory=lambda: Path(".storyteller/github_cache.db"))
+    max_entries: int = 5000
+    max_size_mb: int = 100
+
+
+@dataclass
+class ContextStoreConfig:
+    """Configuration for the disk-backed, commit-keyed repository context store."""
+
+    enabled: bool = False
+    path: Path = field(default_factory=lambda: Path(".storyteller/context_store.db"))
+    max_size_mb: int = 200
+    # Seconds a built context is reused before the branch head is checked again
+    refresh_seconds: int = 60
+
+
+@dataclass
+class APIIndexConfig:
+    """Configuration for the index of API routes and the client calls to them."""
+
+    enabled: bool = False
+    max_files: int = 2000  # Source files indexed per repository
+    max_endpoints: int = 10  # Endpoints added to the context of a story
+
+
+@dataclass
+class StoryContextConfig:
+    """Configuration for story-aware, BM25-ranked repository content."""
+
+    enabled: bool = False
+    token_budget: int = 4000  # Estimated tokens of content added per story
+    max_files: int = 2000  # Files indexed per repository
+
+
+@dataclass
+class IssueMirrorConfig:
+    """Configuration for the local, webhook-fed mirror of GitHub issues."""
+
+    enabled: bool = False
+    max_age_seconds: int = 900  # Incremental sync when older than this
+
+
 @dataclass
 class StorageConfig:
     """Configuration for storage backend selection."""
@@ -68,6 +144,8 @@ class StorageConfig:
     primary: str = "sqlite"  # "github" or "sqlite"
     cache_enabled: bool = False
     deployment_context: str = "pipeline"  # "pipeline" or "mcp"
+    # Seconds between reconciliations of the story cache with GitHub (0: off)
+    cache_reconcile_interval_seconds: int = 300
     issue_label_prefix: str = "storyteller"
     epic_label: str = "epic"
     user_story_label: str = "user-story"
@@ -81,6 +159,18 @@ class Config:
     # GitHub Configuration
     github_token: str
     github_repository: Optional[str] = None
+    # REST API root; GraphQL is served next to it (GitHub Enterprise or a
+    # local stand-in such as fake_github.FakeGitHub)
+    github_api_url: str = "https://api.github.com"
+    github_max_concurrency: int = 8  # Concurrent blocking GitHub API calls
+    github_cache: GitHubCacheConfig = field(default_factory=GitHubCacheConfig)
+    issue_mirror: IssueMirrorConfig = field(default_factory=IssueMirrorConfig)
+    context_store: ContextStoreConfig = field(default_factory=ContextStoreConfig)
+    api_index: APIIndexConfig = field(default_factory=APIIndexConfig)
+    story_context: StoryContextConfig = field(default_factory=StoryContextConfig)
+    # Rate-limit budget kept back for critical (webhook) and normal requests
+    github_critical_reserve: int = 50
+    github_background_reserve: int = 500
 
     # Storage Configuration
     storage: StorageConfig = field(default_factory=StorageConfig)
@@ -89,6 +179,9 @@ class Config:
     default_llm_provider: str = "github"
     openai_api_key: Optional[str] = None
     ollama_api_host: str = "http://localhost:11434"
+    batched_role_analysis: bool = False
+    llm_replay: LLMReplayConfig = field(default_factory=LLMReplayConfig)
+    story_reuse: StoryReuseConfig = field(default_factory=StoryReuseConfig)
 
     # Application Configuration
     log_level: str = "INFO"
@@ -141,15 +234,74 @@ def load_config() -> Config:
     config = Config(
         github_token=github_token,
         github_repository=os.getenv("GITHUB_REPOSITORY"),
+        github_api_url=os.getenv("GITHUB_API_URL", "https://api.github.com"),
+        github_max_concurrency=int(os.getenv("GITHUB_MAX_CONCURRENCY", "8")),
+        github_critical_reserve=int(os.getenv("GITHUB_CRITICAL_RESERVE", "50")),
+        github_background_reserve=int(os.getenv("GITHUB_BACKGROUND_RESERVE", "500")),
+        github_cache=GitHubCacheConfig(
+            enabled=os.getenv("GITHUB_CACHE_ENABLED", "false").lower() == "true",
+            path=Path(os.getenv("GITHUB_CACHE_PATH", ".storyteller/github_cache.db")),
+            max_entries=int(os.getenv("GITHUB_CACHE_MAX_ENTRIES", "5000")),
+            max_size_mb=int(os.getenv("GITHUB_CACHE_MAX_SIZE_MB", "100")),
+        ),
+        issue_mirror=IssueMirrorConfig(
+            enabled=os.getenv("ISSUE_MIRROR_ENABLED", "false").lower() == "true",
+            max_age_seconds=int(os.getenv("ISSUE_MIRROR_MAX_AGE_SECONDS", "900")),
+        ),
+        context_store=ContextStoreConfig(
+            enabled=os.getenv("CONTEXT_STORE_ENABLED", "false").lower() == "true",
+            path=Path(os.getenv("CONTEXT_STORE_PATH", ".storyteller/context_store.db")),
+            max_size_mb=int(os.getenv("CONTEXT_STORE_MAX_SIZE_MB", "200")),
+            refresh_seconds=int(os.getenv("CONTEXT_STORE_REFRESH_SECONDS", "60")),
+        ),
+        api_index=APIIndexConfig(
+            enabled=os.getenv("API_INDEX_ENABLED", "false").lower() == "true",
+            max_files=int(os.getenv("API_INDEX_MAX_FILES", "2000")),
+            max_endpoints=int(os.getenv("API_INDEX_MAX_ENDPOINTS", "10")),
+        ),
+        story_context=StoryContextConfig(
+            enabled=os.getenv("STORY_CONTEXT_ENABLED", "false").lower() == "true",
+            token_budget=int(os.getenv("STORY_CONTEXT_TOKEN_BUDGET", "4000")),
+            max_files=int(os.getenv("STORY_CONTEXT_MAX_FILES", "2000")),
+        ),
         storage=StorageConfig(
             primary=os.getenv("STORAGE_PRIMARY", "sqlite"),
             cache_enabled=os.getenv("STORAGE_CACHE_ENABLED", "false").lower() == "true",
             deployment_context=os.getenv("DEPLOYMENT_CONTEXT", "pipeline"),
+            cache_reconcile_interval_seconds=int(
+                os.getenv("STORAGE_CACHE_RECONCILE_SECONDS", "300")
+            ),
             issue_label_prefix=os.getenv("STORAGE_LABEL_PREFIX", "storyteller"),
         ),
         default_llm_provider=os.getenv("DEFAULT_LLM_PROVIDER", "github"),
         openai_api_key=os.getenv("OPENAI_API_KEY"),
         ollama_api_host=os.getenv("OLLAMA_API_HOST", "http://localhost:11434"),
+        batched_role_analysis=os.getenv("BATCHED_ROLE_ANALYSIS", "false").lower()
+        == "true",
+        llm_replay=LLMReplayConfig(
+            mode=os.getenv("LLM_REPLAY_MODE") or None,
+            fixtures_dir=Path(
+                os.getenv("LLM_REPLAY_FIXTURES_DIR", ".storyteller/llm_fixtures")
+            ),
+            upstream_provider=os.getenv("LLM_REPLAY_UPSTREAM_PROVIDER") or None,
+            on_miss=os.getenv("LLM_REPLAY_ON_MISS", "error"),
+            latency_distribution=os.getenv("LLM_REPLAY_LATENCY", "none"),
+            latency_params=[
+                float(value)
+                for value in os.getenv("LLM_REPLAY_LATENCY_PARAMS", "").split(",")
+                if value.strip()
+            ],
+            seed=(
+                int(os.getenv("LLM_REPLAY_SEED"))
+                if os.getenv("LLM_REPLAY_SEED")
+                else None
+            ),
+        ),
+        story_reuse=StoryReuseConfig(
+            enabled=os.getenv("STORY_REUSE_ENABLED", "false").lower() == "true",
+            max_hamming_distance=int(os.getenv("STORY_REUSE_MAX_DISTANCE", "10")),
+            min_similarity=float(os.getenv("STORY_REUSE_MIN_SIMILARITY", "0.8")),
+        ),
         log_level=os.getenv("LOG_LEVEL", "INFO"),
         max_retries=int(os.getenv("MAX_RETRIES", "3")),
         timeout_seconds=int(os.getenv("TIMEOUT_SECONDS", "30")),
@@ -180,6 +332,11 @@ def load_config() -> Config:
                     dependencies=repo_data.get("dependencies", []),
                     story_labels=repo_data.get("story_labels", []),
                     auto_assign=repo_data.get("auto_assign", {}),
+                    local_path=repo_data.get("local_path"),
+                    local_ref=repo_data.get("local_ref", "HEAD"),
+                    local_fetch_after_seconds=repo_data.get(
+                        "local_fetch_after_seconds", 0
+                    ),
                 )
 
             config.repositories = repositories
@@ -195,6 +352,10 @@ def load_config() -> Config:
                 deployment_context=storage_data.get(
                     "deployment_context", config.storage.deployment_context
                 ),
+                cache_reconcile_interval_seconds=storage_data.get(
+                    "cache_reconcile_interval_seconds",
+                    config.storage.cache_reconcile_interval_seconds,
+                ),
                 issue_label_prefix=storage_data.get(
                     "issue_label_prefix", config.storage.issue_label_prefix
                 ),
@@ -207,6 +368,108 @@ def load_config() -> Config:
                 ),
             )
 
+            # Parse LLM replay config
+            replay_data = config_data.get("llm_replay", {})
+            if replay_data:
+                config.llm_replay = LLMReplayConfig(
+                    mode=replay_data.get("mode", config.llm_replay.mode),
+                    fixtures_dir=Path(
+                        replay_data.get("fixtures_dir", config.llm_replay.fixtures_dir)
+                    ),
+                    upstream_provider=replay_data.get(
+                        "upstream_provider", config.llm_replay.upstream_provider
+                    ),
+                    on_miss=replay_data.get("on_miss", config.llm_replay.on_miss),
+                    latency_distribution=replay_data.get(
+                        "latency_distribution",
+                        config.llm_replay.latency_distribution,
+                    ),
+                    latency_params=replay_data.get(
+                        "latency_params", config.llm_replay.latency_params
+                    ),
+                    seed=replay_data.get("seed", config.llm_replay.seed),
+                )
+
+            # Parse GitHub HTTP cache config
+            cache_data = config_data.get("github_cache", {})
+            if cache_data:
+                config.github_cache = GitHubCacheConfig(
+                    enabled=cache_data.get("enabled", config.github_cache.enabled),
+                    path=Path(cache_data.get("path", config.github_cache.path)),
+                    max_entries=cache_data.get(
+                        "max_entries", config.github_cache.max_entries
+                    ),
+                    max_size_mb=cache_data.get(
+                        "max_size_mb", config.github_cache.max_size_mb
+                    ),
+                )
+
+            # Parse issue mirror config
+            mirror_data = config_data.get("issue_mirror", {})
+            if mirror_data:
+                config.issue_mirror = IssueMirrorConfig(
+                    enabled=mirror_data.get("enabled", config.issue_mirror.enabled),
+                    max_age_seconds=mirror_data.get(
+                        "max_age_seconds", config.issue_mirror.max_age_seconds
+                    ),
+                )
+
+            # Parse context store config
+            store_data = config_data.get("context_store", {})
+            if store_data:
+                config.context_store = ContextStoreConfig(
+                    enabled=store_data.get("enabled", config.context_store.enabled),
+                    path=Path(store_data.get("path", config.context_store.path)),
+                    max_size_mb=store_data.get(
+                        "max_size_mb", config.context_store.max_size_mb
+                    ),
+                    refresh_seconds=store_data.get(
+                        "refresh_seconds", config.context_store.refresh_seconds
+                    ),
+                )
+
+            # Parse API index config
+            api_index_data = config_data.get("api_index", {})
+            if api_index_data:
+                config.api_index = APIIndexConfig(
+                    enabled=api_index_data.get("enabled", config.api_index.enabled),
+                    max_files=api_index_data.get(
+                        "max_files", config.api_index.max_files
+                    ),
+                    max_endpoints=api_index_data.get(
+                        "max_endpoints", config.api_index.max_endpoints
+                    ),
+                )
+
+            # Parse story context config
+            story_context_data = config_data.get("story_context", {})
+            if story_context_data:
+                config.story_context = StoryContextConfig(
+                    enabled=story_context_data.get(
+                        "enabled", config.story_context.enabled
+                    ),
+                    token_budget=story_context_data.get(
+                        "token_budget", config.story_context.token_budget
+                    ),
+                    max_files=story_context_data.get(
+                        "max_files", config.story_context.max_files
+                    ),
+                )
+
+            # Parse story reuse config
+            reuse_data = config_data.get("story_reuse", {})
+            if reuse_data:
+                config.story_reuse = StoryReuseConfig(
+                    enabled=reuse_data.get("enabled", config.story_reuse.enabled),
+                    max_hamming_distance=reuse_data.get(
+                        "max_hamming_distance",
+                        config.story_reuse.max_hamming_distance,
+                    ),
+                    min_similarity=reuse_data.get(
+                        "min_similarity", config.story_reuse.min_similarity
+                    ),
+                )
+
             # Parse story workflow config
             workflow_data = config_data.get("story_workflow", {})
             config.story_workflow = StoryWorkflowConfig(
@@ -0,0 +1,214 @@
+"""Story-aware ranking of repository content with BM25 and a token budget.
+
+Files of a repository are split into chunks of consecutive lines, and a BM25
+inverted index is built over their terms: the words of the content,
+identifiers split at camelCase and snake_case boundaries, and the words of
+the file path, which count for every chunk of the file. An index is built
+once per commit. For a story, chunks are ranked by relevance to its text and
+the best ones are packed into a token budget, so prompts carry the code the
+story is about instead of the same key files for every story.
+"""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Lines per chunk; chunks end early at a blank line after half of this
+CHUNK_LINES = 40
+
+# Path words count this many times in every chunk of a file
+PATH_TERM_WEIGHT = 3
+
+# BM25 term-frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Rough size of a token, for budgeting without a tokenizer
+CHARS_PER_TOKEN = 4
+
+# Vendored, generated and lock files are not ranked
+_SKIPPED_PATH = re.compile(
+    r"(^|/)(node_modules|vendor|dist|build|\.next)/|\.min\.js$"
+    r"|(^|/)(package-lock|npm-shrinkwrap|composer)\.json$"
+)
+
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|\d+")
+_IDENTIFIER_PART = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+_STOP_WORDS = set(
+    "an and are as at be by can for from if in is it of on or so that the this "
+    "to want we with should will when def func function const let var return "
+    "import self true false none null nil new class".split()
+)
+
+
+def _normalize_term(word: str) -> str:
+    word = word.lower()
+    # Plural and singular forms share a term
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def index_terms(text: str) -> List[str]:
+    """Terms of text: words and identifiers, with the parts of identifiers."""
+    terms = []
+    for identifier in _IDENTIFIER.findall(text):
+        parts = _IDENTIFIER_PART.findall(identifier)
+        whole = identifier.replace("_", "")
+        if len(parts) > 1 and len(whole) > 2:
+            terms.append(_normalize_term(whole))
+        for part in parts:
+            if len(part) > 1 and part.lower() not in _STOP_WORDS:
+                terms.append(_normalize_term(part))
+    return terms
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of LLM tokens of a text."""
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def is_rankable(path: str, extensions: Iterable[str]) -> bool:
+    """Whether a file is indexed for story-aware context selection."""
+    return path.endswith(tuple(extensions)) and not _SKIPPED_PATH.search(path)
+
+
+def split_chunks(
+    content: str, chunk_lines: int = CHUNK_LINES
+) -> List[Tuple[int, int, str]]:
+    """Split content into (first line, last line, text) chunks."""
+    lines = content.splitlines()
+    chunks = []
+    start = 0
+    for index, line in enumerate(lines):
+        length = index - start + 1
+        at_break = not line.strip() and length >= chunk_lines // 2
+        if length >= chunk_lines or at_break or index == len(lines) - 1:
+            text = "\n".join(lines[start : index + 1]).strip("\n")
+            if text.strip():
+                chunks.append((start + 1, index + 1, text))
+            start = index + 1
+    return chunks
+
+
+@dataclass
+class ContentChunk:
+    """Consecutive lines of a repository file."""
+
+    repository: str
+    path: str
+    start_line: int
+    end_line: int
+    content: str
+    score: float = 0.0
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.content)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "repository": self.repository,
+            "path": self.path,
+            "lines": f"{self.start_line}-{self.end_line}",
+            "score": round(self.score, 3),
+            "content": self.content,
+        }
+
+
+class ChunkIndex:
+    """BM25 inverted index over the chunks of one repository."""
+
+    def __init__(self, chunks: List[ContentChunk], term_counts: List[Counter]):
+        self.chunks = chunks
+        self._lengths = [sum(counts.values()) for counts in term_counts]
+        total_length = sum(self._lengths)
+        self._average_length = (
+            total_length / len(self._lengths) if total_length else 1.0
+        )
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        for chunk_id, counts in enumerate(term_counts):
+            for term, count in counts.items():
+                self._postings.setdefault(term, []).append((chunk_id, count))
+
+    @classmethod
+    def build(
+        cls,
+        repository: str,
+        files: Dict[str, str],
+        chunk_lines: int = CHUNK_LINES,
+    ) -> "ChunkIndex":
+        """Index the contents of files (path -> text) of a repository."""
+        chunks: List[ContentChunk] = []
+        term_counts: List[Counter] = []
+        for path in sorted(files):
+            if not files[path]:
+                continue
+            path_counts = Counter(
+                {
+                    term: count * PATH_TERM_WEIGHT
+                    for term, count in Counter(index_terms(path)).items()
+                }
+            )
+            for start_line, end_line, text in split_chunks(files[path], chunk_lines):
+                chunks.append(
+                    ContentChunk(repository, path, start_line, end_line, text)
+                )
+                term_counts.append(Counter(index_terms(text)) + path_counts)
+        return cls(chunks, term_counts)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[ContentChunk]:
+        """Chunks matching any term of the query, by descending BM25 score."""
+        chunk_count = len(self.chunks)
+        scores: Dict[int, float] = {}
+        for term in set(index_terms(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(
+                1 + (chunk_count - len(postings) + 0.5) / (len(postings) + 0.5)
+            )
+            for chunk_id, count in postings:
+                norm = BM25_K1 * (
+                    1 - BM25_B + BM25_B * self._lengths[chunk_id] / self._average_length
+                )
+                weight = count * (BM25_K1 + 1) / (count + norm)
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * weight
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [
+            replace(self.chunks[chunk_id], score=score)
+            for chunk_id, score in ranked[:limit]
+        ]
+
+
+def normalize_scores(chunks: List[ContentChunk]) -> List[ContentChunk]:
+    """Scale scores from one index so its best chunk scores 1.0.
+
+    BM25 scores depend on the statistics of the index they come from, so
+    scores of separate repositories are only comparable once normalized.
+    """
+    top = max((chunk.score for chunk in chunks), default=0.0)
+    if top <= 0:
+        return chunks
+    return [replace(chunk, score=chunk.score / top) for chunk in chunks]
+
+
+def pack_chunks(
+    chunks: Iterable[ContentChunk], token_budget: int
+) -> List[ContentChunk]:
+    """Take chunks in order while they fit the token budget.
+
+    A chunk too large for the remaining budget is skipped, so smaller chunks
+    further down can still use it.
+    """
+    packed = []
+    remaining = token_budget
+    for chunk in chunks:
+        if chunk.tokens <= remaining:
+            packed.append(chunk)
+            remaining -= chunk.tokens
+    return packed
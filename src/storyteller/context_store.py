@@ -0,0 +1,257 @@
+"""Disk-backed store of repository context keyed by commit and blob SHA.
+
+A snapshot holds the structure summary and the file listing (path -> blob
+SHA) of a repository at one commit; file contents, and the API symbols
+extracted from them, are stored once per blob SHA. All of these are
+immutable, so nothing stored here goes stale. When a branch moves, only blobs
+whose SHA is not stored yet have to be fetched: the files a commit changed.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class RepositoryContextStore:
+    """SQLite store of repository snapshots and file contents."""
+
+    # Snapshots kept per repository; older commits are dropped
+    SNAPSHOTS_PER_REPOSITORY = 5
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        max_size_bytes: int = 200 * 1024 * 1024,
+    ):
+        self.db_path = Path(db_path)
+        self.max_size_bytes = max_size_bytes
+        self.stats = {"snapshot_hits": 0, "blob_hits": 0, "blob_misses": 0}
+
+        if str(self.db_path) != ":memory:":
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS context_snapshots (
+                repository TEXT NOT NULL,
+                commit_sha TEXT NOT NULL,
+                tree_sha TEXT NOT NULL,
+                structure TEXT NOT NULL,
+                files TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (repository, commit_sha)
+            )
+        """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS context_blobs (
+                blob_sha TEXT PRIMARY KEY,
+                content TEXT,
+                size INTEGER NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+        """
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS context_symbols (
+                blob_sha TEXT PRIMARY KEY,
+                version INTEGER NOT NULL,
+                symbols TEXT NOT NULL
+            )
+        """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_context_blobs_accessed "
+            "ON context_blobs(last_accessed)"
+        )
+        self._conn.commit()
+
+    def get_snapshot(
+        self, repository: str, commit_sha: str
+    ) -> Optional[Dict[str, Any]]:
+        """Return the snapshot of a repository at a commit, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT tree_sha, structure, files FROM context_snapshots "
+                "WHERE repository = ? AND commit_sha = ?",
+                (repository, commit_sha),
+            ).fetchone()
+        if row is None:
+            return None
+        self.stats["snapshot_hits"] += 1
+        return {
+            "commit_sha": commit_sha,
+            "tree_sha": row[0],
+            "structure": json.loads(row[1]),
+            "files": json.loads(row[2]),
+        }
+
+    def get_latest_snapshot(self, repository: str) -> Optional[Dict[str, Any]]:
+        """Return the most recently stored snapshot of a repository, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT commit_sha, tree_sha, structure, files "
+                "FROM context_snapshots WHERE repository = ? "
+                "ORDER BY created_at DESC LIMIT 1",
+                (repository,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "commit_sha": row[0],
+            "tree_sha": row[1],
+            "structure": json.loads(row[2]),
+            "files": json.loads(row[3]),
+        }
+
+    def put_snapshot(
+        self,
+        repository: str,
+        commit_sha: str,
+        tree_sha: str,
+        structure: Dict[str, Any],
+        files: Dict[str, str],
+    ):
+        """Store the structure and file listing (path -> blob SHA) at a commit."""
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO context_snapshots (
+                    repository, commit_sha, tree_sha, structure, files, created_at
+                ) VALUES (?, ?, ?, ?, ?, ?)
+            """,
+                (
+                    repository,
+                    commit_sha,
+                    tree_sha,
+                    json.dumps(structure),
+                    json.dumps(files),
+                    time.time(),
+                ),
+            )
+            self._conn.execute(
+                """
+                DELETE FROM context_snapshots
+                WHERE repository = ? AND commit_sha NOT IN (
+                    SELECT commit_sha FROM context_snapshots WHERE repository = ?
+                    ORDER BY created_at DESC LIMIT ?
+                )
+            """,
+                (repository, repository, self.SNAPSHOTS_PER_REPOSITORY),
+            )
+            self._conn.commit()
+
+    def get_blobs(self, blob_shas: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Return the stored contents (None for binary files) of known blobs."""
+        shas = list(dict.fromkeys(blob_shas))
+        found: Dict[str, Optional[str]] = {}
+        with self._lock:
+            for start in range(0, len(shas), 500):
+                chunk = shas[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                found.update(
+                    self._conn.execute(
+                        "SELECT blob_sha, content FROM context_blobs "
+                        f"WHERE blob_sha IN ({placeholders})",
+                        chunk,
+                    ).fetchall()
+                )
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE context_blobs SET last_accessed = ? WHERE blob_sha = ?",
+                    [(now, sha) for sha in found],
+                )
+                self._conn.commit()
+        self.stats["blob_hits"] += len(found)
+        self.stats["blob_misses"] += len(shas) - len(found)
+        return found
+
+    def put_blobs(self, contents: Dict[str, Optional[str]]):
+        """Store file contents by blob SHA (None for binary files)."""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO context_blobs (
+                    blob_sha, content, size, last_accessed
+                ) VALUES (?, ?, ?, ?)
+            """,
+                [
+                    (sha, content, len(content.encode("utf-8")) if content else 0, now)
+                    for sha, content in contents.items()
+                ],
+            )
+            self._evict()
+            self._conn.commit()
+
+    def get_symbols(
+        self, blob_shas: Iterable[str], version: int
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Return the symbols extracted from known blobs by an extractor version."""
+        shas = list(dict.fromkeys(blob_shas))
+        found: Dict[str, List[Dict[str, Any]]] = {}
+        with self._lock:
+            for start in range(0, len(shas), 500):
+                chunk = shas[start : start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for blob_sha, symbols in self._conn.execute(
+                    "SELECT blob_sha, symbols FROM context_symbols "
+                    f"WHERE version = ? AND blob_sha IN ({placeholders})",
+                    [version, *chunk],
+                ).fetchall():
+                    found[blob_sha] = json.loads(symbols)
+        return found
+
+    def put_symbols(self, symbols: Dict[str, List[Dict[str, Any]]], version: int):
+        """Store the symbols extracted from blobs (kept when contents are evicted)."""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO context_symbols (blob_sha, version, symbols) "
+                "VALUES (?, ?, ?)",
+                [
+                    (sha, version, json.dumps(blob_symbols))
+                    for sha, blob_symbols in symbols.items()
+                ],
+            )
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used blobs until the size limit holds."""
+        (total_size,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM context_blobs"
+        ).fetchone()
+        if total_size <= self.max_size_bytes:
+            return
+
+        evicted = []
+        for blob_sha, size in self._conn.execute(
+            "SELECT blob_sha, size FROM context_blobs ORDER BY last_accessed ASC"
+        ).fetchall():
+            if total_size <= self.max_size_bytes:
+                break
+            evicted.append((blob_sha,))
+            total_size -= size
+        self._conn.executemany("DELETE FROM context_blobs WHERE blob_sha = ?", evicted)
+
+    def clear(self):
+        """Remove all snapshots and contents."""
+        with self._lock:
+            self._conn.execute("DELETE FROM context_snapshots")
+            self._conn.execute("DELETE FROM context_blobs")
+            self._conn.execute("DELETE FROM context_symbols")
+            self._conn.commit()
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
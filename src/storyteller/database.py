@@ -193,6 +193,18 @@ class DatabaseManager:
         # Create pipeline monitoring tables
         self.create_pipeline_monitoring_schema(conn)
 
+        # Create story similarity tables
+        self.create_story_similarity_schema(conn)
+
+        # Create local GitHub issue mirror tables
+        self.create_issue_mirror_schema(conn)
+
+        # Create GitHub project synchronization tables
+        self.create_project_sync_schema(conn)
+
+        # Create cache tables for GitHub-stored stories
+        self.create_github_story_cache_schema(conn)
+
         conn.commit()
 
     def create_conversation_schema(self, conn: sqlite3.Connection):
@@ -622,6 +634,648 @@ class DatabaseManager:
             "CREATE INDEX IF NOT EXISTS idx_discussion_summaries_created_at ON discussion_summaries (created_at)"
         )
 
+    def create_story_similarity_schema(self, conn: sqlite3.Connection):
+        """Create database schema for near-duplicate story detection."""
+
+        # Fingerprints written before band schemes were stored separately
+        # carried four fixed band columns; they are a cache and are rebuilt
+        columns = [
+            row[1] for row in conn.execute("PRAGMA table_info(story_fingerprints)")
+        ]
+        if "band0" in columns:
+            conn.execute("DROP TABLE story_fingerprints")
+
+        # SimHash fingerprints of analyzed stories with their cached analyses
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS story_fingerprints (
+                story_id TEXT PRIMARY KEY,
+                simhash TEXT NOT NULL,
+                repositories TEXT NOT NULL,
+                normalized_content TEXT NOT NULL,
+                expert_analyses TEXT DEFAULT '[]',
+                synthesized_analysis TEXT,
+                created_at TEXT NOT NULL
+            )
+        """
+        )
+
+        # Band values of each fingerprint per banding scheme (number of
+        # bands), so candidates within a Hamming distance are found through
+        # indexed lookups of the bands they must share
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS story_fingerprint_bands (
+                band_count INTEGER NOT NULL,
+                band INTEGER NOT NULL,
+                value INTEGER NOT NULL,
+                story_id TEXT NOT NULL,
+                PRIMARY KEY (band_count, band, value, story_id)
+            )
+        """
+        )
+
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_story_fingerprint_bands_story "
+            "ON story_fingerprint_bands (story_id)"
+        )
+
+    def create_issue_mirror_schema(self, conn: sqlite3.Connection):
+        """Create database schema for the local mirror of GitHub issues."""
+
+        # Issues and pull requests of configured repositories, kept current by
+        # incremental ``since=`` syncs and issue/pull_request webhooks
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS issue_mirror (
+                repository_name TEXT NOT NULL,
+                issue_number INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                body TEXT,
+                state TEXT NOT NULL,
+                is_pull_request INTEGER NOT NULL DEFAULT 0,
+                labels TEXT DEFAULT '[]',
+                assignee TEXT,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                closed_at TEXT,
+
+                PRIMARY KEY (repository_name, issue_number)
+            )
+        """
+        )
+
+        # Identifier-like tokens (story/epic IDs) found in issue titles and
+        # bodies, so reference lookups are indexed instead of substring scans
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS issue_mirror_references (
+                reference TEXT NOT NULL,
+                repository_name TEXT NOT NULL,
+                issue_number INTEGER NOT NULL,
+
+                PRIMARY KEY (reference, repository_name, issue_number),
+                FOREIGN KEY (repository_name, issue_number)
+                    REFERENCES issue_mirror (repository_name, issue_number)
+                    ON DELETE CASCADE
+            )
+        """
+        )
+
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS issue_mirror_sync (
+                repository_name TEXT PRIMARY KEY,
+                last_updated_at TEXT,
+                synced_at TEXT NOT NULL
+            )
+        """
+        )
+
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_issue_mirror_state "
+            "ON issue_mirror (repository_name, state, created_at)"
+        )
+
+    def upsert_mirrored_issues(
+        self, repository_name: str, issues: List[Dict[str, Any]]
+    ) -> int:
+        """Insert or update mirrored issues; older snapshots never win.
+
+        Each issue dict needs number, title, state, created_at and updated_at
+        (ISO strings) and may carry body, is_pull_request, labels, assignee,
+        closed_at and references.
+        """
+        with self.get_connection() as conn:
+            stored = 0
+            for issue in issues:
+                cursor = conn.execute(
+                    """
+                    INSERT INTO issue_mirror
+                    (repository_name, issue_number, title, body, state,
+                     is_pull_request, labels, assignee, created_at, updated_at,
+                     closed_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (repository_name, issue_number) DO UPDATE SET
+                        title = excluded.title,
+                        body = excluded.body,
+                        state = excluded.state,
+                        is_pull_request = excluded.is_pull_request,
+                        labels = excluded.labels,
+                        assignee = excluded.assignee,
+                        updated_at = excluded.updated_at,
+                        closed_at = excluded.closed_at
+                    WHERE excluded.updated_at >= issue_mirror.updated_at
+                """,
+                    (
+                        repository_name,
+                        issue["number"],
+                        issue["title"],
+                        issue.get("body"),
+                        issue["state"],
+                        1 if issue.get("is_pull_request") else 0,
+                        json.dumps(issue.get("labels", [])),
+                        issue.get("assignee"),
+                        issue["created_at"],
+                        issue["updated_at"],
+                        issue.get("closed_at"),
+                    ),
+                )
+                if cursor.rowcount == 0:
+                    continue
+
+                stored += 1
+                conn.execute(
+                    "DELETE FROM issue_mirror_references "
+                    "WHERE repository_name = ? AND issue_number = ?",
+                    (repository_name, issue["number"]),
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO issue_mirror_references "
+                    "(reference, repository_name, issue_number) VALUES (?, ?, ?)",
+                    [
+                        (reference, repository_name, issue["number"])
+                        for reference in issue.get("references", [])
+                    ],
+                )
+            conn.commit()
+            return stored
+
+    def delete_mirrored_issue(self, repository_name: str, issue_number: int) -> bool:
+        """Remove a mirrored issue and its references; True if it was stored."""
+        with self.get_connection() as conn:
+            conn.execute(
+                "DELETE FROM issue_mirror_references "
+                "WHERE repository_name = ? AND issue_number = ?",
+                (repository_name, issue_number),
+            )
+            cursor = conn.execute(
+                "DELETE FROM issue_mirror "
+                "WHERE repository_name = ? AND issue_number = ?",
+                (repository_name, issue_number),
+            )
+            conn.commit()
+            return cursor.rowcount > 0
+
+    def get_mirrored_issues(
+        self,
+        repository_name: str,
+        state: Optional[str] = None,
+        reference: Optional[str] = None,
+        text: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get mirrored issues, newest first.
+
+        ``reference`` uses the indexed reference table; ``text`` falls back to
+        a substring match on title and body within the repository.
+        """
+        query = "SELECT m.* FROM issue_mirror m"
+        params: List[Any] = []
+        if reference:
+            query += (
+                " JOIN issue_mirror_references r"
+                " ON r.repository_name = m.repository_name"
+                " AND r.issue_number = m.issue_number AND r.reference = ?"
+            )
+            params.append(reference)
+
+        query += " WHERE m.repository_name = ?"
+        params.append(repository_name)
+        if state:
+            query += " AND m.state = ?"
+            params.append(state)
+        if text:
+            query += (
+                " AND (instr(m.title, ?) > 0"
+                " OR instr(COALESCE(m.body, ''), ?) > 0)"
+            )
+            params.extend([text, text])
+
+        query += " ORDER BY m.created_at DESC, m.issue_number DESC"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self.get_connection() as conn:
+            issues = []
+            for row in conn.execute(query, params).fetchall():
+                issue = dict(row)
+                issue["number"] = issue.pop("issue_number")
+                issue["is_pull_request"] = bool(issue["is_pull_request"])
+                issue["labels"] = json.loads(issue["labels"] or "[]")
+                issues.append(issue)
+            return issues
+
+    def get_issue_mirror_sync_state(
+        self, repository_name: str
+    ) -> Optional[Dict[str, Any]]:
+        """Get when a repository was last synced and its newest issue update."""
+        with self.get_connection() as conn:
+            row = conn.execute(
+                "SELECT * FROM issue_mirror_sync WHERE repository_name = ?",
+                (repository_name,),
+            ).fetchone()
+            return dict(row) if row else None
+
+    def update_issue_mirror_sync_state(
+        self, repository_name: str, last_updated_at: Optional[str]
+    ):
+        """Record a completed sync of a repository."""
+        with self.get_connection() as conn:
+            conn.execute(
+                """
+                INSERT INTO issue_mirror_sync
+                (repository_name, last_updated_at, synced_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT (repository_name) DO UPDATE SET
+                    last_updated_at = COALESCE(
+                        excluded.last_updated_at, issue_mirror_sync.last_updated_at
+                    ),
+                    synced_at = excluded.synced_at
+            """,
+                (
+                    repository_name,
+                    last_updated_at,
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+            conn.commit()
+
+    def create_project_sync_schema(self, conn: sqlite3.Connection):
+        """Create database schema for GitHub project synchronization state."""
+
+        # Project item of each synced story and the field values last sent,
+        # so repeated syncs only mutate what changed
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS project_item_sync (
+                project_id TEXT NOT NULL,
+                story_id TEXT NOT NULL,
+                repository_name TEXT NOT NULL,
+                issue_number INTEGER NOT NULL,
+                item_id TEXT NOT NULL,
+                field_values TEXT DEFAULT '{}',
+                synced_at TEXT NOT NULL,
+
+                PRIMARY KEY (project_id, story_id)
+            )
+        """
+        )
+
+    def get_project_sync_state(self, project_id: str) -> Dict[str, Dict[str, Any]]:
+        """Get the synced project item and field values of each story."""
+        with self.get_connection() as conn:
+            rows = conn.execute(
+                "SELECT * FROM project_item_sync WHERE project_id = ?",
+                (project_id,),
+            ).fetchall()
+            return {
+                row["story_id"]: {
+                    "repository_name": row["repository_name"],
+                    "issue_number": row["issue_number"],
+                    "item_id": row["item_id"],
+                    "field_values": json.loads(row["field_values"] or "{}"),
+                }
+                for row in rows
+            }
+
+    def save_project_sync_state(
+        self,
+        project_id: str,
+        state: Dict[str, Dict[str, Any]],
+        removed_story_ids: Optional[List[str]] = None,
+    ):
+        """Store the sync state of stories and drop that of removed stories."""
+        synced_at = datetime.now(timezone.utc).isoformat()
+        with self.get_connection() as conn:
+            conn.executemany(
+                "DELETE FROM project_item_sync WHERE project_id = ? AND story_id = ?",
+                [(project_id, story_id) for story_id in removed_story_ids or []],
+            )
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO project_item_sync
+                (project_id, story_id, repository_name, issue_number, item_id,
+                 field_values, synced_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+                [
+                    (
+                        project_id,
+                        story_id,
+                        entry["repository_name"],
+                        entry["issue_number"],
+                        entry["item_id"],
+                        json.dumps(entry.get("field_values", {})),
+                        synced_at,
+                    )
+                    for story_id, entry in state.items()
+                ],
+            )
+            conn.commit()
+
+    def create_github_story_cache_schema(self, conn: sqlite3.Connection):
+        """Create database schema for the cache of GitHub-stored stories."""
+
+        # Stories parsed from GitHub issues when GitHub is the primary
+        # storage, versioned by the issue's updated_at
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS github_story_cache (
+                story_id TEXT PRIMARY KEY,
+                story_type TEXT NOT NULL,
+                repository_name TEXT NOT NULL,
+                issue_number INTEGER NOT NULL,
+                issue_updated_at TEXT NOT NULL,
+                data TEXT NOT NULL,
+                cached_at TEXT NOT NULL
+            )
+        """
+        )
+
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_github_story_cache_issue "
+            "ON github_story_cache (repository_name, issue_number)"
+        )
+
+        # Newest issue update seen by the cache reconciler per repository
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS github_story_cache_sync (
+                repository_name TEXT PRIMARY KEY,
+                last_updated_at TEXT,
+                reconciled_at TEXT NOT NULL
+            )
+        """
+        )
+
+    def cache_github_stories(self, entries: List[Dict[str, Any]]) -> int:
+        """Insert or update cached GitHub stories; older versions never win.
+
+        Each entry needs story, repository_name, issue_number and
+        issue_updated_at (ISO string).
+        """
+        cached_at = datetime.now(timezone.utc).isoformat()
+        with self.get_connection() as conn:
+            stored = 0
+            for entry in entries:
+                story = entry["story"]
+                data = story.to_dict()
+                cursor = conn.execute(
+                    """
+                    INSERT INTO github_story_cache
+                    (story_id, story_type, repository_name, issue_number,
+                     issue_updated_at, data, cached_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (story_id) DO UPDATE SET
+                        story_type = excluded.story_type,
+                        repository_name = excluded.repository_name,
+                        issue_number = excluded.issue_number,
+                        issue_updated_at = excluded.issue_updated_at,
+                        data = excluded.data,
+                        cached_at = excluded.cached_at
+                    WHERE excluded.issue_updated_at
+                        >= github_story_cache.issue_updated_at
+                """,
+                    (
+                        story.id,
+                        data["story_type"],
+                        entry["repository_name"],
+                        entry["issue_number"],
+                        entry["issue_updated_at"],
+                        json.dumps(data),
+                        cached_at,
+                    ),
+                )
+                stored += cursor.rowcount
+            conn.commit()
+            return stored
+
+    def get_cached_github_story(
+        self, story_id: str, story_type: Optional[StoryType] = None
+    ) -> Optional[Union[Epic, UserStory, SubStory]]:
+        """Get a cached GitHub story by ID, optionally of a given type."""
+        query = "SELECT data FROM github_story_cache WHERE story_id = ?"
+        params: List[Any] = [story_id]
+        if story_type:
+            query += " AND story_type = ?"
+            params.append(story_type.value)
+
+        with self.get_connection() as conn:
+            row = conn.execute(query, params).fetchone()
+            return self._row_to_story(json.loads(row["data"])) if row else None
+
+    def get_github_story_cache_versions(self, repository_name: str) -> Dict[int, str]:
+        """Get the cached issue version (updated_at) per issue number."""
+        with self.get_connection() as conn:
+            rows = conn.execute(
+                "SELECT issue_number, issue_updated_at FROM github_story_cache "
+                "WHERE repository_name = ?",
+                (repository_name,),
+            ).fetchall()
+            return {row["issue_number"]: row["issue_updated_at"] for row in rows}
+
+    def get_github_story_cache_repositories(self) -> List[str]:
+        """Get the repositories that have cached GitHub stories."""
+        with self.get_connection() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT repository_name FROM github_story_cache"
+            ).fetchall()
+            return [row["repository_name"] for row in rows]
+
+    def invalidate_github_story_cache(
+        self, repository_name: str, issue_number: int
+    ) -> int:
+        """Drop the cached stories of an issue."""
+        with self.get_connection() as conn:
+            cursor = conn.execute(
+                "DELETE FROM github_story_cache "
+                "WHERE repository_name = ? AND issue_number = ?",
+                (repository_name, issue_number),
+            )
+            conn.commit()
+            return cursor.rowcount
+
+    def get_github_story_cache_sync_state(
+        self, repository_name: str
+    ) -> Optional[Dict[str, Any]]:
+        """Get when the cache of a repository was last reconciled."""
+        with self.get_connection() as conn:
+            row = conn.execute(
+                "SELECT * FROM github_story_cache_sync WHERE repository_name = ?",
+                (repository_name,),
+            ).fetchone()
+            return dict(row) if row else None
+
+    def update_github_story_cache_sync_state(
+        self, repository_name: str, last_updated_at: Optional[str]
+    ):
+        """Record a completed reconciliation of a repository's cache."""
+        with self.get_connection() as conn:
+            conn.execute(
+                """
+                INSERT INTO github_story_cache_sync
+                (repository_name, last_updated_at, reconciled_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT (repository_name) DO UPDATE SET
+                    last_updated_at = COALESCE(
+                        excluded.last_updated_at,
+                        github_story_cache_sync.last_updated_at
+                    ),
+                    reconciled_at = excluded.reconciled_at
+            """,
+                (
+                    repository_name,
+                    last_updated_at,
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+            conn.commit()
+
+    def save_story_fingerprint(
+        self,
+        story_id: str,
+        simhash: int,
+        repositories: List[str],
+        normalized_content: str,
+        expert_analyses: List[Dict[str, Any]],
+        synthesized_analysis: str,
+        bands: Optional[List[int]] = None,
+    ) -> bool:
+        """Store the fingerprint and analyses of a processed story.
+
+        ``bands`` are the band values of ``simhash`` in the caller's banding
+        scheme, which makes the story a candidate for banded lookups.
+        """
+        with self.get_connection() as conn:
+            try:
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO story_fingerprints
+                    (story_id, simhash, repositories, normalized_content,
+                     expert_analyses, synthesized_analysis, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                    (
+                        story_id,
+                        f"{simhash:016x}",
+                        json.dumps(sorted(repositories)),
+                        normalized_content,
+                        json.dumps(expert_analyses),
+                        synthesized_analysis,
+                        datetime.now(timezone.utc).isoformat(),
+                    ),
+                )
+                conn.execute(
+                    "DELETE FROM story_fingerprint_bands WHERE story_id = ?",
+                    (story_id,),
+                )
+                if bands:
+                    self._insert_story_fingerprint_bands(conn, {story_id: bands})
+                conn.commit()
+                return True
+            except Exception as e:
+                logger.error(f"Failed to store story fingerprint: {e}")
+                return False
+
+    def _insert_story_fingerprint_bands(
+        self, conn: sqlite3.Connection, bands_by_story: Dict[str, List[int]]
+    ):
+        conn.executemany(
+            """
+            INSERT OR IGNORE INTO story_fingerprint_bands
+            (band_count, band, value, story_id)
+            VALUES (?, ?, ?, ?)
+        """,
+            [
+                (len(bands), band, value, story_id)
+                for story_id, bands in bands_by_story.items()
+                for band, value in enumerate(bands)
+            ],
+        )
+
+    def get_unbanded_story_fingerprints(self, band_count: int) -> Dict[str, int]:
+        """Get the hashes (story ID -> simhash) lacking bands of a scheme."""
+        with self.get_connection() as conn:
+            cursor = conn.execute(
+                """
+                SELECT story_id, simhash FROM story_fingerprints f
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM story_fingerprint_bands b
+                    WHERE b.band_count = ? AND b.band = 0
+                      AND b.story_id = f.story_id
+                )
+            """,
+                (band_count,),
+            )
+            return {row["story_id"]: int(row["simhash"], 16) for row in cursor}
+
+    def save_story_fingerprint_bands(self, bands_by_story: Dict[str, List[int]]):
+        """Store band values (story ID -> bands) of existing fingerprints."""
+        with self.get_connection() as conn:
+            self._insert_story_fingerprint_bands(conn, bands_by_story)
+            conn.commit()
+
+    def get_story_fingerprint_candidates(
+        self,
+        simhash: int,
+        repositories: List[str],
+        bands: Optional[List[int]] = None,
+        max_distance: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get stored fingerprints for the same repositories.
+
+        With ``bands`` only fingerprints sharing the value of at least one
+        band with ``simhash`` are considered, through the band index. With
+        ``max_distance`` only fingerprints within that Hamming distance are
+        returned; analyses and content are loaded for those alone.
+        """
+        query = (
+            "SELECT story_id, simhash FROM story_fingerprints WHERE repositories = ?"
+        )
+        params: List[Any] = [json.dumps(sorted(repositories))]
+
+        if bands:
+            matches = " OR ".join("(band = ? AND value = ?)" for _ in bands)
+            query += (
+                " AND story_id IN (SELECT story_id FROM story_fingerprint_bands"
+                f" WHERE band_count = ? AND ({matches}))"
+            )
+            params.append(len(bands))
+            for band, value in enumerate(bands):
+                params.extend((band, value))
+
+        with self.get_connection() as conn:
+            story_ids = [
+                row["story_id"]
+                for row in conn.execute(query, params)
+                if max_distance is None
+                or bin(int(row["simhash"], 16) ^ simhash).count("1") <= max_distance
+            ]
+            if not story_ids:
+                return []
+
+            placeholders = ", ".join("?" for _ in story_ids)
+            cursor = conn.execute(
+                f"""
+                SELECT * FROM story_fingerprints
+                WHERE story_id IN ({placeholders})
+                ORDER BY created_at DESC
+            """,
+                story_ids,
+            )
+            candidates = []
+            for row in cursor.fetchall():
+                candidate = dict(row)
+                candidate["simhash"] = int(candidate["simhash"], 16)
+                candidate["repositories"] = json.loads(candidate["repositories"])
+                candidate["expert_analyses"] = json.loads(
+                    candidate["expert_analyses"] or "[]"
+                )
+                candidates.append(candidate)
+            return candidates
+
     def save_story(self, story: Union[Epic, UserStory, SubStory]) -> str:
         """Save a story to the database."""
         with self.get_connection() as conn:
@@ -2373,6 +3027,14 @@ def run_migrations(db_path: str = "storyteller.db"):
             "discussion_threads",
             "thread_perspectives",
             "discussion_summaries",
+            "story_fingerprints",
+            "story_fingerprint_bands",
+            "issue_mirror",
+            "issue_mirror_references",
+            "issue_mirror_sync",
+            "project_item_sync",
+            "github_story_cache",
+            "github_story_cache_sync",
         ]
         missing_tables = [t for t in expected_tables if t not in tables]
 
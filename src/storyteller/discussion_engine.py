@@ -18,6 +18,7 @@ from models import (
 )
 from multi_repo_context import MultiRepositoryContextReader
 from role_analyzer import RoleAssignmentEngine
+from structured_output import StructuredOutputError, extract_json
 
 logger = logging.getLogger(__name__)
 
@@ -178,9 +179,18 @@ class DiscussionEngine:
     ) -> None:
         """Generate initial perspectives from each role."""
 
+        # In batched mode ask for all roles at once, then fill in any gaps
+        batched_perspectives: Dict[str, RolePerspective] = {}
+        if self.config.batched_role_analysis and len(roles) > 1:
+            batched_perspectives = await self._generate_batched_perspectives(
+                roles, story_content, repositories, thread.topic
+            )
+
         # Generate perspectives concurrently for better performance
         perspective_tasks = []
         for role in roles:
+            if role in batched_perspectives:
+                continue
             task = self._generate_role_perspective(
                 role, story_content, repositories, thread.topic
             )
@@ -188,6 +198,10 @@ class DiscussionEngine:
 
         perspectives = await asyncio.gather(*perspective_tasks, return_exceptions=True)
 
+        for role in roles:
+            if role in batched_perspectives:
+                thread.add_perspective(batched_perspectives[role])
+
         for perspective in perspectives:
             if isinstance(perspective, Exception):
                 logger.error(f"Error generating perspective: {perspective}")
@@ -195,6 +209,114 @@ class DiscussionEngine:
 
             thread.add_perspective(perspective)
 
+    async def _generate_batched_perspectives(
+        self,
+        roles: List[str],
+        story_content: str,
+        repositories: List[str],
+        topic: str,
+    ) -> Dict[str, RolePerspective]:
+        """Generate perspectives for several roles with a single LLM request."""
+
+        role_lines = "\n".join(
+            f"- {role}: {self._get_role_description(role)}" for role in roles
+        )
+
+        system_prompt = f"""
+        You are simulating a multi-role discussion about a software development story.
+        The discussion involves repositories: {', '.join(repositories)}
+
+        Participating roles:
+        {role_lines}
+
+        Answer independently for each role, from that role's expertise only.
+        """
+
+        discussion_prompt = f"""
+        Story: {story_content}
+
+        Discussion Topic: {topic}
+
+        Repositories Involved: {', '.join(repositories)}
+
+        Respond with a JSON object only, with exactly one entry per role:
+        {{
+          "perspectives": [
+            {{
+              "role_name": "one of: {', '.join(roles)}",
+              "viewpoint": "the role's viewpoint on this story",
+              "arguments": ["key argument supporting the position"],
+              "concerns": ["concern or potential issue"],
+              "suggestions": ["suggestion for improvement"],
+              "confidence_level": 0.8
+            }}
+          ]
+        }}
+        """
+
+        try:
+            response = await self.llm_handler.generate_response(
+                prompt=discussion_prompt,
+                system_prompt=system_prompt,
+                max_tokens=1000 * (len(roles) + 1),
+                json_mode=True,
+            )
+        except Exception as e:
+            logger.warning(f"Batched perspective request failed: {e}")
+            return {}
+
+        return self._parse_batched_perspectives(response.content, roles, repositories)
+
+    def _parse_batched_perspectives(
+        self, response_content: str, roles: List[str], repositories: List[str]
+    ) -> Dict[str, RolePerspective]:
+        """Validate a batched perspective response, keeping only well-formed roles."""
+
+        try:
+            data, _ = extract_json(response_content)
+        except StructuredOutputError as e:
+            logger.warning(f"Failed to parse batched perspectives: {e}")
+            return {}
+
+        entries = data.get("perspectives", []) if isinstance(data, dict) else data
+        if not isinstance(entries, list):
+            return {}
+
+        def _as_list(value: Any) -> List[str]:
+            if not isinstance(value, list):
+                return []
+            return [str(item) for item in value if item]
+
+        perspectives = {}
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+
+            role_name = entry.get("role_name")
+            viewpoint = entry.get("viewpoint")
+            if role_name not in roles or role_name in perspectives:
+                continue
+            if not isinstance(viewpoint, str) or not viewpoint.strip():
+                continue
+
+            try:
+                confidence_level = float(entry.get("confidence_level", 0.7))
+            except (TypeError, ValueError):
+                confidence_level = 0.7
+
+            perspectives[role_name] = RolePerspective(
+                role_name=role_name,
+                viewpoint=viewpoint,
+                arguments=_as_list(entry.get("arguments")),
+                concerns=_as_list(entry.get("concerns")),
+                suggestions=_as_list(entry.get("suggestions")),
+                confidence_level=min(max(confidence_level, 0.0), 1.0),
+                repository_context=", ".join(repositories),
+                metadata={"batched": True},
+            )
+
+        return perspectives
+
     async def _generate_role_perspective(
         self,
         role_name: str,
@@ -250,8 +372,8 @@ class DiscussionEngine:
                 confidence_level=0.0,
             )
 
-    def _build_role_system_prompt(self, role_name: str, repositories: List[str]) -> str:
-        """Build a system prompt for a specific role."""
+    def _get_role_description(self, role_name: str) -> str:
+        """Get the one-line description used to prime a role."""
 
         role_descriptions = {
             "product-owner": "You are a Product Owner focused on business value, user needs, and strategic alignment.",
@@ -264,11 +386,16 @@ class DiscussionEngine:
             "ai-expert": "You are an AI Expert focused on machine learning, data science, and AI implementation.",
         }
 
-        base_description = role_descriptions.get(
+        return role_descriptions.get(
             role_name,
             f"You are a {role_name.replace('-', ' ').title()} with expertise in your domain.",
         )
 
+    def _build_role_system_prompt(self, role_name: str, repositories: List[str]) -> str:
+        """Build a system prompt for a specific role."""
+
+        base_description = self._get_role_description(role_name)
+
         return f"""
         {base_description}
         
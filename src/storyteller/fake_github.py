@@ -0,0 +1,1428 @@
+"""In-process stand-in for the GitHub REST and GraphQL APIs.
+
+FakeGitHub serves the subset of the API storyteller uses (repositories,
+issues and comments, contents, branches, git trees and blobs, languages,
+issue search, workflow
+jobs and logs, and the Projects v2 GraphQL operations) from in-memory state
+over a local HTTP server. Point ``GITHUB_API_URL`` (``Config.github_api_url``)
+at ``FakeGitHub.url`` and GitHubHandler, GitHubStorageManager and
+PipelineMonitor run unmodified against it.
+
+Every request is counted per route. Latency, rate-limit budgets, secondary
+rate limits and failures can be injected to measure call counts and
+latency sensitivity without touching GitHub.
+"""
+
+import base64
+import fnmatch
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlencode, urlparse
+
+logger = logging.getLogger(__name__)
+
+# Routes counted against the search rate-limit budget instead of core
+_SEARCH_ROUTES = ("search.issues",)
+
+
+class FakeGitHubError(Exception):
+    """An error response to return from a fake endpoint."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _timestamp(value: Optional[datetime] = None) -> str:
+    value = value or datetime.now(timezone.utc)
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _git_sha(kind: str, data: bytes) -> str:
+    header = f"{kind} {len(data)}\0".encode("utf-8")
+    return hashlib.sha1(header + data).hexdigest()
+
+
+@dataclass
+class FakeRepository:
+    """State of one fake repository."""
+
+    full_name: str
+    id: int
+    default_branch: str = "main"
+    language: Optional[str] = "Python"
+    description: str = ""
+    files: Dict[str, str] = field(default_factory=dict)  # path -> text
+    issues: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+    comments: Dict[int, List[Dict[str, Any]]] = field(default_factory=dict)
+    labels: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    workflow_jobs: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    job_logs: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def node_id(self) -> str:
+        return f"R_{self.id}"
+
+
+@dataclass
+class FakeProject:
+    """State of one fake Projects (v2) board."""
+
+    id: str
+    number: int
+    title: str
+    description: str = ""
+    fields: List[Dict[str, Any]] = field(default_factory=list)
+    items: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+
+@dataclass
+class _Failure:
+    route: str  # fnmatch pattern over route names, e.g. "issues.*"
+    status: int
+    remaining: int
+    message: str
+    headers: Dict[str, str] = field(default_factory=dict)
+
+
+# GraphQL --------------------------------------------------------------------
+
+_TOKEN_PATTERN = re.compile(
+    r'\s+|,|#[^\n]*|(?P<string>"(?:[^"\\]|\\.)*")|(?P<spread>\.\.\.)'
+    r"|(?P<punct>[{}()\[\]:!$=@])|(?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)"
+    r"|(?P<name>[_A-Za-z][_0-9A-Za-z]*)"
+)
+
+
+@dataclass
+class _Field:
+    alias: str
+    name: str
+    arguments: Dict[str, Any]
+    selections: List[Any]
+
+
+@dataclass
+class _InlineFragment:
+    type_condition: Optional[str]
+    selections: List[Any]
+
+
+class _GraphQLParser:
+    """Parser for the executable GraphQL subset used by storyteller."""
+
+    def __init__(self, document: str, variables: Optional[Dict[str, Any]]):
+        self.tokens: List[Tuple[str, str]] = []
+        position = 0
+        while position < len(document):
+            match = _TOKEN_PATTERN.match(document, position)
+            if not match:
+                raise FakeGitHubError(400, f"Syntax error at {position}")
+            position = match.end()
+            if match.lastgroup:
+                self.tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        self.index = 0
+        self.variables = variables or {}
+
+    def _peek(self) -> Tuple[Optional[str], Optional[str]]:
+        if self.index < len(self.tokens):
+            return self.tokens[self.index]
+        return None, None
+
+    def _next(self) -> Tuple[str, str]:
+        token = self._peek()
+        if token[0] is None:
+            raise FakeGitHubError(400, "Unexpected end of document")
+        self.index += 1
+        return token
+
+    def _expect(self, value: str) -> None:
+        kind, text = self._next()
+        if text != value:
+            raise FakeGitHubError(400, f"Expected {value!r}, got {text!r}")
+
+    def parse(self) -> Tuple[str, List[Any]]:
+        """Return the operation type and root selections of the document."""
+        operation = "query"
+        kind, text = self._peek()
+        if kind == "name" and text in ("query", "mutation"):
+            operation = self._next()[1]
+            if self._peek()[0] == "name":
+                self._next()  # Operation name
+            if self._peek()[1] == "(":
+                self._skip_variable_definitions()
+        return operation, self._selection_set()
+
+    def _skip_variable_definitions(self) -> None:
+        depth = 0
+        while True:
+            _, text = self._next()
+            if text == "(":
+                depth += 1
+            elif text == ")":
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def _selection_set(self) -> List[Any]:
+        self._expect("{")
+        selections = []
+        while self._peek()[1] != "}":
+            if self._peek()[0] == "spread":
+                self._next()
+                type_condition = None
+                if self._peek()[1] == "on":
+                    self._next()
+                    type_condition = self._next()[1]
+                selections.append(
+                    _InlineFragment(type_condition, self._selection_set())
+                )
+                continue
+
+            alias = name = self._next()[1]
+            if self._peek()[1] == ":":
+                self._next()
+                name = self._next()[1]
+            arguments = {}
+            if self._peek()[1] == "(":
+                self._next()
+                while self._peek()[1] != ")":
+                    argument = self._next()[1]
+                    self._expect(":")
+                    arguments[argument] = self._value()
+                self._next()
+            sub_selections = []
+            if self._peek()[1] == "{":
+                sub_selections = self._selection_set()
+            selections.append(_Field(alias, name, arguments, sub_selections))
+        self._next()
+        return selections
+
+    def _value(self) -> Any:
+        kind, text = self._next()
+        if text == "$":
+            return self.variables.get(self._next()[1])
+        if kind == "string":
+            return json.loads(text)
+        if kind == "number":
+            return float(text) if re.search(r"[.eE]", text) else int(text)
+        if text == "[":
+            values = []
+            while self._peek()[1] != "]":
+                values.append(self._value())
+            self._next()
+            return values
+        if text == "{":
+            values = {}
+            while self._peek()[1] != "}":
+                name = self._next()[1]
+                self._expect(":")
+                values[name] = self._value()
+            self._next()
+            return values
+        if kind == "name":
+            return {"true": True, "false": False, "null": None}.get(text, text)
+        raise FakeGitHubError(400, f"Unexpected token {text!r}")
+
+
+def _resolve(
+    value: Any, selections: List[Any], path: List[Any], errors: List[Dict]
+) -> Any:
+    """Resolve a selection set against dicts whose values may be resolvers."""
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return [
+            _resolve(item, selections, path + [index], errors)
+            for index, item in enumerate(value)
+        ]
+    if not selections:
+        return value
+
+    result: Dict[str, Any] = {}
+    for selection in selections:
+        if isinstance(selection, _InlineFragment):
+            typename = value.get("__typename")
+            if selection.type_condition in (None, typename):
+                result.update(_resolve(value, selection.selections, path, errors))
+            continue
+
+        raw = value.get(selection.name)
+        try:
+            if callable(raw):
+                raw = raw(**selection.arguments)
+        except FakeGitHubError as e:
+            errors.append({"message": str(e), "path": path + [selection.alias]})
+            result[selection.alias] = None
+            continue
+        result[selection.alias] = _resolve(
+            raw, selection.selections, path + [selection.alias], errors
+        )
+    return result
+
+
+# Server ---------------------------------------------------------------------
+
+
+class FakeGitHub:
+    """Local HTTP server emulating the GitHub API subset storyteller uses.
+
+    Args:
+        latency: Seconds added to every response
+        latency_jitter: Upper bound of extra random latency per response
+        rate_limit: Core REST requests per rate-limit window
+        graphql_rate_limit: GraphQL requests per window
+        search_rate_limit: Search requests per window
+        rate_limit_window: Seconds until an exhausted budget resets
+        failure_rate: Probability of an injected 502 on any request
+        seed: Seed for latency jitter and random failures
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        rate_limit: int = 5000,
+        graphql_rate_limit: int = 5000,
+        search_rate_limit: int = 30,
+        rate_limit_window: float = 3600.0,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.rate_limit_window = rate_limit_window
+        self.failure_rate = failure_rate
+        self.limits = {
+            "core": rate_limit,
+            "graphql": graphql_rate_limit,
+            "search": search_rate_limit,
+        }
+
+        self.repositories: Dict[str, FakeRepository] = {}
+        self.projects: Dict[str, FakeProject] = {}
+        self.calls: Counter = Counter()
+        self.call_log: List[Dict[str, Any]] = []
+
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._failures: List[_Failure] = []
+        self._budgets: Dict[str, Dict[str, float]] = {}
+        self._next_id = 1
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._routes = self._build_routes()
+        self.reset_rate_limits()
+
+    # Lifecycle
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as the GitHub API URL."""
+        if not self._server:
+            raise RuntimeError("FakeGitHub is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeGitHub":
+        """Start serving on a free local port."""
+        fake = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _handle(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                status, headers, payload = fake.handle_request(
+                    self.command, self.path, dict(self.headers.items()), body
+                )
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(payload)
+
+            do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = do_HEAD = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="fake-github", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeGitHub":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    # Seeding
+
+    def _new_id(self) -> int:
+        with self._lock:
+            self._next_id += 1
+            return self._next_id
+
+    def add_repository(
+        self,
+        full_name: str,
+        files: Optional[Dict[str, str]] = None,
+        default_branch: str = "main",
+        language: Optional[str] = "Python",
+        description: str = "",
+    ) -> FakeRepository:
+        """Create a repository with the given files (path -> text)."""
+        repository = FakeRepository(
+            full_name=full_name,
+            id=self._new_id(),
+            default_branch=default_branch,
+            language=language,
+            description=description,
+            files=dict(files or {}),
+        )
+        self.repositories[full_name] = repository
+        return repository
+
+    def add_issue(
+        self,
+        full_name: str,
+        title: str,
+        body: str = "",
+        labels: Optional[List[str]] = None,
+        state: str = "open",
+        assignees: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Create an issue directly in the fake state."""
+        with self._lock:
+            repository = self.repositories[full_name]
+            return self._create_issue(
+                repository,
+                {
+                    "title": title,
+                    "body": body,
+                    "labels": labels or [],
+                    "assignees": assignees or [],
+                    "state": state,
+                },
+            )
+
+    def add_project(
+        self,
+        title: str,
+        fields: Optional[List[Tuple[str, str, Optional[List[str]]]]] = None,
+        description: str = "",
+    ) -> FakeProject:
+        """Create a project with (name, data type, options) fields."""
+        with self._lock:
+            project = FakeProject(
+                id=f"PVT_{self._new_id()}",
+                number=len(self.projects) + 1,
+                title=title,
+                description=description,
+            )
+            for name, data_type, options in fields or [("Status", "TEXT", None)]:
+                field_data = {
+                    "id": f"PVTF_{self._new_id()}",
+                    "name": name,
+                    "dataType": data_type,
+                    "__typename": "ProjectV2Field",
+                }
+                if options is not None:
+                    field_data["__typename"] = "ProjectV2SingleSelectField"
+                    field_data["options"] = [
+                        {"id": f"PVTO_{self._new_id()}", "name": option}
+                        for option in options
+                    ]
+                project.fields.append(field_data)
+            self.projects[project.id] = project
+            return project
+
+    def add_workflow_run(
+        self,
+        full_name: str,
+        run_id: str,
+        jobs: List[Dict[str, Any]],
+        logs: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Register the jobs (and job_id -> log text) of a workflow run."""
+        repository = self.repositories[full_name]
+        repository.workflow_jobs[str(run_id)] = jobs
+        for job_id, text in (logs or {}).items():
+            repository.job_logs[str(job_id)] = text
+
+    # Fault injection and metrics
+
+    def fail_next(
+        self,
+        route: str = "*",
+        status: int = 500,
+        count: int = 1,
+        message: str = "Injected failure",
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Fail the next count requests whose route name matches route."""
+        with self._lock:
+            self._failures.append(
+                _Failure(route, status, count, message, dict(headers or {}))
+            )
+
+    def trigger_secondary_rate_limit(
+        self, route: str = "*", count: int = 1, retry_after: int = 1
+    ) -> None:
+        """Answer the next requests with a secondary rate limit response."""
+        self.fail_next(
+            route,
+            status=403,
+            count=count,
+            message="You have exceeded a secondary rate limit.",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    def reset_rate_limits(self) -> None:
+        """Restore every rate-limit budget to its full limit."""
+        with self._lock:
+            reset_at = time.time() + self.rate_limit_window
+            self._budgets = {
+                resource: {"remaining": limit, "reset": reset_at}
+                for resource, limit in self.limits.items()
+            }
+
+    def reset_metrics(self) -> None:
+        """Forget recorded calls."""
+        with self._lock:
+            self.calls.clear()
+            self.call_log.clear()
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def snapshot_calls(self) -> Counter:
+        """Copy of the per-route call counter."""
+        with self._lock:
+            return Counter(self.calls)
+
+    # Request handling
+
+    def _build_routes(self) -> List[Tuple[str, "re.Pattern", str, Callable]]:
+        repo = r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)"
+        routes = [
+            ("GET", r"/rate_limit", "rate_limit", self._rate_limit),
+            ("POST", r"/graphql", "graphql", self._graphql),
+            ("POST", r"/api/graphql", "graphql", self._graphql),
+            ("GET", r"/search/issues", "search.issues", self._search_issues),
+            ("GET", repo, "repos.get", self._get_repository),
+            ("GET", repo + r"/languages", "repos.languages", self._languages),
+            ("GET", repo + r"/issues", "issues.list", self._list_issues),
+            ("POST", repo + r"/issues", "issues.create", self._post_issue),
+            ("GET", repo + r"/issues/(?P<number>\d+)", "issues.get", self._get_issue),
+            (
+                "PATCH",
+                repo + r"/issues/(?P<number>\d+)",
+                "issues.edit",
+                self._edit_issue,
+            ),
+            (
+                "GET",
+                repo + r"/issues/(?P<number>\d+)/comments",
+                "issues.comments.list",
+                self._list_comments,
+            ),
+            (
+                "POST",
+                repo + r"/issues/(?P<number>\d+)/comments",
+                "issues.comments.create",
+                self._create_comment,
+            ),
+            ("GET", repo + r"/labels", "labels.list", self._list_labels),
+            ("GET", repo + r"/labels/(?P<name>[^/]+)", "labels.get", self._get_label),
+            ("POST", repo + r"/labels", "labels.create", self._create_label),
+            (
+                "GET",
+                repo + r"/contents/?(?P<path>.*)",
+                "contents.get",
+                self._get_contents,
+            ),
+            (
+                "GET",
+                repo + r"/branches/(?P<branch>[^/]+)",
+                "branches.get",
+                self._get_branch,
+            ),
+            (
+                "GET",
+                repo + r"/git/trees/(?P<sha>[^/]+)",
+                "git.trees.get",
+                self._get_tree,
+            ),
+            (
+                "GET",
+                repo + r"/git/blobs/(?P<sha>[^/]+)",
+                "git.blobs.get",
+                self._get_blob,
+            ),
+            (
+                "GET",
+                repo + r"/actions/runs/(?P<run_id>[^/]+)/jobs",
+                "actions.jobs.list",
+                self._list_jobs,
+            ),
+            (
+                "GET",
+                repo + r"/actions/jobs/(?P<job_id>[^/]+)/logs",
+                "actions.jobs.logs",
+                self._job_logs,
+            ),
+        ]
+        return [
+            (method, re.compile(pattern + r"/?$"), name, handler)
+            for method, pattern, name, handler in routes
+        ]
+
+    def _rate_headers(self, resource: str) -> Dict[str, str]:
+        budget = self._budgets[resource]
+        return {
+            "X-RateLimit-Limit": str(self.limits[resource]),
+            "X-RateLimit-Remaining": str(int(budget["remaining"])),
+            "X-RateLimit-Reset": str(int(budget["reset"])),
+            "X-RateLimit-Used": str(self.limits[resource] - int(budget["remaining"])),
+            "X-RateLimit-Resource": resource,
+        }
+
+    def handle_request(
+        self, method: str, raw_path: str, headers: Dict[str, str], body: bytes
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """Answer one HTTP request; returns (status, headers, body)."""
+        started = time.perf_counter()
+        parsed = urlparse(raw_path)
+        query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        path = parsed.path
+        if path.startswith("/api/v3/"):
+            path = path[len("/api/v3") :]
+
+        match_method = "GET" if method == "HEAD" else method
+        route_name, handler, params = "unknown", None, {}
+        for route_method, pattern, name, route_handler in self._routes:
+            match = pattern.match(path)
+            if match and route_method == match_method:
+                route_name, handler, params = name, route_handler, match.groupdict()
+                break
+        resource = (
+            "graphql"
+            if route_name == "graphql"
+            else "search" if route_name in _SEARCH_ROUTES else "core"
+        )
+
+        delay = self.latency
+        if self.latency_jitter:
+            delay += self._random.uniform(0, self.latency_jitter)
+        if delay:
+            time.sleep(delay)
+
+        status, response_headers, payload = self._dispatch(
+            route_name, handler, params, query, headers, body, resource
+        )
+
+        with self._lock:
+            self.calls[route_name] += 1
+            self.call_log.append(
+                {
+                    "method": method,
+                    "route": route_name,
+                    "path": path,
+                    "status": status,
+                    "seconds": time.perf_counter() - started,
+                }
+            )
+        return status, response_headers, payload
+
+    def _dispatch(
+        self,
+        route_name: str,
+        handler: Optional[Callable],
+        params: Dict[str, str],
+        query: Dict[str, str],
+        headers: Dict[str, str],
+        body: bytes,
+        resource: str,
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        def respond(status, payload, extra_headers=None):
+            response_headers = {"Content-Type": "application/json; charset=utf-8"}
+            response_headers.update(self._rate_headers(resource))
+            response_headers.update(extra_headers or {})
+            if isinstance(payload, str):
+                response_headers["Content-Type"] = "text/plain; charset=utf-8"
+                data = payload.encode("utf-8")
+            else:
+                data = json.dumps(payload).encode("utf-8")
+            return status, response_headers, data
+
+        with self._lock:
+            now = time.time()
+            budget = self._budgets[resource]
+            if now >= budget["reset"]:
+                budget["remaining"] = self.limits[resource]
+                budget["reset"] = now + self.rate_limit_window
+
+            for failure in self._failures:
+                if failure.remaining > 0 and fnmatch.fnmatch(route_name, failure.route):
+                    failure.remaining -= 1
+                    self._failures = [f for f in self._failures if f.remaining > 0]
+                    return respond(
+                        failure.status, {"message": failure.message}, failure.headers
+                    )
+            if self.failure_rate and self._random.random() < self.failure_rate:
+                return respond(502, {"message": "Injected server error"})
+
+            if budget["remaining"] <= 0:
+                return respond(
+                    403,
+                    {"message": f"API rate limit exceeded for {resource}"},
+                )
+            budget["remaining"] -= 1
+
+            if handler is None:
+                return respond(404, {"message": "Not Found"})
+
+            try:
+                json_body = json.loads(body) if body else {}
+                result = handler(params=params, query=query, body=json_body)
+            except FakeGitHubError as e:
+                return respond(e.status, {"message": str(e)})
+
+        status, payload, extra_headers = 200, result, {}
+        if isinstance(result, tuple):
+            status, payload, extra_headers = (result + ({},))[:3]
+
+        response = respond(status, payload, extra_headers)
+        if status == 200 and headers.get("If-None-Match"):
+            etag = '"' + hashlib.sha1(response[2]).hexdigest() + '"'
+            if headers["If-None-Match"] == etag:
+                # Conditional hits do not count against the rate limit
+                with self._lock:
+                    self._budgets[resource]["remaining"] += 1
+                return 304, {"ETag": etag, **self._rate_headers(resource)}, b""
+        if status == 200:
+            response[1]["ETag"] = '"' + hashlib.sha1(response[2]).hexdigest() + '"'
+        return response
+
+    # REST helpers
+
+    def _api(self, path: str) -> str:
+        return f"{self.url}{path}"
+
+    def _repository(self, params: Dict[str, str]) -> FakeRepository:
+        full_name = f"{params['owner']}/{params['repo']}"
+        repository = self.repositories.get(full_name)
+        if repository is None:
+            raise FakeGitHubError(404, "Not Found")
+        return repository
+
+    def _paginate(self, items: List[Any], query: Dict[str, str], path: str):
+        per_page = min(int(query.get("per_page", 30)), 100)
+        page = int(query.get("page", 1))
+        start = (page - 1) * per_page
+        headers = {}
+        if start + per_page < len(items):
+            next_query = dict(query, page=str(page + 1), per_page=str(per_page))
+            last_page = (len(items) + per_page - 1) // per_page
+            last_query = dict(query, page=str(last_page), per_page=str(per_page))
+            headers["Link"] = (
+                f'<{self._api(path)}?{urlencode(next_query)}>; rel="next", '
+                f'<{self._api(path)}?{urlencode(last_query)}>; rel="last"'
+            )
+        return items[start : start + per_page], headers
+
+    def _repository_json(self, repository: FakeRepository) -> Dict[str, Any]:
+        owner, name = repository.full_name.split("/", 1)
+        return {
+            "id": repository.id,
+            "node_id": repository.node_id,
+            "name": name,
+            "full_name": repository.full_name,
+            "owner": {"login": owner, "id": 1, "type": "Organization"},
+            "private": False,
+            "description": repository.description,
+            "default_branch": repository.default_branch,
+            "language": repository.language,
+            "url": self._api(f"/repos/{repository.full_name}"),
+            "html_url": f"https://github.com/{repository.full_name}",
+        }
+
+    def _label_json(self, repository: FakeRepository, name: str) -> Dict[str, Any]:
+        label = repository.labels.setdefault(
+            name, {"id": self._new_id(), "name": name, "color": "ededed"}
+        )
+        return {
+            **label,
+            "url": self._api(f"/repos/{repository.full_name}/labels/{name}"),
+        }
+
+    def _issue_json(
+        self, repository: FakeRepository, issue: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        base = f"/repos/{repository.full_name}/issues/{issue['number']}"
+        assignees = [{"login": login, "id": 1} for login in issue["assignees"]]
+        return {
+            "id": issue["id"],
+            "node_id": issue["node_id"],
+            "number": issue["number"],
+            "title": issue["title"],
+            "body": issue["body"],
+            "state": issue["state"],
+            "labels": [self._label_json(repository, name) for name in issue["labels"]],
+            "assignee": assignees[0] if assignees else None,
+            "assignees": assignees,
+            "user": {"login": "storyteller", "id": 1},
+            "comments": len(repository.comments.get(issue["number"], [])),
+            "created_at": issue["created_at"],
+            "updated_at": issue["updated_at"],
+            "closed_at": issue["closed_at"],
+            "url": self._api(base),
+            "repository_url": self._api(f"/repos/{repository.full_name}"),
+            "comments_url": self._api(base + "/comments"),
+            "html_url": f"https://github.com/{repository.full_name}/issues/"
+            f"{issue['number']}",
+        }
+
+    def _create_issue(
+        self, repository: FakeRepository, data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        if not data.get("title"):
+            raise FakeGitHubError(422, "Validation Failed: title is required")
+        number = max(repository.issues, default=0) + 1
+        now = _timestamp()
+        issue_id = self._new_id()
+        issue = {
+            "id": issue_id,
+            "node_id": f"I_{issue_id}",
+            "number": number,
+            "title": data["title"],
+            "body": data.get("body") or "",
+            "state": data.get("state", "open"),
+            "labels": [
+                label if isinstance(label, str) else label["name"]
+                for label in data.get("labels", [])
+            ],
+            "assignees": list(data.get("assignees", [])),
+            "created_at": now,
+            "updated_at": now,
+            "closed_at": now if data.get("state") == "closed" else None,
+        }
+        repository.issues[number] = issue
+        return issue
+
+    def _find_issue(
+        self, params: Dict[str, str]
+    ) -> Tuple[FakeRepository, Dict[str, Any]]:
+        repository = self._repository(params)
+        issue = repository.issues.get(int(params["number"]))
+        if issue is None:
+            raise FakeGitHubError(404, "Not Found")
+        return repository, issue
+
+    # REST endpoints
+
+    def _rate_limit(self, **_) -> Dict[str, Any]:
+        resources = {
+            resource: {
+                "limit": self.limits[resource],
+                "remaining": int(budget["remaining"]),
+                "reset": int(budget["reset"]),
+                "used": self.limits[resource] - int(budget["remaining"]),
+            }
+            for resource, budget in self._budgets.items()
+        }
+        return {"resources": resources, "rate": resources["core"]}
+
+    def _get_repository(self, params, **_) -> Dict[str, Any]:
+        return self._repository_json(self._repository(params))
+
+    def _languages(self, params, **_) -> Dict[str, int]:
+        repository = self._repository(params)
+        extensions = {
+            ".py": "Python",
+            ".js": "JavaScript",
+            ".ts": "TypeScript",
+            ".go": "Go",
+            ".java": "Java",
+            ".rs": "Rust",
+        }
+        languages: Counter = Counter()
+        for path, text in repository.files.items():
+            for extension, language in extensions.items():
+                if path.endswith(extension):
+                    languages[language] += len(text.encode("utf-8"))
+        return dict(languages)
+
+    def _list_issues(self, params, query, **_):
+        repository = self._repository(params)
+        state = query.get("state", "open")
+        labels = [label for label in query.get("labels", "").split(",") if label]
+        since = query.get("since")
+        issues = [
+            issue
+            for issue in repository.issues.values()
+            if (state == "all" or issue["state"] == state)
+            and all(label in issue["labels"] for label in labels)
+            and (not since or issue["updated_at"] >= since.replace("+00:00", "Z"))
+        ]
+        sort_key = "updated_at" if query.get("sort") == "updated" else "created_at"
+        issues.sort(
+            key=lambda issue: (issue[sort_key], issue["number"]),
+            reverse=query.get("direction", "desc") == "desc",
+        )
+        page, headers = self._paginate(
+            issues, query, f"/repos/{repository.full_name}/issues"
+        )
+        return 200, [self._issue_json(repository, issue) for issue in page], headers
+
+    def _post_issue(self, params, body, **_):
+        repository = self._repository(params)
+        issue = self._create_issue(repository, body)
+        return 201, self._issue_json(repository, issue)
+
+    def _get_issue(self, params, **_):
+        repository, issue = self._find_issue(params)
+        return self._issue_json(repository, issue)
+
+    def _edit_issue(self, params, body, **_):
+        repository, issue = self._find_issue(params)
+        for key in ("title", "body", "assignees"):
+            if key in body:
+                issue[key] = body[key]
+        if "labels" in body:
+            issue["labels"] = [
+                label if isinstance(label, str) else label["name"]
+                for label in body["labels"]
+            ]
+        if "state" in body and body["state"] != issue["state"]:
+            issue["state"] = body["state"]
+            issue["closed_at"] = _timestamp() if body["state"] == "closed" else None
+        issue["updated_at"] = _timestamp()
+        return self._issue_json(repository, issue)
+
+    def _comment_json(self, repository, number, comment) -> Dict[str, Any]:
+        return {
+            **comment,
+            "user": {"login": "storyteller", "id": 1},
+            "url": self._api(
+                f"/repos/{repository.full_name}/issues/comments/{comment['id']}"
+            ),
+            "html_url": f"https://github.com/{repository.full_name}/issues/"
+            f"{number}#issuecomment-{comment['id']}",
+        }
+
+    def _list_comments(self, params, query, **_):
+        repository, issue = self._find_issue(params)
+        comments = repository.comments.get(issue["number"], [])
+        page, headers = self._paginate(
+            comments,
+            query,
+            f"/repos/{repository.full_name}/issues/{issue['number']}/comments",
+        )
+        return (
+            200,
+            [self._comment_json(repository, issue["number"], c) for c in page],
+            headers,
+        )
+
+    def _create_comment(self, params, body, **_):
+        repository, issue = self._find_issue(params)
+        now = _timestamp()
+        comment = {
+            "id": self._new_id(),
+            "body": body.get("body", ""),
+            "created_at": now,
+            "updated_at": now,
+        }
+        repository.comments.setdefault(issue["number"], []).append(comment)
+        issue["updated_at"] = now
+        return 201, self._comment_json(repository, issue["number"], comment)
+
+    def _list_labels(self, params, query, **_):
+        repository = self._repository(params)
+        page, headers = self._paginate(
+            sorted(repository.labels), query, f"/repos/{repository.full_name}/labels"
+        )
+        return 200, [self._label_json(repository, name) for name in page], headers
+
+    def _get_label(self, params, **_):
+        repository = self._repository(params)
+        name = unquote(params["name"])
+        if name not in repository.labels:
+            raise FakeGitHubError(404, "Not Found")
+        return self._label_json(repository, name)
+
+    def _create_label(self, params, body, **_):
+        repository = self._repository(params)
+        label = self._label_json(repository, body["name"])
+        repository.labels[body["name"]].update(
+            {k: body[k] for k in ("color", "description") if k in body}
+        )
+        return 201, label
+
+    def _trees(
+        self, repository: FakeRepository
+    ) -> Tuple[str, Dict[str, List[Dict[str, Any]]]]:
+        """Build git trees for the current files; returns (root sha, trees)."""
+        children: Dict[str, Dict[str, Any]] = {"": {}}
+        for path in sorted(repository.files):
+            parts = path.split("/")
+            for depth in range(1, len(parts)):
+                children.setdefault("/".join(parts[:depth]), {})
+            parent = "/".join(parts[:-1])
+            children[parent][parts[-1]] = ("blob", path)
+            for depth in range(1, len(parts)):
+                directory = "/".join(parts[:depth])
+                children["/".join(parts[: depth - 1])][parts[depth - 1]] = (
+                    "tree",
+                    directory,
+                )
+
+        trees: Dict[str, List[Dict[str, Any]]] = {}
+
+        def build(directory: str) -> str:
+            entries = []
+            for name, (kind, path) in sorted(children[directory].items()):
+                if kind == "blob":
+                    data = repository.files[path].encode("utf-8")
+                    entries.append(
+                        {
+                            "path": name,
+                            "mode": "100644",
+                            "type": "blob",
+                            "sha": _git_sha("blob", data),
+                            "size": len(data),
+                        }
+                    )
+                else:
+                    entries.append(
+                        {
+                            "path": name,
+                            "mode": "040000",
+                            "type": "tree",
+                            "sha": build(path),
+                        }
+                    )
+            sha = _git_sha(
+                "tree",
+                "".join(f"{e['mode']} {e['path']}\0{e['sha']}" for e in entries).encode(
+                    "utf-8"
+                ),
+            )
+            trees[sha] = entries
+            return sha
+
+        return build(""), trees
+
+    @staticmethod
+    def _commit_sha(root_sha: str) -> str:
+        # The fake keeps no history; each distinct tree is its own commit
+        return _git_sha("commit", f"tree {root_sha}\n".encode("utf-8"))
+
+    def _get_branch(self, params, **_):
+        repository = self._repository(params)
+        if params["branch"] != repository.default_branch:
+            raise FakeGitHubError(404, "Branch not found")
+        root_sha, _ = self._trees(repository)
+        commit_sha = self._commit_sha(root_sha)
+        base = f"/repos/{repository.full_name}"
+        return {
+            "name": repository.default_branch,
+            "protected": False,
+            "commit": {
+                "sha": commit_sha,
+                "url": self._api(f"{base}/commits/{commit_sha}"),
+                "commit": {
+                    "message": "",
+                    "tree": {
+                        "sha": root_sha,
+                        "url": self._api(f"{base}/git/trees/{root_sha}"),
+                    },
+                },
+            },
+        }
+
+    def _find_blob(self, repository: FakeRepository, sha: str) -> Optional[bytes]:
+        for text in repository.files.values():
+            raw = text.encode("utf-8")
+            if _git_sha("blob", raw) == sha:
+                return raw
+        return None
+
+    def _get_blob(self, params, **_):
+        repository = self._repository(params)
+        raw = self._find_blob(repository, params["sha"])
+        if raw is None:
+            raise FakeGitHubError(404, "Not Found")
+        return {
+            "sha": params["sha"],
+            "size": len(raw),
+            "url": self._api(
+                f"/repos/{repository.full_name}/git/blobs/{params['sha']}"
+            ),
+            "encoding": "base64",
+            "content": base64.encodebytes(raw).decode("ascii"),
+        }
+
+    def _get_tree(self, params, query, **_):
+        repository = self._repository(params)
+        root_sha, trees = self._trees(repository)
+        sha = params["sha"]
+        if sha in (repository.default_branch, "HEAD"):
+            sha = root_sha
+        if sha not in trees:
+            raise FakeGitHubError(404, "Not Found")
+
+        def entries_for(tree_sha: str, prefix: str, recursive: bool):
+            for entry in trees[tree_sha]:
+                path = prefix + entry["path"]
+                yield dict(
+                    entry,
+                    path=path,
+                    url=self._api(
+                        f"/repos/{repository.full_name}/git/"
+                        f"{'trees' if entry['type'] == 'tree' else 'blobs'}/"
+                        f"{entry['sha']}"
+                    ),
+                )
+                if recursive and entry["type"] == "tree":
+                    yield from entries_for(entry["sha"], path + "/", True)
+
+        recursive = query.get("recursive") not in (None, "", "0", "false")
+        return {
+            "sha": sha,
+            "url": self._api(f"/repos/{repository.full_name}/git/trees/{sha}"),
+            "tree": list(entries_for(sha, "", recursive)),
+            "truncated": False,
+        }
+
+    def _content_json(self, repository, path: str, kind: str) -> Dict[str, Any]:
+        url = self._api(f"/repos/{repository.full_name}/contents/{path}")
+        data = {
+            "type": kind,
+            "name": path.rsplit("/", 1)[-1],
+            "path": path,
+            "url": url,
+            "html_url": f"https://github.com/{repository.full_name}/blob/"
+            f"{repository.default_branch}/{path}",
+            "git_url": url,
+            "download_url": None,
+            "size": 0,
+            "sha": _git_sha("tree", path.encode("utf-8")),
+        }
+        if kind == "file":
+            raw = repository.files[path].encode("utf-8")
+            data["size"] = len(raw)
+            data["sha"] = _git_sha("blob", raw)
+        return data
+
+    def _get_contents(self, params, query, **_):
+        repository = self._repository(params)
+        path = unquote(params.get("path") or "").strip("/")
+        ref = query.get("ref")
+        if ref not in (None, repository.default_branch, "HEAD"):
+            raise FakeGitHubError(404, f"No commit found for the ref {ref}")
+
+        if path in repository.files:
+            data = self._content_json(repository, path, "file")
+            data["encoding"] = "base64"
+            data["content"] = base64.encodebytes(
+                repository.files[path].encode("utf-8")
+            ).decode("ascii")
+            return data
+
+        prefix = f"{path}/" if path else ""
+        entries = {}
+        for file_path in repository.files:
+            if not file_path.startswith(prefix):
+                continue
+            name = file_path[len(prefix) :].split("/", 1)[0]
+            child = prefix + name
+            entries[child] = "file" if child == file_path else "dir"
+        if not entries:
+            raise FakeGitHubError(404, "Not Found")
+        return [
+            self._content_json(repository, child, kind)
+            for child, kind in sorted(entries.items())
+        ]
+
+    def _search_issues(self, query, **_):
+        terms = re.findall(r'(\w+):"([^"]*)"|(\w+):(\S+)|"([^"]*)"|(\S+)', query["q"])
+        qualifiers: List[Tuple[str, str]] = []
+        words: List[str] = []
+        for quoted_key, quoted_value, key, value, phrase, word in terms:
+            if quoted_key or key:
+                qualifiers.append((quoted_key or key, quoted_value or value))
+            else:
+                words.append((phrase or word).lower())
+
+        repositories = [v for k, v in qualifiers if k == "repo"]
+        fields = [v for k, v in qualifiers if k == "in"] or ["title", "body"]
+        matches = []
+        for repository in self.repositories.values():
+            if repositories and repository.full_name not in repositories:
+                continue
+            for issue in repository.issues.values():
+                if not self._issue_matches(issue, qualifiers):
+                    continue
+                text = " ".join(issue[f] or "" for f in fields if f in issue).lower()
+                if all(word in text for word in words):
+                    matches.append((repository, issue))
+
+        matches.sort(key=lambda match: match[1]["updated_at"], reverse=True)
+        page, headers = self._paginate(matches, query, "/search/issues")
+        return (
+            200,
+            {
+                "total_count": len(matches),
+                "incomplete_results": False,
+                "items": [self._issue_json(r, issue) for r, issue in page],
+            },
+            headers,
+        )
+
+    @staticmethod
+    def _issue_matches(issue: Dict[str, Any], qualifiers) -> bool:
+        for key, value in qualifiers:
+            if key == "label" and value not in issue["labels"]:
+                return False
+            if key in ("state", "is") and value in ("open", "closed"):
+                if issue["state"] != value:
+                    return False
+            if key == "is" and value == "pr":
+                return False
+            if key == "assignee" and value not in issue["assignees"]:
+                return False
+        return True
+
+    def _list_jobs(self, params, **_):
+        repository = self._repository(params)
+        jobs = repository.workflow_jobs.get(params["run_id"])
+        if jobs is None:
+            raise FakeGitHubError(404, "Not Found")
+        return {"total_count": len(jobs), "jobs": jobs}
+
+    def _job_logs(self, params, **_):
+        repository = self._repository(params)
+        logs = repository.job_logs.get(params["job_id"])
+        if logs is None:
+            raise FakeGitHubError(404, "Not Found")
+        return logs
+
+    # GraphQL endpoint
+
+    def _graphql(self, body, **_):
+        try:
+            operation, selections = _GraphQLParser(
+                body.get("query", ""), body.get("variables")
+            ).parse()
+        except FakeGitHubError as e:
+            return {"errors": [{"message": str(e)}]}
+
+        root = self._mutation_root() if operation == "mutation" else self._query_root()
+        errors: List[Dict[str, Any]] = []
+        data = _resolve(root, selections, [], errors)
+        payload: Dict[str, Any] = {"data": data}
+        if errors:
+            payload["errors"] = errors
+        return payload
+
+    def _issue_node(self, repository: FakeRepository, issue: Dict[str, Any]):
+        return {
+            "__typename": "Issue",
+            "id": issue["node_id"],
+            "number": issue["number"],
+            "title": issue["title"],
+            "body": issue["body"],
+            "state": issue["state"].upper(),
+            "url": f"https://github.com/{repository.full_name}/issues/"
+            f"{issue['number']}",
+            "repository": lambda: self._repository_node(repository),
+        }
+
+    def _blob_node(
+        self,
+        repository: FakeRepository,
+        expression: Optional[str] = None,
+        oid: Optional[str] = None,
+    ):
+        if oid is not None:
+            raw = self._find_blob(repository, oid)
+            if raw is None:
+                return None
+            text = raw.decode("utf-8")
+        else:
+            ref, _, path = (expression or "").partition(":")
+            if ref not in (repository.default_branch, "HEAD") or (
+                path not in repository.files
+            ):
+                return None
+            text = repository.files[path]
+            raw = text.encode("utf-8")
+        return {
+            "__typename": "Blob",
+            "oid": _git_sha("blob", raw),
+            "byteSize": len(raw),
+            "isBinary": False,
+            "isTruncated": False,
+            "text": text,
+        }
+
+    def _repository_node(self, repository: FakeRepository):
+        def issue(number):
+            found = repository.issues.get(int(number))
+            if found is None:
+                raise FakeGitHubError(
+                    404,
+                    f"Could not resolve to an Issue with the number of {number}.",
+                )
+            return self._issue_node(repository, found)
+
+        return {
+            "__typename": "Repository",
+            "id": repository.node_id,
+            "name": repository.full_name.split("/", 1)[1],
+            "nameWithOwner": repository.full_name,
+            "defaultBranchRef": {"name": repository.default_branch},
+            "issue": issue,
+            "object": lambda expression=None, oid=None: self._blob_node(
+                repository, expression, oid
+            ),
+        }
+
+    def _project_node(self, project: FakeProject):
+        def items(first=100, **_):
+            return {
+                "totalCount": len(project.items),
+                "nodes": [
+                    self._item_node(project, item_id)
+                    for item_id in list(project.items)[:first]
+                ],
+            }
+
+        return {
+            "__typename": "ProjectV2",
+            "id": project.id,
+            "number": project.number,
+            "title": project.title,
+            "url": f"https://github.com/orgs/fake/projects/{project.number}",
+            "fields": lambda first=20, **_: {"nodes": project.fields[:first]},
+            "items": items,
+        }
+
+    def _item_node(self, project: FakeProject, item_id: str):
+        item = project.items[item_id]
+        content = self._node(item["content_id"])
+        return {
+            "__typename": "ProjectV2Item",
+            "id": item_id,
+            "content": content,
+            "fieldValues": {
+                "nodes": [
+                    {"field": {"id": field_id}, **value}
+                    for field_id, value in item["field_values"].items()
+                ]
+            },
+        }
+
+    def _node(self, node_id: str):
+        if node_id in self.projects:
+            return self._project_node(self.projects[node_id])
+        for project in self.projects.values():
+            if node_id in project.items:
+                return self._item_node(project, node_id)
+        for repository in self.repositories.values():
+            if repository.node_id == node_id:
+                return self._repository_node(repository)
+            for issue in repository.issues.values():
+                if issue["node_id"] == node_id:
+                    return self._issue_node(repository, issue)
+        return None
+
+    def _query_root(self):
+        def repository(owner, name):
+            found = self.repositories.get(f"{owner}/{name}")
+            if found is None:
+                raise FakeGitHubError(
+                    404, f"Could not resolve to a Repository with the name '{name}'."
+                )
+            return self._repository_node(found)
+
+        return {
+            "repository": repository,
+            "node": lambda id: self._node(id),
+            "organization": lambda login: {"id": f"O_{login}", "login": login},
+            "viewer": {"login": "storyteller"},
+        }
+
+    def _mutation_root(self):
+        def project(project_id) -> FakeProject:
+            found = self.projects.get(project_id)
+            if found is None:
+                raise FakeGitHubError(404, f"Could not resolve project {project_id}")
+            return found
+
+        def add_item(input):
+            board = project(input["projectId"])
+            if self._node(input["contentId"]) is None:
+                raise FakeGitHubError(404, f"Could not resolve {input['contentId']}")
+            for item_id, item in board.items.items():
+                if item["content_id"] == input["contentId"]:
+                    break
+            else:
+                item_id = f"PVTI_{self._new_id()}"
+                board.items[item_id] = {
+                    "content_id": input["contentId"],
+                    "field_values": {},
+                }
+            return {"item": self._item_node(board, item_id)}
+
+        def update_field(input):
+            board = project(input["projectId"])
+            if input["itemId"] not in board.items:
+                raise FakeGitHubError(404, f"Could not resolve {input['itemId']}")
+            if not any(f["id"] == input["fieldId"] for f in board.fields):
+                raise FakeGitHubError(404, f"Could not resolve {input['fieldId']}")
+            board.items[input["itemId"]]["field_values"][input["fieldId"]] = input[
+                "value"
+            ]
+            return {"projectV2Item": {"id": input["itemId"]}}
+
+        def create_project(input):
+            created = self.add_project(
+                input["title"], description=input.get("description", "")
+            )
+            return {"projectV2": self._project_node(created)}
+
+        return {
+            "addProjectV2ItemById": add_item,
+            "updateProjectV2ItemFieldValue": update_field,
+            "createProjectV2": create_project,
+        }
@@ -0,0 +1,382 @@
+"""Benchmark harness for storyteller's GitHub operations.
+
+Each scenario runs one storyteller operation against a seeded FakeGitHub and
+reports the API calls it made (per route) and its wall time, so changes to
+call patterns, batching and caching can be measured offline and under
+simulated latency, without a token or rate-limit budget.
+"""
+
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from config import Config, RepositoryConfig, StorageConfig
+from fake_github import FakeGitHub
+from github_handler import GitHubHandler
+from github_storage import GitHubStorageManager, YAMLFrontmatterParser
+from models import Epic, StoryHierarchy, SubStory, UserStory
+from multi_repo_context import MultiRepositoryContextReader
+from pipeline_monitor import PipelineMonitor
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_EPIC_ID = "epic_benchmark"
+
+
+@dataclass
+class BenchmarkResult:
+    """API calls and wall time of one scenario run."""
+
+    name: str
+    wall_seconds: float
+    api_calls: int
+    calls_by_route: Dict[str, int] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "api_calls": self.api_calls,
+            "calls_by_route": self.calls_by_route,
+            "error": self.error,
+        }
+
+
+class GitHubBenchmark:
+    """Seeded fake GitHub plus the storyteller objects scenarios run with.
+
+    Args:
+        fake: Running FakeGitHub to seed and measure
+        repositories: Number of repositories to create
+        files_per_repository: Source files per repository
+        issues_per_repository: Issues per repository (half reference the epic)
+        request_spacing: Keep PyGithub's default spacing between requests
+            (0.25s, 1s for writes); disabled by default so results reflect
+            storyteller's own call pattern
+    """
+
+    def __init__(
+        self,
+        fake: FakeGitHub,
+        repositories: int = 3,
+        files_per_repository: int = 20,
+        issues_per_repository: int = 20,
+        request_spacing: bool = False,
+    ):
+        self.fake = fake
+        self.request_spacing = request_spacing
+        self.repository_keys = [f"service{index}" for index in range(repositories)]
+        self.config = Config(
+            github_token="benchmark-token",
+            github_api_url=fake.url,
+            repositories={
+                key: RepositoryConfig(
+                    name=f"bench/{key}",
+                    type="backend",
+                    description=f"Benchmark repository {key}",
+                    dependencies=self.repository_keys[:index],
+                )
+                for index, key in enumerate(self.repository_keys)
+            },
+            storage=StorageConfig(primary="github"),
+        )
+        self._seed(files_per_repository, issues_per_repository)
+        self.project = fake.add_project(
+            "Benchmark project", fields=[("Status", "TEXT", None)]
+        )
+        self.state: Dict[str, Any] = {}
+
+    @property
+    def repository_names(self) -> List[str]:
+        return [self.config.repositories[key].name for key in self.repository_keys]
+
+    def _seed(self, files_per_repository: int, issues_per_repository: int):
+        for name in self.repository_names:
+            files = {
+                "README.md": f"# {name}\n\nBenchmark repository.\n",
+                "requirements.txt": "fastapi\npydantic\n",
+                "Dockerfile": "FROM python:3.11\n",
+            }
+            for index in range(files_per_repository):
+                package = f"pkg{index % 4}"
+                files[f"src/{package}/module_{index}.py"] = (
+                    f'"""Module {index}."""\n\n\ndef handler_{index}():\n'
+                    f"    return {index}\n" * 20
+                )
+            self.fake.add_repository(name, files=files)
+            self.fake.add_workflow_run(
+                name,
+                "1",
+                jobs=[
+                    {
+                        "id": 11,
+                        "name": "tests",
+                        "conclusion": "failure",
+                        "steps": [{"name": "pytest", "conclusion": "failure"}],
+                    },
+                    {"id": 12, "name": "lint", "conclusion": "success", "steps": []},
+                ],
+                logs={"11": "FAILED tests/test_app.py::test_handler - AssertionError"},
+            )
+            for index in range(issues_per_repository):
+                related = index % 2 == 0
+                self.fake.add_issue(
+                    name,
+                    f"Task {index}",
+                    body=f"Part of {BENCHMARK_EPIC_ID}" if related else "Unrelated",
+                    labels=["storyteller"],
+                    state="closed" if index % 3 == 0 else "open",
+                )
+
+    def handler(self) -> GitHubHandler:
+        """A fresh GitHubHandler (no warm caches) for the fake."""
+        return self.prepare(GitHubHandler(self.config))
+
+    def prepare(self, handler: GitHubHandler) -> GitHubHandler:
+        """Apply the benchmark's request spacing setting to a handler."""
+        if not self.request_spacing:
+            requester = handler.github.requester
+            requester._Requester__seconds_between_requests = None
+            requester._Requester__seconds_between_writes = None
+        return handler
+
+    def hierarchy(self) -> StoryHierarchy:
+        """A story hierarchy whose stories map onto seeded issues."""
+        first = self.repository_names[0]
+        epic = Epic(
+            id=BENCHMARK_EPIC_ID, title="Benchmark epic", target_repositories=[first]
+        )
+        epic.github_issue_number = 1
+        user_story = UserStory(
+            epic_id=epic.id, title="Benchmark story", target_repositories=[first]
+        )
+        user_story.github_issue_number = 2
+        sub_stories = []
+        for index, name in enumerate(self.repository_names):
+            for number in range(3, 8):
+                sub_story = SubStory(
+                    user_story_id=user_story.id,
+                    title=f"Task {index}-{number}",
+                    target_repository=name,
+                )
+                sub_story.github_issue_number = number
+                sub_stories.append(sub_story)
+        return StoryHierarchy(
+            epic=epic,
+            user_stories=[user_story],
+            sub_stories={user_story.id: sub_stories},
+        )
+
+    def stored_hierarchy(self, user_stories: int = 10, sub_stories: int = 4) -> int:
+        """Seed a hierarchy stored as frontmatter issues (no API calls).
+
+        Returns:
+            Issue number of the stored epic
+        """
+        if "stored_epic_number" in self.state:
+            return self.state["stored_epic_number"]
+
+        name = self.repository_names[0]
+        storage = self.config.storage
+
+        def add(title: str, label: str, metadata: Dict[str, Any]) -> int:
+            body = YAMLFrontmatterParser.create_frontmatter_content(
+                metadata, f"# {title}\n\nBenchmark story."
+            )
+            issue = self.fake.add_issue(
+                name, title, body=body, labels=[storage.issue_label_prefix, label]
+            )
+            return issue["number"]
+
+        epic_id = "epic_stored"
+        number = add(
+            "Epic: Stored",
+            storage.epic_label,
+            {"epic_id": epic_id, "story_type": "epic"},
+        )
+        for index in range(user_stories):
+            user_story_id = f"story_stored_{index}"
+            add(
+                f"User Story: {index}",
+                storage.user_story_label,
+                {
+                    "user_story_id": user_story_id,
+                    "story_type": "user_story",
+                    "epic_id": epic_id,
+                },
+            )
+            for sub_index in range(sub_stories):
+                add(
+                    f"Sub-Story: {index}-{sub_index}",
+                    storage.sub_story_label,
+                    {
+                        "sub_story_id": f"sub_stored_{index}_{sub_index}",
+                        "story_type": "sub_story",
+                        "user_story_id": user_story_id,
+                    },
+                )
+        self.state["stored_epic_number"] = number
+        return number
+
+
+# Scenarios ------------------------------------------------------------------
+
+
+async def _repository_structure(bench: GitHubBenchmark):
+    handler = bench.handler()
+    await asyncio.gather(
+        *[handler.get_repository_structure(name) for name in bench.repository_names]
+    )
+
+
+async def _list_files_recursive(bench: GitHubBenchmark):
+    handler = bench.handler()
+    await asyncio.gather(
+        *[
+            handler.list_repository_files(name, recursive=True)
+            for name in bench.repository_names
+        ]
+    )
+
+
+async def _repository_context(bench: GitHubBenchmark):
+    reader = MultiRepositoryContextReader(bench.config)
+    bench.prepare(reader.github_handler)
+    await reader.get_multi_repository_context(bench.repository_keys)
+
+
+async def _cross_repository_stories(bench: GitHubBenchmark):
+    handler = bench.handler()
+    await handler.create_cross_repository_stories(
+        "As a user I want benchmarks", "Expert analysis", bench.repository_keys
+    )
+
+
+async def _project_sync(bench: GitHubBenchmark):
+    handler = bench.state["project_handler"] = bench.handler()
+    hierarchy = bench.state["hierarchy"] = bench.hierarchy()
+    await handler.sync_story_to_project(hierarchy, bench.project.id)
+
+
+async def _project_sync_unchanged(bench: GitHubBenchmark):
+    """Re-sync the hierarchy of project_sync (full sync when run alone)."""
+    handler = bench.state.get("project_handler") or bench.handler()
+    hierarchy = bench.state.get("hierarchy") or bench.hierarchy()
+    await handler.sync_story_to_project(hierarchy, bench.project.id)
+
+
+async def _epic_progress(bench: GitHubBenchmark):
+    handler = bench.handler()
+    await handler.get_cross_repository_progress_data(
+        BENCHMARK_EPIC_ID, bench.repository_names
+    )
+
+
+async def _storage_save_epic(bench: GitHubBenchmark):
+    storage = GitHubStorageManager(bench.config, bench.config.storage)
+    bench.prepare(storage.github_handler)
+    epic = Epic(id="epic_storage", title="Stored epic", description="Benchmark")
+    await storage.save_epic(epic, bench.repository_names[0])
+
+
+async def _storage_get_epic(bench: GitHubBenchmark):
+    storage = GitHubStorageManager(bench.config, bench.config.storage)
+    bench.prepare(storage.github_handler)
+    await storage.get_epic("epic_storage", bench.repository_names[0])
+
+
+async def _storage_reconstruct_hierarchy(bench: GitHubBenchmark):
+    epic_number = bench.stored_hierarchy()
+    storage = GitHubStorageManager(bench.config, bench.config.storage)
+    bench.prepare(storage.github_handler)
+    await storage.reconstruct_story_hierarchy(epic_number, bench.repository_names[0])
+
+
+async def _pipeline_failure_logs(bench: GitHubBenchmark):
+    monitor = PipelineMonitor(bench.config)
+    bench.prepare(monitor.github_handler)
+    for name in bench.repository_names:
+        jobs = await monitor._get_workflow_jobs(name, "1")
+        for job in jobs:
+            if job.get("conclusion") == "failure":
+                await monitor._get_job_logs(name, job["id"])
+
+
+SCENARIOS: Dict[str, Callable[[GitHubBenchmark], Awaitable[None]]] = {
+    "repository_structure": _repository_structure,
+    "list_files_recursive": _list_files_recursive,
+    "repository_context": _repository_context,
+    "cross_repository_stories": _cross_repository_stories,
+    "project_sync": _project_sync,
+    "project_sync_unchanged": _project_sync_unchanged,
+    "epic_progress": _epic_progress,
+    "storage_save_epic": _storage_save_epic,
+    "storage_get_epic": _storage_get_epic,
+    "storage_reconstruct_hierarchy": _storage_reconstruct_hierarchy,
+    "pipeline_failure_logs": _pipeline_failure_logs,
+}
+
+
+async def run_scenario(bench: GitHubBenchmark, name: str) -> BenchmarkResult:
+    """Run one scenario and record the calls it made."""
+    bench.fake.reset_metrics()
+    started = time.perf_counter()
+    error = None
+    try:
+        await SCENARIOS[name](bench)
+    except Exception as e:
+        logger.error(f"Benchmark scenario {name} failed: {e}")
+        error = str(e)
+    wall_seconds = time.perf_counter() - started
+    calls = bench.fake.snapshot_calls()
+    return BenchmarkResult(
+        name=name,
+        wall_seconds=wall_seconds,
+        api_calls=sum(calls.values()),
+        calls_by_route=dict(sorted(calls.items())),
+        error=error,
+    )
+
+
+def run_benchmarks(
+    scenarios: Optional[List[str]] = None,
+    latency: float = 0.0,
+    latency_jitter: float = 0.0,
+    repositories: int = 3,
+    files_per_repository: int = 20,
+    issues_per_repository: int = 20,
+    request_spacing: bool = False,
+    seed: Optional[int] = 42,
+) -> List[BenchmarkResult]:
+    """Run scenarios in order against a fresh fake GitHub.
+
+    Runs in a temporary working directory, as some components create their
+    SQLite databases in the current directory.
+    """
+    names = scenarios or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"Unknown benchmark scenarios: {', '.join(unknown)}")
+
+    previous_directory = os.getcwd()
+    with (
+        tempfile.TemporaryDirectory() as directory,
+        FakeGitHub(latency=latency, latency_jitter=latency_jitter, seed=seed) as fake,
+    ):
+        os.chdir(directory)
+        try:
+            bench = GitHubBenchmark(
+                fake,
+                repositories=repositories,
+                files_per_repository=files_per_repository,
+                issues_per_repository=issues_per_repository,
+                request_spacing=request_spacing,
+            )
+            return [asyncio.run(run_scenario(bench, name)) for name in names]
+        finally:
+            os.chdir(previous_directory)
@@ -0,0 +1,289 @@
+"""Conditional-request (ETag/Last-Modified) HTTP cache for GitHub reads.
+
+Cached GET responses are stored in SQLite together with their validators.
+Repeated requests are sent with ``If-None-Match``/``If-Modified-Since``; a
+``304 Not Modified`` is answered from the cache and does not count against
+the GitHub rate limit.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+# Headers that describe the wire encoding of the original body, not the
+# decoded body we store
+_UNCACHED_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+class GitHubHTTPCache:
+    """SQLite store of GitHub GET responses keyed by URL and credentials."""
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        max_entries: int = 5000,
+        max_size_bytes: int = 100 * 1024 * 1024,
+    ):
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self.max_size_bytes = max_size_bytes
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+        if str(self.db_path) != ":memory:":
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS http_cache (
+                cache_key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+        """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_http_cache_accessed "
+            "ON http_cache(last_accessed)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def cache_key(url: str, headers: Dict[str, str]) -> str:
+        """Key a request by URL and the headers GitHub varies responses on."""
+        vary = "\n".join(
+            [url, headers.get("Authorization", ""), headers.get("Accept", "")]
+        )
+        return hashlib.sha256(vary.encode("utf-8")).hexdigest()
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for a key, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, status, headers, body "
+                "FROM http_cache WHERE cache_key = ?",
+                (cache_key,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "etag": row[0],
+            "last_modified": row[1],
+            "status": row[2],
+            "headers": json.loads(row[3]),
+            "body": bytes(row[4]),
+        }
+
+    def touch(self, cache_key: str):
+        """Mark an entry as recently used after it answered a request (a hit)."""
+        with self._lock:
+            self.stats["hits"] += 1
+            self._conn.execute(
+                "UPDATE http_cache SET last_accessed = ? WHERE cache_key = ?",
+                (time.time(), cache_key),
+            )
+            self._conn.commit()
+
+    def record_miss(self):
+        """Count a request the cache could not answer."""
+        with self._lock:
+            self.stats["misses"] += 1
+
+    def put(
+        self,
+        cache_key: str,
+        url: str,
+        status: int,
+        headers: Dict[str, str],
+        body: bytes,
+    ) -> bool:
+        """Store a response that carries a validator; returns whether it was kept."""
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return False
+        if len(body) > self.max_size_bytes:
+            return False
+
+        stored_headers = {
+            name: value
+            for name, value in headers.items()
+            if name.lower() not in _UNCACHED_HEADERS
+        }
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO http_cache (
+                    cache_key, url, etag, last_modified, status, headers, body,
+                    size, last_accessed
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+                (
+                    cache_key,
+                    url,
+                    etag,
+                    last_modified,
+                    status,
+                    json.dumps(stored_headers),
+                    sqlite3.Binary(body),
+                    len(body),
+                    time.time(),
+                ),
+            )
+            self.stats["stores"] += 1
+            self._evict()
+            self._conn.commit()
+        return True
+
+    def _evict(self):
+        """Drop least recently used entries until both size limits hold."""
+        count, total_size = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM http_cache"
+        ).fetchone()
+        if count <= self.max_entries and total_size <= self.max_size_bytes:
+            return
+
+        evicted = []
+        for cache_key, size in self._conn.execute(
+            "SELECT cache_key, size FROM http_cache ORDER BY last_accessed ASC"
+        ).fetchall():
+            if count <= self.max_entries and total_size <= self.max_size_bytes:
+                break
+            evicted.append((cache_key,))
+            count -= 1
+            total_size -= size
+
+        self._conn.executemany("DELETE FROM http_cache WHERE cache_key = ?", evicted)
+        self.stats["evictions"] += len(evicted)
+
+    def clear(self):
+        """Remove all cached responses."""
+        with self._lock:
+            self._conn.execute("DELETE FROM http_cache")
+            self._conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters, hit rate and current cache size."""
+        with self._lock:
+            count, total_size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM http_cache"
+            ).fetchone()
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            **stats,
+            "hit_rate": stats["hits"] / lookups if lookups else 0.0,
+            "entries": count,
+            "size_bytes": total_size,
+        }
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class ConditionalCacheAdapter(HTTPAdapter):
+    """requests adapter that revalidates GET responses against the cache."""
+
+    def __init__(self, cache: GitHubHTTPCache, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(self, request, **kwargs):
+        if request.method != "GET" or kwargs.get("stream"):
+            return super().send(request, **kwargs)
+
+        cache_key = self.cache.cache_key(request.url, request.headers)
+        entry = self.cache.get(cache_key)
+        if entry:
+            if entry["etag"]:
+                request.headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                request.headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and entry:
+            self.cache.touch(cache_key)
+            # Keep fresh rate-limit headers from the 304, body from the cache
+            headers = CaseInsensitiveDict(entry["headers"])
+            headers.update(
+                (name, value)
+                for name, value in response.headers.items()
+                if name.lower() not in _UNCACHED_HEADERS
+            )
+            response.status_code = entry["status"]
+            response.reason = "OK"
+            response.headers = headers
+            response._content = entry["body"]
+            response.from_cache = True
+            return response
+
+        self.cache.record_miss()
+        response.from_cache = False
+        if response.status_code == 200:
+            self.cache.put(
+                cache_key,
+                request.url,
+                response.status_code,
+                dict(response.headers),
+                response.content,
+            )
+        return response
+
+
+def customize_github_session(github_client, configure) -> bool:
+    """Apply configure(session) to the requests session of a PyGithub client.
+
+    PyGithub creates its session inside a connection class; the client's
+    requester is switched to a subclass that calls configure on every new
+    session. Returns False when the PyGithub version does not allow this.
+    """
+    requester = getattr(github_client, "requester", None)
+    base_class = getattr(requester, "_Requester__connectionClass", None)
+    if not isinstance(base_class, type):
+        return False
+
+    class CustomizedConnection(base_class):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            configure(self)
+
+    requester._Requester__connectionClass = CustomizedConnection
+    return True
+
+
+def install_http_cache(github_client, cache: GitHubHTTPCache) -> bool:
+    """Route a PyGithub client's requests through the conditional cache."""
+
+    def _mount(connection):
+        pool_size = getattr(connection, "pool_size", None)
+        adapter_kwargs = {"max_retries": getattr(connection, "retry", 0)}
+        if pool_size:
+            adapter_kwargs.update(pool_connections=pool_size, pool_maxsize=pool_size)
+        connection.session.mount(
+            f"{connection.protocol}://",
+            ConditionalCacheAdapter(cache, **adapter_kwargs),
+        )
+
+    if not customize_github_session(github_client, _mount):
+        logger.warning("GitHub HTTP cache not supported by this PyGithub version")
+        return False
+    return True
@@ -1,21 +1,87 @@
 """GitHub API handler for AI Story Management System."""
 
+import asyncio
 import base64
+import codecs
+import copy
+import functools
+import json
 import logging
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import requests
-from config import Config, RepositoryConfig
+from config import Config, GitHubCacheConfig, IssueMirrorConfig, RepositoryConfig
+from database import DatabaseManager
 from github import Github, Repository
 from github.GithubException import GithubException
 from github.Issue import Issue
+from github_cache import (
+    GitHubHTTPCache,
+    customize_github_session,
+    install_http_cache,
+)
+from github_scheduler import (
+    GitHubRequestScheduler,
+    SecondaryRateLimitError,
+    request_priority,
+    shared_scheduler,
+)
+from graphql_batch import (
+    DEFAULT_BATCH_SIZE,
+    GraphQLOperation,
+    GraphQLOperationResult,
+    build_batch_document,
+    chunk_operations,
+    split_batch_response,
+)
+from issue_mirror import IssueMirror
 from models import ProjectData, ProjectField
+from single_flight import SingleFlight
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
 
+def decode_base64_text(
+    encoded: str, max_bytes: Optional[int] = None, chunk_size: int = 64 * 1024
+) -> str:
+    """Decode base64 UTF-8 content chunk by chunk, stopping after max_bytes.
+
+    Large files are never decoded as a whole; a multi-byte character cut off
+    at max_bytes is dropped.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    parts = []
+    produced = 0
+    pending = ""
+    for start in range(0, len(encoded), chunk_size):
+        chunk = pending + "".join(encoded[start : start + chunk_size].split())
+        usable = len(chunk) - len(chunk) % 4
+        pending = chunk[usable:]
+        raw = base64.b64decode(chunk[:usable])
+        if max_bytes is not None and produced + len(raw) >= max_bytes:
+            parts.append(decoder.decode(raw[: max_bytes - produced]))
+            return "".join(parts)
+        produced += len(raw)
+        parts.append(decoder.decode(raw))
+    parts.append(decoder.decode(base64.b64decode(pending), final=True))
+    return "".join(parts)
+
+
+def _truncate_text(text: str, max_bytes: Optional[int]) -> str:
+    if max_bytes is None or len(text) * 4 <= max_bytes:
+        return text
+    encoded = text.encode("utf-8")
+    if len(encoded) <= max_bytes:
+        return text
+    return encoded[:max_bytes].decode("utf-8", errors="ignore")
+
+
 @dataclass
 class IssueData:
     """Data structure for GitHub issue creation."""
@@ -31,11 +97,187 @@ class IssueData:
 class GitHubHandler:
     """Handler for GitHub API operations."""
 
-    def __init__(self, config: Config):
+    # Number of tree listings and structure summaries kept in memory,
+    # keyed by tree SHA
+    TREE_CACHE_SIZE = 32
+
+    # Well-known root files reported by get_repository_structure
+    KEY_FILE_NAMES = frozenset(
+        [
+            "README.md",
+            "README.rst",
+            "README.txt",
+            "readme.md",
+            "package.json",
+            "requirements.txt",
+            "Cargo.toml",
+            "go.mod",
+            "pom.xml",
+            "build.gradle",
+            "Makefile",
+            "Dockerfile",
+            ".gitignore",
+            "LICENSE",
+            "CHANGELOG.md",
+        ]
+    )
+
+    # Aliased lookups per GraphQL query document (mutations use the default)
+    GRAPHQL_QUERY_BATCH_SIZE = 100
+
+    # Blobs fetched per GraphQL document by get_file_contents; kept lower
+    # than lookups as every alias carries file text
+    FILE_CONTENT_BATCH_SIZE = 50
+
+    # Default per-file cap (bytes of UTF-8 text) for get_file_contents
+    MAX_FILE_CONTENT_BYTES = 100 * 1024
+
+    # Seconds project field and option IDs are reused before refetching
+    PROJECT_FIELDS_TTL_SECONDS = 900
+
+    def __init__(
+        self,
+        config: Config,
+        database: Optional[DatabaseManager] = None,
+        scheduler: Optional[GitHubRequestScheduler] = None,
+    ):
         self.config = config
-        self.github = Github(config.github_token)
+        self.database = database
+
+        api_url = getattr(config, "github_api_url", None)
+        if not isinstance(api_url, str) or not api_url:
+            api_url = "https://api.github.com"
+        self.api_url = api_url.rstrip("/")
+        # GitHub Enterprise serves GraphQL at /api/graphql next to /api/v3
+        if self.api_url.endswith("/api/v3"):
+            self.graphql_url = self.api_url[: -len("/v3")] + "/graphql"
+        else:
+            self.graphql_url = f"{self.api_url}/graphql"
+
+        # The request scheduler paces requests and handles secondary rate
+        # limits across all lanes, so PyGithub only retries connection errors
+        # and does not throttle (or sleep on 403/429s) in a worker thread.
+        # Listings use GitHub's largest page size rather than its default of 30
+        self.github = Github(
+            config.github_token,
+            base_url=self.api_url,
+            per_page=100,
+            retry=Retry(
+                total=3,
+                connect=3,
+                read=0,
+                status=0,
+                other=0,
+                backoff_factor=0.5,
+                respect_retry_after_header=False,
+            ),
+            seconds_between_requests=None,
+            seconds_between_writes=None,
+        )
         self._repositories: Dict[str, Repository] = {}
 
+        # PyGithub and requests are blocking; async methods run them on the
+        # scheduler's bounded thread pool so the event loop stays free
+        max_concurrency = getattr(config, "github_max_concurrency", None)
+        if not isinstance(max_concurrency, int) or max_concurrency < 1:
+            max_concurrency = 8
+
+        # Requests are admitted by priority lane against the rate-limit budget
+        # that GitHub reports in the headers of every response; all handlers
+        # of a token share one scheduler unless one is passed in
+        if scheduler is None:
+            reserves = [
+                getattr(config, name, None)
+                for name in ("github_critical_reserve", "github_background_reserve")
+            ]
+            scheduler = shared_scheduler(
+                (self.api_url, config.github_token),
+                max_concurrency=max_concurrency,
+                critical_reserve=reserves[0] if isinstance(reserves[0], int) else 50,
+                background_reserve=(
+                    reserves[1] if isinstance(reserves[1], int) else 500
+                ),
+            )
+        self.scheduler = scheduler
+        customize_github_session(
+            self.github,
+            lambda connection: connection.session.hooks["response"].append(
+                self.scheduler.observe_response
+            ),
+        )
+
+        # Git trees are immutable, so listings cached by tree SHA never go stale
+        self._tree_cache: (
+            "OrderedDict[str, List[Tuple[str, str, str, Optional[int]]]]"
+        ) = OrderedDict()
+        self._structure_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._tree_cache_lock = threading.Lock()
+
+        # Concurrent identical reads (structure, listings, file batches,
+        # project fields) share one in-flight call; joiners get copies
+        self._single_flight = SingleFlight()
+
+        # Optional ETag cache: unchanged resources are revalidated with 304s,
+        # which GitHub does not count against the rate limit
+        self.http_cache: Optional[GitHubHTTPCache] = None
+        cache_config = getattr(config, "github_cache", None)
+        if isinstance(cache_config, GitHubCacheConfig) and cache_config.enabled:
+            try:
+                http_cache = GitHubHTTPCache(
+                    cache_config.path,
+                    max_entries=cache_config.max_entries,
+                    max_size_bytes=cache_config.max_size_mb * 1024 * 1024,
+                )
+                if install_http_cache(self.github, http_cache):
+                    self.http_cache = http_cache
+            except Exception as e:
+                logger.warning(f"Failed to initialize GitHub HTTP cache: {e}")
+
+        # Project schemas per project ID, and per project the item and last
+        # synced field values of each story (persisted when a database is set)
+        self._project_fields_cache: Dict[str, Tuple[float, List[ProjectField]]] = {}
+        self._project_sync_state: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+        # Optional local issue mirror for progress and related-issue lookups,
+        # kept in the owner's database
+        self.issue_mirror: Optional[IssueMirror] = None
+        mirror_config = getattr(config, "issue_mirror", None)
+        if isinstance(mirror_config, IssueMirrorConfig) and mirror_config.enabled:
+            if self.database:
+                self.issue_mirror = IssueMirror(
+                    self, self.database, max_age_seconds=mirror_config.max_age_seconds
+                )
+            else:
+                logger.debug("Issue mirror disabled for a handler without a database")
+
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Run a blocking GitHub REST call on the scheduler's thread pool."""
+        return await self._run_scheduled("core", func, *args, **kwargs)
+
+    async def _run_scheduled(self, resource: str, func, *args, **kwargs):
+        """Run a blocking call once the scheduler admits it for resource.
+
+        The priority lane comes from the caller's request_priority() context.
+        """
+        loop = asyncio.get_running_loop()
+        call = functools.partial(func, *args, **kwargs)
+        return await self.scheduler.run(
+            lambda: loop.run_in_executor(self.scheduler.executor, call),
+            resource=resource,
+        )
+
+    request_priority = staticmethod(request_priority)
+
+    def get_rate_limit_metrics(self) -> Dict[str, Any]:
+        """Get queued work per priority lane and the tracked rate-limit budgets."""
+        return self.scheduler.get_metrics()
+
+    def get_http_cache_stats(self) -> Dict[str, Any]:
+        """Get hit-rate and size metrics for the GitHub HTTP cache."""
+        if not self.http_cache:
+            return {"enabled": False}
+        return {"enabled": True, **self.http_cache.get_stats()}
+
     def get_repository(self, repo_name: str) -> Repository:
         """Get a GitHub repository object with caching."""
 
@@ -66,15 +308,15 @@ class GitHubHandler:
                 raise ValueError("No target repository specified")
 
         try:
-            repo = self.get_repository(target_repo)
+            repo = await self._run_blocking(self.get_repository, target_repo)
 
             # Create the issue
-            issue = repo.create_issue(
+            issue = await self._run_blocking(
+                repo.create_issue,
                 title=issue_data.title,
                 body=issue_data.body,
                 labels=issue_data.labels,
                 assignees=issue_data.assignees,
-                milestone=None,  # Milestone handling can be added later
             )
 
             logger.info(
@@ -98,24 +340,28 @@ class GitHubHandler:
     ) -> Issue:
         """Update an existing GitHub issue."""
 
-        try:
+        # Update fields if provided, in a single edit request
+        edit_kwargs: Dict[str, Any] = {}
+        if title is not None:
+            edit_kwargs["title"] = title
+        if body is not None:
+            edit_kwargs["body"] = body
+        if labels is not None:
+            edit_kwargs["labels"] = labels
+        if assignees is not None:
+            edit_kwargs["assignees"] = assignees
+        if state is not None and state.lower() in ("open", "closed"):
+            edit_kwargs["state"] = state.lower()
+
+        def _update() -> Issue:
             repo = self.get_repository(repository_name)
             issue = repo.get_issue(issue_number)
+            if edit_kwargs:
+                issue.edit(**edit_kwargs)
+            return issue
 
-            # Update fields if provided
-            if title is not None:
-                issue.edit(title=title)
-            if body is not None:
-                issue.edit(body=body)
-            if labels is not None:
-                issue.edit(labels=labels)
-            if assignees is not None:
-                issue.edit(assignees=assignees)
-            if state is not None:
-                if state.lower() == "closed":
-                    issue.edit(state="closed")
-                elif state.lower() == "open":
-                    issue.edit(state="open")
+        try:
+            issue = await self._run_blocking(_update)
 
             logger.info(f"Updated issue #{issue_number} in {repository_name}")
             return issue
@@ -131,11 +377,14 @@ class GitHubHandler:
     ) -> None:
         """Add a comment to a GitHub issue."""
 
-        try:
+        def _comment() -> None:
             repo = self.get_repository(repository_name)
             issue = repo.get_issue(issue_number)
             issue.create_comment(comment)
 
+        try:
+            await self._run_blocking(_comment)
+
             logger.info(f"Added comment to issue #{issue_number} in {repository_name}")
 
         except GithubException as e:
@@ -146,8 +395,8 @@ class GitHubHandler:
         """Get a GitHub issue by number."""
 
         try:
-            repo = self.get_repository(repository_name)
-            return repo.get_issue(issue_number)
+            repo = await self._run_blocking(self.get_repository, repository_name)
+            return await self._run_blocking(repo.get_issue, issue_number)
 
         except GithubException as e:
             logger.error(
@@ -310,15 +559,14 @@ class GitHubHandler:
                 )
                 created_issues.append(issue)
 
-                # Add cross-references to previously created issues
-                if len(created_issues) > 1:
-                    await self._add_cross_references(created_issues)
-
             except Exception as e:
                 logger.error(f"Failed to create story in repository {repo_key}: {e}")
                 # Continue with other repositories
                 continue
 
+        # Link all issues once they exist: one comment per issue
+        await self._add_cross_references(created_issues)
+
         return created_issues
 
     def _sort_repositories_by_dependencies(
@@ -355,37 +603,44 @@ class GitHubHandler:
         return sorted_repos
 
     async def _add_cross_references(self, issues: List[Issue]) -> None:
-        """Add cross-references between related issues."""
+        """Post one consolidated related-issues comment on each issue."""
 
         if len(issues) < 2:
             return
 
-        for i, issue in enumerate(issues):
-            other_issues = [other for j, other in enumerate(issues) if j != i]
-
+        async def _reference(issue: Issue) -> None:
             reference_text = "**Related Issues:**\n"
-            for other in other_issues:
-                reference_text += f"- {other.repository.full_name}#{other.number}\n"
+            for other in issues:
+                if other is not issue:
+                    reference_text += f"- {other.repository.full_name}#{other.number}\n"
 
             try:
-                await self.add_issue_comment(
-                    repository_name=issue.repository.full_name,
-                    issue_number=issue.number,
-                    comment=reference_text,
-                )
+                await self._run_blocking(issue.create_comment, reference_text)
             except Exception as e:
                 logger.warning(
                     f"Failed to add cross-reference to issue #{issue.number}: {e}"
                 )
 
+        with request_priority("background"):
+            await asyncio.gather(*[_reference(issue) for issue in issues])
+
     async def get_file_content(
-        self, repository_name: str, file_path: str, ref: str = "main"
+        self,
+        repository_name: str,
+        file_path: str,
+        ref: str = "main",
+        max_size: Optional[int] = None,
     ) -> Optional[str]:
-        """Get the content of a file from a repository."""
+        """Get the content of a file from a repository.
+
+        With max_size, only the first max_size bytes are decoded.
+        """
 
         try:
-            repo = self.get_repository(repository_name)
-            content_file = repo.get_contents(file_path, ref=ref)
+            repo = await self._run_blocking(self.get_repository, repository_name)
+            content_file = await self._run_blocking(
+                repo.get_contents, file_path, ref=ref
+            )
 
             if isinstance(content_file, list):
                 # Multiple files returned - shouldn't happen for specific file path
@@ -396,9 +651,9 @@ class GitHubHandler:
 
             # Decode content if it's base64 encoded
             if content_file.encoding == "base64":
-                content = base64.b64decode(content_file.content).decode("utf-8")
+                content = decode_base64_text(content_file.content, max_size)
             else:
-                content = content_file.content
+                content = _truncate_text(content_file.content, max_size)
 
             return content
 
@@ -414,6 +669,169 @@ class GitHubHandler:
             logger.error(f"Error getting file content: {e}")
             return None
 
+    async def get_file_contents(
+        self,
+        repository_name: str,
+        file_paths: List[str],
+        ref: str = "HEAD",
+        max_file_size: Optional[int] = MAX_FILE_CONTENT_BYTES,
+    ) -> Dict[str, Optional[str]]:
+        """Get the contents of many files, batched into GraphQL blob lookups.
+
+        Each file is an aliased ``object(expression: "ref:path")`` lookup, so
+        up to FILE_CONTENT_BATCH_SIZE files cost one request. Text is capped
+        at max_file_size bytes per file. Files GitHub truncates in GraphQL,
+        and batches that fail outright, are fetched concurrently over REST.
+
+        Returns:
+            Mapping of path to content; None for missing or binary files
+        """
+        paths = list(dict.fromkeys(file_paths))
+        return await self._single_flight.run(
+            ("file_contents", repository_name, ref, max_file_size, tuple(paths)),
+            lambda: self._get_file_contents(repository_name, paths, ref, max_file_size),
+        )
+
+    async def _get_file_contents(
+        self,
+        repository_name: str,
+        paths: List[str],
+        ref: str,
+        max_file_size: Optional[int],
+    ) -> Dict[str, Optional[str]]:
+        owner, _, name = repository_name.partition("/")
+        contents: Dict[str, Optional[str]] = {}
+        rest_paths = []
+
+        operations = [
+            GraphQLOperation(
+                field="repository",
+                selection=(
+                    f"object(expression: {json.dumps(f'{ref}:{path}')}) "
+                    "{ ... on Blob { byteSize isBinary isTruncated text } }"
+                ),
+                arguments={"owner": owner, "name": name},
+                argument_types={"owner": "String!", "name": "String!"},
+                key=path,
+            )
+            for path in paths
+        ]
+        results = await self.execute_graphql_batch(
+            operations, operation_type="query", batch_size=self.FILE_CONTENT_BATCH_SIZE
+        )
+
+        for result in results:
+            path = result.key
+            if not result.success:
+                rest_paths.append(path)
+                continue
+            text, complete = self._graphql_blob_text(
+                result.data.get("object"), max_file_size
+            )
+            if complete:
+                contents[path] = text
+            else:
+                rest_paths.append(path)
+
+        if rest_paths:
+            fetched = await asyncio.gather(
+                *[
+                    self.get_file_content(
+                        repository_name, path, ref=ref, max_size=max_file_size
+                    )
+                    for path in rest_paths
+                ]
+            )
+            contents.update(zip(rest_paths, fetched))
+
+        return {path: contents.get(path) for path in paths}
+
+    @staticmethod
+    def _graphql_blob_text(
+        blob: Optional[Dict[str, Any]], max_file_size: Optional[int]
+    ) -> Tuple[Optional[str], bool]:
+        """Text of a GraphQL Blob capped at max_file_size (None if binary).
+
+        The flag is False when GraphQL cut the text short of what was asked
+        for and it has to be fetched over REST instead.
+        """
+        if not blob or blob.get("isBinary") or blob.get("text") is None:
+            return None, True
+        if blob.get("isTruncated") and (
+            max_file_size is None or len(blob["text"].encode("utf-8")) < max_file_size
+        ):
+            return None, False
+        return _truncate_text(blob["text"], max_file_size), True
+
+    def _get_tree_entries(
+        self, repo: Repository, tree_sha: str
+    ) -> List[Tuple[str, str, str, Optional[int]]]:
+        """Return (path, type, SHA, size) for every entry below a tree.
+
+        Listings are cached by tree SHA.
+
+        Uses a single recursive Git Trees request. When GitHub truncates the
+        response, the tree is walked one level at a time instead, with each
+        subtree fetched (and cached) recursively on its own.
+        """
+        with self._tree_cache_lock:
+            cached = self._tree_cache.get(tree_sha)
+            if cached is not None:
+                self._tree_cache.move_to_end(tree_sha)
+                return cached
+
+        tree = repo.get_git_tree(tree_sha, recursive=True)
+        if not tree.truncated:
+            entries = [
+                (element.path, element.type, element.sha, element.size)
+                for element in tree.tree
+            ]
+        else:
+            logger.info(
+                f"Tree {tree_sha} in {repo.full_name} is truncated, "
+                "listing subtrees individually"
+            )
+            entries = []
+            for element in repo.get_git_tree(tree_sha).tree:
+                entries.append((element.path, element.type, element.sha, element.size))
+                if element.type == "tree":
+                    entries.extend(
+                        (f"{element.path}/{sub_path}", *entry)
+                        for sub_path, *entry in self._get_tree_entries(
+                            repo, element.sha
+                        )
+                    )
+
+        with self._tree_cache_lock:
+            self._tree_cache[tree_sha] = entries
+            while len(self._tree_cache) > self.TREE_CACHE_SIZE:
+                self._tree_cache.popitem(last=False)
+        return entries
+
+    def _list_tree_files(
+        self,
+        repo: Repository,
+        path: str,
+        ref: str,
+        file_extensions: Optional[List[str]],
+    ) -> List[Tuple[str, str]]:
+        """List files below path at ref using the Git Trees API."""
+        # Resolving the ref returns only the root entries; the recursive
+        # listing is then served from cache while the tree is unchanged
+        root_sha = repo.get_git_tree(ref).sha
+        prefix = f"{path.strip('/')}/" if path.strip("/") else ""
+
+        files = []
+        for entry_path, entry_type, _, _ in self._get_tree_entries(repo, root_sha):
+            if entry_type != "blob" or not entry_path.startswith(prefix):
+                continue
+            if file_extensions and not any(
+                entry_path.endswith(ext) for ext in file_extensions
+            ):
+                continue
+            files.append((entry_path, "file"))
+        return files
+
     async def list_repository_files(
         self,
         repository_name: str,
@@ -424,12 +842,39 @@ class GitHubHandler:
     ) -> List[Tuple[str, str]]:
         """List files in a repository directory.
 
+        Recursive listings use the Git Trees API, so a whole repository is
+        listed with one request and cached by tree SHA.
+
         Returns:
             List of tuples (file_path, file_type)
         """
+        return await self._single_flight.run(
+            (
+                "files",
+                repository_name,
+                path,
+                ref,
+                recursive,
+                tuple(file_extensions) if file_extensions else None,
+            ),
+            lambda: self._list_repository_files(
+                repository_name, path, ref, recursive, file_extensions
+            ),
+        )
 
-        try:
+    async def _list_repository_files(
+        self,
+        repository_name: str,
+        path: str,
+        ref: str,
+        recursive: bool,
+        file_extensions: Optional[List[str]],
+    ) -> List[Tuple[str, str]]:
+        def _list_files() -> List[Tuple[str, str]]:
             repo = self.get_repository(repository_name)
+            if recursive:
+                return self._list_tree_files(repo, path, ref, file_extensions)
+
             files = []
 
             def _process_contents(contents, current_path=""):
@@ -443,15 +888,6 @@ class GitHubHandler:
                                 files.append((full_path, content.type))
                         else:
                             files.append((full_path, content.type))
-                    elif content.type == "dir" and recursive:
-                        # Recursively get directory contents
-                        try:
-                            sub_contents = repo.get_contents(full_path, ref=ref)
-                            if isinstance(sub_contents, list):
-                                _process_contents(sub_contents, full_path)
-                        except GithubException:
-                            # Skip directories we can't access
-                            continue
 
             contents = repo.get_contents(path, ref=ref)
             if isinstance(contents, list):
@@ -464,6 +900,9 @@ class GitHubHandler:
 
             return files
 
+        try:
+            return await self._run_blocking(_list_files)
+
         except GithubException as e:
             logger.error(f"Failed to list files in {repository_name}: {e}")
             return []
@@ -474,10 +913,43 @@ class GitHubHandler:
     async def get_repository_structure(
         self, repository_name: str, ref: str = "main"
     ) -> Dict[str, Any]:
-        """Get a summary of the repository structure and key files."""
+        """Get a summary of the repository structure and key files.
+
+        Built from a single root tree listing; languages are only fetched
+        when the tree changed, as summaries are cached per root tree SHA.
+        """
+        return await self._single_flight.run(
+            ("structure", repository_name, ref),
+            lambda: self._get_repository_structure(repository_name, ref),
+        )
 
+    async def _get_repository_structure(
+        self, repository_name: str, ref: str
+    ) -> Dict[str, Any]:
         try:
-            repo = self.get_repository(repository_name)
+            repo = await self._run_blocking(self.get_repository, repository_name)
+
+            try:
+                root_tree = await self._run_blocking(repo.get_git_tree, ref)
+            except GithubException:
+                if ref == repo.default_branch:
+                    raise
+                logger.debug(
+                    f"Ref {ref} not found in {repository_name}, "
+                    f"using default branch {repo.default_branch}"
+                )
+                root_tree = await self._run_blocking(
+                    repo.get_git_tree, repo.default_branch
+                )
+
+            cache_key = f"{repository_name}:{root_tree.sha}"
+            with self._tree_cache_lock:
+                cached = self._structure_cache.get(cache_key)
+                if cached is not None:
+                    self._structure_cache.move_to_end(cache_key)
+            if cached is not None:
+                return copy.deepcopy(cached)
+
             structure = {
                 "name": repository_name,
                 "default_branch": repo.default_branch,
@@ -491,57 +963,23 @@ class GitHubHandler:
 
             # Get language statistics
             try:
-                languages = repo.get_languages()
+                languages = await self._run_blocking(repo.get_languages)
                 structure["languages"] = dict(languages)
             except Exception:
                 pass
 
-            # Get key files (README, package files, config files, etc.)
-            key_file_patterns = [
-                "README.md",
-                "README.rst",
-                "README.txt",
-                "readme.md",
-                "package.json",
-                "requirements.txt",
-                "Cargo.toml",
-                "go.mod",
-                "pom.xml",
-                "build.gradle",
-                "Makefile",
-                "Dockerfile",
-                ".gitignore",
-                "LICENSE",
-                "CHANGELOG.md",
-            ]
-
-            for pattern in key_file_patterns:
-                try:
-                    content = repo.get_contents(pattern, ref=ref)
-                    if not isinstance(content, list):
-                        structure["key_files"].append(
-                            {
-                                "name": content.name,
-                                "path": content.path,
-                                "size": content.size,
-                            }
-                        )
-                except Exception:
-                    continue
-
-            # Get top-level directory structure
-            try:
-                contents = repo.get_contents("", ref=ref)
-                if isinstance(contents, list):
-                    for content in contents:
-                        if content.type == "dir":
-                            structure["directories"].append(content.name)
-                        else:
-                            structure["file_count"] += 1
-                            structure["total_size"] += content.size or 0
-            except Exception:
-                pass
+            self.summarize_root_entries(
+                structure,
+                [
+                    (element.path, element.type, element.size)
+                    for element in root_tree.tree
+                ],
+            )
 
+            with self._tree_cache_lock:
+                self._structure_cache[cache_key] = copy.deepcopy(structure)
+                while len(self._structure_cache) > self.TREE_CACHE_SIZE:
+                    self._structure_cache.popitem(last=False)
             return structure
 
         except GithubException as e:
@@ -553,6 +991,157 @@ class GitHubHandler:
             logger.error(f"Error getting repository structure: {e}")
             return {"error": str(e)}
 
+    def summarize_root_entries(
+        self,
+        structure: Dict[str, Any],
+        entries: List[Tuple[str, str, Optional[int]]],
+    ):
+        """Add directories, file counts and key files of root tree entries."""
+        for path, entry_type, size in entries:
+            if entry_type == "tree":
+                structure["directories"].append(path)
+            elif entry_type == "blob":
+                structure["file_count"] += 1
+                structure["total_size"] += size or 0
+                if path in self.KEY_FILE_NAMES:
+                    structure["key_files"].append(
+                        {"name": path, "path": path, "size": size}
+                    )
+
+    # Commit-addressed reads (used by context_store.RepositoryContextStore)
+
+    async def get_head_commit(
+        self, repository_name: str, ref: str = "main"
+    ) -> Tuple[str, str]:
+        """Resolve a branch to its head commit SHA and root tree SHA.
+
+        Costs one request. Falls back to the default branch when ref does
+        not exist, like get_repository_structure.
+        """
+        repo = await self._run_blocking(self.get_repository, repository_name)
+        try:
+            branch = await self._run_blocking(repo.get_branch, ref)
+        except GithubException:
+            if ref == repo.default_branch:
+                raise
+            branch = await self._run_blocking(repo.get_branch, repo.default_branch)
+        return branch.commit.sha, branch.commit.commit.tree.sha
+
+    async def get_tree_snapshot(
+        self,
+        repository_name: str,
+        tree_sha: str,
+        languages: Optional[Dict[str, int]] = None,
+    ) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """Summarize a tree and map each of its files to its blob SHA.
+
+        Both come from one recursive tree listing. The summary has the shape
+        of get_repository_structure; languages are fetched unless given.
+
+        Returns:
+            Tuple of (structure, {file path: blob SHA})
+        """
+        repo = await self._run_blocking(self.get_repository, repository_name)
+        entries = await self._run_blocking(self._get_tree_entries, repo, tree_sha)
+
+        structure = {
+            "name": repository_name,
+            "default_branch": repo.default_branch,
+            "language": repo.language,
+            "languages": {},
+            "key_files": [],
+            "directories": [],
+            "file_count": 0,
+            "total_size": 0,
+        }
+        if languages is None:
+            try:
+                languages = dict(await self._run_blocking(repo.get_languages))
+            except Exception:
+                languages = {}
+        structure["languages"] = dict(languages)
+        self.summarize_root_entries(
+            structure,
+            [
+                (path, entry_type, size)
+                for path, entry_type, _, size in entries
+                if "/" not in path
+            ],
+        )
+
+        blobs = {
+            path: sha for path, entry_type, sha, _ in entries if entry_type == "blob"
+        }
+        return structure, blobs
+
+    async def get_blobs(
+        self,
+        repository_name: str,
+        blob_shas: List[str],
+        max_file_size: Optional[int] = MAX_FILE_CONTENT_BYTES,
+    ) -> Dict[str, Optional[str]]:
+        """Get the text of blobs by SHA, batched into GraphQL object lookups.
+
+        Like get_file_contents, but content-addressed: the result cannot be
+        from a different version than the SHA names.
+
+        Returns:
+            Mapping of blob SHA to text (None for missing or binary blobs);
+            blobs that could not be fetched are left out
+        """
+        owner, _, name = repository_name.partition("/")
+        shas = list(dict.fromkeys(blob_shas))
+        texts: Dict[str, Optional[str]] = {}
+        rest_shas = []
+
+        operations = [
+            GraphQLOperation(
+                field="repository",
+                selection=(
+                    f"object(oid: {json.dumps(sha)}) "
+                    "{ ... on Blob { isBinary isTruncated text } }"
+                ),
+                arguments={"owner": owner, "name": name},
+                argument_types={"owner": "String!", "name": "String!"},
+                key=sha,
+            )
+            for sha in shas
+        ]
+        results = await self.execute_graphql_batch(
+            operations, operation_type="query", batch_size=self.FILE_CONTENT_BATCH_SIZE
+        )
+        for result in results:
+            if not result.success:
+                rest_shas.append(result.key)
+                continue
+            text, complete = self._graphql_blob_text(
+                result.data.get("object"), max_file_size
+            )
+            if complete:
+                texts[result.key] = text
+            else:
+                rest_shas.append(result.key)
+
+        if rest_shas:
+            repo = await self._run_blocking(self.get_repository, repository_name)
+
+            async def _fetch(sha: str):
+                try:
+                    blob = await self._run_blocking(repo.get_git_blob, sha)
+                except GithubException as e:
+                    logger.error(
+                        f"Failed to get blob {sha} from {repository_name}: {e}"
+                    )
+                    return
+                try:
+                    texts[sha] = decode_base64_text(blob.content, max_file_size)
+                except UnicodeDecodeError:
+                    texts[sha] = None
+
+            await asyncio.gather(*[_fetch(sha) for sha in rest_shas])
+
+        return {sha: texts[sha] for sha in shas if sha in texts}
+
     # GitHub Projects API Methods
 
     def _execute_graphql_query(
@@ -560,6 +1149,17 @@ class GitHubHandler:
     ) -> Dict[str, Any]:
         """Execute a GraphQL query against GitHub's API."""
 
+        result = self._execute_graphql_request(query, variables)
+        if "errors" in result:
+            raise Exception(f"GraphQL errors: {result['errors']}")
+
+        return result.get("data", {})
+
+    def _execute_graphql_request(
+        self, query: str, variables: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """POST a GraphQL document and return the full payload (data and errors)."""
+
         headers = {
             "Authorization": f"Bearer {self.config.github_token}",
             "Content-Type": "application/json",
@@ -570,19 +1170,224 @@ class GitHubHandler:
             payload["variables"] = variables
 
         response = requests.post(
-            "https://api.github.com/graphql", headers=headers, json=payload, timeout=30
+            self.graphql_url, headers=headers, json=payload, timeout=30
         )
+        self.scheduler.update_from_headers(response.headers, resource="graphql")
+
+        if response.status_code in (403, 429) and (
+            "retry-after" in response.headers
+            or "secondary rate limit" in response.text.lower()
+        ):
+            raise SecondaryRateLimitError(
+                f"GraphQL secondary rate limit: {response.text}",
+                retry_after=float(response.headers.get("retry-after", 60)),
+            )
 
         if response.status_code != 200:
             raise Exception(
                 f"GraphQL request failed: {response.status_code} - {response.text}"
             )
 
-        result = response.json()
-        if "errors" in result:
-            raise Exception(f"GraphQL errors: {result['errors']}")
+        return response.json()
 
-        return result.get("data", {})
+    async def _execute_graphql_query_async(
+        self, query: str, variables: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """Execute a GraphQL query without blocking the event loop."""
+        return await self._run_scheduled(
+            "graphql", self._execute_graphql_query, query, variables
+        )
+
+    async def execute_graphql_batch(
+        self,
+        operations: List[GraphQLOperation],
+        operation_type: str = "mutation",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> List[GraphQLOperationResult]:
+        """Run operations as aliased multi-operation documents.
+
+        Returns one result per operation, in order. Errors are reported per
+        alias, so one failing operation does not fail the rest of its batch.
+        """
+        results: List[GraphQLOperationResult] = []
+        for batch in chunk_operations(operations, batch_size):
+            document, variables = build_batch_document(batch, operation_type)
+            try:
+                payload = await self._run_scheduled(
+                    "graphql", self._execute_graphql_request, document, variables
+                )
+            except Exception as e:
+                logger.error(f"GraphQL batch of {len(batch)} operations failed: {e}")
+                results.extend(
+                    GraphQLOperationResult(
+                        key=operation.key, error=str(e), request_failed=True
+                    )
+                    for operation in batch
+                )
+                continue
+            results.extend(
+                split_batch_response(batch, payload.get("data"), payload.get("errors"))
+            )
+        return results
+
+    async def _resolve_issue_node_ids(
+        self, issue_refs: List[Tuple[int, str]]
+    ) -> Dict[Tuple[int, str], GraphQLOperationResult]:
+        """Look up issue node IDs for (issue_number, repository_name) pairs."""
+        operations = []
+        results = {}
+        for issue_number, repository_name in dict.fromkeys(issue_refs):
+            owner, _, name = repository_name.partition("/")
+            if not owner or not name:
+                results[(issue_number, repository_name)] = GraphQLOperationResult(
+                    key=(issue_number, repository_name),
+                    error=f"Invalid repository name: {repository_name}",
+                )
+                continue
+            operations.append(
+                GraphQLOperation(
+                    field="repository",
+                    selection=f"issue(number: {int(issue_number)}) {{ id }}",
+                    arguments={"owner": owner, "name": name},
+                    argument_types={"owner": "String!", "name": "String!"},
+                    key=(issue_number, repository_name),
+                )
+            )
+
+        for result in await self.execute_graphql_batch(
+            operations, operation_type="query", batch_size=self.GRAPHQL_QUERY_BATCH_SIZE
+        ):
+            issue = (result.data or {}).get("issue")
+            if result.success and not issue:
+                result = GraphQLOperationResult(key=result.key, error="Issue not found")
+            results[result.key] = result
+        return results
+
+    async def _find_missing_project_items(self, item_ids: List[str]) -> Set[str]:
+        """Project item IDs that no longer resolve, e.g. removed items.
+
+        Items whose lookup request failed as a whole are assumed to exist.
+        """
+        operations = [
+            GraphQLOperation(
+                field="node",
+                selection="id",
+                arguments={"id": item_id},
+                argument_types={"id": "ID!"},
+                key=item_id,
+            )
+            for item_id in dict.fromkeys(item_ids)
+        ]
+        return {
+            result.key
+            for result in await self.execute_graphql_batch(
+                operations,
+                operation_type="query",
+                batch_size=self.GRAPHQL_QUERY_BATCH_SIZE,
+            )
+            if not result.success and not result.request_failed
+        }
+
+    async def add_issues_to_project_batched(
+        self, project_id: str, issue_refs: List[Tuple[int, str]]
+    ) -> List[Dict[str, Any]]:
+        """Add issues to a project using batched GraphQL lookups and mutations.
+
+        Args:
+            project_id: Project (v2) node ID
+            issue_refs: List of (issue_number, repository_name)
+
+        Issues whose batch request failed as a whole (rather than failing
+        their own alias) are retried one by one with add_issue_to_project.
+
+        Returns:
+            One result per issue with success, issue_number, repository and
+            either data (the project item) or error
+        """
+        node_ids = await self._resolve_issue_node_ids(issue_refs)
+
+        operations = [
+            GraphQLOperation(
+                field="addProjectV2ItemById",
+                selection="item { id content { ... on Issue { title number } } }",
+                arguments={
+                    "input": {
+                        "projectId": project_id,
+                        "contentId": node_ids[ref].data["issue"]["id"],
+                    }
+                },
+                argument_types={"input": "AddProjectV2ItemByIdInput!"},
+                key=ref,
+            )
+            for ref in dict.fromkeys(issue_refs)
+            if node_ids[ref].success
+        ]
+        added = {
+            result.key: result
+            for result in await self.execute_graphql_batch(operations)
+        }
+
+        results = []
+        for issue_number, repository_name in issue_refs:
+            ref = (issue_number, repository_name)
+            outcome = added.get(ref) or node_ids[ref]
+            if outcome.request_failed:
+                try:
+                    item = await self.add_issue_to_project(
+                        project_id, issue_number, repository_name
+                    )
+                    outcome = GraphQLOperationResult(key=ref, data={"item": item})
+                except Exception as e:
+                    outcome = GraphQLOperationResult(key=ref, error=str(e))
+            entry = {
+                "success": outcome.success,
+                "issue_number": issue_number,
+                "repository": repository_name,
+            }
+            if outcome.success:
+                entry["data"] = outcome.data["item"]
+            else:
+                entry["error"] = outcome.error
+                logger.error(
+                    f"Failed to add issue #{issue_number} to project: {outcome.error}"
+                )
+            results.append(entry)
+        return results
+
+    async def update_project_item_fields_batched(
+        self, project_id: str, updates: List[Tuple[str, str, Any]]
+    ) -> List[GraphQLOperationResult]:
+        """Update many project item fields with batched GraphQL mutations.
+
+        Args:
+            project_id: Project (v2) node ID
+            updates: List of (item_id, field_id, value)
+        """
+        operations = [
+            GraphQLOperation(
+                field="updateProjectV2ItemFieldValue",
+                selection="projectV2Item { id }",
+                arguments={
+                    "input": {
+                        "projectId": project_id,
+                        "itemId": item_id,
+                        "fieldId": field_id,
+                        "value": value,
+                    }
+                },
+                argument_types={"input": "UpdateProjectV2ItemFieldValueInput!"},
+                key=(item_id, field_id),
+            )
+            for item_id, field_id, value in updates
+        ]
+        results = await self.execute_graphql_batch(operations)
+        for result in results:
+            if not result.success:
+                logger.error(
+                    f"Failed to update project item {result.key[0]} "
+                    f"field {result.key[1]}: {result.error}"
+                )
+        return results
 
     async def create_project(
         self, project_data: ProjectData, repository_name: Optional[str] = None
@@ -593,7 +1398,7 @@ class GitHubHandler:
             # Get repository node ID if creating a repository-level project
             repo_node_id = None
             if repository_name:
-                repo = self.get_repository(repository_name)
+                repo = await self._run_blocking(self.get_repository, repository_name)
                 repo_node_id = repo.node_id
 
             # Determine if this is an organization or repository project
@@ -628,7 +1433,7 @@ class GitHubHandler:
                     }
                 }
                 """
-                org_result = self._execute_graphql_query(
+                org_result = await self._execute_graphql_query_async(
                     org_query, {"login": project_data.organization_login}
                 )
                 org_id = org_result["organization"]["id"]
@@ -662,7 +1467,7 @@ class GitHubHandler:
                     "Either repository_name or organization_login must be provided"
                 )
 
-            result = self._execute_graphql_query(mutation, variables)
+            result = await self._execute_graphql_query_async(mutation, variables)
             project = result["createProjectV2"]["projectV2"]
 
             logger.info(
@@ -681,8 +1486,7 @@ class GitHubHandler:
 
         try:
             # Get issue node ID
-            repo = self.get_repository(repository_name)
-            issue = repo.get_issue(issue_number)
+            issue = await self.get_issue(repository_name, issue_number)
             issue_node_id = issue.node_id
 
             mutation = """
@@ -706,7 +1510,7 @@ class GitHubHandler:
 
             variables = {"projectId": project_id, "contentId": issue_node_id}
 
-            result = self._execute_graphql_query(mutation, variables)
+            result = await self._execute_graphql_query_async(mutation, variables)
             item = result["addProjectV2ItemById"]["item"]
 
             logger.info(f"Added issue #{issue_number} to project {project_id}")
@@ -745,7 +1549,7 @@ class GitHubHandler:
                 "value": value,
             }
 
-            result = self._execute_graphql_query(mutation, variables)
+            result = await self._execute_graphql_query_async(mutation, variables)
 
             logger.info(f"Updated project item {item_id} field {field_id}")
             return result["updateProjectV2ItemFieldValue"]["projectV2Item"]
@@ -754,9 +1558,29 @@ class GitHubHandler:
             logger.error(f"Failed to update project item field: {e}")
             raise Exception(f"GitHub Projects API error: {e}")
 
-    async def get_project_fields(self, project_id: str) -> List[ProjectField]:
-        """Get all custom fields for a GitHub Project."""
+    async def get_project_fields(
+        self, project_id: str, refresh: bool = False
+    ) -> List[ProjectField]:
+        """Get all custom fields for a GitHub Project.
+
+        Fields are cached per project for PROJECT_FIELDS_TTL_SECONDS; pass
+        refresh=True or call invalidate_project_fields after schema changes.
+        """
+
+        cached = self._project_fields_cache.get(project_id)
+        if (
+            cached
+            and not refresh
+            and time.monotonic() - cached[0] < self.PROJECT_FIELDS_TTL_SECONDS
+        ):
+            return cached[1]
+
+        return await self._single_flight.run(
+            ("project_fields", project_id),
+            lambda: self._fetch_project_fields(project_id),
+        )
 
+    async def _fetch_project_fields(self, project_id: str) -> List[ProjectField]:
         try:
             query = """
             query($projectId: ID!) {
@@ -797,7 +1621,7 @@ class GitHubHandler:
             """
 
             variables = {"projectId": project_id}
-            result = self._execute_graphql_query(query, variables)
+            result = await self._execute_graphql_query_async(query, variables)
 
             fields = []
             field_nodes = result["node"]["fields"]["nodes"]
@@ -827,12 +1651,29 @@ class GitHubHandler:
                 fields.append(field)
 
             logger.info(f"Retrieved {len(fields)} fields for project {project_id}")
+            self._project_fields_cache[project_id] = (time.monotonic(), fields)
             return fields
 
         except Exception as e:
             logger.error(f"Failed to get project fields: {e}")
             raise Exception(f"GitHub Projects API error: {e}")
 
+    def invalidate_project_fields(self, project_id: Optional[str] = None):
+        """Drop cached project fields of one project, or of all projects."""
+        if project_id is None:
+            self._project_fields_cache.clear()
+        else:
+            self._project_fields_cache.pop(project_id, None)
+
+    def _get_project_sync_state(self, project_id: str) -> Dict[str, Dict[str, Any]]:
+        if project_id not in self._project_sync_state:
+            self._project_sync_state[project_id] = (
+                self.database.get_project_sync_state(project_id)
+                if self.database
+                else {}
+            )
+        return self._project_sync_state[project_id]
+
     async def bulk_add_issues_to_project(
         self,
         project_id: str,
@@ -840,20 +1681,8 @@ class GitHubHandler:
     ) -> List[Dict[str, Any]]:
         """Add multiple issues to a project in bulk."""
 
-        results = []
-        for issue_number, repository_name in issue_data:
-            try:
-                result = await self.add_issue_to_project(
-                    project_id, issue_number, repository_name
-                )
-                results.append(
-                    {"success": True, "data": result, "issue_number": issue_number}
-                )
-            except Exception as e:
-                logger.error(f"Failed to add issue #{issue_number} to project: {e}")
-                results.append(
-                    {"success": False, "error": str(e), "issue_number": issue_number}
-                )
+        with request_priority("background"):
+            results = await self.add_issues_to_project_batched(project_id, issue_data)
 
         success_count = sum(1 for r in results if r["success"])
         logger.info(
@@ -868,11 +1697,26 @@ class GitHubHandler:
         story_hierarchy: Any,  # StoryHierarchy object
         project_id: str,
         field_mappings: Dict[str, str] = None,  # Map story fields to project field IDs
+        force: bool = False,
     ) -> Dict[str, Any]:
-        """Synchronize a story hierarchy with a GitHub Project."""
+        """Synchronize a story hierarchy with a GitHub Project.
+
+        Only changes are sent: stories already in the project keep their item
+        and fields are only updated when their value differs from the last
+        sync. The items of those stories are looked up in one batched query
+        per sync, and stories whose item was removed from the project are
+        added again. Pass force=True to re-add every item and re-set every
+        field.
+        """
 
         field_mappings = field_mappings or {}
-        sync_results = {"epic": None, "user_stories": [], "sub_stories": []}
+        sync_results = {
+            "epic": None,
+            "user_stories": [],
+            "sub_stories": [],
+            "errors": [],
+            "unchanged": 0,
+        }
 
         try:
             # Create issues for the story hierarchy if they don't exist
@@ -882,64 +1726,160 @@ class GitHubHandler:
             project_fields = await self.get_project_fields(project_id)
             field_lookup = {field.name: field.id for field in project_fields}
 
-            # Sync epic (if it has an associated issue)
-            if (
-                hasattr(story_hierarchy.epic, "github_issue_number")
-                and story_hierarchy.epic.github_issue_number
-            ):
-                epic_item = await self.add_issue_to_project(
-                    project_id,
-                    story_hierarchy.epic.github_issue_number,
-                    (
-                        story_hierarchy.epic.target_repositories[0]
-                        if story_hierarchy.epic.target_repositories
-                        else "default"
-                    ),
+            # Collect every story with an associated issue
+            stories = []
+            epic = story_hierarchy.epic
+            if getattr(epic, "github_issue_number", None):
+                repository = (
+                    epic.target_repositories[0]
+                    if epic.target_repositories
+                    else "default"
                 )
+                stories.append(("epic", epic, repository))
 
-                # Update custom fields based on story metadata
-                if "Status" in field_lookup and story_hierarchy.epic.status:
-                    await self.update_project_item_field(
-                        project_id,
-                        epic_item["id"],
-                        field_lookup["Status"],
-                        {"text": story_hierarchy.epic.status.value},
+            for user_story in story_hierarchy.user_stories:
+                if getattr(user_story, "github_issue_number", None):
+                    repository = (
+                        user_story.target_repositories[0]
+                        if user_story.target_repositories
+                        else "default"
                     )
+                    stories.append(("user_stories", user_story, repository))
 
-                sync_results["epic"] = epic_item
+            for sub_story_list in story_hierarchy.sub_stories.values():
+                for sub_story in sub_story_list:
+                    if getattr(sub_story, "github_issue_number", None):
+                        stories.append(
+                            (
+                                "sub_stories",
+                                sub_story,
+                                sub_story.target_repository or "default",
+                            )
+                        )
 
-            # Sync user stories
-            for user_story in story_hierarchy.user_stories:
+            state = {} if force else self._get_project_sync_state(project_id)
+            synced: Dict[str, Dict[str, Any]] = {}
+            removed: List[str] = []
+
+            # Stories whose issue is not in the project yet (or changed) are
+            # added with batched GraphQL requests
+            to_add = []
+            for kind, story, repository in stories:
+                entry = state.get(story.id)
                 if (
-                    hasattr(user_story, "github_issue_number")
-                    and user_story.github_issue_number
+                    entry
+                    and entry["issue_number"] == story.github_issue_number
+                    and entry["repository_name"] == repository
                 ):
-                    story_item = await self.add_issue_to_project(
-                        project_id,
-                        user_story.github_issue_number,
-                        (
-                            user_story.target_repositories[0]
-                            if user_story.target_repositories
-                            else "default"
-                        ),
+                    synced[story.id] = entry
+                else:
+                    to_add.append((story, repository))
+
+            with request_priority("background"):
+                missing = await self._find_missing_project_items(
+                    [entry["item_id"] for entry in synced.values()]
+                )
+                for kind, story, repository in stories:
+                    entry = synced.get(story.id)
+                    if entry and entry["item_id"] in missing:
+                        del synced[story.id]
+                        to_add.append((story, repository))
+
+                added = await self.add_issues_to_project_batched(
+                    project_id,
+                    [
+                        (story.github_issue_number, repository)
+                        for story, repository in to_add
+                    ],
+                )
+                for (story, repository), result in zip(to_add, added):
+                    if not result["success"]:
+                        sync_results["errors"].append(
+                            {
+                                "story_id": story.id,
+                                "issue_number": result["issue_number"],
+                                "error": result["error"],
+                            }
+                        )
+                        if story.id in state:
+                            removed.append(story.id)
+                        continue
+                    synced[story.id] = {
+                        "repository_name": repository,
+                        "issue_number": story.github_issue_number,
+                        "item_id": result["data"]["id"],
+                        "field_values": {},
+                        "item": result["data"],
+                    }
+
+                field_updates = []
+                for kind, story, _ in stories:
+                    entry = synced.get(story.id)
+                    if not entry:
+                        continue
+                    added_item = entry.pop("item", None)
+                    item = added_item or {"id": entry["item_id"]}
+                    if kind == "epic":
+                        sync_results["epic"] = item
+                    else:
+                        sync_results[kind].append(item)
+
+                    # Update custom fields based on story metadata
+                    desired = {}
+                    if kind == "epic" and "Status" in field_lookup and story.status:
+                        desired[field_lookup["Status"]] = {"text": story.status.value}
+                    changed = {
+                        field_id: value
+                        for field_id, value in desired.items()
+                        if entry["field_values"].get(field_id) != value
+                    }
+                    field_updates.extend(
+                        (entry["item_id"], field_id, value)
+                        for field_id, value in changed.items()
                     )
-                    sync_results["user_stories"].append(story_item)
+                    if story.id in state and not added_item and not changed:
+                        sync_results["unchanged"] += 1
 
-            # Sync sub-stories
-            for sub_story_list in story_hierarchy.sub_stories.values():
-                for sub_story in sub_story_list:
-                    if (
-                        hasattr(sub_story, "github_issue_number")
-                        and sub_story.github_issue_number
+                if field_updates:
+                    item_stories = {
+                        entry["item_id"]: story_id for story_id, entry in synced.items()
+                    }
+                    updates = dict(
+                        ((item_id, field_id), value)
+                        for item_id, field_id, value in field_updates
+                    )
+                    for update in await self.update_project_item_fields_batched(
+                        project_id, field_updates
                     ):
-                        sub_item = await self.add_issue_to_project(
-                            project_id,
-                            sub_story.github_issue_number,
-                            sub_story.target_repository or "default",
+                        story_id = item_stories[update.key[0]]
+                        if update.success:
+                            synced[story_id]["field_values"][update.key[1]] = updates[
+                                update.key
+                            ]
+                            continue
+                        sync_results["errors"].append(
+                            {"item_id": update.key[0], "error": update.error}
                         )
-                        sync_results["sub_stories"].append(sub_item)
+                        # The item may have been removed from the project or
+                        # the field changed; start over for both next time
+                        self.invalidate_project_fields(project_id)
+                        synced.pop(story_id, None)
+                        removed.append(story_id)
+
+            if not force:
+                state.update(synced)
+                for story_id in removed:
+                    state.pop(story_id, None)
+            else:
+                self._project_sync_state[project_id] = synced
+            if self.database:
+                self.database.save_project_sync_state(project_id, synced, removed)
 
-            logger.info(f"Synchronized story hierarchy to project {project_id}")
+            logger.info(
+                f"Synchronized story hierarchy to project {project_id}: "
+                f"{len(stories) - len(sync_results['errors'])}/{len(stories)} items "
+                f"({len(to_add)} added, {len(field_updates)} field updates)"
+            )
             return sync_results
 
         except Exception as e:
@@ -980,23 +1920,30 @@ class GitHubHandler:
             "last_updated": datetime.now(timezone.utc).isoformat(),
         }
 
-        for repository_name in repositories:
-            try:
-                repo_data = await self._fetch_repository_progress(
-                    repository_name, epic_id
-                )
-                progress_data["repositories"][repository_name] = repo_data
-                progress_data["issues_by_repository"][repository_name] = repo_data.get(
-                    "issues", []
-                )
-            except Exception as e:
+        results = await asyncio.gather(
+            *[
+                self._fetch_repository_progress(repository_name, epic_id)
+                for repository_name in repositories
+            ],
+            return_exceptions=True,
+        )
+
+        for repository_name, repo_data in zip(repositories, results):
+            if isinstance(repo_data, Exception):
                 logger.error(
-                    f"Failed to fetch progress for repository {repository_name}: {e}"
+                    f"Failed to fetch progress for repository {repository_name}: "
+                    f"{repo_data}"
                 )
                 progress_data["repositories"][repository_name] = {
-                    "error": str(e),
+                    "error": str(repo_data),
                     "status": "error",
                 }
+                continue
+
+            progress_data["repositories"][repository_name] = repo_data
+            progress_data["issues_by_repository"][repository_name] = repo_data.get(
+                "issues", []
+            )
 
         return progress_data
 
@@ -1005,23 +1952,22 @@ class GitHubHandler:
     ) -> Dict[str, Any]:
         """Fetch progress data for a specific repository related to an epic."""
         try:
-            repo = self.get_repository(repository_name)
-
-            # Search for issues related to the epic
-            # Using a search query to find issues with epic reference
-            query = f"repo:{repository_name} {epic_id} in:title,body"
-            issues = list(repo.get_issues(state="all"))
-
-            # Filter issues that reference the epic
-            epic_related_issues = []
-            for issue in issues:
-                if epic_id in issue.title or epic_id in (issue.body or ""):
-                    epic_related_issues.append(issue)
+            if self.issue_mirror:
+                # Indexed local lookup; the mirror only syncs changes since
+                # its last sync and is otherwise kept current by webhooks
+                await self.issue_mirror.ensure_fresh(repository_name)
+                epic_related_issues = self.issue_mirror.get_epic_issues(
+                    repository_name, epic_id
+                )
+            else:
+                epic_related_issues = await self._fetch_epic_issues_from_api(
+                    repository_name, epic_id
+                )
 
             # Calculate progress metrics
             total_issues = len(epic_related_issues)
             closed_issues = sum(
-                1 for issue in epic_related_issues if issue.state == "closed"
+                1 for issue in epic_related_issues if issue["state"] == "closed"
             )
             open_issues = total_issues - closed_issues
 
@@ -1030,19 +1976,21 @@ class GitHubHandler:
             )
 
             # Get issue details for visualization
-            issue_details = []
-            for issue in epic_related_issues[:20]:  # Limit to most recent 20
-                issue_details.append(
-                    {
-                        "number": issue.number,
-                        "title": issue.title,
-                        "state": issue.state,
-                        "created_at": issue.created_at.isoformat(),
-                        "updated_at": issue.updated_at.isoformat(),
-                        "assignee": issue.assignee.login if issue.assignee else None,
-                        "labels": [label.name for label in issue.labels],
-                    }
-                )
+            issue_details = [
+                {
+                    key: issue[key]
+                    for key in (
+                        "number",
+                        "title",
+                        "state",
+                        "created_at",
+                        "updated_at",
+                        "assignee",
+                        "labels",
+                    )
+                }
+                for issue in epic_related_issues[:20]  # Limit to most recent 20
+            ]
 
             return {
                 "repository": repository_name,
@@ -1065,6 +2013,27 @@ class GitHubHandler:
             )
             raise
 
+    async def _fetch_epic_issues_from_api(
+        self, repository_name: str, epic_id: str
+    ) -> List[Dict[str, Any]]:
+        """List every issue of a repository and keep those referencing the epic."""
+        repo = await self._run_blocking(self.get_repository, repository_name)
+        issues = await self._run_blocking(lambda: list(repo.get_issues(state="all")))
+
+        return [
+            {
+                "number": issue.number,
+                "title": issue.title,
+                "state": issue.state,
+                "created_at": issue.created_at.isoformat(),
+                "updated_at": issue.updated_at.isoformat(),
+                "assignee": issue.assignee.login if issue.assignee else None,
+                "labels": [label.name for label in issue.labels],
+            }
+            for issue in issues
+            if epic_id in issue.title or epic_id in (issue.body or "")
+        ]
+
     async def update_cross_repository_project_progress(
         self, project_id: str, epic_id: str, repositories: List[str]
     ) -> Dict[str, Any]:
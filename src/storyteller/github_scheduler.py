@@ -0,0 +1,348 @@
+"""Rate-limit-aware scheduling of GitHub API requests.
+
+Requests are admitted through priority lanes. Each lane keeps a reserve of
+the remaining rate-limit budget for the lanes above it, so bulk background
+work cannot starve webhook-driven notifications. Budgets are tracked per
+rate-limit resource (REST ``core`` and ``graphql``) from response headers,
+and secondary rate limits pause all lanes with backoff.
+
+GitHub counts the rate limit per token, so handlers share one scheduler per
+API URL and token (see shared_scheduler): webhook work and background scans
+compete for the same budget, reserves and concurrency limit.
+"""
+
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Mapping, Optional
+
+from github.GithubException import GithubException
+
+logger = logging.getLogger(__name__)
+
+LANES = ("critical", "normal", "background")
+
+# Seconds a reserved budget without a known reset is trusted before a lane
+# may send a request again to refresh it
+BUDGET_RECHECK_SECONDS = 60.0
+
+_current_priority: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "github_request_priority", default="normal"
+)
+
+
+def current_priority() -> str:
+    """Priority lane for GitHub requests made in the current context."""
+    return _current_priority.get()
+
+
+@contextmanager
+def request_priority(priority: str):
+    """Run the enclosed GitHub requests in the given priority lane."""
+    if priority not in LANES:
+        raise ValueError(f"Unknown request priority: {priority}")
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class SecondaryRateLimitError(Exception):
+    """Raised for secondary (abuse) rate-limit responses outside PyGithub."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass
+class RateLimitBudget:
+    """Remaining request budget for one GitHub rate-limit resource."""
+
+    resource: str
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    reset_at: Optional[float] = None
+    updated_at: Optional[float] = None
+
+    def current_remaining(self, now: float) -> Optional[int]:
+        """Remaining requests, assuming a full budget once the window reset.
+
+        Without a known reset, the budget is unknown (None) once it was not
+        refreshed for BUDGET_RECHECK_SECONDS.
+        """
+        if self.reset_at is not None and now >= self.reset_at:
+            return self.limit
+        if self.reset_at is None and now >= self.recheck_at():
+            return None
+        return self.remaining
+
+    def recheck_at(self) -> float:
+        """When a budget without a known reset is considered stale."""
+        return (self.updated_at or 0.0) + BUDGET_RECHECK_SECONDS
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "remaining": self.remaining,
+            "reset_at": self.reset_at,
+        }
+
+
+class GitHubRequestScheduler:
+    """Admit GitHub requests by priority while respecting rate-limit budgets."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        critical_reserve: int = 50,
+        background_reserve: int = 500,
+        max_secondary_retries: int = 3,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_secondary_retries = max_secondary_retries
+        # Budget a lane must leave untouched for the lanes above it
+        self.reserves = {
+            "critical": 0,
+            "normal": critical_reserve,
+            "background": critical_reserve + background_reserve,
+        }
+        self.budgets = {
+            resource: RateLimitBudget(resource) for resource in ("core", "graphql")
+        }
+        self.paused_until = 0.0
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._in_flight = 0
+        self._waiting = {lane: 0 for lane in LANES}
+        self._condition: Optional[asyncio.Condition] = None
+        self._condition_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.metrics = {
+            "completed": {lane: 0 for lane in LANES},
+            "secondary_limit_hits": 0,
+            "deferred": 0,
+        }
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Thread pool for blocking calls, sized to the concurrency limit."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency, thread_name_prefix="github"
+                )
+            return self._executor
+
+    def close(self):
+        """Shut down the thread pool; a later request starts a new one."""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def update_from_headers(
+        self, headers: Mapping[str, str], resource: Optional[str] = None
+    ):
+        """Record the budget reported by GitHub's X-RateLimit-* headers.
+
+        Missing, malformed or unreadable headers are ignored, so they never
+        fail the request they came with.
+        """
+        try:
+            values = {
+                name: headers.get(f"X-RateLimit-{name}")
+                for name in ("Resource", "Remaining", "Limit", "Reset")
+            }
+        except Exception:
+            logger.debug("Ignoring unreadable rate-limit headers", exc_info=True)
+            return
+        values = {
+            name: value
+            for name, value in values.items()
+            if isinstance(value, (str, int)) and not isinstance(value, bool)
+        }
+        if "Remaining" not in values:
+            return
+
+        try:
+            remaining = int(values["Remaining"])
+            limit = int(values["Limit"]) if "Limit" in values else None
+            reset_at = float(values["Reset"]) if "Reset" in values else None
+        except ValueError:
+            logger.debug("Ignoring malformed rate-limit headers: %s", values)
+            return
+
+        resource = values.get("Resource") or resource or "core"
+        budget = self.budgets.setdefault(resource, RateLimitBudget(resource))
+        budget.remaining = remaining
+        budget.updated_at = time.time()
+        if limit is not None:
+            budget.limit = limit
+        if reset_at is not None:
+            budget.reset_at = reset_at
+
+    def observe_response(self, response, *args, **kwargs):
+        """requests response hook that feeds rate-limit headers to the scheduler."""
+        self.update_from_headers(response.headers)
+
+    def _wait_time(self, lane: str, resource: str, now: float) -> Optional[float]:
+        """Seconds until lane may start a request (0 = now, None = on release)."""
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self._in_flight >= self.max_concurrency:
+            return None
+        if any(self._waiting[other] for other in LANES[: LANES.index(lane)]):
+            return None
+
+        budget = self.budgets.get(resource)
+        remaining = budget.current_remaining(now) if budget else None
+        if remaining is not None and remaining <= self.reserves[lane]:
+            # Re-check at the reset (or when the budget goes stale), never
+            # wait for a release that may not come
+            if budget.reset_at is not None and budget.reset_at > now:
+                return budget.reset_at - now
+            recheck_at = budget.recheck_at()
+            return recheck_at - now if recheck_at > now else BUDGET_RECHECK_SECONDS
+        return 0
+
+    async def _acquire(self, lane: str, resource: str):
+        # Conditions belong to one event loop; callers may use several in turn
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._condition_loop is not loop:
+            self._condition = asyncio.Condition()
+            self._condition_loop = loop
+
+        async with self._condition:
+            self._waiting[lane] += 1
+            deferred = False
+            try:
+                while True:
+                    delay = self._wait_time(lane, resource, time.time())
+                    if delay == 0:
+                        break
+                    if delay is not None and not deferred:
+                        deferred = True
+                        self.metrics["deferred"] += 1
+                        logger.info(
+                            f"Deferring {lane} GitHub {resource} request "
+                            f"for {delay:.0f}s to respect the rate limit"
+                        )
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+            finally:
+                self._waiting[lane] -= 1
+                # Lower lanes held back by this waiter may proceed now
+                self._condition.notify_all()
+            self._in_flight += 1
+
+    async def _release(self, lane: str):
+        async with self._condition:
+            self._in_flight -= 1
+            self.metrics["completed"][lane] += 1
+            self._condition.notify_all()
+
+    @staticmethod
+    def _secondary_retry_after(error: Exception) -> Optional[float]:
+        """Return the advised wait when error is a secondary rate limit."""
+        if isinstance(error, SecondaryRateLimitError):
+            return error.retry_after or 60.0
+        if not isinstance(error, GithubException) or error.status not in (403, 429):
+            return None
+
+        headers = error.headers or {}
+        retry_after = headers.get("retry-after") or headers.get("Retry-After")
+        if retry_after:
+            return float(retry_after)
+        message = str(error.data).lower()
+        if "secondary rate limit" in message or "abuse" in message:
+            return 60.0
+        return None
+
+    async def run(
+        self,
+        call,
+        priority: Optional[str] = None,
+        resource: str = "core",
+    ):
+        """Run an awaitable factory in a priority lane, retrying secondary limits.
+
+        Args:
+            call: Zero-argument function returning the awaitable to schedule
+            priority: Lane name; defaults to the lane of the current context
+            resource: Rate-limit resource the request counts against
+        """
+        lane = priority or current_priority()
+        if lane not in LANES:
+            raise ValueError(f"Unknown request priority: {lane}")
+
+        attempt = 0
+        while True:
+            await self._acquire(lane, resource)
+            try:
+                return await call()
+            except Exception as e:
+                retry_after = self._secondary_retry_after(e)
+                if retry_after is None or attempt >= self.max_secondary_retries:
+                    raise
+                # Back off exponentially unless GitHub said how long to wait
+                delay = retry_after * (2**attempt)
+                attempt += 1
+                self.metrics["secondary_limit_hits"] += 1
+                self.paused_until = max(self.paused_until, time.time() + delay)
+                logger.warning(
+                    f"GitHub secondary rate limit hit; pausing requests for "
+                    f"{delay:.0f}s (retry {attempt}/{self.max_secondary_retries})"
+                )
+            finally:
+                await self._release(lane)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queued and in-flight requests per lane plus the tracked budgets."""
+        return {
+            "queued": dict(self._waiting),
+            "in_flight": self._in_flight,
+            "completed": dict(self.metrics["completed"]),
+            "secondary_limit_hits": self.metrics["secondary_limit_hits"],
+            "deferred": self.metrics["deferred"],
+            "paused_until": self.paused_until or None,
+            "budgets": {
+                resource: budget.to_dict() for resource, budget in self.budgets.items()
+            },
+        }
+
+
+_shared_schedulers: Dict[Hashable, GitHubRequestScheduler] = {}
+_shared_schedulers_lock = threading.Lock()
+
+
+def shared_scheduler(budget_key: Hashable, **settings) -> GitHubRequestScheduler:
+    """The process-wide scheduler of one rate-limit budget.
+
+    Args:
+        budget_key: Identifies the budget, e.g. (API URL, token)
+        **settings: GitHubRequestScheduler arguments, used on first creation
+    """
+    with _shared_schedulers_lock:
+        scheduler = _shared_schedulers.get(budget_key)
+        if scheduler is None:
+            scheduler = GitHubRequestScheduler(**settings)
+            _shared_schedulers[budget_key] = scheduler
+        return scheduler
+
+
+def reset_shared_schedulers():
+    """Close and forget all shared schedulers (for tests and reconfiguration)."""
+    with _shared_schedulers_lock:
+        schedulers = list(_shared_schedulers.values())
+        _shared_schedulers.clear()
+    for scheduler in schedulers:
+        scheduler.close()
@@ -4,11 +4,14 @@ This module implements GitHub Issues/Projects as the primary storage mechanism,
 supporting both ephemeral (pipeline) and persistent (MCP) deployment contexts.
 """
 
+import asyncio
+import copy
 import logging
 import re
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 import yaml
 from config import Config, get_config
@@ -17,11 +20,122 @@ from github.GithubException import GithubException
 from github.Issue import Issue
 from github.IssueComment import IssueComment
 from github_handler import GitHubHandler, IssueData
+from github_scheduler import request_priority
 from models import Epic, StoryHierarchy, StoryStatus, StoryType, SubStory, UserStory
 from story_manager import StoryAnalysis
 
 logger = logging.getLogger(__name__)
 
+# libyaml's C loader and dumper are much faster than the pure-Python ones and
+# produce the same results for frontmatter
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CDumper", yaml.Dumper)
+
+_FRONTMATTER_PATTERN = re.compile(r"^---\s*\n(.*?)\n---\s*\n(.*)$", re.DOTALL)
+
+# Lines and scalars of the flat frontmatter storyteller writes itself; any
+# other YAML is left to the full parser
+_FLAT_KEY = re.compile(r"([A-Za-z_][A-Za-z0-9_]*):(?: (.*))?")
+# Plain scalars may contain colons (e.g. URLs), but not before a space or last
+_FLAT_PLAIN_STRING = re.compile(r"[A-Za-z](?:[A-Za-z0-9 _.,/()'+-]|:(?=[^ ]))*")
+_FLAT_QUOTED_STRING = re.compile(r"'((?:[^']|'')*)'")
+_FLAT_INT = re.compile(r"-?(?:0|[1-9][0-9]*)")
+_FLAT_FLOAT = re.compile(r"-?(?:0|[1-9][0-9]*)\.[0-9]+")
+_FLAT_CONSTANTS = {"null": None, "true": True, "false": False}
+# Plain words YAML 1.1 resolves to booleans or null
+_YAML_RESERVED_WORDS = frozenset(
+    word
+    for base in ("yes", "no", "on", "off", "true", "false", "null")
+    for word in (base, base.capitalize(), base.upper())
+)
+
+
+class _NotFlat(Exception):
+    """Frontmatter needs the full YAML parser."""
+
+
+def _parse_flat_scalar(text: str) -> Any:
+    if text in _FLAT_CONSTANTS:
+        return _FLAT_CONSTANTS[text]
+    if text == "[]":
+        return []
+    if text == "{}":
+        return {}
+    match = _FLAT_QUOTED_STRING.fullmatch(text)
+    if match:
+        return match.group(1).replace("''", "'")
+    if _FLAT_INT.fullmatch(text):
+        return int(text)
+    if _FLAT_FLOAT.fullmatch(text):
+        return float(text)
+    if (
+        _FLAT_PLAIN_STRING.fullmatch(text)
+        and not text.endswith(" ")
+        and text not in _YAML_RESERVED_WORDS
+    ):
+        return text
+    raise _NotFlat(text)
+
+
+def parse_flat_yaml(text: str) -> Optional[Dict[str, Any]]:
+    """Parse a flat YAML mapping of scalars and scalar lists without PyYAML.
+
+    Handles what ``yaml.dump`` emits for storyteller's own frontmatter: one
+    ``key: value`` per line, lists as ``- item`` lines, mappings of scalars
+    (such as ``metadata``) as ``  key: value`` lines and empty ``{}``/``[]``.
+    Returns None for anything else (deeper nesting, lists inside mappings,
+    block or multi-line scalars, tags, ambiguous plain scalars), which
+    callers parse with PyYAML.
+    """
+    result: Dict[str, Any] = {}
+    # Key whose value is still open: a list or mapping may follow it
+    open_key = None
+    try:
+        for line in text.split("\n"):
+            if line.startswith("- "):
+                if open_key is None or isinstance(result[open_key], dict):
+                    return None
+                if result[open_key] is None:
+                    result[open_key] = []
+                result[open_key].append(_parse_flat_scalar(line[2:]))
+                continue
+
+            if line.startswith("  "):
+                match = _FLAT_KEY.fullmatch(line[2:])
+                if not match or open_key is None or isinstance(result[open_key], list):
+                    return None
+                if result[open_key] is None:
+                    result[open_key] = {}
+                mapping = result[open_key]
+                key, value = match.groups()
+                if key in mapping:
+                    return None
+                mapping[key] = None if value is None else _parse_flat_scalar(value)
+                continue
+
+            match = _FLAT_KEY.fullmatch(line)
+            if not match or match.group(1) in result:
+                return None
+            key, value = match.groups()
+            if value is None:
+                # A list or mapping follows, or the value is null
+                result[key] = None
+                open_key = key
+            else:
+                result[key] = _parse_flat_scalar(value)
+                open_key = None
+    except _NotFlat:
+        return None
+    return result
+
+
+def _issue_version(issue: Issue) -> str:
+    """Version of a cached story: its issue's updated_at as a UTC ISO string."""
+    updated_at = issue.updated_at
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    return updated_at.astimezone(timezone.utc).isoformat()
+
 
 @dataclass
 class StorageConfig:
@@ -30,6 +144,7 @@ class StorageConfig:
     primary: str = "github"  # "github" or "sqlite"
     cache_enabled: bool = False
     deployment_context: str = "pipeline"  # "pipeline" or "mcp"
+    cache_reconcile_interval_seconds: int = 300
     issue_label_prefix: str = "storyteller"
     epic_label: str = "epic"
     user_story_label: str = "user-story"
@@ -54,6 +169,31 @@ class GitHubIssueMetadata:
 class YAMLFrontmatterParser:
     """Parser for YAML frontmatter in GitHub issue bodies."""
 
+    # Parsed issue bodies kept per parser, keyed by (issue id, updated_at)
+    PARSE_CACHE_SIZE = 2048
+
+    def __init__(self):
+        self._parse_cache: "OrderedDict[Tuple[Any, Any], Tuple[Dict, str]]" = (
+            OrderedDict()
+        )
+
+    def extract_issue_frontmatter(self, issue: Issue) -> Tuple[Dict[str, Any], str]:
+        """Extract frontmatter of an issue body, parsing each issue version once.
+
+        Returns a copy of the cached frontmatter, so callers may modify it.
+        """
+        key = (issue.id, issue.updated_at)
+        cached = self._parse_cache.get(key)
+        if cached is None:
+            cached = self.extract_frontmatter(issue.body or "")
+            self._parse_cache[key] = cached
+            while len(self._parse_cache) > self.PARSE_CACHE_SIZE:
+                self._parse_cache.popitem(last=False)
+        else:
+            self._parse_cache.move_to_end(key)
+        frontmatter, remaining_content = cached
+        return copy.deepcopy(frontmatter), remaining_content
+
     @staticmethod
     def extract_frontmatter(content: str) -> Tuple[Dict[str, Any], str]:
         """Extract YAML frontmatter and remaining content from issue body.
@@ -68,8 +208,7 @@ class YAMLFrontmatterParser:
             return {}, ""
 
         # Match YAML frontmatter pattern: ---\n...yaml...\n---
-        pattern = r"^---\s*\n(.*?)\n---\s*\n(.*)$"
-        match = re.match(pattern, content, re.DOTALL)
+        match = _FRONTMATTER_PATTERN.match(content)
 
         if not match:
             return {}, content
@@ -77,7 +216,9 @@ class YAMLFrontmatterParser:
         try:
             frontmatter_text = match.group(1)
             remaining_content = match.group(2).strip()
-            frontmatter = yaml.safe_load(frontmatter_text) or {}
+            frontmatter = parse_flat_yaml(frontmatter_text)
+            if frontmatter is None:
+                frontmatter = yaml.load(frontmatter_text, Loader=_YAML_LOADER) or {}
             return frontmatter, remaining_content
         except yaml.YAMLError as e:
             logger.warning(f"Failed to parse YAML frontmatter: {e}")
@@ -98,7 +239,9 @@ class YAMLFrontmatterParser:
             return content
 
         try:
-            frontmatter_yaml = yaml.dump(metadata, default_flow_style=False)
+            frontmatter_yaml = yaml.dump(
+                metadata, Dumper=_YAML_DUMPER, default_flow_style=False
+            )
             return f"---\n{frontmatter_yaml}---\n\n{content}"
         except yaml.YAMLError as e:
             logger.warning(f"Failed to create YAML frontmatter: {e}")
@@ -124,8 +267,14 @@ class GitHubStorageManager:
         self.github_handler = GitHubHandler(self.config)
         self.frontmatter_parser = YAMLFrontmatterParser()
 
-        # Optional SQLite cache for persistent deployment
+        # Optional SQLite read-through/write-through cache of parsed stories
+        # for persistent deployment; kept current by issue webhooks and a
+        # background reconciler
         self._sqlite_cache = None
+        self._reconciler_task: Optional[asyncio.Task] = None
+
+        # (repository, Epic ID) of hierarchies whose last save failed
+        self._unfinished_hierarchies: Set[Tuple[str, str]] = set()
         if (
             self.storage_config.cache_enabled
             and self.storage_config.deployment_context == "mcp"
@@ -187,11 +336,11 @@ class GitHubStorageManager:
         # Create the issue
         issue = await self.github_handler.create_issue(issue_data, repository_name)
 
-        # Update SQLite cache if enabled
+        # Write through to the SQLite cache if enabled
         if self._sqlite_cache:
             epic.metadata["github_issue_number"] = issue.number
             epic.metadata["github_repository"] = issue.repository.full_name
-            self._sqlite_cache.save_epic(epic)
+            self._cache_stories([(epic, issue, issue.repository.full_name)])
 
         logger.info(f"Saved Epic {epic.id} as GitHub issue #{issue.number}")
         return issue
@@ -208,6 +357,14 @@ class GitHubStorageManager:
         Returns:
             Epic instance if found, None otherwise
         """
+        cached = self._get_cached_story(epic_id, StoryType.EPIC)
+        if cached and (
+            not repository_name
+            or cached.metadata.get("github_repository") == repository_name
+        ):
+            logger.debug(f"Using cached Epic {epic_id}")
+            return cached
+
         try:
             # Search for issues with the epic_id in frontmatter
             search_query = f"label:{self.storage_config.epic_label} {epic_id} in:body"
@@ -220,6 +377,9 @@ class GitHubStorageManager:
             for issue in issues:
                 epic = await self._parse_epic_from_issue(issue)
                 if epic and epic.id == epic_id:
+                    self._cache_stories(
+                        [(epic, issue, epic.metadata["github_repository"])]
+                    )
                     return epic
 
             return None
@@ -228,19 +388,22 @@ class GitHubStorageManager:
             logger.error(f"Failed to retrieve Epic {epic_id}: {e}")
             return None
 
-    async def _parse_epic_from_issue(self, issue: Issue) -> Optional[Epic]:
+    async def _parse_epic_from_issue(
+        self, issue: Issue, repository_name: Optional[str] = None
+    ) -> Optional[Epic]:
         """Parse an Epic from a GitHub issue.
 
         Args:
             issue: GitHub Issue instance
+            repository_name: Repository of the issue, if known (saves a lookup)
 
         Returns:
             Epic instance if successfully parsed, None otherwise
         """
         try:
             # Extract frontmatter and content
-            frontmatter, content = self.frontmatter_parser.extract_frontmatter(
-                issue.body or ""
+            frontmatter, content = self.frontmatter_parser.extract_issue_frontmatter(
+                issue
             )
 
             if not frontmatter or frontmatter.get("story_type") != "epic":
@@ -270,7 +433,7 @@ class GitHubStorageManager:
             epic.metadata.update(
                 {
                     "github_issue_number": issue.number,
-                    "github_repository": issue.repository.full_name,
+                    "github_repository": repository_name or issue.repository.full_name,
                     "github_url": issue.html_url,
                 }
             )
@@ -332,11 +495,11 @@ class GitHubStorageManager:
         # Create the issue
         issue = await self.github_handler.create_issue(issue_data, repository_name)
 
-        # Update SQLite cache if enabled
+        # Write through to the SQLite cache if enabled
         if self._sqlite_cache:
             user_story.metadata["github_issue_number"] = issue.number
             user_story.metadata["github_repository"] = issue.repository.full_name
-            self._sqlite_cache.save_user_story(user_story)
+            self._cache_stories([(user_story, issue, issue.repository.full_name)])
 
         logger.info(f"Saved User Story {user_story.id} as GitHub issue #{issue.number}")
         return issue
@@ -396,11 +559,11 @@ class GitHubStorageManager:
         # Create the issue
         issue = await self.github_handler.create_issue(issue_data, target_repo)
 
-        # Update SQLite cache if enabled
+        # Write through to the SQLite cache if enabled
         if self._sqlite_cache:
             sub_story.metadata["github_issue_number"] = issue.number
             sub_story.metadata["github_repository"] = issue.repository.full_name
-            self._sqlite_cache.save_sub_story(sub_story)
+            self._cache_stories([(sub_story, issue, issue.repository.full_name)])
 
         logger.info(f"Saved Sub-Story {sub_story.id} as GitHub issue #{issue.number}")
         return issue
@@ -468,6 +631,144 @@ class GitHubStorageManager:
 
         return "\n".join(comment_parts)
 
+    # Hierarchy Publishing
+
+    async def save_hierarchy(
+        self,
+        hierarchy: StoryHierarchy,
+        repository_name: Optional[str] = None,
+        max_concurrency: int = 4,
+    ) -> Dict[str, Issue]:
+        """Save an Epic with all its User Stories and Sub-Stories as GitHub issues.
+
+        Issues are created level by level (the Epic, then all User Stories,
+        then all Sub-Stories) with up to max_concurrency creations in flight
+        within a level. The frontmatter metadata of each child records the
+        issue number of its parent as parent_issue_number.
+
+        After a failed save of the hierarchy, or when its stories carry issue
+        numbers in this repository from an earlier save, stories already
+        stored in the repository are matched by ID and not created again, so
+        the same call resumes where the previous one stopped. Otherwise no
+        stored issues are listed.
+
+        Args:
+            hierarchy: StoryHierarchy to save
+            repository_name: Repository for all issues of the hierarchy
+                (optional, uses default if not specified)
+            max_concurrency: Maximum concurrent issue creations
+
+        Returns:
+            Issues of the hierarchy keyed by story ID
+
+        Raises:
+            ValueError: Sub-Stories whose User Story is neither part of the
+                hierarchy nor stored in the repository (before any issue is
+                created)
+            Exception: The first failed issue creation of a level, once the
+                other creations of that level have finished
+        """
+        repo_name = repository_name or self.config.github_repository
+        if not repo_name:
+            raise ValueError("No target repository specified")
+
+        epic = hierarchy.epic
+        all_stories = hierarchy.get_all_stories()
+        story_ids = {story.id for story in all_stories}
+        external_parents = set(hierarchy.sub_stories) - {
+            user_story.id for user_story in hierarchy.user_stories
+        }
+        issues: Dict[str, Issue] = {}
+        if (
+            external_parents
+            or (repo_name, epic.id) in self._unfinished_hierarchies
+            or any(
+                story.metadata.get("github_repository") == repo_name
+                for story in all_stories
+            )
+        ):
+            issues = await self._find_stored_stories(
+                repo_name, story_ids | external_parents
+            )
+        missing_parents = external_parents - issues.keys()
+        if missing_parents:
+            raise ValueError(
+                f"Sub-Stories of Epic {epic.id} belong to User Stories that are "
+                f"neither in the hierarchy nor stored in {repo_name}: "
+                f"{', '.join(sorted(missing_parents))}"
+            )
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _publish(story, save, parent_id: Optional[str]):
+            if story.id not in issues:
+                if parent_id is not None:
+                    story.metadata["parent_issue_number"] = issues[parent_id].number
+                async with semaphore:
+                    issues[story.id] = await save(story, repo_name)
+            issue = issues[story.id]
+            story.metadata.update(
+                {
+                    "github_issue_number": issue.number,
+                    "github_repository": repo_name,
+                    "github_url": issue.html_url,
+                }
+            )
+
+        levels = [
+            [(epic, self.save_epic, None)],
+            [
+                (user_story, self.save_user_story, epic.id)
+                for user_story in hierarchy.user_stories
+            ],
+            [
+                (sub_story, self.save_sub_story, user_story_id)
+                for user_story_id, children in hierarchy.sub_stories.items()
+                for sub_story in children
+            ],
+        ]
+        existing = len(issues)
+        for level in levels:
+            # Let the whole level finish before failing so no creation is
+            # left running behind the caller's back
+            results = await asyncio.gather(
+                *(_publish(*entry) for entry in level), return_exceptions=True
+            )
+            errors = [result for result in results if isinstance(result, Exception)]
+            if errors:
+                self._unfinished_hierarchies.add((repo_name, epic.id))
+                logger.error(
+                    f"Failed to save {len(errors)} of {len(level)} stories of "
+                    f"Epic {epic.id}; saving the hierarchy again resumes it"
+                )
+                raise errors[0]
+
+        self._unfinished_hierarchies.discard((repo_name, epic.id))
+        logger.info(
+            f"Saved hierarchy of Epic {epic.id} to {repo_name} "
+            f"({len(issues) - existing} issues created)"
+        )
+        return {story.id: issues[story.id] for story in all_stories}
+
+    async def _find_stored_stories(
+        self, repository_name: str, story_ids: Set[str]
+    ) -> Dict[str, Issue]:
+        """Map those of story_ids stored in a repository to their issues."""
+        id_fields = {
+            "epic": "epic_id",
+            "user_story": "user_story_id",
+            "sub_story": "sub_story_id",
+        }
+        stored: Dict[str, Issue] = {}
+        for issue in await self._list_labeled_issues(
+            repository_name, self.storage_config.issue_label_prefix
+        ):
+            frontmatter, _ = self.frontmatter_parser.extract_issue_frontmatter(issue)
+            story_id = frontmatter.get(id_fields.get(frontmatter.get("story_type")))
+            if story_id in story_ids:
+                stored.setdefault(story_id, issue)
+        return stored
+
     # Hierarchy Reconstruction
 
     async def reconstruct_story_hierarchy(
@@ -475,6 +776,9 @@ class GitHubStorageManager:
     ) -> Optional[StoryHierarchy]:
         """Reconstruct complete story hierarchy from GitHub issues.
 
+        Costs one issue fetch plus one label-filtered listing per story type,
+        independent of the number of stories in the epic.
+
         Args:
             epic_issue_number: GitHub issue number of the Epic
             repository_name: Repository name (optional)
@@ -490,22 +794,36 @@ class GitHubStorageManager:
             )
 
             # Parse Epic
-            epic = await self._parse_epic_from_issue(epic_issue)
+            epic = await self._parse_epic_from_issue(epic_issue, repo_name)
             if not epic:
                 logger.error(f"Failed to parse Epic from issue #{epic_issue_number}")
                 return None
-
-            # Find related User Stories
-            user_stories = await self._find_user_stories_for_epic(epic.id, repo_name)
-
-            # Find Sub-Stories for each User Story
-            sub_stories = {}
-            for user_story in user_stories:
-                user_story_subs = await self._find_sub_stories_for_user_story(
-                    user_story.id, repo_name
-                )
-                if user_story_subs:
-                    sub_stories[user_story.id] = user_story_subs
+            self._cache_stories([(epic, epic_issue, repo_name)])
+
+            # List user stories and sub-stories of the repository by label
+            # (one paginated listing per story type, however large the epic)
+            # and group them by parent ID locally
+            user_stories, all_sub_stories = await asyncio.gather(
+                self._list_user_stories(repo_name),
+                self._list_sub_stories(repo_name),
+            )
+            user_stories = [
+                user_story
+                for user_story in user_stories
+                if user_story.epic_id == epic.id
+            ]
+
+            sub_stories: Dict[str, List[SubStory]] = {
+                user_story.id: [] for user_story in user_stories
+            }
+            for sub_story in all_sub_stories:
+                if sub_story.user_story_id in sub_stories:
+                    sub_stories[sub_story.user_story_id].append(sub_story)
+            sub_stories = {
+                user_story_id: children
+                for user_story_id, children in sub_stories.items()
+                if children
+            }
 
             # Create hierarchy
             hierarchy = StoryHierarchy(
@@ -521,53 +839,86 @@ class GitHubStorageManager:
             logger.error(f"Failed to reconstruct story hierarchy: {e}")
             return None
 
-    async def _find_user_stories_for_epic(
-        self, epic_id: str, repository_name: str
-    ) -> List[UserStory]:
-        """Find all User Stories belonging to an Epic."""
-        try:
-            search_query = f"label:{self.storage_config.user_story_label} {epic_id} in:body repo:{repository_name}"
-            issues = self.github_handler.github.search_issues(search_query)
+    async def _list_labeled_issues(
+        self, repository_name: str, label: str
+    ) -> List[Issue]:
+        """List all issues (open and closed) of a repository carrying a label.
 
-            user_stories = []
-            for issue in issues:
-                user_story = await self._parse_user_story_from_issue(issue)
-                if user_story and user_story.epic_id == epic_id:
-                    user_stories.append(user_story)
+        Costs one request per 100 labeled issues, so the cost grows with the
+        number of stories stored in the repository.
+        """
 
-            return user_stories
+        def _list() -> List[Issue]:
+            repo = self.github_handler.get_repository(repository_name)
+            # Pull requests are told apart by URL: reading pull_request of
+            # an issue without one would fetch each issue individually
+            return [
+                issue
+                for issue in repo.get_issues(state="all", labels=[label])
+                if "/pull/" not in issue.html_url
+            ]
 
+        return await self.github_handler._run_blocking(_list)
+
+    async def _list_user_stories(self, repository_name: str) -> List[UserStory]:
+        """List and parse all User Stories of a repository."""
+        try:
+            issues = await self._list_labeled_issues(
+                repository_name, self.storage_config.user_story_label
+            )
         except Exception as e:
-            logger.error(f"Failed to find user stories for epic {epic_id}: {e}")
+            logger.error(f"Failed to list user stories in {repository_name}: {e}")
             return []
 
-    async def _find_sub_stories_for_user_story(
-        self, user_story_id: str, repository_name: str
-    ) -> List[SubStory]:
-        """Find all Sub-Stories belonging to a User Story."""
+        user_stories = []
+        parsed = []
+        for issue in issues:
+            user_story = await self._parse_user_story_from_issue(issue, repository_name)
+            if user_story:
+                user_stories.append(user_story)
+                parsed.append((user_story, issue, repository_name))
+        self._cache_stories(parsed)
+        return user_stories
+
+    async def _list_sub_stories(self, repository_name: str) -> List[SubStory]:
+        """List and parse all Sub-Stories of a repository."""
         try:
-            search_query = f"label:{self.storage_config.sub_story_label} {user_story_id} in:body repo:{repository_name}"
-            issues = self.github_handler.github.search_issues(search_query)
-
-            sub_stories = []
-            for issue in issues:
-                sub_story = await self._parse_sub_story_from_issue(issue)
-                if sub_story and sub_story.user_story_id == user_story_id:
-                    sub_stories.append(sub_story)
-
-            return sub_stories
-
-        except Exception as e:
-            logger.error(
-                f"Failed to find sub stories for user story {user_story_id}: {e}"
+            issues = await self._list_labeled_issues(
+                repository_name, self.storage_config.sub_story_label
             )
+        except Exception as e:
+            logger.error(f"Failed to list sub stories in {repository_name}: {e}")
             return []
 
-    async def _parse_user_story_from_issue(self, issue: Issue) -> Optional[UserStory]:
+        sub_stories = []
+        parsed = []
+        for issue in issues:
+            sub_story = await self._parse_sub_story_from_issue(issue, repository_name)
+            if sub_story:
+                sub_stories.append(sub_story)
+                parsed.append((sub_story, issue, repository_name))
+        self._cache_stories(parsed)
+        return sub_stories
+
+    async def _parse_story_from_issue(
+        self, issue: Issue, repository_name: Optional[str] = None
+    ) -> Optional[Union[Epic, UserStory, SubStory]]:
+        """Parse an issue as whichever story type its frontmatter declares."""
+        frontmatter, _ = self.frontmatter_parser.extract_issue_frontmatter(issue)
+        parser = {
+            "epic": self._parse_epic_from_issue,
+            "user_story": self._parse_user_story_from_issue,
+            "sub_story": self._parse_sub_story_from_issue,
+        }.get(frontmatter.get("story_type"))
+        return await parser(issue, repository_name) if parser else None
+
+    async def _parse_user_story_from_issue(
+        self, issue: Issue, repository_name: Optional[str] = None
+    ) -> Optional[UserStory]:
         """Parse a UserStory from a GitHub issue."""
         try:
-            frontmatter, content = self.frontmatter_parser.extract_frontmatter(
-                issue.body or ""
+            frontmatter, content = self.frontmatter_parser.extract_issue_frontmatter(
+                issue
             )
 
             if not frontmatter or frontmatter.get("story_type") != "user_story":
@@ -598,7 +949,7 @@ class GitHubStorageManager:
             user_story.metadata.update(
                 {
                     "github_issue_number": issue.number,
-                    "github_repository": issue.repository.full_name,
+                    "github_repository": repository_name or issue.repository.full_name,
                     "github_url": issue.html_url,
                 }
             )
@@ -609,11 +960,13 @@ class GitHubStorageManager:
             logger.error(f"Failed to parse UserStory from issue #{issue.number}: {e}")
             return None
 
-    async def _parse_sub_story_from_issue(self, issue: Issue) -> Optional[SubStory]:
+    async def _parse_sub_story_from_issue(
+        self, issue: Issue, repository_name: Optional[str] = None
+    ) -> Optional[SubStory]:
         """Parse a SubStory from a GitHub issue."""
         try:
-            frontmatter, content = self.frontmatter_parser.extract_frontmatter(
-                issue.body or ""
+            frontmatter, content = self.frontmatter_parser.extract_issue_frontmatter(
+                issue
             )
 
             if not frontmatter or frontmatter.get("story_type") != "sub_story":
@@ -644,7 +997,7 @@ class GitHubStorageManager:
             sub_story.metadata.update(
                 {
                     "github_issue_number": issue.number,
-                    "github_repository": issue.repository.full_name,
+                    "github_repository": repository_name or issue.repository.full_name,
                     "github_url": issue.html_url,
                 }
             )
@@ -655,6 +1008,160 @@ class GitHubStorageManager:
             logger.error(f"Failed to parse SubStory from issue #{issue.number}: {e}")
             return None
 
+    # SQLite Cache
+
+    def _get_cached_story(
+        self, story_id: str, story_type: StoryType
+    ) -> Optional[Union[Epic, UserStory, SubStory]]:
+        if not self._sqlite_cache:
+            return None
+        self._ensure_cache_reconciler()
+        try:
+            return self._sqlite_cache.get_cached_github_story(story_id, story_type)
+        except Exception as e:
+            logger.warning(f"Failed to read story {story_id} from cache: {e}")
+            return None
+
+    def _cache_stories(
+        self, stories: List[Tuple[Union[Epic, UserStory, SubStory], Issue, str]]
+    ) -> None:
+        """Write stories and the version of their issues to the SQLite cache."""
+        if not self._sqlite_cache or not stories:
+            return
+        self._ensure_cache_reconciler()
+        try:
+            self._sqlite_cache.cache_github_stories(
+                [
+                    {
+                        "story": story,
+                        "repository_name": repository_name,
+                        "issue_number": issue.number,
+                        "issue_updated_at": _issue_version(issue),
+                    }
+                    for story, issue, repository_name in stories
+                ]
+            )
+        except Exception as e:
+            logger.warning(f"Failed to update story cache: {e}")
+
+    def invalidate_cached_issue(self, repository_name: str, issue_number: int) -> int:
+        """Drop cached stories of an issue, e.g. after an issue webhook."""
+        if not self._sqlite_cache:
+            return 0
+        return self._sqlite_cache.invalidate_github_story_cache(
+            repository_name, issue_number
+        )
+
+    async def reconcile_cache(
+        self, repository_names: Optional[List[str]] = None
+    ) -> int:
+        """Refresh cached stories whose issues changed without a webhook.
+
+        Lists storyteller issues updated since the newest update seen by the
+        previous pass and re-parses those whose cached version differs.
+
+        Args:
+            repository_names: Repositories to reconcile (default: all cached)
+
+        Returns:
+            Number of cache entries refreshed or dropped
+        """
+        if not self._sqlite_cache:
+            return 0
+        if repository_names is None:
+            repository_names = self._sqlite_cache.get_github_story_cache_repositories()
+
+        changed = 0
+        for repository_name in repository_names:
+            try:
+                changed += await self._reconcile_repository(repository_name)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to reconcile story cache for {repository_name}: {e}"
+                )
+        return changed
+
+    async def _reconcile_repository(self, repository_name: str) -> int:
+        cache = self._sqlite_cache
+        versions = cache.get_github_story_cache_versions(repository_name)
+        state = cache.get_github_story_cache_sync_state(repository_name)
+        since = (state or {}).get("last_updated_at") or min(
+            versions.values(), default=None
+        )
+
+        def _list() -> List[Issue]:
+            repo = self.github_handler.get_repository(repository_name)
+            kwargs = {
+                "state": "all",
+                "labels": [self.storage_config.issue_label_prefix],
+                "sort": "updated",
+                "direction": "asc",
+            }
+            if since:
+                kwargs["since"] = datetime.fromisoformat(since)
+            return [
+                issue
+                for issue in repo.get_issues(**kwargs)
+                if "/pull/" not in issue.html_url
+            ]
+
+        with request_priority("background"):
+            issues = await self.github_handler._run_blocking(_list)
+
+        changed = 0
+        refreshed = []
+        for issue in issues:
+            cached_version = versions.get(issue.number)
+            if cached_version is None or cached_version == _issue_version(issue):
+                continue
+            changed += cache.invalidate_github_story_cache(
+                repository_name, issue.number
+            )
+            story = await self._parse_story_from_issue(issue, repository_name)
+            if story:
+                refreshed.append((story, issue, repository_name))
+        self._cache_stories(refreshed)
+
+        cache.update_github_story_cache_sync_state(
+            repository_name,
+            max((_issue_version(issue) for issue in issues), default=None),
+        )
+        if changed:
+            logger.info(
+                f"Reconciled story cache for {repository_name}: "
+                f"{changed} stale entries, {len(refreshed)} refreshed"
+            )
+        return changed
+
+    async def run_cache_reconciler(self, interval_seconds: int):
+        """Reconcile the cache every interval_seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.reconcile_cache()
+            except Exception as e:
+                logger.warning(f"Story cache reconciliation failed: {e}")
+
+    def _ensure_cache_reconciler(self):
+        """Start the background reconciler on first use of the cache."""
+        interval = getattr(self.storage_config, "cache_reconcile_interval_seconds", 0)
+        if not self._sqlite_cache or not interval:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = self._reconciler_task
+        if task and not task.done() and task.get_loop() is loop:
+            return
+        self._reconciler_task = loop.create_task(self.run_cache_reconciler(interval))
+
+    def stop_cache_reconciler(self):
+        """Cancel the background reconciler, if running."""
+        if self._reconciler_task:
+            self._reconciler_task.cancel()
+            self._reconciler_task = None
+
     # Utility Methods
 
     def _extract_title_from_content(self, content: str) -> Optional[str]:
@@ -0,0 +1,105 @@
+"""Batching of GitHub GraphQL operations into aliased multi-operation documents.
+
+Many independent mutations (or lookups) are packed into one request, each
+under its own alias (``op0``, ``op1``, ...). GitHub reports errors per path,
+so a failing operation only fails its own alias and the rest of the batch
+still succeeds.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Operations per request; keeps documents well inside GitHub's node and
+# secondary rate limits for mutations
+DEFAULT_BATCH_SIZE = 25
+
+
+@dataclass
+class GraphQLOperation:
+    """One aliased field of a batched GraphQL document."""
+
+    field: str  # e.g. "addProjectV2ItemById"
+    selection: str  # e.g. "item { id }"
+    arguments: Dict[str, Any]  # argument name -> value
+    argument_types: Dict[str, str]  # argument name -> GraphQL type
+    key: Any = None  # Caller's identifier for the result
+
+
+@dataclass
+class GraphQLOperationResult:
+    """Outcome of one operation in a batch."""
+
+    key: Any
+    data: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    # The whole batch request failed, not just this operation
+    request_failed: bool = False
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+def chunk_operations(
+    operations: Sequence[GraphQLOperation], batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[List[GraphQLOperation]]:
+    """Split operations into batches of at most batch_size."""
+    batch_size = max(1, batch_size)
+    for start in range(0, len(operations), batch_size):
+        yield list(operations[start : start + batch_size])
+
+
+def build_batch_document(
+    operations: Sequence[GraphQLOperation], operation_type: str = "mutation"
+) -> Tuple[str, Dict[str, Any]]:
+    """Build an aliased document and its variables for a batch of operations."""
+    declarations = []
+    fields = []
+    variables: Dict[str, Any] = {}
+
+    for index, operation in enumerate(operations):
+        arguments = []
+        for name, value in operation.arguments.items():
+            variable = f"{name}{index}"
+            declarations.append(f"${variable}: {operation.argument_types[name]}")
+            arguments.append(f"{name}: ${variable}")
+            variables[variable] = value
+        fields.append(
+            f"  op{index}: {operation.field}({', '.join(arguments)}) "
+            f"{{ {operation.selection} }}"
+        )
+
+    document = (
+        f"{operation_type}({', '.join(declarations)}) {{\n" + "\n".join(fields) + "\n}"
+    )
+    return document, variables
+
+
+def split_batch_response(
+    operations: Sequence[GraphQLOperation],
+    data: Optional[Dict[str, Any]],
+    errors: Optional[List[Dict[str, Any]]],
+) -> List[GraphQLOperationResult]:
+    """Map a batched response back to per-operation results."""
+    data = data or {}
+    errors_by_alias: Dict[str, List[str]] = {}
+    unattributed = []
+    for error in errors or []:
+        path = error.get("path") or []
+        message = error.get("message", str(error))
+        if path and str(path[0]).startswith("op"):
+            errors_by_alias.setdefault(str(path[0]), []).append(message)
+        else:
+            unattributed.append(message)
+
+    results = []
+    for index, operation in enumerate(operations):
+        alias = f"op{index}"
+        alias_errors = errors_by_alias.get(alias, [])
+        value = data.get(alias)
+        if alias_errors or value is None:
+            message = "; ".join(alias_errors or unattributed) or "No data returned"
+            results.append(GraphQLOperationResult(key=operation.key, error=message))
+        else:
+            results.append(GraphQLOperationResult(key=operation.key, data=value))
+    return results
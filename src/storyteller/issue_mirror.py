@@ -0,0 +1,173 @@
+"""Local mirror of GitHub issues for configured repositories.
+
+The mirror is bootstrapped with one full listing per repository and then
+kept current with incremental ``since=`` syncs and the ``issues`` and
+``pull_request`` webhooks, so progress tracking and related-issue lookups
+become indexed local queries instead of paginating the GitHub API.
+"""
+
+import asyncio
+import logging
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from database import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+# Identifier-like tokens such as story_ab12cd34 or epic-42
+REFERENCE_PATTERN = re.compile(r"[A-Za-z0-9]+(?:[_-][A-Za-z0-9]+)+")
+
+
+def extract_references(*texts: Optional[str]) -> List[str]:
+    """Extract identifier-like tokens used to look up issues by story/epic ID."""
+    references = []
+    for text in texts:
+        references.extend(REFERENCE_PATTERN.findall(text or ""))
+    return list(dict.fromkeys(ref for ref in references if len(ref) <= 100))
+
+
+def _isoformat(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc).isoformat()
+    # Webhook payloads use "2024-01-01T00:00:00Z"
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00")).isoformat()
+
+
+def issue_record_from_github(issue) -> Dict[str, Any]:
+    """Build a mirror record from a PyGithub Issue."""
+    return {
+        "number": issue.number,
+        "title": issue.title,
+        "body": issue.body,
+        "state": issue.state,
+        "is_pull_request": issue.pull_request is not None,
+        "labels": [label.name for label in issue.labels],
+        "assignee": issue.assignee.login if issue.assignee else None,
+        "created_at": _isoformat(issue.created_at),
+        "updated_at": _isoformat(issue.updated_at),
+        "closed_at": _isoformat(issue.closed_at),
+        "references": extract_references(issue.title, issue.body),
+    }
+
+
+def issue_record_from_payload(
+    data: Dict[str, Any], is_pull_request: bool = False
+) -> Dict[str, Any]:
+    """Build a mirror record from an issue or pull_request webhook object."""
+    assignee = data.get("assignee") or {}
+    return {
+        "number": data["number"],
+        "title": data.get("title", ""),
+        "body": data.get("body"),
+        "state": data.get("state", "open"),
+        "is_pull_request": is_pull_request or "pull_request" in data,
+        "labels": [label.get("name") for label in data.get("labels", [])],
+        "assignee": assignee.get("login"),
+        "created_at": _isoformat(data.get("created_at"))
+        or datetime.now(timezone.utc).isoformat(),
+        "updated_at": _isoformat(data.get("updated_at"))
+        or datetime.now(timezone.utc).isoformat(),
+        "closed_at": _isoformat(data.get("closed_at")),
+        "references": extract_references(data.get("title"), data.get("body")),
+    }
+
+
+class IssueMirror:
+    """Keeps a local, queryable copy of GitHub issues per repository."""
+
+    def __init__(
+        self,
+        github_handler,
+        database: DatabaseManager,
+        max_age_seconds: int = 900,
+    ):
+        self.github_handler = github_handler
+        self.database = database
+        self.max_age_seconds = max_age_seconds
+        self._sync_locks: Dict[str, asyncio.Lock] = {}
+
+    async def sync_repository(self, repository_name: str) -> int:
+        """Fetch issues updated since the last sync (all issues on first sync)."""
+        state = self.database.get_issue_mirror_sync_state(repository_name)
+        since = None
+        if state and state.get("last_updated_at"):
+            since = datetime.fromisoformat(state["last_updated_at"])
+
+        def _fetch() -> List[Dict[str, Any]]:
+            repo = self.github_handler.get_repository(repository_name)
+            kwargs = {"state": "all", "sort": "updated", "direction": "asc"}
+            if since:
+                kwargs["since"] = since
+            return [
+                issue_record_from_github(issue) for issue in repo.get_issues(**kwargs)
+            ]
+
+        records = await self.github_handler._run_blocking(_fetch)
+        stored = self.database.upsert_mirrored_issues(repository_name, records)
+        last_updated = max((r["updated_at"] for r in records), default=None)
+        self.database.update_issue_mirror_sync_state(repository_name, last_updated)
+
+        logger.info(
+            f"Synced issue mirror for {repository_name}: {len(records)} fetched, "
+            f"{stored} stored ({'incremental' if since else 'full'})"
+        )
+        return stored
+
+    async def ensure_fresh(self, repository_name: str):
+        """Sync a repository unless it was synced within max_age_seconds."""
+        lock = self._sync_locks.setdefault(repository_name, asyncio.Lock())
+        async with lock:
+            state = self.database.get_issue_mirror_sync_state(repository_name)
+            if state:
+                synced_at = datetime.fromisoformat(state["synced_at"])
+                age = datetime.now(timezone.utc) - synced_at
+                if age < timedelta(seconds=self.max_age_seconds):
+                    return
+            await self.sync_repository(repository_name)
+
+    def apply_webhook(self, payload: Dict[str, Any]) -> bool:
+        """Update the mirror from an issues or pull_request webhook payload."""
+        repository_name = (payload.get("repository") or {}).get("full_name")
+        if not repository_name:
+            return False
+
+        if payload.get("issue"):
+            # Deleted and transferred issues no longer belong to the repository
+            if payload.get("action") in ("deleted", "transferred"):
+                return self.database.delete_mirrored_issue(
+                    repository_name, payload["issue"]["number"]
+                )
+            record = issue_record_from_payload(payload["issue"])
+        elif payload.get("pull_request"):
+            record = issue_record_from_payload(
+                payload["pull_request"], is_pull_request=True
+            )
+        else:
+            return False
+
+        return self.database.upsert_mirrored_issues(repository_name, [record]) > 0
+
+    def get_epic_issues(
+        self, repository_name: str, epic_id: str
+    ) -> List[Dict[str, Any]]:
+        """Get mirrored issues whose title or body references an epic."""
+        if REFERENCE_PATTERN.fullmatch(epic_id):
+            return self.database.get_mirrored_issues(repository_name, reference=epic_id)
+        return self.database.get_mirrored_issues(repository_name, text=epic_id)
+
+    def get_issues(
+        self,
+        repository_name: str,
+        state: Optional[str] = "open",
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get mirrored issues of a repository, newest first."""
+        return self.database.get_mirrored_issues(
+            repository_name, state=state, limit=limit
+        )
@@ -1,13 +1,20 @@
 """LLM Handler for AI Story Management System."""
 
 import asyncio
+import hashlib
+import json
 import logging
+import random
+import re
+import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import aiohttp
-from config import Config
+from config import Config, LLMReplayConfig
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +30,10 @@ class LLMResponse:
     metadata: Optional[Dict[str, Any]] = None
 
 
+class ReplayMissError(Exception):
+    """Raised in replay mode when no fixture was recorded for a request."""
+
+
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
 
@@ -73,6 +84,8 @@ class GitHubModelsProvider(LLMProvider):
             "temperature": kwargs.get("temperature", 0.7),
             "max_tokens": kwargs.get("max_tokens", 2000),
         }
+        if kwargs.get("json_mode"):
+            payload["response_format"] = {"type": "json_object"}
 
         headers = {
             "Authorization": f"Bearer {self.api_token}",
@@ -109,6 +122,9 @@ class GitHubModelsProvider(LLMProvider):
 class OpenAIProvider(LLMProvider):
     """OpenAI LLM provider implementation."""
 
+    # Models that reject response_format={"type": "json_object"}
+    JSON_MODE_UNSUPPORTED_MODELS = ("gpt-4", "gpt-4-0613", "gpt-4-0314")
+
     def __init__(self, api_key: str):
         self.api_key = api_key
         self.default_model = "gpt-4"
@@ -138,12 +154,17 @@ class OpenAIProvider(LLMProvider):
             messages.append({"role": "system", "content": system_prompt})
         messages.append({"role": "user", "content": prompt})
 
+        request_kwargs = {}
+        if kwargs.get("json_mode") and model not in self.JSON_MODE_UNSUPPORTED_MODELS:
+            request_kwargs["response_format"] = {"type": "json_object"}
+
         try:
             response = await client.chat.completions.create(
                 model=model,
                 messages=messages,
                 temperature=kwargs.get("temperature", 0.7),
                 max_tokens=kwargs.get("max_tokens", 2000),
+                **request_kwargs,
             )
 
             return LLMResponse(
@@ -191,6 +212,8 @@ class OllamaProvider(LLMProvider):
                 "num_predict": kwargs.get("max_tokens", 2000),
             },
         }
+        if kwargs.get("json_mode"):
+            payload["format"] = "json"
 
         async with aiohttp.ClientSession() as session:
             async with session.post(
@@ -217,6 +240,374 @@ class OllamaProvider(LLMProvider):
         return self.default_model
 
 
+class SyntheticResponseGenerator:
+    """Produces deterministic, schema-valid responses for known storyteller prompts.
+
+    Used by the replay provider so the story pipeline, discussions and
+    consensus flow can run end to end without a live model.
+    """
+
+    DEFAULT_ROLES = ["system-architect", "lead-developer"]
+
+    def __init__(self, seed: Optional[int] = None):
+        self.seed = seed
+
+    def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Generate a response matching the schema requested by the prompt."""
+
+        system_prompt = system_prompt or ""
+        rng = random.Random(f"{self.seed}:{system_prompt}:{prompt}")
+
+        if '"recommended_roles"' in system_prompt:
+            return json.dumps(self._story_content_analysis(system_prompt, rng))
+        if '"user_stories"' in system_prompt:
+            return json.dumps(self._epic_breakdown(system_prompt, prompt, rng))
+        if "department assignments" in system_prompt:
+            return json.dumps(self._department_assignments(system_prompt, rng))
+        if '"analyses"' in system_prompt:
+            return json.dumps(
+                {"analyses": self._role_entries(system_prompt, "analyses", rng)}
+            )
+        if '"perspectives"' in prompt:
+            return json.dumps(
+                {"perspectives": self._role_entries(prompt, "perspectives", rng)}
+            )
+
+        return self._free_text(rng)
+
+    def _story_content_analysis(
+        self, system_prompt: str, rng: random.Random
+    ) -> Dict[str, Any]:
+        roles_match = re.search(
+            r"Available expert roles include:(.*?)\n\n", system_prompt, re.DOTALL
+        )
+        roles = self.DEFAULT_ROLES
+        if roles_match:
+            candidates = [
+                r.strip(" .\n")
+                for r in roles_match.group(1).replace("\n", " ").split(",")
+            ]
+            candidates = [r for r in candidates if r and " " not in r]
+            if candidates:
+                roles = rng.sample(candidates, min(3, len(candidates)))
+
+        return {
+            "recommended_roles": roles,
+            "target_repositories": ["backend"],
+            "complexity": rng.choice(["low", "medium", "high"]),
+            "themes": ["synthetic"],
+            "reasoning": "Synthetic analysis generated for offline benchmarking",
+        }
+
+    def _epic_breakdown(
+        self, system_prompt: str, prompt: str, rng: random.Random
+    ) -> Dict[str, Any]:
+        count_match = re.search(r"create (\d+) focused", system_prompt)
+        count = int(count_match.group(1)) if count_match else 3
+
+        repos_match = re.search(r"target repositories: \[(.*?)\]", system_prompt)
+        repos = (
+            [r.strip(" '\"") for r in repos_match.group(1).split(",") if r.strip()]
+            if repos_match
+            else ["backend"]
+        )
+
+        title_match = re.search(r"Epic: (.+)", prompt)
+        epic_title = title_match.group(1).strip() if title_match else "the epic"
+
+        user_stories = []
+        for index in range(count):
+            user_stories.append(
+                {
+                    "title": f"{epic_title} - part {index + 1}",
+                    "description": (
+                        f"As a user, I want part {index + 1} of {epic_title} "
+                        "so that I get its business value."
+                    ),
+                    "user_persona": "user",
+                    "user_goal": f"use part {index + 1} of {epic_title}",
+                    "acceptance_criteria": [
+                        f"Criterion {n + 1} for part {index + 1}" for n in range(3)
+                    ],
+                    "target_repositories": repos[:2] or ["backend"],
+                    "story_points": rng.choice([1, 2, 3, 5, 8, 13]),
+                    "rationale": "Synthetic user story",
+                }
+            )
+
+        return {
+            "user_stories": user_stories,
+            "breakdown_rationale": "Synthetic breakdown generated for benchmarking",
+        }
+
+    def _department_assignments(
+        self, system_prompt: str, rng: random.Random
+    ) -> List[Dict[str, Any]]:
+        departments_match = re.search(
+            r"Available departments: \[(.*?)\]", system_prompt
+        )
+        departments = (
+            [
+                d.strip(" '\"")
+                for d in departments_match.group(1).split(",")
+                if d.strip()
+            ]
+            if departments_match
+            else ["backend"]
+        )
+
+        assignments = []
+        for index, department in enumerate(departments):
+            assignments.append(
+                {
+                    "department": department,
+                    "title": f"{department.title()} implementation",
+                    "description": f"Synthetic {department} work",
+                    "tasks": [f"{department} task {n + 1}" for n in range(3)],
+                    "dependencies": departments[:index][-1:],
+                    "target_repository": department,
+                    "estimated_hours": rng.choice([4, 8, 12, 16]),
+                    "technical_context": "Synthetic technical context",
+                }
+            )
+        return assignments
+
+    def _role_entries(
+        self, text: str, kind: str, rng: random.Random
+    ) -> List[Dict[str, Any]]:
+        roles_match = re.search(r'"role_name": "one of: (.*?)"', text)
+        roles = (
+            [r.strip() for r in roles_match.group(1).split(",") if r.strip()]
+            if roles_match
+            else []
+        )
+
+        entries = []
+        for role in roles:
+            if kind == "analyses":
+                entries.append(
+                    {
+                        "role_name": role,
+                        "analysis": f"Synthetic analysis from {role}.",
+                        "recommendations": [f"{role} recommends a small first step"],
+                        "concerns": [f"{role} is concerned about scope"],
+                    }
+                )
+            else:
+                entries.append(
+                    {
+                        "role_name": role,
+                        "viewpoint": f"Synthetic viewpoint from {role}.",
+                        "arguments": [f"{role} argument"],
+                        "concerns": [f"{role} concern"],
+                        "suggestions": [f"{role} suggestion"],
+                        "confidence_level": round(rng.uniform(0.6, 0.95), 2),
+                    }
+                )
+        return entries
+
+    def _free_text(self, rng: random.Random) -> str:
+        return "\n".join(
+            [
+                "Viewpoint:",
+                "This is a synthetic response generated for offline benchmarking.",
+                "Arguments:",
+                "- The story is well scoped",
+                "Concerns:",
+                "- Synthetic risk to consider",
+                "Suggestions:",
+                "- We recommend adding acceptance tests",
+                f"Confidence: {rng.uniform(0.6, 0.95):.2f}",
+            ]
+        )
+
+
+class ReplayProvider(LLMProvider):
+    """Record/replay LLM provider for deterministic offline runs.
+
+    Modes:
+        record: forward to an upstream provider and store each request/response
+        replay: serve stored responses (optionally synthetic on a miss)
+        synthetic: always generate schema-valid responses locally
+    """
+
+    MODES = ("record", "replay", "synthetic")
+    LATENCY_DISTRIBUTIONS = (
+        "none",
+        "fixed",
+        "uniform",
+        "normal",
+        "lognormal",
+        "recorded",
+    )
+
+    def __init__(
+        self,
+        mode: str = "replay",
+        fixtures_dir: Path = Path(".storyteller/llm_fixtures"),
+        upstream: Optional[LLMProvider] = None,
+        on_miss: str = "error",
+        latency_distribution: str = "none",
+        latency_params: Optional[List[float]] = None,
+        seed: Optional[int] = None,
+    ):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown replay mode '{mode}'. Use: {self.MODES}")
+        if latency_distribution not in self.LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown latency distribution '{latency_distribution}'. "
+                f"Use: {self.LATENCY_DISTRIBUTIONS}"
+            )
+        if mode == "record" and upstream is None:
+            raise ValueError("Record mode requires an upstream provider")
+
+        self.mode = mode
+        self.fixtures_dir = Path(fixtures_dir)
+        self.upstream = upstream
+        self.on_miss = on_miss
+        self.latency_distribution = latency_distribution
+        self.latency_params = list(latency_params or [])
+        self.default_model = "replay"
+        self.synthetic = SyntheticResponseGenerator(seed)
+        self._rng = random.Random(seed)
+        self.stats = {
+            "requests": 0,
+            "recorded": 0,
+            "replayed": 0,
+            "synthetic": 0,
+            "misses": 0,
+            "simulated_latency_seconds": 0.0,
+        }
+
+    @staticmethod
+    def fixture_key(prompt: str, system_prompt: Optional[str] = None) -> str:
+        """Compute the stable fixture key for a request."""
+        payload = json.dumps(
+            {"system_prompt": system_prompt or "", "prompt": prompt}, sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _fixture_path(self, key: str) -> Path:
+        return self.fixtures_dir / f"{key}.json"
+
+    def load_fixture(self, key: str) -> Optional[Dict[str, Any]]:
+        """Load a recorded fixture by key."""
+        path = self._fixture_path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable LLM fixture {path}: {e}")
+            return None
+
+    def save_fixture(self, key: str, fixture: Dict[str, Any]) -> None:
+        """Persist a recorded fixture."""
+        self.fixtures_dir.mkdir(parents=True, exist_ok=True)
+        with open(self._fixture_path(key), "w", encoding="utf-8") as f:
+            json.dump(fixture, f, indent=2, default=str)
+
+    def sample_latency(self, recorded: Optional[float] = None) -> float:
+        """Sample a simulated latency (seconds) from the configured distribution."""
+        params = self.latency_params
+        distribution = self.latency_distribution
+
+        if distribution == "none":
+            return 0.0
+        if distribution == "recorded":
+            return max(recorded or 0.0, 0.0)
+        if distribution == "fixed":
+            return max(params[0] if params else 0.0, 0.0)
+        if distribution == "uniform":
+            low, high = (params + [0.0, 1.0][len(params) :])[:2]
+            return max(self._rng.uniform(low, high), 0.0)
+        if distribution == "normal":
+            mean, stddev = (params + [1.0, 0.25][len(params) :])[:2]
+            return max(self._rng.gauss(mean, stddev), 0.0)
+        # lognormal: params are (mu, sigma) of the underlying normal
+        mu, sigma = (params + [0.0, 0.5][len(params) :])[:2]
+        return self._rng.lognormvariate(mu, sigma)
+
+    async def generate_response(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        model: Optional[str] = None,
+        **kwargs,
+    ) -> LLMResponse:
+        """Record, replay or synthesize a response depending on the mode."""
+
+        self.stats["requests"] += 1
+        key = self.fixture_key(prompt, system_prompt)
+
+        if self.mode == "record":
+            started = time.perf_counter()
+            response = await self.upstream.generate_response(
+                prompt=prompt, system_prompt=system_prompt, model=model, **kwargs
+            )
+            elapsed = time.perf_counter() - started
+
+            self.save_fixture(
+                key,
+                {
+                    "key": key,
+                    "request": {
+                        "prompt": prompt,
+                        "system_prompt": system_prompt,
+                        "model": model,
+                    },
+                    "response": {
+                        "content": response.content,
+                        "model": response.model,
+                        "provider": response.provider,
+                        "usage": response.usage,
+                    },
+                    "latency_seconds": elapsed,
+                    "recorded_at": datetime.now(timezone.utc).isoformat(),
+                },
+            )
+            self.stats["recorded"] += 1
+            return response
+
+        fixture = self.load_fixture(key) if self.mode == "replay" else None
+
+        if fixture is None and self.mode == "replay":
+            self.stats["misses"] += 1
+            if self.on_miss != "synthetic":
+                raise ReplayMissError(
+                    f"No recorded LLM fixture for request {key[:12]} "
+                    f"in {self.fixtures_dir}"
+                )
+
+        if fixture is not None:
+            content = fixture["response"]["content"]
+            usage = fixture["response"].get("usage")
+            recorded_latency = fixture.get("latency_seconds")
+            self.stats["replayed"] += 1
+        else:
+            content = self.synthetic.generate(prompt, system_prompt)
+            usage = None
+            recorded_latency = None
+            self.stats["synthetic"] += 1
+
+        delay = self.sample_latency(recorded_latency)
+        if delay > 0:
+            self.stats["simulated_latency_seconds"] += delay
+            await asyncio.sleep(delay)
+
+        return LLMResponse(
+            content=content,
+            model=model or self.default_model,
+            provider="replay",
+            usage=usage,
+            metadata={"replay_key": key, "simulated_latency": delay},
+        )
+
+    def get_default_model(self) -> str:
+        return self.default_model
+
+
 class LLMHandler:
     """Main handler for LLM interactions."""
 
@@ -239,6 +630,30 @@ class LLMHandler:
         # Ollama
         self.providers["ollama"] = OllamaProvider(self.config.ollama_api_host)
 
+        # Record/replay (offline benchmarking and deterministic runs)
+        replay_config = getattr(self.config, "llm_replay", None)
+        if isinstance(replay_config, LLMReplayConfig) and replay_config.mode:
+            upstream = None
+            if replay_config.mode == "record":
+                upstream_name = replay_config.upstream_provider or (
+                    self.config.default_llm_provider
+                )
+                upstream = self.providers.get(upstream_name)
+                if upstream is None:
+                    raise ValueError(
+                        f"Replay upstream provider '{upstream_name}' not available"
+                    )
+
+            self.providers["replay"] = ReplayProvider(
+                mode=replay_config.mode,
+                fixtures_dir=replay_config.fixtures_dir,
+                upstream=upstream,
+                on_miss=replay_config.on_miss,
+                latency_distribution=replay_config.latency_distribution,
+                latency_params=replay_config.latency_params,
+                seed=replay_config.seed,
+            )
+
         if not self.providers:
             raise ValueError("No LLM providers available. Check your configuration.")
 
@@ -271,6 +686,9 @@ class LLMHandler:
             return await llm_provider.generate_response(
                 prompt=prompt, system_prompt=system_prompt, model=model, **kwargs
             )
+        except ReplayMissError:
+            # A missing fixture stays missing; retrying only adds backoff
+            raise
         except Exception as e:
             if retry_count < self.config.max_retries:
                 logger.warning(f"LLM request failed (attempt {retry_count + 1}): {e}")
@@ -319,6 +737,59 @@ Be concise but thorough in your analysis. Focus on aspects most relevant to your
 
         return await self.generate_response(prompt=prompt, system_prompt=system_prompt)
 
+    async def analyze_story_with_roles(
+        self,
+        story_content: str,
+        role_definitions: Dict[str, str],
+        context: Optional[Dict[str, Any]] = None,
+    ) -> LLMResponse:
+        """Analyze a story from several expert role perspectives in one request.
+
+        The story and context are sent once; the model answers with one JSON
+        object per role so the caller can validate each analysis separately.
+        """
+
+        roles_text = "\n\n".join(
+            f"=== {role_name} ===\n{definition}"
+            for role_name, definition in role_definitions.items()
+        )
+
+        system_prompt = f"""You are a panel of expert roles analyzing a user story for the Recipe Authority Platform.
+
+Role Definitions:
+{roles_text}
+
+For EACH role above, analyze the provided user story strictly from that role's expert perspective and provide:
+1. Analysis of the story from the role's domain expertise
+2. Specific recommendations or considerations
+3. Potential risks or issues the role foresees
+
+Respond with a JSON object only, containing exactly one entry per role:
+{{
+  "analyses": [
+    {{
+      "role_name": "one of: {', '.join(role_definitions)}",
+      "analysis": "concise but thorough analysis text",
+      "recommendations": ["recommendation 1", "recommendation 2"],
+      "concerns": ["concern 1", "concern 2"]
+    }}
+  ]
+}}"""
+
+        prompt = f"""User Story to Analyze:
+{story_content}"""
+
+        if context:
+            prompt += f"\n\nAdditional Context:\n{context}"
+
+        return await self.generate_response(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            # Leave room for one full analysis per role in the single reply
+            max_tokens=1000 * (len(role_definitions) + 1),
+            json_mode=True,
+        )
+
     async def synthesize_expert_analyses(
         self,
         story_content: str,
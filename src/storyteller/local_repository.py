@@ -0,0 +1,205 @@
+"""Read repository files from a local checkout or bare mirror.
+
+Self-hosted runners usually have the repositories checked out already. A
+repository configured with a ``local_path`` is listed with ``git ls-tree``
+and read from the working tree (large files through mmap) or, for bare
+mirrors and other refs, with one ``git cat-file --batch`` process, so no
+GitHub API calls are made. Directories that are not git repositories are
+walked on the filesystem instead.
+"""
+
+import logging
+import mmap
+import os
+import subprocess
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class LocalRepository:
+    """A repository read from the local filesystem or a git mirror.
+
+    Args:
+        path: Working tree, bare mirror or plain directory
+        ref: Ref to read from git repositories
+        fetch_after_seconds: Run ``git fetch`` before reading when the last
+            fetch is older than this (None or 0: never fetch)
+    """
+
+    # Files at least this large are read through mmap
+    MMAP_THRESHOLD_BYTES = 64 * 1024
+
+    def __init__(
+        self,
+        path: os.PathLike,
+        ref: str = "HEAD",
+        fetch_after_seconds: Optional[int] = None,
+    ):
+        self.path = Path(path).expanduser()
+        self.ref = ref
+        self.fetch_after_seconds = fetch_after_seconds
+        self.git_dir = self._find_git_dir()
+
+    def _find_git_dir(self) -> Optional[Path]:
+        if (self.path / ".git").exists():
+            return self.path / ".git"
+        if (self.path / "HEAD").is_file() and (self.path / "objects").is_dir():
+            return self.path  # bare mirror
+        return None
+
+    @property
+    def is_bare(self) -> bool:
+        return self.git_dir is not None and self.git_dir == self.path
+
+    def _git(self, *args: str) -> str:
+        return subprocess.run(
+            ["git", "-C", str(self.path), *args],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+
+    def refresh_if_stale(self) -> bool:
+        """Fetch from the remote when the last fetch is older than the threshold.
+
+        Returns:
+            True if a fetch ran and succeeded
+        """
+        if not self.git_dir or not self.fetch_after_seconds:
+            return False
+        marker = self.git_dir / "FETCH_HEAD"
+        last_fetch = (marker if marker.exists() else self.git_dir).stat().st_mtime
+        if time.time() - last_fetch < self.fetch_after_seconds:
+            return False
+        try:
+            self._git("fetch", "--prune", "--quiet")
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.warning(f"git fetch failed in {self.path}, using local state: {e}")
+            return False
+        # Mirrors do not write FETCH_HEAD when nothing changed
+        marker.touch()
+        return True
+
+    def get_default_branch(self) -> Optional[str]:
+        """Branch HEAD points to, if any."""
+        if not self.git_dir:
+            return None
+        try:
+            return self._git("symbolic-ref", "--short", "HEAD").strip() or None
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def get_head_commit(self) -> Optional[str]:
+        """Commit SHA the ref points to, if this is a git repository."""
+        if not self.git_dir:
+            return None
+        try:
+            return self._git("rev-parse", "--verify", f"{self.ref}^{{commit}}").strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def list_files(self) -> List[Tuple[str, Optional[int]]]:
+        """List (path, size) of every file, in git tree order."""
+        if not self.git_dir:
+            return self._walk_files()
+
+        output = self._git("ls-tree", "-r", "-l", "-z", "--full-tree", self.ref)
+        files = []
+        for record in output.split("\0"):
+            if not record:
+                continue
+            meta, _, path = record.partition("\t")
+            _, entry_type, _, size = meta.split()
+            if entry_type == "blob":
+                files.append((path, int(size) if size.isdigit() else None))
+        return files
+
+    def _walk_files(self) -> List[Tuple[str, Optional[int]]]:
+        files = []
+        for root, directories, names in os.walk(self.path):
+            directories[:] = sorted(d for d in directories if d != ".git")
+            for name in names:
+                file_path = Path(root) / name
+                if file_path.is_file():
+                    files.append(
+                        (
+                            file_path.relative_to(self.path).as_posix(),
+                            file_path.stat().st_size,
+                        )
+                    )
+        return sorted(files)
+
+    def read_files(
+        self, paths: List[str], max_bytes: Optional[int] = None
+    ) -> Dict[str, Optional[str]]:
+        """Read UTF-8 text of files, capped at max_bytes.
+
+        Returns:
+            Mapping of path to content; None for missing or binary files
+        """
+        if self.git_dir and (self.is_bare or self.ref != "HEAD"):
+            return self._cat_files(paths, max_bytes)
+        return {path: self._read_file(path, max_bytes) for path in paths}
+
+    def _read_file(self, path: str, max_bytes: Optional[int]) -> Optional[str]:
+        file_path = self.path / path
+        try:
+            size = file_path.stat().st_size
+            with open(file_path, "rb") as handle:
+                if size >= self.MMAP_THRESHOLD_BYTES:
+                    with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                        raw = m[: max_bytes if max_bytes is not None else size]
+                else:
+                    raw = handle.read() if max_bytes is None else handle.read(max_bytes)
+        except (OSError, ValueError):
+            return None
+        return _decode_text(raw, truncated=max_bytes is not None and size > max_bytes)
+
+    def _cat_files(
+        self, paths: List[str], max_bytes: Optional[int]
+    ) -> Dict[str, Optional[str]]:
+        contents: Dict[str, Optional[str]] = {}
+        process = subprocess.Popen(
+            ["git", "-C", str(self.path), "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        try:
+            for path in paths:
+                process.stdin.write(f"{self.ref}:{path}\n".encode("utf-8"))
+                process.stdin.flush()
+                header = process.stdout.readline().split()
+                if len(header) != 3 or header[1] != b"blob":
+                    contents[path] = None
+                    continue
+                size = int(header[2])
+                keep = size if max_bytes is None else min(size, max_bytes)
+                raw = process.stdout.read(keep)
+                # Skip the rest of the blob and its trailing newline
+                remaining = size - keep + 1
+                while remaining:
+                    skipped = process.stdout.read(min(remaining, 1 << 20))
+                    if not skipped:
+                        break
+                    remaining -= len(skipped)
+                contents[path] = _decode_text(raw, truncated=keep < size)
+        finally:
+            process.stdin.close()
+            process.wait()
+        return contents
+
+
+def _decode_text(raw: bytes, truncated: bool = False) -> Optional[str]:
+    """Decode UTF-8 text; None for binary content."""
+    if b"\0" in raw[:8000]:
+        return None
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off by truncation is dropped
+        if truncated and e.reason == "unexpected end of data":
+            return raw[: e.start].decode("utf-8")
+        return None
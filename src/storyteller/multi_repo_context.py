@@ -1,16 +1,59 @@
 """Multi-repository code context reading and intelligence."""
 
 import asyncio
+import copy
 import logging
+import time
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-from config import Config, get_config
+from api_index import (
+    API_SOURCE_EXTENSIONS,
+    EXTRACTOR_VERSION,
+    APIEndpointMap,
+    APISymbol,
+    extract_api_symbols,
+    is_api_source,
+)
+from config import (
+    APIIndexConfig,
+    Config,
+    ContextStoreConfig,
+    StoryContextConfig,
+    get_config,
+)
+from context_ranking import (
+    ChunkIndex,
+    ContentChunk,
+    is_rankable,
+    normalize_scores,
+    pack_chunks,
+)
+from context_store import RepositoryContextStore
 from github_handler import GitHubHandler
+from github_scheduler import request_priority
+from local_repository import LocalRepository
+from path_scan import PathScan, basename_regex
+from single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+# Files considered when selecting the key files of a repository context
+CONTEXT_FILE_EXTENSIONS = [
+    ".py",
+    ".js",
+    ".jsx",
+    ".ts",
+    ".tsx",
+    ".java",
+    ".go",
+    ".md",
+    ".json",
+    ".yml",
+    ".yaml",
+]
+
 
 @dataclass
 class FileContext:
@@ -141,10 +184,14 @@ class RepositoryTypeDetector:
     }
 
     def detect_repository_type(
-        self, structure: Dict[str, Any], files: List[str]
+        self,
+        structure: Dict[str, Any],
+        files: List[str],
+        scan: Optional[PathScan] = None,
     ) -> str:
         """Detect repository type based on file structure and contents."""
 
+        scan = scan or PathScan(files)
         scores = {}
 
         # Score based on file patterns
@@ -153,15 +200,15 @@ class RepositoryTypeDetector:
             for pattern in patterns:
                 if pattern.endswith("/"):
                     # Directory pattern
-                    if any(pattern.rstrip("/") in f for f in files):
+                    if scan.any_contains(pattern.rstrip("/")):
                         score += 2
                 elif "." in pattern:
                     # File extension pattern
-                    if any(f.endswith(pattern) for f in files):
+                    if scan.any_endswith(pattern):
                         score += 1
                 else:
                     # Specific file pattern
-                    if any(pattern in f for f in files):
+                    if scan.any_contains(pattern):
                         score += 3
 
             scores[repo_type] = score
@@ -172,25 +219,39 @@ class RepositoryTypeDetector:
 
         return "unknown"
 
-    def detect_languages(self, files: List[str]) -> Dict[str, int]:
+    def detect_languages(
+        self, files: List[str], scan: Optional[PathScan] = None
+    ) -> Dict[str, int]:
         """Detect programming languages used in the repository."""
 
-        language_counts = {}
-
-        for file_path in files:
-            for language, patterns in self.LANGUAGE_PATTERNS.items():
-                for pattern in patterns:
-                    if file_path.endswith(pattern) or pattern in file_path:
-                        language_counts[language] = language_counts.get(language, 0) + 1
-                        break
+        scan = scan or PathScan(files)
 
-        return language_counts
+        # A file counts once for each language with a pattern it contains
+        language_files = {}
+        for language, patterns in self.LANGUAGE_PATTERNS.items():
+            matched = set()
+            for pattern in patterns:
+                matched.update(scan.containing(pattern))
+            if matched:
+                language_files[language] = matched
+
+        # Languages in the order their first file is listed
+        return {
+            language: len(matched)
+            for language, matched in sorted(
+                language_files.items(), key=lambda item: min(item[1])
+            )
+        }
 
     def detect_frameworks(
-        self, files: List[str], file_contents: Dict[str, str]
+        self,
+        files: List[str],
+        file_contents: Dict[str, str],
+        scan: Optional[PathScan] = None,
     ) -> List[str]:
         """Detect frameworks used in the repository."""
 
+        scan = scan or PathScan(files)
         frameworks = []
 
         for framework, patterns in self.FRAMEWORK_PATTERNS.items():
@@ -199,7 +260,7 @@ class RepositoryTypeDetector:
                     # Check package.json contents
                     if framework in file_contents[pattern].lower():
                         frameworks.append(framework)
-                elif any(pattern in f for f in files):
+                elif scan.any_contains(pattern):
                     frameworks.append(framework)
                     break
 
@@ -269,71 +330,80 @@ class IntelligentFileSelector:
         "devops": [".yml", ".yaml", ".json", ".toml", ".sh", ".ps1"],
     }
 
+    # Files scored highest whatever the repository type
+    KEY_FILE_NAMES = basename_regex(
+        ["readme.md", "package.json", "requirements.txt", "dockerfile"]
+    )
+
     def select_important_files(
-        self, repo_type: str, files: List[Tuple[str, str]], max_files: int = 20
+        self,
+        repo_type: str,
+        files: List[Tuple[str, str]],
+        max_files: int = 20,
+        scan: Optional[PathScan] = None,
     ) -> List[str]:
-        """Select the most important files for context based on repository type."""
+        """Select the most important files for context based on repository type.
+
+        Scores are computed for all files at once from the pattern matches
+        of a PathScan of the listed paths (which may be shared with the type
+        detector) rather than by testing every pattern against every file.
+        """
 
         important_patterns = self.IMPORTANT_FILES.get(repo_type, [])
         important_extensions = self.IMPORTANT_EXTENSIONS.get(repo_type, [])
 
-        scored_files = []
+        paths = [file_path for file_path, _ in files]
+        scan = scan or PathScan(paths)
+        scores = scan.zeros()
 
-        for file_path, file_type in files:
-            if file_type != "file":
-                continue
+        # Score based on important file patterns
+        for pattern in important_patterns:
+            scan.add(scores, scan.containing(pattern), 10)
 
-            score = 0
+        # Score based on important extensions
+        for ext in important_extensions:
+            scan.add(scores, scan.ending_with(ext), 5)
+
+        # Boost score for root-level files
+        root = [index for index, path in enumerate(paths) if "/" not in path.strip("/")]
+        scan.add(scores, root, 3)
+
+        # Reduce score for deep nested files
+        depths = scan.depths()
+        deep = [index for index, depth in enumerate(depths) if depth > 3]
+        scan.add(scores, deep, [-depths[index] for index in deep])
 
-            # Score based on important file patterns
-            for pattern in important_patterns:
-                if pattern in file_path:
-                    score += 10
-                elif file_path.endswith(pattern):
-                    score += 8
-
-            # Score based on important extensions
-            for ext in important_extensions:
-                if file_path.endswith(ext):
-                    score += 5
-
-            # Boost score for root-level files
-            if "/" not in file_path.strip("/"):
-                score += 3
-
-            # Reduce score for deep nested files
-            depth = file_path.count("/")
-            if depth > 3:
-                score -= depth
-
-            # Boost score for common important files
-            filename = Path(file_path).name.lower()
-            if filename in [
-                "readme.md",
-                "package.json",
-                "requirements.txt",
-                "dockerfile",
-            ]:
-                score += 15
-
-            if score > 0:
-                scored_files.append((file_path, score))
+        # Boost score for common important files
+        scan.add(scores, scan.matching(self.KEY_FILE_NAMES), 15)
 
         # Sort by score and return top files
-        scored_files.sort(key=lambda x: x[1], reverse=True)
-        return [f[0] for f in scored_files[:max_files]]
+        candidates = [file_type == "file" for _, file_type in files]
+        return [paths[index] for index in scan.top(scores, candidates, max_files)]
 
 
 class ContextCache:
-    """Simple in-memory cache for repository contexts."""
+    """Simple in-memory cache for repository contexts.
 
-    def __init__(self, max_size: int = 100):
+    With ttl_seconds, items expire that many seconds after they were set.
+    """
+
+    def __init__(self, max_size: int = 100, ttl_seconds: Optional[float] = None):
         self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
         self._cache: Dict[str, Any] = {}
+        self._stored_at: Dict[str, float] = {}
         self._access_order: List[str] = []
 
     def get(self, key: str) -> Optional[Any]:
         """Get item from cache."""
+        if (
+            key in self._cache
+            and self.ttl_seconds is not None
+            and time.monotonic() - self._stored_at[key] >= self.ttl_seconds
+        ):
+            self._access_order.remove(key)
+            del self._cache[key]
+            del self._stored_at[key]
         if key in self._cache:
             # Move to end (most recently used)
             self._access_order.remove(key)
@@ -350,13 +420,16 @@ class ContextCache:
             # Remove least recently used item
             oldest = self._access_order.pop(0)
             del self._cache[oldest]
+            del self._stored_at[oldest]
 
         self._cache[key] = value
+        self._stored_at[key] = time.monotonic()
         self._access_order.append(key)
 
     def clear(self) -> None:
         """Clear cache."""
         self._cache.clear()
+        self._stored_at.clear()
         self._access_order.clear()
 
 
@@ -368,19 +441,85 @@ class MultiRepositoryContextReader:
         self.github_handler = GitHubHandler(self.config)
         self.type_detector = RepositoryTypeDetector()
         self.file_selector = IntelligentFileSelector()
-        self.cache = ContextCache()
+
+        # Optional disk-backed store of snapshots per commit and contents per
+        # blob SHA; contexts then survive restarts, and rebuilding one after
+        # the branch moved fetches only the files that changed
+        self.context_store: Optional[RepositoryContextStore] = None
+        store_config = getattr(self.config, "context_store", None)
+        if isinstance(store_config, ContextStoreConfig) and store_config.enabled:
+            try:
+                self.context_store = RepositoryContextStore(
+                    store_config.path,
+                    max_size_bytes=store_config.max_size_mb * 1024 * 1024,
+                )
+            except Exception as e:
+                logger.warning(f"Failed to open repository context store: {e}")
+
+        api_index_config = getattr(self.config, "api_index", None)
+        self.api_index_config = (
+            api_index_config
+            if isinstance(api_index_config, APIIndexConfig)
+            else APIIndexConfig()
+        )
+
+        story_context_config = getattr(self.config, "story_context", None)
+        self.story_context_config = (
+            story_context_config
+            if isinstance(story_context_config, StoryContextConfig)
+            else StoryContextConfig()
+        )
+        # BM25 index of the latest commit seen per repository
+        self._chunk_indexes: Dict[str, Tuple[str, ChunkIndex]] = {}
+
+        # Repositories with a local_path are read from disk, without API calls
+        self._local_repositories: Dict[str, LocalRepository] = {}
+
+        # Built contexts are kept in memory; with the store they expire so
+        # the branch head is checked again every refresh_seconds
+        self.cache = ContextCache(
+            ttl_seconds=store_config.refresh_seconds if self.context_store else None
+        )
+        # Concurrent requests for the same context share one scan
+        self._single_flight = SingleFlight()
+        # Chunk indexes are read-only once built, so joiners share one index
+        self._index_flight = SingleFlight(copy_result=None)
 
     async def get_repository_context(
         self, repository_key: str, max_files: int = 20, use_cache: bool = True
     ) -> Optional[RepositoryContext]:
-        """Get context for a single repository."""
+        """Get context for a single repository.
+
+        Callers get their own copy, so a context can be modified freely
+        without affecting the cache or concurrent callers.
+        """
 
         cache_key = f"repo_context_{repository_key}_{max_files}"
+        if use_cache and self._get_local_repository(repository_key):
+            # Local checkouts are read in milliseconds; always reflect their
+            # current state
+            use_cache = False
         if use_cache:
             cached = self.cache.get(cache_key)
             if cached:
                 logger.debug(f"Using cached context for {repository_key}")
-                return cached
+                return copy.deepcopy(cached)
+
+        # Context scans are bulk reads; run them in the background lane so
+        # webhook-driven requests keep their share of the rate limit
+        with request_priority("background"):
+            if not use_cache:
+                return await self._build_repository_context(repository_key, max_files)
+            return await self._single_flight.run(
+                cache_key,
+                lambda: self._build_repository_context(
+                    repository_key, max_files, cache_key
+                ),
+            )
+
+    async def _build_repository_context(
+        self, repository_key: str, max_files: int, cache_key: Optional[str] = None
+    ) -> Optional[RepositoryContext]:
 
         repo_config = self.config.repositories.get(repository_key)
         if not repo_config:
@@ -388,57 +527,90 @@ class MultiRepositoryContextReader:
             return None
 
         try:
-            # Get repository structure
-            structure = await self.github_handler.get_repository_structure(
-                repo_config.name
-            )
+            snapshot = None
+            local_files = None
+            local_repository = self._get_local_repository(repository_key)
+            if local_repository:
+                try:
+                    structure, local_files = await asyncio.to_thread(
+                        self._scan_local_repository, repo_config.name, local_repository
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"Failed to read {repo_config.name} from "
+                        f"{local_repository.path}, using the GitHub API: {e}"
+                    )
+                    local_repository = None
+
+            if local_repository:
+                files = [
+                    (path, "file")
+                    for path, _ in local_files
+                    if path.endswith(tuple(CONTEXT_FILE_EXTENSIONS))
+                ]
+            elif self.context_store:
+                # Structure and listing of the branch head, from the store
+                # unless the head moved
+                snapshot = await self._load_snapshot(repo_config.name)
+                structure = snapshot["structure"]
+                files = [
+                    (path, "file")
+                    for path in snapshot["files"]
+                    if path.endswith(tuple(CONTEXT_FILE_EXTENSIONS))
+                ]
+            else:
+                # Get repository structure
+                structure = await self.github_handler.get_repository_structure(
+                    repo_config.name
+                )
 
-            if "error" in structure:
-                error_msg = structure["error"]
-                logger.error(
-                    f"Failed to get structure for {repo_config.name}: {error_msg}"
+                if "error" in structure:
+                    error_msg = structure["error"]
+                    logger.error(
+                        f"Failed to get structure for {repo_config.name}: {error_msg}"
+                    )
+                    return None
+
+                # List repository files
+                files = await self.github_handler.list_repository_files(
+                    repo_config.name,
+                    recursive=True,
+                    file_extensions=CONTEXT_FILE_EXTENSIONS,
                 )
-                return None
-
-            # List repository files
-            files = await self.github_handler.list_repository_files(
-                repo_config.name,
-                recursive=True,
-                file_extensions=[
-                    ".py",
-                    ".js",
-                    ".jsx",
-                    ".ts",
-                    ".tsx",
-                    ".java",
-                    ".go",
-                    ".md",
-                    ".json",
-                    ".yml",
-                    ".yaml",
-                ],
-            )
 
             # Detect repository type and languages
+            # (one scan of the paths serves the detectors and the selector)
             file_paths = [f[0] for f in files]
+            scan = PathScan(file_paths)
             detected_type = self.type_detector.detect_repository_type(
-                structure, file_paths
+                structure, file_paths, scan
             )
-            detected_languages = self.type_detector.detect_languages(file_paths)
+            detected_languages = self.type_detector.detect_languages(file_paths, scan)
 
             # Select important files
             important_files = self.file_selector.select_important_files(
-                detected_type, files, max_files
+                detected_type, files, max_files, scan
             )
 
-            # Read content of important files
-            key_file_contexts = []
-            for file_path in important_files[
-                :max_files
-            ]:  # Limit to prevent API rate limiting
-                content = await self.github_handler.get_file_content(
-                    repo_config.name, file_path
+            # Read content of important files in batched round trips
+            selected_files = important_files[:max_files]
+            if local_repository:
+                contents = await asyncio.to_thread(
+                    local_repository.read_files,
+                    selected_files,
+                    self.github_handler.MAX_FILE_CONTENT_BYTES,
                 )
+            elif snapshot:
+                contents = await self._read_snapshot_files(
+                    repo_config.name, snapshot["files"], selected_files
+                )
+            else:
+                contents = await self.github_handler.get_file_contents(
+                    repo_config.name, selected_files
+                )
+            key_file_contexts = []
+            for file_path in selected_files:
+                content = contents.get(file_path)
                 if content:
                     file_context = FileContext(
                         repository=repo_config.name,
@@ -466,8 +638,8 @@ class MultiRepositoryContextReader:
             )
 
             # Cache the result
-            if use_cache:
-                self.cache.set(cache_key, repo_context)
+            if cache_key:
+                self.cache.set(cache_key, copy.deepcopy(repo_context))
 
             logger.info(
                 f"Generated context for {repository_key}: "
@@ -479,6 +651,344 @@ class MultiRepositoryContextReader:
             logger.error(f"Error getting repository context for {repository_key}: {e}")
             return None
 
+    def _get_local_repository(self, repository_key: str) -> Optional[LocalRepository]:
+        """The local checkout or mirror configured for a repository, if any."""
+        repo_config = self.config.repositories.get(repository_key)
+        local_path = getattr(repo_config, "local_path", None)
+        if not isinstance(local_path, str) or not local_path:
+            return None
+        if repository_key not in self._local_repositories:
+            self._local_repositories[repository_key] = LocalRepository(
+                local_path,
+                ref=repo_config.local_ref,
+                fetch_after_seconds=repo_config.local_fetch_after_seconds,
+            )
+        return self._local_repositories[repository_key]
+
+    def _scan_local_repository(
+        self, repository_name: str, local_repository: LocalRepository
+    ) -> Tuple[Dict[str, Any], List[Tuple[str, Optional[int]]]]:
+        """Structure summary and file listing of a local repository.
+
+        The summary has the shape of GitHubHandler.get_repository_structure;
+        languages are estimated from file extensions and sizes.
+        """
+        local_repository.refresh_if_stale()
+        files = local_repository.list_files()
+
+        languages: Dict[str, int] = {}
+        for path, size in files:
+            language = self._detect_file_language(path)
+            if language:
+                languages[language] = languages.get(language, 0) + (size or 0)
+
+        structure = {
+            "name": repository_name,
+            "default_branch": local_repository.get_default_branch(),
+            "language": max(languages, key=languages.get) if languages else None,
+            "languages": languages,
+            "key_files": [],
+            "directories": [],
+            "file_count": 0,
+            "total_size": 0,
+        }
+        directories = sorted(
+            {path.split("/", 1)[0] for path, _ in files if "/" in path}
+        )
+        self.github_handler.summarize_root_entries(
+            structure,
+            [(directory, "tree", None) for directory in directories]
+            + [(path, "blob", size) for path, size in files if "/" not in path],
+        )
+        return structure, files
+
+    async def _load_snapshot(self, repository_name: str) -> Dict[str, Any]:
+        """Structure and file listing (path -> blob SHA) at the branch head.
+
+        Costs one request while the head is unchanged, and one more for the
+        tree listing of a new head.
+        """
+        commit_sha, tree_sha = await self.github_handler.get_head_commit(
+            repository_name
+        )
+        snapshot = self.context_store.get_snapshot(repository_name, commit_sha)
+        if snapshot:
+            return snapshot
+
+        # Language statistics barely move between commits; they are carried
+        # over from the previous snapshot instead of being fetched again
+        previous = self.context_store.get_latest_snapshot(repository_name)
+        structure, files = await self.github_handler.get_tree_snapshot(
+            repository_name,
+            tree_sha,
+            languages=previous["structure"]["languages"] if previous else None,
+        )
+        if previous:
+            changed = sum(
+                1 for path, sha in files.items() if previous["files"].get(path) != sha
+            )
+            logger.info(
+                f"{repository_name} moved from {previous['commit_sha'][:7]} to "
+                f"{commit_sha[:7]}: {changed} files added or changed"
+            )
+
+        self.context_store.put_snapshot(
+            repository_name, commit_sha, tree_sha, structure, files
+        )
+        return {
+            "commit_sha": commit_sha,
+            "tree_sha": tree_sha,
+            "structure": structure,
+            "files": files,
+        }
+
+    async def _read_snapshot_files(
+        self, repository_name: str, files: Dict[str, str], paths: List[str]
+    ) -> Dict[str, Optional[str]]:
+        """Contents of files of a snapshot; only blobs not stored are fetched."""
+        blob_shas = {path: files[path] for path in paths if path in files}
+        contents = self.context_store.get_blobs(blob_shas.values())
+        missing = [sha for sha in blob_shas.values() if sha not in contents]
+        if missing:
+            fetched = await self.github_handler.get_blobs(repository_name, missing)
+            self.context_store.put_blobs(fetched)
+            contents.update(fetched)
+        return {path: contents.get(sha) for path, sha in blob_shas.items()}
+
+    async def get_api_endpoints(
+        self, repository_keys: Optional[List[str]] = None
+    ) -> APIEndpointMap:
+        """Map of the API routes of repositories joined with the calls to them.
+
+        Symbols are extracted from source files once per blob SHA when the
+        context store is enabled, so only files changed by new commits are
+        fetched and scanned again.
+        """
+        if repository_keys is None:
+            repository_keys = list(self.config.repositories.keys())
+
+        with request_priority("background"):
+            results = await asyncio.gather(
+                *(self._get_api_symbols(key) for key in repository_keys),
+                return_exceptions=True,
+            )
+
+        symbols: List[APISymbol] = []
+        for repository_key, result in zip(repository_keys, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Failed to index API of {repository_key}: {result}")
+                continue
+            symbols.extend(result)
+        return APIEndpointMap(symbols)
+
+    async def _get_api_symbols(self, repository_key: str) -> List[APISymbol]:
+        """Routes, handlers and HTTP calls declared in a repository."""
+        repo_config = self.config.repositories.get(repository_key)
+        if not repo_config:
+            logger.warning(f"Repository configuration not found: {repository_key}")
+            return []
+
+        local_repository = self._get_local_repository(repository_key)
+        if local_repository:
+            symbols = await asyncio.to_thread(
+                self._extract_local_api_symbols, local_repository
+            )
+        else:
+            cache_key = f"api_symbols_{repository_key}"
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return list(cached)
+            if self.context_store:
+                symbols = await self._extract_snapshot_api_symbols(repo_config.name)
+            else:
+                files = await self.github_handler.list_repository_files(
+                    repo_config.name,
+                    recursive=True,
+                    file_extensions=API_SOURCE_EXTENSIONS,
+                )
+                paths = self._api_source_paths([path for path, _ in files])
+                contents = await self.github_handler.get_file_contents(
+                    repo_config.name, paths
+                )
+                symbols = [
+                    symbol
+                    for path in paths
+                    for symbol in extract_api_symbols(path, contents.get(path))
+                ]
+            self.cache.set(cache_key, symbols)
+
+        for symbol in symbols:
+            symbol.repository = repo_config.name
+        return list(symbols)
+
+    def _api_source_paths(self, paths: List[str]) -> List[str]:
+        """Source files to index, up to the configured maximum."""
+        paths = [path for path in paths if is_api_source(path)]
+        max_files = self.api_index_config.max_files
+        if len(paths) > max_files:
+            logger.warning(
+                f"Indexing the API of {max_files} of {len(paths)} source files"
+            )
+        return paths[:max_files]
+
+    def _extract_local_api_symbols(
+        self, local_repository: LocalRepository
+    ) -> List[APISymbol]:
+        local_repository.refresh_if_stale()
+        paths = self._api_source_paths(
+            [path for path, _ in local_repository.list_files()]
+        )
+        contents = local_repository.read_files(
+            paths, self.github_handler.MAX_FILE_CONTENT_BYTES
+        )
+        return [
+            symbol
+            for path in paths
+            for symbol in extract_api_symbols(path, contents.get(path))
+        ]
+
+    async def _extract_snapshot_api_symbols(
+        self, repository_name: str
+    ) -> List[APISymbol]:
+        """Symbols of the branch head; only blobs not indexed yet are fetched."""
+        snapshot = await self._load_snapshot(repository_name)
+        blob_shas = {
+            path: snapshot["files"][path]
+            for path in self._api_source_paths(list(snapshot["files"]))
+        }
+        stored = self.context_store.get_symbols(blob_shas.values(), EXTRACTOR_VERSION)
+        missing = {sha: path for path, sha in blob_shas.items() if sha not in stored}
+        if missing:
+            # Contents are not kept; once extracted, the symbols are enough
+            contents = await self.github_handler.get_blobs(
+                repository_name, list(missing)
+            )
+            extracted = {
+                sha: [
+                    symbol.to_stored()
+                    for symbol in extract_api_symbols(missing[sha], content)
+                ]
+                for sha, content in contents.items()
+            }
+            self.context_store.put_symbols(extracted, EXTRACTOR_VERSION)
+            stored.update(extracted)
+
+        return [
+            APISymbol(**data, file_path=path)
+            for path, sha in blob_shas.items()
+            for data in stored.get(sha, [])
+        ]
+
+    async def get_story_context(
+        self,
+        story: str,
+        repository_keys: Optional[List[str]] = None,
+        token_budget: Optional[int] = None,
+    ) -> List[ContentChunk]:
+        """Repository content most relevant to a story, within a token budget.
+
+        Chunks of all repositories are ranked together by BM25 score against
+        the story text, normalized per repository so each repository's best
+        match ranks first, and the best ones are taken while they fit the
+        budget.
+        """
+        if repository_keys is None:
+            repository_keys = list(self.config.repositories.keys())
+        if token_budget is None:
+            token_budget = self.story_context_config.token_budget
+
+        with request_priority("background"):
+            indexes = await asyncio.gather(
+                *(self._get_chunk_index(key) for key in repository_keys),
+                return_exceptions=True,
+            )
+
+        ranked: List[ContentChunk] = []
+        for repository_key, index in zip(repository_keys, indexes):
+            if isinstance(index, BaseException):
+                logger.warning(f"Failed to index {repository_key}: {index}")
+            elif index:
+                ranked.extend(normalize_scores(index.search(story)))
+        ranked.sort(key=lambda chunk: -chunk.score)
+        return pack_chunks(ranked, token_budget)
+
+    async def _get_chunk_index(self, repository_key: str) -> Optional[ChunkIndex]:
+        """BM25 index of a repository at its current commit."""
+        repo_config = self.config.repositories.get(repository_key)
+        if not repo_config:
+            logger.warning(f"Repository configuration not found: {repository_key}")
+            return None
+        return await self._index_flight.run(
+            ("chunk_index", repository_key),
+            lambda: self._build_chunk_index(repository_key, repo_config.name),
+        )
+
+    async def _build_chunk_index(
+        self, repository_key: str, repository_name: str
+    ) -> ChunkIndex:
+        """Index the head commit, unless the index of that commit is built."""
+        local_repository = self._get_local_repository(repository_key)
+        files = None
+        if local_repository:
+            await asyncio.to_thread(local_repository.refresh_if_stale)
+            commit_sha = await asyncio.to_thread(local_repository.get_head_commit)
+        elif self.context_store:
+            snapshot = await self._load_snapshot(repository_name)
+            commit_sha, files = snapshot["commit_sha"], snapshot["files"]
+        else:
+            commit_sha, tree_sha = await self.github_handler.get_head_commit(
+                repository_name
+            )
+
+        cached = self._chunk_indexes.get(repository_key)
+        if cached and commit_sha and cached[0] == commit_sha:
+            return cached[1]
+
+        if local_repository:
+            paths = self._rankable_paths(
+                [
+                    path
+                    for path, _ in await asyncio.to_thread(local_repository.list_files)
+                ]
+            )
+            contents = await asyncio.to_thread(
+                local_repository.read_files,
+                paths,
+                self.github_handler.MAX_FILE_CONTENT_BYTES,
+            )
+        else:
+            if files is None:
+                _, files = await self.github_handler.get_tree_snapshot(
+                    repository_name, tree_sha, languages={}
+                )
+            paths = self._rankable_paths(list(files))
+            if self.context_store:
+                contents = await self._read_snapshot_files(
+                    repository_name, files, paths
+                )
+            else:
+                fetched = await self.github_handler.get_blobs(
+                    repository_name, list(dict.fromkeys(files[p] for p in paths))
+                )
+                contents = {path: fetched.get(files[path]) for path in paths}
+
+        index = await asyncio.to_thread(ChunkIndex.build, repository_name, contents)
+        if commit_sha:
+            self._chunk_indexes[repository_key] = (commit_sha, index)
+        logger.info(
+            f"Indexed {len(index.chunks)} chunks of {len(paths)} files "
+            f"of {repository_name}"
+        )
+        return index
+
+    def _rankable_paths(self, paths: List[str]) -> List[str]:
+        """Files to index for story context, up to the configured maximum."""
+        paths = [path for path in paths if is_rankable(path, CONTEXT_FILE_EXTENSIONS)]
+        max_files = self.story_context_config.max_files
+        if len(paths) > max_files:
+            logger.warning(f"Indexing {max_files} of {len(paths)} files for stories")
+        return paths[:max_files]
+
     async def get_multi_repository_context(
         self, repository_keys: Optional[List[str]] = None, max_files_per_repo: int = 15
     ) -> MultiRepositoryContext:
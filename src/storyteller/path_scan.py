@@ -0,0 +1,153 @@
+"""Precompiled matching of path patterns against every file of a repository.
+
+Repository type detection and key file scoring test dozens of patterns
+against every path, which adds up on repositories with tens of thousands of
+files. A PathScan joins the paths of a repository with newlines (which paths
+never contain), so "does any file contain this pattern" is a single C-level
+substring search, and the files containing or ending with a pattern are found
+from the offsets of its occurrences. Results are memoized per pattern, so
+detectors and scorers sharing a scan match each pattern once. With NumPy
+installed, offsets are mapped to files and scores are computed on arrays.
+"""
+
+import bisect
+import re
+from typing import Dict, List, Pattern, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+class PathScan:
+    """The paths of a repository, prepared for matching many patterns."""
+
+    def __init__(self, paths: Sequence[str], use_numpy: bool = NUMPY_AVAILABLE):
+        if use_numpy and not NUMPY_AVAILABLE:
+            raise ImportError(
+                "NumPy package not available. Install with: pip install numpy"
+            )
+        self.paths = list(paths)
+        self.use_numpy = use_numpy
+        self.text = "\n" + "\n".join(self.paths) + "\n"
+
+        starts = []
+        offset = 1
+        for path in self.paths:
+            starts.append(offset)
+            offset += len(path) + 1
+        self._starts = np.array(starts, dtype=np.int64) if use_numpy else starts
+        self._matches: Dict[Tuple[str, str], Sequence[int]] = {}
+        self._depths = None
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def any_contains(self, pattern: str) -> bool:
+        """Whether any path contains pattern."""
+        return pattern in self.text
+
+    def any_endswith(self, suffix: str) -> bool:
+        """Whether any path ends with suffix."""
+        return suffix + "\n" in self.text
+
+    def containing(self, pattern: str) -> Sequence[int]:
+        """Ascending indexes of the paths containing pattern."""
+        return self._files_with(pattern, "")
+
+    def ending_with(self, suffix: str) -> Sequence[int]:
+        """Ascending indexes of the paths ending with suffix."""
+        return self._files_with(suffix, "\n")
+
+    def matching(self, regex: Pattern) -> Sequence[int]:
+        """Ascending indexes of the paths a regex (not spanning lines) matches."""
+        key = (regex.pattern, f"re:{regex.flags}")
+        if key not in self._matches:
+            offsets = [match.start() for match in regex.finditer(self.text)]
+            self._matches[key] = self._files_at(offsets)
+        return self._matches[key]
+
+    def depths(self) -> List[int]:
+        """Number of slashes in each path."""
+        if self._depths is None:
+            self._depths = [path.count("/") for path in self.paths]
+        return self._depths
+
+    def zeros(self) -> Sequence[int]:
+        """A score of zero for each path."""
+        if self.use_numpy:
+            return np.zeros(len(self.paths), dtype=np.int64)
+        return [0] * len(self.paths)
+
+    def add(
+        self,
+        scores: Sequence[int],
+        indexes: Sequence[int],
+        points: Union[int, Sequence[int]],
+    ):
+        """Add points (one number, or one per index) to the scores of paths."""
+        if self.use_numpy:
+            indexes = np.asarray(indexes, dtype=np.int64)
+            scores[indexes] += np.asarray(points, dtype=np.int64)
+        elif isinstance(points, int):
+            for index in indexes:
+                scores[index] += points
+        else:
+            for index, value in zip(indexes, points):
+                scores[index] += value
+
+    def top(
+        self, scores: Sequence[int], candidates: Sequence[bool], count: int
+    ) -> List[int]:
+        """Indexes of the highest positive candidate scores, ties in path order."""
+        if self.use_numpy:
+            positive = np.flatnonzero(np.asarray(candidates, dtype=bool) & (scores > 0))
+            if len(positive) > count > 0:
+                # Only scores reaching the count-th highest need sorting
+                kth = len(positive) - count
+                threshold = np.partition(scores[positive], kth)[kth]
+                positive = positive[scores[positive] >= threshold]
+            order = np.lexsort((positive, -scores[positive]))
+            return positive[order][:count].tolist()
+
+        ranked = [
+            index
+            for index, score in enumerate(scores)
+            if candidates[index] and score > 0
+        ]
+        ranked.sort(key=lambda index: -scores[index])
+        return ranked[:count]
+
+    def _files_with(self, needle: str, terminator: str) -> Sequence[int]:
+        key = (needle, terminator)
+        if key not in self._matches:
+            needle += terminator
+            find = self.text.find
+            offsets = []
+            offset = find(needle)
+            while offset != -1:
+                offsets.append(offset)
+                offset = find(needle, offset + 1)
+            self._matches[key] = self._files_at(offsets)
+        return self._matches[key]
+
+    def _files_at(self, offsets: List[int]) -> Sequence[int]:
+        """Unique indexes of the paths holding ascending text offsets."""
+        if self.use_numpy:
+            indexes = np.searchsorted(self._starts, offsets, side="right") - 1
+            return np.unique(indexes)
+        files: List[int] = []
+        for offset in offsets:
+            index = bisect.bisect_right(self._starts, offset) - 1
+            if not files or files[-1] != index:
+                files.append(index)
+        return files
+
+
+def basename_regex(names: Sequence[str]) -> Pattern:
+    """Regex matching paths whose file name is one of names, ignoring case."""
+    alternatives = "|".join(re.escape(name) for name in names)
+    return re.compile(rf"(?<=[\n/])(?:{alternatives})(?=\n)", re.IGNORECASE)
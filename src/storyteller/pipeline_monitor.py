@@ -34,7 +34,7 @@ class PipelineMonitor:
     def __init__(self, config: Config):
         self.config = config
         self.database = DatabaseManager()
-        self.github_handler = GitHubHandler(config)
+        self.github_handler = GitHubHandler(config, self.database)
 
         # Initialize recovery manager if available
         self.recovery_manager = RecoveryManager(config) if RecoveryManager else None
@@ -232,7 +232,10 @@ class PipelineMonitor:
                 "Accept": "application/vnd.github.v3+json",
             }
 
-            url = f"https://api.github.com/repos/{repository}/actions/runs/{workflow_run_id}/jobs"
+            url = (
+                f"{self.github_handler.api_url}/repos/{repository}"
+                f"/actions/runs/{workflow_run_id}/jobs"
+            )
             response = requests.get(url, headers=headers, timeout=30)
 
             if response.status_code == 200:
@@ -292,7 +295,8 @@ class PipelineMonitor:
             }
 
             url = (
-                f"https://api.github.com/repos/{repository}/actions/jobs/{job_id}/logs"
+                f"{self.github_handler.api_url}/repos/{repository}"
+                f"/actions/jobs/{job_id}/logs"
             )
             response = requests.get(url, headers=headers, timeout=30)
 
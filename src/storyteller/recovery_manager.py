@@ -37,7 +37,7 @@ class RecoveryManager:
     def __init__(self, config: Config):
         self.config = config
         self.database = DatabaseManager()
-        self.github_handler = GitHubHandler(config)
+        self.github_handler = GitHubHandler(config, self.database)
 
     async def create_checkpoint(
         self,
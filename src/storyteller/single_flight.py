@@ -0,0 +1,86 @@
+"""Single-flight coalescing of concurrent identical async calls.
+
+While a call for a key is in flight, further callers for the same key await
+that call instead of starting their own, so a burst of requests for the same
+repository scan or listing (e.g. right after a cache expires) costs one set
+of GitHub requests. Once the call finishes the key is released; results are
+not cached here.
+
+A call runs in the priority lane of the caller that started it, so callers
+only join calls in their own or a more urgent lane; a webhook-driven caller
+never waits behind a background scan of the same key.
+"""
+
+import asyncio
+import copy
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from github_scheduler import LANES, current_priority
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    """An in-flight call, the lane it runs in and the callers awaiting it."""
+
+    def __init__(self, task: "asyncio.Task[Any]", lane: str):
+        self.task = task
+        self.lane = lane
+        self.callers = 0
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time and shares its result.
+
+    When more than one caller shared a call, each receives its own copy of
+    the result (made with copy_result, a deep copy by default), so a caller
+    mutating its result cannot affect the others.
+    """
+
+    def __init__(self, copy_result: Optional[Callable[[Any], Any]] = copy.deepcopy):
+        self.copy_result = copy_result
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Whether a call for key is currently running."""
+        return key in self._flights
+
+    async def run(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Await func() for key, or the call already in flight for key.
+
+        The call runs as its own task in the starting caller's context (e.g.
+        its request priority), and a cancelled caller does not cancel it for
+        the others. A caller in a more urgent lane than the call in flight
+        starts its own call, which later callers for key then join.
+        """
+        loop = asyncio.get_running_loop()
+        lane = current_priority()
+        flight = self._flights.get(key)
+        if (
+            flight is None
+            or flight.task.done()
+            or flight.task.get_loop() is not loop
+            or LANES.index(lane) < LANES.index(flight.lane)
+        ):
+            flight = _Flight(loop.create_task(func()), lane)
+            self._flights[key] = flight
+            flight.task.add_done_callback(
+                lambda task, key=key: self._release(key, task)
+            )
+        else:
+            logger.debug(f"Joining in-flight call for {key!r}")
+        flight.callers += 1
+
+        result = await asyncio.shield(flight.task)
+        if flight.callers > 1 and self.copy_result is not None:
+            return self.copy_result(result)
+        return result
+
+    def _release(self, key: Hashable, task: "asyncio.Task[Any]"):
+        flight = self._flights.get(key)
+        if flight is not None and flight.task is task:
+            del self._flights[key]
+        if not task.cancelled():
+            # Mark the exception retrieved when every caller was cancelled
+            task.exception()
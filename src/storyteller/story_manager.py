@@ -3,20 +3,111 @@
 import asyncio
 import json
 import logging
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from config import Config, get_config, load_role_files
+from config import (
+    APIIndexConfig,
+    Config,
+    StoryContextConfig,
+    get_config,
+    load_role_files,
+)
 from database import DatabaseManager
 from github_handler import GitHubHandler
 from llm_handler import LLMHandler
 from models import Epic, StoryHierarchy, StoryStatus, SubStory, UserStory
 from multi_repo_context import MultiRepositoryContextReader
 from role_analyzer import RoleAssignmentEngine
+from story_similarity import SimilarStoryMatch, StorySimilarityIndex
+from structured_output import (
+    StructuredOutputError,
+    generate_structured_response,
+    parse_structured_output,
+)
 
 logger = logging.getLogger(__name__)
 
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+
+STORY_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "required": ["recommended_roles", "target_repositories", "complexity"],
+    "properties": {
+        "recommended_roles": _STRING_LIST,
+        "target_repositories": _STRING_LIST,
+        "complexity": {"type": "string", "enum": ["low", "medium", "high"]},
+        "themes": _STRING_LIST,
+        "reasoning": {"type": "string"},
+    },
+}
+
+EPIC_BREAKDOWN_SCHEMA = {
+    "type": "object",
+    "required": ["user_stories"],
+    "properties": {
+        "user_stories": {
+            "type": "array",
+            "minItems": 1,
+            "items": {
+                "type": "object",
+                "required": ["title", "description"],
+                "properties": {
+                    "title": {"type": "string"},
+                    "description": {"type": "string"},
+                    "user_persona": {"type": "string"},
+                    "user_goal": {"type": "string"},
+                    "acceptance_criteria": _STRING_LIST,
+                    "target_repositories": _STRING_LIST,
+                    "story_points": {"type": "integer"},
+                    "rationale": {"type": "string"},
+                },
+            },
+        },
+        "breakdown_rationale": {"type": "string"},
+    },
+}
+
+DEPARTMENT_ASSIGNMENTS_SCHEMA = {
+    "type": "array",
+    "minItems": 1,
+    "items": {
+        "type": "object",
+        "required": ["department", "title", "description"],
+        "properties": {
+            "department": {"type": "string"},
+            "title": {"type": "string"},
+            "description": {"type": "string"},
+            "tasks": _STRING_LIST,
+            "dependencies": _STRING_LIST,
+            "target_repository": {"type": "string"},
+            "estimated_hours": {"type": "number"},
+            "technical_context": {"type": "string"},
+        },
+    },
+}
+
+BATCHED_ANALYSES_SCHEMA = {
+    "type": "object",
+    "required": ["analyses"],
+    "properties": {
+        "analyses": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["role_name", "analysis"],
+                "properties": {
+                    "role_name": {"type": "string"},
+                    "analysis": {"type": "string"},
+                    "recommendations": _STRING_LIST,
+                    "concerns": _STRING_LIST,
+                },
+            },
+        }
+    },
+}
+
 
 @dataclass
 class StoryAnalysis:
@@ -59,8 +150,8 @@ class StoryProcessor:
     def __init__(self, config: Optional[Config] = None):
         self.config = config or get_config()
         self.llm_handler = LLMHandler(self.config)
-        self.github_handler = GitHubHandler(self.config)
         self.database = DatabaseManager()  # Add database support
+        self.github_handler = GitHubHandler(self.config, self.database)
         self.role_definitions = load_role_files()
         self._processing_queue: Dict[str, ProcessedStory] = {}
 
@@ -68,6 +159,11 @@ class StoryProcessor:
         self.role_assignment_engine = RoleAssignmentEngine(self.config)
         self.context_reader = MultiRepositoryContextReader(self.config)
 
+        # Near-duplicate detection for reusing prior expert analyses
+        self.similarity_index = StorySimilarityIndex(
+            self.database, getattr(self.config, "story_reuse", None)
+        )
+
         # Initialize GitHub storage if configured
         self.github_storage = None
         if self.config.storage.primary == "github":
@@ -107,39 +203,51 @@ Respond with a JSON object containing:
   "reasoning": "explanation of choices"
 }"""
 
+        default_analysis = {
+            "recommended_roles": ["system-architect", "lead-developer"],
+            "target_repositories": [self.config.default_repository],
+            "complexity": "medium",
+            "themes": ["general"],
+            "reasoning": "Default analysis due to parsing error",
+        }
+
         try:
-            response = await self.llm_handler.generate_response(
+            structured = await generate_structured_response(
+                self.llm_handler,
                 prompt=f"Analyze this user story:\n\n{story_content}",
                 system_prompt=system_prompt,
+                schema=STORY_ANALYSIS_SCHEMA,
             )
-
-            # Parse JSON response
-            analysis = json.loads(response.content)
-
-            # Validate and clean up the analysis
+            analysis = structured.data
+        except (StructuredOutputError, json.JSONDecodeError, KeyError) as e:
+            partial = getattr(e, "data", None)
+            if not isinstance(partial, dict):
+                logger.warning(f"Failed to parse story analysis, using defaults: {e}")
+                return default_analysis
+
+            # Keep the valid fields and only default the ones still missing
+            logger.warning(f"Story analysis incomplete, using defaults for: {e.errors}")
+            analysis = partial
+
+        # Validate and clean up the analysis
+        if "recommended_roles" in analysis:
             analysis["recommended_roles"] = [
                 role
-                for role in analysis.get("recommended_roles", [])
+                for role in analysis["recommended_roles"]
                 if role in self.role_definitions
             ]
 
+        if "target_repositories" in analysis:
             analysis["target_repositories"] = [
                 repo
-                for repo in analysis.get("target_repositories", [])
+                for repo in analysis["target_repositories"]
                 if repo in self.config.repositories
             ]
 
-            return analysis
+        for key, value in default_analysis.items():
+            analysis.setdefault(key, value)
 
-        except (json.JSONDecodeError, KeyError) as e:
-            logger.warning(f"Failed to parse story analysis, using defaults: {e}")
-            return {
-                "recommended_roles": ["system-architect", "lead-developer"],
-                "target_repositories": [self.config.default_repository],
-                "complexity": "medium",
-                "themes": ["general"],
-                "reasoning": "Default analysis due to parsing error",
-            }
+        return analysis
 
     async def assign_roles_intelligently(
         self,
@@ -283,37 +391,161 @@ Respond with a JSON object containing:
             logger.error(f"Failed to get analysis from {role_name}: {e}")
             raise
 
+    async def get_batched_expert_analyses(
+        self,
+        story_content: str,
+        role_names: List[str],
+        context: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, StoryAnalysis]:
+        """Get analyses from several expert roles with a single LLM request.
+
+        Returns only the roles that came back as valid entries; callers are
+        expected to fall back to per-role analysis for anything missing.
+        """
+
+        role_definitions = {
+            role_name: self.role_definitions[role_name]
+            for role_name in role_names
+            if role_name in self.role_definitions
+        }
+        if not role_definitions:
+            return {}
+
+        try:
+            response = await self.llm_handler.analyze_story_with_roles(
+                story_content=story_content,
+                role_definitions=role_definitions,
+                context=context,
+            )
+        except Exception as e:
+            logger.warning(f"Batched expert analysis request failed: {e}")
+            return {}
+
+        return self._parse_batched_analyses(
+            response.content,
+            list(role_definitions.keys()),
+            metadata={
+                "model": response.model,
+                "provider": response.provider,
+                "usage": response.usage,
+                "batched": True,
+                "batch_size": len(role_definitions),
+            },
+        )
+
+    def _parse_batched_analyses(
+        self,
+        content: str,
+        role_names: List[str],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, StoryAnalysis]:
+        """Validate a batched analysis response and map it to StoryAnalysis objects."""
+
+        try:
+            data, _, _ = parse_structured_output(content, BATCHED_ANALYSES_SCHEMA)
+        except StructuredOutputError as e:
+            logger.warning(f"Failed to parse batched expert analysis: {e}")
+            return {}
+
+        # Entries that failed validation have already been dropped
+        entries = (data or {}).get("analyses", [])
+
+        analyses = {}
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+
+            role_name = entry.get("role_name")
+            analysis_text = entry.get("analysis")
+            if role_name not in role_names or role_name in analyses:
+                continue
+            if not isinstance(analysis_text, str) or not analysis_text.strip():
+                continue
+
+            recommendations = entry.get("recommendations", [])
+            concerns = entry.get("concerns", [])
+
+            analyses[role_name] = StoryAnalysis(
+                role_name=role_name,
+                analysis=analysis_text,
+                recommendations=(
+                    [str(r) for r in recommendations if r]
+                    if isinstance(recommendations, list)
+                    else []
+                ),
+                concerns=(
+                    [str(c) for c in concerns if c]
+                    if isinstance(concerns, list)
+                    else []
+                ),
+                metadata=dict(metadata or {}),
+            )
+
+        return analyses
+
     async def process_story_with_experts(
         self,
         story_content: str,
         expert_roles: List[str],
         context: Optional[Dict[str, Any]] = None,
+        batched: Optional[bool] = None,
     ) -> List[StoryAnalysis]:
-        """Process a story with multiple expert roles in parallel."""
+        """Process a story with multiple expert roles in parallel.
 
-        # Create analysis tasks for all expert roles
-        analysis_tasks = [
-            self.get_expert_analysis(story_content, role_name, context)
+        With batched mode (``batched=True`` or ``config.batched_role_analysis``)
+        all roles are analyzed in one request first, and only the roles missing
+        from that response are requested individually.
+        """
+
+        valid_roles = [
+            role_name
             for role_name in expert_roles
             if role_name in self.role_definitions
         ]
 
-        if not analysis_tasks:
+        if not valid_roles:
             raise ValueError("No valid expert roles provided")
 
+        if batched is None:
+            batched = self.config.batched_role_analysis
+
+        batched_analyses: Dict[str, StoryAnalysis] = {}
+        if batched and len(valid_roles) > 1:
+            batched_analyses = await self.get_batched_expert_analyses(
+                story_content, valid_roles, context
+            )
+            logger.info(
+                f"Batched analysis returned {len(batched_analyses)}/"
+                f"{len(valid_roles)} expert roles"
+            )
+
+        # Create analysis tasks for roles not covered by the batched response
+        remaining_roles = [
+            role_name for role_name in valid_roles if role_name not in batched_analyses
+        ]
+        analysis_tasks = [
+            self.get_expert_analysis(story_content, role_name, context)
+            for role_name in remaining_roles
+        ]
+
         # Execute all analyses in parallel
         try:
             analyses = await asyncio.gather(*analysis_tasks, return_exceptions=True)
 
             # Filter out failed analyses and log errors
-            successful_analyses = []
-            for i, result in enumerate(analyses):
+            results_by_role = dict(batched_analyses)
+            for role_name, result in zip(remaining_roles, analyses):
                 if isinstance(result, Exception):
-                    logger.error(
-                        f"Expert analysis failed for {expert_roles[i]}: {result}"
-                    )
+                    logger.error(f"Expert analysis failed for {role_name}: {result}")
                 else:
-                    successful_analyses.append(result)
+                    results_by_role[role_name] = result
+
+            # Keep the requested role order
+            successful_analyses = [
+                results_by_role[role_name]
+                for role_name in valid_roles
+                if role_name in results_by_role
+            ]
 
             if not successful_analyses:
                 raise Exception("All expert analyses failed")
@@ -487,6 +719,51 @@ Respond with a JSON object containing:
                 repository_contexts = []
                 cross_repository_insights = {}
 
+            context_repository_keys = [
+                repo_key
+                for repo_key in target_repositories
+                if repo_key in self.config.repositories
+            ]
+
+            # Routes and client calls of the API endpoints the story is about
+            api_endpoints = []
+            api_index_config = getattr(self.config, "api_index", None)
+            if (
+                isinstance(api_index_config, APIIndexConfig)
+                and api_index_config.enabled
+                and repository_contexts
+            ):
+                try:
+                    endpoint_map = await self.context_reader.get_api_endpoints(
+                        context_repository_keys
+                    )
+                    api_endpoints = [
+                        endpoint.to_dict()
+                        for endpoint in endpoint_map.search(
+                            story_request.content, api_index_config.max_endpoints
+                        )
+                    ]
+                except Exception as e:
+                    logger.warning(f"Failed to look up API endpoints: {e}")
+
+            # Repository content ranked by relevance to this story
+            relevant_code = []
+            story_context_config = getattr(self.config, "story_context", None)
+            if (
+                isinstance(story_context_config, StoryContextConfig)
+                and story_context_config.enabled
+                and repository_contexts
+            ):
+                try:
+                    chunks = await self.context_reader.get_story_context(
+                        story_request.content,
+                        context_repository_keys,
+                        story_context_config.token_budget,
+                    )
+                    relevant_code = [chunk.to_dict() for chunk in chunks]
+                except Exception as e:
+                    logger.warning(f"Failed to rank repository content: {e}")
+
             # Prepare enhanced context for expert analysis
             enhanced_context = story_request.context or {}
             enhanced_context.update(
@@ -521,6 +798,13 @@ Respond with a JSON object containing:
                     "target_repositories": target_repositories,
                 }
             )
+            if api_endpoints:
+                enhanced_context["api_endpoints"] = api_endpoints
+            if relevant_code:
+                # Ranked content replaces the path-pattern key files
+                for repo_context in enhanced_context["repository_contexts"]:
+                    del repo_context["important_files"]
+                enhanced_context["relevant_code"] = relevant_code
 
             # Determine expert roles
             expert_roles = (
@@ -531,19 +815,64 @@ Respond with a JSON object containing:
 
             logger.info(f"Using expert roles: {expert_roles}")
 
-            # Get expert analyses with enhanced context
-            expert_analyses = await self.process_story_with_experts(
-                story_content=story_request.content,
-                expert_roles=expert_roles,
-                context=enhanced_context,
+            # Look for a near-duplicate story whose analyses can be reused
+            reuse_match = self._find_reusable_story(
+                story_request.content, target_repositories
+            )
+            reused_analyses = (
+                self._reusable_analyses(reuse_match, expert_roles)
+                if reuse_match
+                else {}
             )
 
-            # Synthesize analyses with cross-repository considerations
-            synthesized_analysis = await self.synthesize_analyses(
-                story_content=story_request.content,
-                expert_analyses=expert_analyses,
-                context=enhanced_context,
+            # Get expert analyses with enhanced context for the remaining roles
+            remaining_roles = [
+                role_name
+                for role_name in expert_roles
+                if role_name not in reused_analyses
+                and (not reused_analyses or role_name in self.role_definitions)
+            ]
+            generated_analyses = []
+            if remaining_roles:
+                generated_analyses = await self.process_story_with_experts(
+                    story_content=story_request.content,
+                    expert_roles=remaining_roles,
+                    context=enhanced_context,
+                )
+            analyses_by_role = dict(reused_analyses)
+            analyses_by_role.update({a.role_name: a for a in generated_analyses})
+            expert_analyses = [
+                analyses_by_role[role_name]
+                for role_name in expert_roles
+                if role_name in analyses_by_role
+            ]
+
+            # An identical story analyzed by the same experts keeps its synthesis;
+            # otherwise synthesize again so the result reflects the new wording
+            reuse_synthesis = bool(
+                reuse_match
+                and reuse_match.is_exact
+                and reuse_match.synthesized_analysis
+                and not generated_analyses
             )
+            if reuse_synthesis:
+                synthesized_analysis = reuse_match.synthesized_analysis
+            else:
+                # Synthesize analyses with cross-repository considerations
+                synthesized_analysis = await self.synthesize_analyses(
+                    story_content=story_request.content,
+                    expert_analyses=expert_analyses,
+                    context=enhanced_context,
+                )
+
+            if self.similarity_index.config.enabled and not reuse_synthesis:
+                self._index_processed_story(
+                    story_id,
+                    story_request.content,
+                    target_repositories,
+                    expert_analyses,
+                    synthesized_analysis,
+                )
 
             # Create processed story
             processed_story = ProcessedStory(
@@ -568,6 +897,21 @@ Respond with a JSON object containing:
                     "cross_repository_insights": cross_repository_insights,
                     "context_quality": len(repository_contexts)
                     / max(len(target_repositories), 1),
+                    "analysis_reuse": {
+                        "reused": bool(reused_analyses),
+                        "source_story_id": (
+                            reuse_match.story_id if reuse_match else None
+                        ),
+                        "hamming_distance": (
+                            reuse_match.hamming_distance if reuse_match else None
+                        ),
+                        "similarity": (
+                            round(reuse_match.similarity, 3) if reuse_match else None
+                        ),
+                        "reused_roles": list(reused_analyses),
+                        "generated_roles": [a.role_name for a in generated_analyses],
+                        "reused_synthesis": reuse_synthesis,
+                    },
                 },
             )
 
@@ -583,6 +927,82 @@ Respond with a JSON object containing:
             logger.error(f"Failed to process story {story_id}: {e}")
             raise
 
+    def _find_reusable_story(
+        self, story_content: str, target_repositories: List[str]
+    ) -> Optional[SimilarStoryMatch]:
+        """Find a previously analyzed near-duplicate story, if reuse is enabled."""
+
+        if not self.similarity_index.config.enabled:
+            return None
+
+        try:
+            match = self.similarity_index.find_similar(
+                story_content, target_repositories
+            )
+        except Exception as e:
+            logger.warning(f"Near-duplicate lookup failed: {e}")
+            return None
+
+        if match:
+            logger.info(
+                f"Story is a near duplicate of {match.story_id} "
+                f"(distance {match.hamming_distance}, "
+                f"similarity {match.similarity:.2f})"
+            )
+        return match
+
+    def _reusable_analyses(
+        self, match: SimilarStoryMatch, expert_roles: List[str]
+    ) -> Dict[str, StoryAnalysis]:
+        """Get the cached analyses of a near-duplicate story for the requested roles."""
+
+        reused = {}
+        for data in match.expert_analyses:
+            role_name = data.get("role_name")
+            if (
+                role_name not in expert_roles
+                or role_name not in self.role_definitions
+                or not data.get("analysis")
+            ):
+                continue
+
+            metadata = dict(data.get("metadata") or {})
+            metadata.update(
+                {
+                    "reused_from": match.story_id,
+                    "similarity": round(match.similarity, 3),
+                }
+            )
+            reused[role_name] = StoryAnalysis(
+                role_name=role_name,
+                analysis=data["analysis"],
+                recommendations=list(data.get("recommendations") or []),
+                concerns=list(data.get("concerns") or []),
+                metadata=metadata,
+            )
+        return reused
+
+    def _index_processed_story(
+        self,
+        story_id: str,
+        story_content: str,
+        target_repositories: List[str],
+        expert_analyses: List[StoryAnalysis],
+        synthesized_analysis: str,
+    ) -> None:
+        """Add a processed story to the near-duplicate index."""
+
+        try:
+            self.similarity_index.add(
+                story_id=story_id,
+                content=story_content,
+                repositories=target_repositories,
+                expert_analyses=[asdict(analysis) for analysis in expert_analyses],
+                synthesized_analysis=synthesized_analysis,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to index story {story_id} for reuse: {e}")
+
     async def create_github_issues(self, processed_story: ProcessedStory) -> List[Any]:
         """Create GitHub issues for a processed story."""
 
@@ -1016,16 +1436,15 @@ Target Repositories: {epic.target_repositories}
 Estimated Duration: {epic.estimated_duration_weeks} weeks"""
 
         try:
-            response = await self.processor.llm_handler.generate_response(
+            structured = await generate_structured_response(
+                self.processor.llm_handler,
                 prompt=epic_content,
                 system_prompt=system_prompt,
+                schema=EPIC_BREAKDOWN_SCHEMA,
             )
+            return structured.data
 
-            # Parse JSON response
-            breakdown = json.loads(response.content)
-            return breakdown
-
-        except (json.JSONDecodeError, KeyError) as e:
+        except (StructuredOutputError, json.JSONDecodeError, KeyError) as e:
             logger.warning(f"Failed to parse epic breakdown, using fallback: {e}")
             # Fallback: create a basic user story from the epic
             return {
@@ -1237,16 +1656,15 @@ Target Repositories: {user_story.target_repositories}
 Story Points: {user_story.story_points}"""
 
         try:
-            response = await self.processor.llm_handler.generate_response(
+            structured = await generate_structured_response(
+                self.processor.llm_handler,
                 prompt=user_story_content,
                 system_prompt=system_prompt,
+                schema=DEPARTMENT_ASSIGNMENTS_SCHEMA,
             )
+            return structured.data
 
-            # Parse JSON response
-            departments_analysis = json.loads(response.content)
-            return departments_analysis
-
-        except (json.JSONDecodeError, KeyError) as e:
+        except (StructuredOutputError, json.JSONDecodeError, KeyError) as e:
             logger.warning(
                 f"Failed to parse department analysis, using context-aware fallback: {e}"
             )
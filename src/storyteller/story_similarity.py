@@ -0,0 +1,201 @@
+"""Near-duplicate story detection for reusing prior expert analyses."""
+
+import hashlib
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+from config import StoryReuseConfig
+from database import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+SIMHASH_BITS = 64
+SHINGLE_SIZE = 3
+
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+@dataclass
+class SimilarStoryMatch:
+    """A previously analyzed story that is a near duplicate of a new one."""
+
+    story_id: str
+    hamming_distance: int
+    similarity: float
+    expert_analyses: List[Dict[str, Any]] = field(default_factory=list)
+    synthesized_analysis: Optional[str] = None
+
+    @property
+    def is_exact(self) -> bool:
+        """Whether the normalized story text is identical."""
+        return self.hamming_distance == 0 and self.similarity >= 1.0
+
+
+def normalize_story_text(content: str) -> str:
+    """Normalize story text so wording-neutral edits do not change it."""
+    return " ".join(_TOKEN_PATTERN.findall(content.lower()))
+
+
+def shingles(normalized: str, size: int = SHINGLE_SIZE) -> Set[str]:
+    """Get the set of word shingles of a normalized text."""
+    words = normalized.split()
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def compute_simhash(normalized: str) -> int:
+    """Compute a 64-bit SimHash over the word shingles of a normalized text."""
+    weights = [0] * SIMHASH_BITS
+    for shingle in shingles(normalized):
+        digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Count the differing bits of two hashes."""
+    return bin(a ^ b).count("1")
+
+
+def simhash_bands(simhash: int, max_distance: int) -> List[int]:
+    """Split a hash into max_distance + 1 bands of (nearly) equal width.
+
+    Hashes within max_distance bits differ in at most max_distance bands, so
+    they always share the value of at least one band.
+    """
+    band_count = max(1, min(max_distance + 1, SIMHASH_BITS))
+    width, wider = divmod(SIMHASH_BITS, band_count)
+    bands = []
+    offset = 0
+    for band in range(band_count):
+        bits = width + (1 if band < wider else 0)
+        bands.append(simhash >> offset & ((1 << bits) - 1))
+        offset += bits
+    return bands
+
+
+def jaccard_similarity(a: Set[str], b: Set[str]) -> float:
+    """Jaccard similarity of two shingle sets."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class StorySimilarityIndex:
+    """SimHash index of analyzed stories stored alongside them in SQLite.
+
+    Candidates for the same repositories are found through indexed lookups
+    of SimHash bands (max_hamming_distance + 1 of them, so no hash within the
+    distance is missed), filtered by distance and confirmed with the exact
+    Jaccard similarity of word shingles, so a hash collision never causes an
+    unrelated story's analyses to be reused.
+    """
+
+    def __init__(
+        self,
+        database: DatabaseManager,
+        config: Optional[StoryReuseConfig] = None,
+    ):
+        self.database = database
+        self.config = config or StoryReuseConfig()
+        self._bands_backfilled = False
+
+    def _bands(self, simhash: int) -> Optional[List[int]]:
+        """Bands of a hash, or None when the distance allows any hash."""
+        if self.config.max_hamming_distance >= SIMHASH_BITS:
+            return None
+        return simhash_bands(simhash, self.config.max_hamming_distance)
+
+    def _backfill_bands(self):
+        """Band stored fingerprints indexed under another distance limit."""
+        if self._bands_backfilled:
+            return
+        self._bands_backfilled = True
+        bands = self._bands(0)
+        if bands is None:
+            return
+        unbanded = self.database.get_unbanded_story_fingerprints(len(bands))
+        if unbanded:
+            self.database.save_story_fingerprint_bands(
+                {
+                    story_id: self._bands(simhash)
+                    for story_id, simhash in unbanded.items()
+                }
+            )
+
+    def find_similar(
+        self, content: str, repositories: List[str]
+    ) -> Optional[SimilarStoryMatch]:
+        """Find the closest previously analyzed story for the same repositories."""
+        normalized = normalize_story_text(content)
+        if not normalized:
+            return None
+
+        fingerprint = compute_simhash(normalized)
+        new_shingles = shingles(normalized)
+
+        self._backfill_bands()
+        candidates = self.database.get_story_fingerprint_candidates(
+            fingerprint,
+            repositories,
+            bands=self._bands(fingerprint),
+            max_distance=self.config.max_hamming_distance,
+        )
+
+        best: Optional[SimilarStoryMatch] = None
+        for candidate in candidates:
+            distance = hamming_distance(fingerprint, candidate["simhash"])
+            if distance > self.config.max_hamming_distance:
+                continue
+
+            similarity = jaccard_similarity(
+                new_shingles, shingles(candidate["normalized_content"])
+            )
+            if similarity < self.config.min_similarity:
+                continue
+
+            if best is None or similarity > best.similarity:
+                best = SimilarStoryMatch(
+                    story_id=candidate["story_id"],
+                    hamming_distance=distance,
+                    similarity=similarity,
+                    expert_analyses=candidate["expert_analyses"],
+                    synthesized_analysis=candidate["synthesized_analysis"],
+                )
+
+        return best
+
+    def add(
+        self,
+        story_id: str,
+        content: str,
+        repositories: List[str],
+        expert_analyses: List[Dict[str, Any]],
+        synthesized_analysis: str,
+    ) -> bool:
+        """Index an analyzed story so later near duplicates can reuse it."""
+        normalized = normalize_story_text(content)
+        if not normalized:
+            return False
+
+        simhash = compute_simhash(normalized)
+        return self.database.save_story_fingerprint(
+            story_id=story_id,
+            simhash=simhash,
+            repositories=repositories,
+            normalized_content=normalized,
+            expert_analyses=expert_analyses,
+            synthesized_analysis=synthesized_analysis,
+            bands=self._bands(simhash),
+        )
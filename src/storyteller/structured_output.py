@@ -0,0 +1,357 @@
+"""Structured (JSON) output parsing, validation and repair for LLM responses.
+
+Schemas use a small subset of JSON Schema: ``type`` (object, array, string,
+integer, number, boolean), ``properties``, ``required``, ``items``,
+``enum`` and ``minItems``.
+"""
+
+import ast
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_FENCE_PATTERN = re.compile(r"```(?:json|JSON)?\s*\n?(.*?)```", re.DOTALL)
+_TRAILING_COMMA_PATTERN = re.compile(r",\s*([}\]])")
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+
+_MISSING = object()
+
+
+class StructuredOutputError(Exception):
+    """Raised when an LLM response cannot be turned into valid structured data."""
+
+    def __init__(self, message: str, data: Any = None, errors: List[str] = None):
+        super().__init__(message)
+        self.data = data
+        self.errors = errors or []
+
+
+@dataclass
+class StructuredOutput:
+    """Validated data parsed from one or more LLM responses."""
+
+    data: Any
+    repaired: bool = False
+    reasks: int = 0
+    responses: List[Any] = field(default_factory=list)
+
+
+def _find_json_span(text: str) -> Optional[str]:
+    """Return the first balanced JSON object/array in text, closing truncated ones."""
+    start = next((i for i, char in enumerate(text) if char in "{["), None)
+    if start is None:
+        return None
+
+    stack = []
+    in_string = False
+    escaped = False
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]":
+            if not stack or stack.pop() != char:
+                return text[start : index + 1]
+            if not stack:
+                return text[start : index + 1]
+
+    # Truncated output: close the open string and containers
+    candidate = text[start:]
+    if in_string:
+        candidate += '"'
+    candidate = re.sub(r",\s*$", "", candidate.rstrip())
+    candidate = re.sub(r":\s*$", ": null", candidate)
+    if stack and stack[-1] == "}":
+        # Drop an object key that lost its value
+        candidate = re.sub(r'([{,])\s*"[^"]*"$', r"\1", candidate)
+        candidate = re.sub(r",\s*$", "", candidate)
+    return candidate + "".join(reversed(stack))
+
+
+def _loads_lenient(candidate: str) -> Tuple[Any, bool]:
+    """Parse JSON, applying cheap repairs when strict parsing fails."""
+    try:
+        return json.loads(candidate), False
+    except json.JSONDecodeError:
+        pass
+
+    repaired = _TRAILING_COMMA_PATTERN.sub(r"\1", candidate.translate(_SMART_QUOTES))
+    try:
+        return json.loads(repaired), True
+    except json.JSONDecodeError:
+        pass
+
+    # Python-style literals (single quotes, True/False/None)
+    pythonic = re.sub(r"\btrue\b", "True", repaired)
+    pythonic = re.sub(r"\bfalse\b", "False", pythonic)
+    pythonic = re.sub(r"\bnull\b", "None", pythonic)
+    try:
+        value = ast.literal_eval(pythonic)
+    except (ValueError, SyntaxError, MemoryError, RecursionError) as e:
+        raise StructuredOutputError(f"Response is not valid JSON: {e}")
+    if not isinstance(value, (dict, list)):
+        raise StructuredOutputError("Response does not contain a JSON object or array")
+    return value, True
+
+
+def extract_json(text: str) -> Tuple[Any, bool]:
+    """Extract JSON from raw model output.
+
+    Handles markdown fences, leading/trailing prose, trailing commas, smart
+    quotes, Python-style literals and truncated output. Returns the parsed
+    value and whether any repair was needed.
+    """
+    if not isinstance(text, str) or not text.strip():
+        raise StructuredOutputError("Response is empty")
+
+    text = text.strip().lstrip("\ufeff")
+    try:
+        return json.loads(text), False
+    except json.JSONDecodeError:
+        pass
+
+    fenced = _FENCE_PATTERN.search(text)
+    if fenced:
+        text = fenced.group(1).strip()
+        try:
+            return json.loads(text), True
+        except json.JSONDecodeError:
+            pass
+
+    candidate = _find_json_span(text)
+    if candidate is None:
+        raise StructuredOutputError("Response does not contain JSON")
+
+    value, _ = _loads_lenient(candidate)
+    return value, True
+
+
+def _conform(value: Any, schema: Dict[str, Any], path: str, errors: List[str]):
+    """Coerce value to the schema where cheap, recording paths that stay invalid."""
+    expected = schema.get("type")
+
+    if expected == "object":
+        if isinstance(value, list) and len(value) == 1 and isinstance(value[0], dict):
+            value = value[0]
+        if not isinstance(value, dict):
+            errors.append(path or "$")
+            return _MISSING
+
+        result = dict(value)
+        for name, property_schema in schema.get("properties", {}).items():
+            if name not in value or value[name] is None:
+                continue
+            conformed = _conform(
+                value[name],
+                property_schema,
+                f"{path}.{name}" if path else name,
+                errors,
+            )
+            if conformed is _MISSING:
+                result.pop(name, None)
+            else:
+                result[name] = conformed
+
+        for name in schema.get("required", []):
+            if name not in result or result[name] is None:
+                missing_path = f"{path}.{name}" if path else name
+                if missing_path not in errors:
+                    errors.append(missing_path)
+        return result
+
+    if expected == "array":
+        if isinstance(value, dict):
+            lists = [v for v in value.values() if isinstance(v, list)]
+            if len(lists) == 1:
+                value = lists[0]
+            else:
+                value = [value]
+        elif isinstance(value, str):
+            if schema.get("items", {}).get("type") == "string":
+                value = [
+                    part.strip(" -*\t")
+                    for part in re.split(r"[\n,;]", value)
+                    if part.strip(" -*\t")
+                ]
+            else:
+                value = [value]
+        elif not isinstance(value, list):
+            value = [value]
+
+        item_schema = schema.get("items")
+        items = value
+        if item_schema:
+            items = []
+            for index, item in enumerate(value):
+                item_errors: List[str] = []
+                conformed = _conform(item, item_schema, f"{path}[{index}]", item_errors)
+                if conformed is _MISSING or item_errors:
+                    # Invalid entries are dropped rather than failing the whole list
+                    logger.debug(f"Dropping invalid entry {path}[{index}]")
+                    continue
+                items.append(conformed)
+
+        if len(items) < schema.get("minItems", 0):
+            errors.append(path or "$")
+            return _MISSING
+        return items
+
+    if expected == "string":
+        if isinstance(value, (dict, list)):
+            errors.append(path or "$")
+            return _MISSING
+        value = str(value)
+        enum = schema.get("enum")
+        if enum:
+            match = next((e for e in enum if e.lower() == value.strip().lower()), None)
+            if match is None:
+                errors.append(path or "$")
+                return _MISSING
+            value = match
+        return value
+
+    if expected in ("integer", "number"):
+        if isinstance(value, bool):
+            errors.append(path or "$")
+            return _MISSING
+        if isinstance(value, str):
+            number = re.search(r"-?\d+(?:\.\d+)?", value)
+            if not number:
+                errors.append(path or "$")
+                return _MISSING
+            value = float(number.group(0))
+        if not isinstance(value, (int, float)):
+            errors.append(path or "$")
+            return _MISSING
+        return int(round(value)) if expected == "integer" else value
+
+    if expected == "boolean":
+        if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+            return value.strip().lower() == "true"
+        if not isinstance(value, bool):
+            errors.append(path or "$")
+            return _MISSING
+        return value
+
+    return value
+
+
+def validate_structured_data(
+    data: Any, schema: Dict[str, Any]
+) -> Tuple[Any, List[str]]:
+    """Coerce data to a schema; returns the repaired data and invalid paths."""
+    errors: List[str] = []
+    conformed = _conform(data, schema, "", errors)
+    return (None if conformed is _MISSING else conformed), errors
+
+
+def parse_structured_output(
+    content: str, schema: Dict[str, Any]
+) -> Tuple[Any, List[str], bool]:
+    """Extract, repair and validate structured data from a model response.
+
+    Returns ``(data, errors, repaired)``; ``data`` may be partial when there
+    are errors. Raises StructuredOutputError when no JSON can be recovered.
+    """
+    raw, repaired = extract_json(content)
+    data, errors = validate_structured_data(raw, schema)
+    return data, errors, repaired or data != raw
+
+
+def _schema_example(schema: Dict[str, Any]) -> Any:
+    """Build a compact example value that shows the expected shape."""
+    expected = schema.get("type")
+    if expected == "object":
+        return {
+            name: _schema_example(prop)
+            for name, prop in schema.get("properties", {}).items()
+        }
+    if expected == "array":
+        return [_schema_example(schema.get("items", {"type": "string"}))]
+    if schema.get("enum"):
+        return "|".join(schema["enum"])
+    return {"integer": 0, "number": 0, "boolean": False}.get(expected, "...")
+
+
+def _targeted_reask_prompt(
+    prompt: str, schema: Dict[str, Any], fields: List[str]
+) -> str:
+    properties = schema.get("properties", {})
+    example = {name: _schema_example(properties.get(name, {})) for name in fields}
+    return (
+        f"{prompt}\n\n"
+        "Your previous JSON response was missing or had invalid values for: "
+        f"{', '.join(fields)}.\n"
+        "Respond with a JSON object containing ONLY these fields:\n"
+        f"{json.dumps(example, indent=2)}"
+    )
+
+
+async def generate_structured_response(
+    llm_handler,
+    prompt: str,
+    system_prompt: Optional[str],
+    schema: Dict[str, Any],
+    max_reasks: int = 1,
+    **kwargs,
+) -> StructuredOutput:
+    """Request structured data from the LLM and validate it against a schema.
+
+    Object schemas are requested in provider JSON mode where supported. When
+    top-level fields are missing or invalid, only those fields are re-requested
+    (up to ``max_reasks`` times) and merged, instead of repeating the full call.
+    """
+    json_mode = schema.get("type") == "object"
+    response = await llm_handler.generate_response(
+        prompt=prompt, system_prompt=system_prompt, json_mode=json_mode, **kwargs
+    )
+    data, errors, repaired = parse_structured_output(response.content, schema)
+    result = StructuredOutput(data=data, repaired=repaired, responses=[response])
+
+    while (
+        errors and json_mode and isinstance(data, dict) and result.reasks < max_reasks
+    ):
+        fields = sorted({error.split(".")[0].split("[")[0] for error in errors})
+        logger.info(f"Re-asking LLM for missing structured fields: {fields}")
+        result.reasks += 1
+
+        reask_response = await llm_handler.generate_response(
+            prompt=_targeted_reask_prompt(prompt, schema, fields),
+            system_prompt=system_prompt,
+            json_mode=True,
+            **kwargs,
+        )
+        result.responses.append(reask_response)
+        try:
+            patch, _ = extract_json(reask_response.content)
+        except StructuredOutputError as e:
+            logger.warning(f"Targeted re-ask returned unusable output: {e}")
+            continue
+        if isinstance(patch, dict):
+            data = {**data, **{k: v for k, v in patch.items() if k in fields}}
+        data, errors = validate_structured_data(data, schema)
+
+    if errors or data is None:
+        raise StructuredOutputError(
+            f"Structured response failed validation: {', '.join(errors)}",
+            data=data,
+            errors=errors,
+        )
+
+    result.data = data
+    return result
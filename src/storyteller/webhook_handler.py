@@ -9,6 +9,8 @@ from typing import Any, Dict, List, Optional
 
 from config import Config
 from database import DatabaseManager
+from github_scheduler import request_priority
+from issue_mirror import IssueMirror
 from models import StoryStatus
 from pipeline_monitor import PipelineMonitor
 
@@ -18,6 +20,17 @@ logger = logging.getLogger(__name__)
 class WebhookHandler:
     """Handles GitHub webhook events for automatic story status transitions and pipeline monitoring."""
 
+    # Issue events after which cached copies of GitHub-stored stories are stale
+    STORY_CACHE_INVALIDATING_EVENTS = frozenset(
+        [
+            "issues.edited",
+            "issues.closed",
+            "issues.reopened",
+            "issues.deleted",
+            "issues.transferred",
+        ]
+    )
+
     def __init__(self, config: Config):
         self.config = config
         self.database = DatabaseManager()
@@ -137,8 +150,30 @@ class WebhookHandler:
             f"Processing webhook event: {event_key} for repository: {repo_name}"
         )
 
-        # Process the event
-        result = await self._process_event(event_key, payload, repo_name)
+        # Keep the local issue mirror current before acting on the event
+        issue_mirror = getattr(
+            self.pipeline_monitor.github_handler, "issue_mirror", None
+        )
+        if isinstance(issue_mirror, IssueMirror) and (
+            "issue" in payload or "pull_request" in payload
+        ):
+            try:
+                issue_mirror.apply_webhook(payload)
+            except Exception as e:
+                logger.warning(f"Failed to update issue mirror from webhook: {e}")
+
+        if event_key in self.STORY_CACHE_INVALIDATING_EVENTS:
+            try:
+                self.database.invalidate_github_story_cache(
+                    repo_name, payload["issue"].get("number")
+                )
+            except Exception as e:
+                logger.warning(f"Failed to invalidate cached stories: {e}")
+
+        # Process the event; webhook-driven GitHub requests use the critical
+        # lane so background scans cannot starve them of rate-limit budget
+        with request_priority("critical"):
+            result = await self._process_event(event_key, payload, repo_name)
 
         # Log the transition for audit trail
         await self._log_transition(event_key, payload, result, repo_name)
@@ -550,6 +585,14 @@ class WebhookHandler:
     async def _find_related_issues(self, pipeline_run, repo_name: str) -> List[int]:
         """Find GitHub issues related to the failed pipeline."""
         try:
+            github_handler = self.pipeline_monitor.github_handler
+            issue_mirror = getattr(github_handler, "issue_mirror", None)
+            if isinstance(issue_mirror, IssueMirror):
+                # Served from the local mirror instead of an API call per failure
+                await issue_mirror.ensure_fresh(repo_name)
+                issues = issue_mirror.get_issues(repo_name, state="open", limit=1)
+                return [issue["number"] for issue in issues]
+
             # Look for open issues in the repository
             issues = self.pipeline_monitor.github_handler.list_issues(
                 repository_name=repo_name, state="open", limit=10
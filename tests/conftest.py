@@ -17,6 +17,16 @@ os.environ["GITHUB_TOKEN"] = "test_token"
 os.environ["DEFAULT_LLM_PROVIDER"] = "github"
 
 
+@pytest.fixture(autouse=True)
+def isolated_github_schedulers():
+    """Give every test fresh process-wide GitHub request schedulers."""
+    from github_scheduler import reset_shared_schedulers
+
+    reset_shared_schedulers()
+    yield
+    reset_shared_schedulers()
+
+
 @pytest.fixture
 def temp_database():
     """Create a temporary database for testing."""
@@ -0,0 +1,207 @@
+"""Tests for the cross-repository API endpoint index."""
+
+import pytest
+from api_index import APIEndpointMap, extract_api_symbols, normalize_api_path
+from config import ContextStoreConfig
+from multi_repo_context import MultiRepositoryContextReader
+
+BACKEND_FILES = {
+    "cmd/server/main.go": """package main
+
+func main() {
+	r := mux.NewRouter()
+	api := r.PathPrefix("/api").Subrouter()
+	api.HandleFunc("/users/{id}", handlers.GetUser).Methods("GET")
+	http.HandleFunc("POST /api/orders", createOrder)
+	v1 := e.Group("/v1")
+	v1.DELETE("/items/:id", deleteItem)
+}
+""",
+    "internal/handlers/users.go": """package handlers
+
+func (h *Handlers) GetUser(w http.ResponseWriter, r *http.Request) {
+	id := mux.Vars(r)["id"]
+	h.write(w, h.users.Get(id))
+}
+""",
+    "internal/handlers/users_test.go": 'r.HandleFunc("/test-only", nil)\n',
+}
+
+PYTHON_FILES = {
+    "app/routes.py": """from fastapi import APIRouter
+
+router = APIRouter(prefix="/projects", tags=["projects"])
+
+
+@router.get("/{project_id}")
+async def get_project(project_id: int):
+    return {}
+
+
+@router.api_route("/{project_id}/archive", methods=["POST", "PUT"])
+async def archive_project(project_id: int):
+    return {}
+""",
+}
+
+FRONTEND_FILES = {
+    "src/api/client.ts": """const api = axios.create({ baseURL: API_URL });
+
+export const getUser = (id: string) => api.get(`/api/users/${id}`);
+
+export function createOrder(order: Order) {
+  return fetch(`${API_URL}/api/orders?draft=1`, {
+    method: "POST",
+    body: JSON.stringify(order),
+  });
+}
+
+export const archive = () => axios({ method: "put", url: "/projects/7/archive" });
+export const ping = () => fetch("https://status.example.com/ping");
+""",
+    "src/server.js": """const router = express.Router();
+router.get("/health", (req, res) => res.send("ok"));
+""",
+}
+
+
+def _index(files_by_repository):
+    symbols = []
+    for repository, files in files_by_repository.items():
+        for path, content in files.items():
+            for symbol in extract_api_symbols(path, content):
+                symbol.repository = repository
+                symbols.append(symbol)
+    return APIEndpointMap(symbols)
+
+
+class TestAPISymbolExtraction:
+    """Test cases for route and call extraction."""
+
+    def test_normalize_api_path(self):
+        for path in (
+            "/users/{id}",
+            "/users/:id/",
+            "/users/<int:id>",
+            "https://api.example.com/users/42?x=1",
+            "${API_URL}/users/${user.id}",
+            "/Users/[id]",
+        ):
+            assert normalize_api_path(path) == "/users/{}"
+
+    def test_routes_and_calls(self):
+        symbols = {
+            (s.kind, s.method, s.path, s.framework, s.name)
+            for files in (BACKEND_FILES, PYTHON_FILES, FRONTEND_FILES)
+            for path, content in files.items()
+            if not path.endswith("_test.go")
+            for s in extract_api_symbols(path, content)
+        }
+
+        assert symbols == {
+            ("route", "GET", "/api/users/{id}", "go", "GetUser"),
+            ("route", "POST", "/api/orders", "go", "createOrder"),
+            ("route", "DELETE", "/v1/items/:id", "go", "deleteItem"),
+            ("handler", "", "", "go", "GetUser"),
+            ("route", "GET", "/projects/{project_id}", "fastapi", "get_project"),
+            (
+                "route",
+                "POST",
+                "/projects/{project_id}/archive",
+                "fastapi",
+                "archive_project",
+            ),
+            (
+                "route",
+                "PUT",
+                "/projects/{project_id}/archive",
+                "fastapi",
+                "archive_project",
+            ),
+            ("call", "GET", "/api/users/${id}", "axios", None),
+            ("call", "POST", "${API_URL}/api/orders?draft=1", "fetch", None),
+            ("call", "PUT", "/projects/7/archive", "axios", None),
+            ("call", "GET", "https://status.example.com/ping", "fetch", None),
+            ("route", "GET", "/health", "express", None),
+        }
+
+    def test_endpoint_map_joins_repositories(self):
+        endpoint_map = _index(
+            {
+                "owner/backend": BACKEND_FILES,
+                "owner/projects": PYTHON_FILES,
+                "owner/frontend": FRONTEND_FILES,
+            }
+        )
+        endpoints = {(e.method, e.path): e for e in endpoint_map.endpoints}
+
+        user = endpoints[("GET", "/api/users/{}")]
+        assert user.repositories == ["owner/backend", "owner/frontend"]
+        assert [h.file_path for h in user.handlers] == ["internal/handlers/users.go"]
+        assert "mux.Vars(r)" in user.handlers[0].code
+        assert "api.get(`/api/users/${id}`)" in user.calls[0].code
+        assert len(endpoints[("POST", "/api/orders")].calls) == 1
+        assert len(endpoints[("PUT", "/projects/{}/archive")].calls) == 1
+        assert not endpoints[("POST", "/projects/{}/archive")].calls
+        assert [c.path for c in endpoint_map.unmatched_calls] == [
+            "https://status.example.com/ping"
+        ]
+
+        relevant = endpoint_map.search("As a customer I can place orders", limit=1)
+        assert [(e.method, e.path) for e in relevant] == [("POST", "/api/orders")]
+
+
+class TestStoredAPIIndex:
+    """Test cases for API symbols stored per blob SHA."""
+
+    @pytest.mark.asyncio
+    async def test_only_changed_files_scanned_again(self, tmp_path):
+        from fake_github import FakeGitHub
+        from github_benchmark import GitHubBenchmark
+
+        with FakeGitHub() as fake:
+            bench = GitHubBenchmark(
+                fake, repositories=2, files_per_repository=0, issues_per_repository=0
+            )
+            bench.config.context_store = ContextStoreConfig(
+                enabled=True, path=tmp_path / "context.db"
+            )
+            backend, frontend = bench.repository_names
+            fake.repositories[backend].files.update(BACKEND_FILES)
+            fake.repositories[frontend].files.update(FRONTEND_FILES)
+
+            def reader():
+                context_reader = MultiRepositoryContextReader(bench.config)
+                bench.prepare(context_reader.github_handler)
+                return context_reader
+
+            first = await reader().get_api_endpoints(bench.repository_keys)
+            user = next(e for e in first.endpoints if e.path == "/api/users/{}")
+            assert [c.repository for c in user.calls] == [frontend]
+
+            # After a restart the symbols of unchanged blobs come from the store
+            fake.reset_metrics()
+            restarted = await reader().get_api_endpoints(bench.repository_keys)
+            assert fake.snapshot_calls() == {"repos.get": 2, "branches.get": 2}
+            assert [e.to_dict() for e in restarted.endpoints] == [
+                e.to_dict() for e in first.endpoints
+            ]
+
+            # A commit changing one source file fetches only that blob
+            files = fake.repositories[frontend].files
+            files["src/api/client.ts"] += "export const cancel = (id) => "
+            files["src/api/client.ts"] += "api.post(`/api/orders/${id}/cancel`);\n"
+            context_reader = reader()
+            fake.reset_metrics()
+            changed = await context_reader.get_api_endpoints(bench.repository_keys)
+            assert fake.snapshot_calls() == {
+                "repos.get": 2,
+                "branches.get": 2,
+                "git.trees.get": 1,
+                "graphql": 1,
+            }
+            assert [c.path for c in changed.unmatched_calls] == [
+                "/projects/7/archive",
+                "https://status.example.com/ping",
+                "/api/orders/${id}/cancel",
+            ]
@@ -0,0 +1,221 @@
+"""Tests for batched multi-role analysis in story processing and discussions."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from config import Config
+from discussion_engine import DiscussionEngine
+from llm_handler import LLMResponse
+from models import DiscussionThread, RolePerspective
+from story_manager import StoryAnalysis, StoryProcessor
+
+
+def _response(content: str) -> LLMResponse:
+    return LLMResponse(content=content, model="test-model", provider="test")
+
+
+@pytest.fixture
+def processor():
+    """Create a story processor with mocked collaborators."""
+    config = Config(github_token="test_token", batched_role_analysis=True)
+    with (
+        patch("story_manager.LLMHandler") as mock_llm,
+        patch("story_manager.GitHubHandler"),
+        patch("story_manager.DatabaseManager"),
+        patch("story_manager.RoleAssignmentEngine"),
+        patch("story_manager.MultiRepositoryContextReader"),
+        patch(
+            "story_manager.load_role_files",
+            return_value={
+                "system-architect": "Architecture role",
+                "lead-developer": "Development role",
+                "qa-engineer": "QA role",
+            },
+        ),
+    ):
+        mock_llm.return_value = MagicMock()
+        yield StoryProcessor(config)
+
+
+class TestBatchedExpertAnalysis:
+    """Test cases for batched expert analysis in StoryProcessor."""
+
+    @pytest.mark.asyncio
+    async def test_single_request_covers_all_roles(self, processor):
+        """All roles answered in one request means no per-role calls."""
+        processor.llm_handler.analyze_story_with_roles = AsyncMock(
+            return_value=_response(
+                json.dumps(
+                    {
+                        "analyses": [
+                            {
+                                "role_name": "system-architect",
+                                "analysis": "Solid design",
+                                "recommendations": ["Use caching"],
+                                "concerns": ["Scaling"],
+                            },
+                            {
+                                "role_name": "lead-developer",
+                                "analysis": "Feasible",
+                                "recommendations": [],
+                                "concerns": [],
+                            },
+                        ]
+                    }
+                )
+            )
+        )
+        processor.llm_handler.analyze_story_with_role = AsyncMock()
+
+        analyses = await processor.process_story_with_experts(
+            "As a user I want X", ["system-architect", "lead-developer"]
+        )
+
+        assert [a.role_name for a in analyses] == [
+            "system-architect",
+            "lead-developer",
+        ]
+        assert analyses[0].recommendations == ["Use caching"]
+        assert analyses[0].metadata["batched"] is True
+        processor.llm_handler.analyze_story_with_roles.assert_awaited_once()
+        processor.llm_handler.analyze_story_with_role.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_missing_roles_fall_back_to_individual_calls(self, processor):
+        """Roles missing or invalid in the batched reply are requested one by one."""
+        processor.llm_handler.analyze_story_with_roles = AsyncMock(
+            return_value=_response(
+                json.dumps(
+                    {
+                        "analyses": [
+                            {"role_name": "system-architect", "analysis": "Good"},
+                            {"role_name": "lead-developer", "analysis": ""},
+                            {"role_name": "unknown-role", "analysis": "Ignored"},
+                        ]
+                    }
+                )
+            )
+        )
+        processor.llm_handler.analyze_story_with_role = AsyncMock(
+            return_value=_response("We should add tests.")
+        )
+
+        analyses = await processor.process_story_with_experts(
+            "Story", ["system-architect", "lead-developer", "qa-engineer"]
+        )
+
+        assert [a.role_name for a in analyses] == [
+            "system-architect",
+            "lead-developer",
+            "qa-engineer",
+        ]
+        called_roles = [
+            call.kwargs["role_name"]
+            for call in processor.llm_handler.analyze_story_with_role.await_args_list
+        ]
+        assert sorted(called_roles) == ["lead-developer", "qa-engineer"]
+
+    @pytest.mark.asyncio
+    async def test_unparseable_batch_falls_back_for_every_role(self, processor):
+        """A non-JSON batched reply degrades to the per-role workflow."""
+        processor.llm_handler.analyze_story_with_roles = AsyncMock(
+            return_value=_response("Sorry, I cannot do that.")
+        )
+        processor.llm_handler.analyze_story_with_role = AsyncMock(
+            return_value=_response("Analysis text")
+        )
+
+        analyses = await processor.process_story_with_experts(
+            "Story", ["system-architect", "lead-developer"]
+        )
+
+        assert len(analyses) == 2
+        assert processor.llm_handler.analyze_story_with_role.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_batching_disabled_uses_per_role_calls(self, processor):
+        """Explicitly disabling batching skips the batched request."""
+        processor.llm_handler.analyze_story_with_roles = AsyncMock()
+        processor.llm_handler.analyze_story_with_role = AsyncMock(
+            return_value=_response("Analysis text")
+        )
+
+        analyses = await processor.process_story_with_experts(
+            "Story", ["system-architect", "lead-developer"], batched=False
+        )
+
+        assert all(isinstance(a, StoryAnalysis) for a in analyses)
+        processor.llm_handler.analyze_story_with_roles.assert_not_called()
+
+
+class TestBatchedPerspectives:
+    """Test cases for batched initial perspectives in DiscussionEngine."""
+
+    @pytest.fixture
+    def engine(self):
+        config = Config(github_token="test_token", batched_role_analysis=True)
+        with (
+            patch("discussion_engine.DatabaseManager"),
+            patch("discussion_engine.LLMHandler") as mock_llm,
+            patch("discussion_engine.RoleAssignmentEngine"),
+            patch("discussion_engine.MultiRepositoryContextReader"),
+        ):
+            mock_llm.return_value = MagicMock()
+            yield DiscussionEngine(config)
+
+    @pytest.mark.asyncio
+    async def test_batched_perspectives_with_fallback(self, engine):
+        """Batched perspectives are used and only missing roles are re-requested."""
+        batched_reply = json.dumps(
+            {
+                "perspectives": [
+                    {
+                        "role_name": "product-owner",
+                        "viewpoint": "High business value",
+                        "arguments": ["Users asked for it"],
+                        "concerns": [],
+                        "suggestions": ["Ship an MVP"],
+                        "confidence_level": 0.9,
+                    }
+                ]
+            }
+        )
+        engine.llm_handler.generate_response = AsyncMock(
+            side_effect=[
+                _response(batched_reply),
+                _response("Viewpoint: Needs tests\nConcerns:\n- Coverage"),
+            ]
+        )
+
+        thread = DiscussionThread(conversation_id="conv_1", topic="Feature")
+        await engine._generate_initial_perspectives(
+            thread, "Story", ["product-owner", "qa-engineer"], ["backend"]
+        )
+
+        roles = {p.role_name: p for p in thread.perspectives}
+        assert set(roles) == {"product-owner", "qa-engineer"}
+        assert roles["product-owner"].confidence_level == 0.9
+        assert roles["product-owner"].metadata["batched"] is True
+        assert engine.llm_handler.generate_response.await_count == 2
+
+    def test_parse_batched_perspectives_rejects_invalid_entries(self, engine):
+        """Entries with unknown roles or no viewpoint are dropped."""
+        content = json.dumps(
+            {
+                "perspectives": [
+                    {"role_name": "qa-engineer", "viewpoint": "Test first"},
+                    {"role_name": "qa-engineer", "viewpoint": "Duplicate"},
+                    {"role_name": "intruder", "viewpoint": "Not requested"},
+                    {"role_name": "product-owner"},
+                ]
+            }
+        )
+
+        perspectives = engine._parse_batched_perspectives(
+            content, ["qa-engineer", "product-owner"], ["backend"]
+        )
+
+        assert list(perspectives) == ["qa-engineer"]
+        assert isinstance(perspectives["qa-engineer"], RolePerspective)
+        assert perspectives["qa-engineer"].viewpoint == "Test first"
@@ -0,0 +1,152 @@
+"""Tests for story-aware BM25 ranking of repository content."""
+
+import asyncio
+
+import pytest
+from context_ranking import (
+    ChunkIndex,
+    ContentChunk,
+    index_terms,
+    normalize_scores,
+    pack_chunks,
+    split_chunks,
+)
+from multi_repo_context import MultiRepositoryContextReader
+
+FILES = {
+    "README.md": "# Shop\n\nAn online shop with accounts, payments and a catalog.\n",
+    "src/auth/password_reset.py": """import secrets
+
+
+def create_reset_token(user):
+    \"\"\"Create a password reset token and email it to the user.\"\"\"
+    token = secrets.token_urlsafe()
+    send_email(user.email, f"Reset your password: {token}")
+    return token
+""",
+    "src/payments/refunds.py": """def refund_payment(payment, amount):
+    \"\"\"Refund part of a captured payment.\"\"\"
+    if amount > payment.captured:
+        raise ValueError("Refund exceeds captured amount")
+    return gateway.refund(payment.id, amount)
+""",
+    "src/catalog/search.py": """def search_products(query):
+    return Product.objects.filter(name__icontains=query)
+""",
+    "node_modules/lib/index.js": "function resetPassword() {}\n",
+}
+
+
+class TestChunkIndex:
+    """Test cases for ChunkIndex and its helpers."""
+
+    def test_index_terms(self):
+        assert index_terms("getUserPasswords(reset_token)") == [
+            "getuserpassword",
+            "get",
+            "user",
+            "password",
+            "resettoken",
+            "reset",
+            "token",
+        ]
+
+    def test_split_chunks_at_blank_lines(self):
+        content = "\n".join(["a = 1"] * 25 + [""] + ["b = 2"] * 50)
+        assert [(start, end) for start, end, _ in split_chunks(content, 40)] == [
+            (1, 26),
+            (27, 66),
+            (67, 76),
+        ]
+
+    def test_story_ranks_relevant_chunks(self):
+        index = ChunkIndex.build("owner/shop", FILES)
+
+        ranked = index.search("As a customer I want to reset my forgotten password")
+        assert ranked[0].path == "src/auth/password_reset.py"
+        assert ranked[0].score > 0
+        ranked = index.search("Support staff can refund a payment partially")
+        assert ranked[0].path == "src/payments/refunds.py"
+        assert index.search("quantum entanglement") == []
+
+    def test_pack_chunks_into_budget(self):
+        chunks = [
+            ContentChunk("repo", path, 1, 1, "x" * size)
+            for path, size in (("a", 400), ("b", 800), ("c", 200), ("d", 40))
+        ]
+        # 100 + 200 tokens would exceed the budget; c and d still fit
+        packed = pack_chunks(chunks, token_budget=200)
+        assert [c.path for c in packed] == ["a", "c", "d"]
+        assert sum(c.tokens for c in packed) <= 200
+
+    def test_scores_normalized_per_repository(self):
+        large = ChunkIndex.build("owner/large", FILES)
+        small = ChunkIndex.build(
+            "owner/small", {"docs/password.md": "Password reset emails expire."}
+        )
+        story = "Reset a forgotten password"
+
+        ranked = [
+            *normalize_scores(large.search(story)),
+            *normalize_scores(small.search(story)),
+        ]
+        top = [c for c in ranked if c.score == 1.0]
+        assert sorted(c.repository for c in top) == ["owner/large", "owner/small"]
+        assert all(0 < c.score <= 1.0 for c in ranked)
+        assert normalize_scores([]) == []
+
+
+class TestStoryContext:
+    """Test cases for MultiRepositoryContextReader.get_story_context."""
+
+    @pytest.mark.asyncio
+    async def test_index_built_once_per_commit(self):
+        from fake_github import FakeGitHub
+        from github_benchmark import GitHubBenchmark
+
+        with FakeGitHub() as fake:
+            bench = GitHubBenchmark(
+                fake, repositories=1, files_per_repository=0, issues_per_repository=0
+            )
+            name = bench.repository_names[0]
+            fake.repositories[name].files = dict(FILES)
+            reader = MultiRepositoryContextReader(bench.config)
+            bench.prepare(reader.github_handler)
+
+            story = "Reset a forgotten password"
+            chunks = await reader.get_story_context(story, token_budget=100)
+            assert [c.path for c in chunks] == ["src/auth/password_reset.py"]
+            assert chunks[0].repository == name
+            assert "create_reset_token" in chunks[0].content
+
+            # The same commit reuses its index: only the head is resolved
+            fake.reset_metrics()
+            refund = await reader.get_story_context("Refund a payment")
+            assert fake.snapshot_calls() == {"branches.get": 1}
+            assert refund[0].path == "src/payments/refunds.py"
+
+            # A new commit is indexed again
+            files = fake.repositories[name].files
+            files["src/auth/password_reset.py"] += "\n\ndef expire_reset_tokens():\n"
+            chunks = await reader.get_story_context("Expire reset tokens")
+            assert "expire_reset_tokens" in chunks[0].content
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_index(self):
+        from fake_github import FakeGitHub
+        from github_benchmark import GitHubBenchmark
+
+        with FakeGitHub() as fake:
+            bench = GitHubBenchmark(
+                fake, repositories=1, files_per_repository=0, issues_per_repository=0
+            )
+            fake.repositories[bench.repository_names[0]].files = dict(FILES)
+            reader = MultiRepositoryContextReader(bench.config)
+            bench.prepare(reader.github_handler)
+            key = next(iter(bench.config.repositories))
+
+            first, second = await asyncio.gather(
+                reader._get_chunk_index(key), reader._get_chunk_index(key)
+            )
+            # Joiners get the built index itself, not a deep copy
+            assert first is second
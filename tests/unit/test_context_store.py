@@ -0,0 +1,99 @@
+"""Tests for the commit-keyed repository context store."""
+
+import pytest
+from config import ContextStoreConfig
+from context_store import RepositoryContextStore
+from multi_repo_context import MultiRepositoryContextReader
+
+
+class TestRepositoryContextStore:
+    """Test cases for RepositoryContextStore."""
+
+    def test_snapshots_by_commit(self, tmp_path):
+        store = RepositoryContextStore(tmp_path / "context.db")
+        for index in range(RepositoryContextStore.SNAPSHOTS_PER_REPOSITORY + 2):
+            store.put_snapshot(
+                "owner/repo",
+                f"commit{index}",
+                f"tree{index}",
+                {"name": "owner/repo"},
+                {"README.md": f"blob{index}"},
+            )
+
+        latest = store.get_latest_snapshot("owner/repo")
+        assert latest["commit_sha"] == "commit6"
+        assert latest["files"] == {"README.md": "blob6"}
+        assert store.get_snapshot("owner/repo", "commit6")["tree_sha"] == "tree6"
+        # Only the most recent snapshots of a repository are kept
+        assert store.get_snapshot("owner/repo", "commit1") is None
+        assert store.get_snapshot("owner/other", "commit6") is None
+
+        # Contents survive reopening the store
+        store.put_blobs({"blob6": "# Repo", "binary": None})
+        store.close()
+        store = RepositoryContextStore(tmp_path / "context.db")
+        assert store.get_blobs(["blob6", "binary", "unknown"]) == {
+            "blob6": "# Repo",
+            "binary": None,
+        }
+
+    def test_least_recently_used_blobs_evicted(self):
+        store = RepositoryContextStore(":memory:", max_size_bytes=10)
+        store.put_blobs({"a": "12345"})
+        store.put_blobs({"b": "12345"})
+        store.get_blobs(["a"])
+        store.put_blobs({"c": "12345"})
+
+        assert set(store.get_blobs(["a", "b", "c"])) == {"a", "c"}
+
+
+class TestStoredRepositoryContext:
+    """Test cases for MultiRepositoryContextReader with the context store."""
+
+    @pytest.mark.asyncio
+    async def test_restart_and_small_commit_fetch_only_changes(self, tmp_path):
+        from fake_github import FakeGitHub
+        from github_benchmark import GitHubBenchmark
+
+        with FakeGitHub() as fake:
+            bench = GitHubBenchmark(
+                fake, repositories=1, files_per_repository=8, issues_per_repository=0
+            )
+            bench.config.context_store = ContextStoreConfig(
+                enabled=True, path=tmp_path / "context.db"
+            )
+            key, name = bench.repository_keys[0], bench.repository_names[0]
+            for index in range(3):
+                fake.repositories[name].files[f"docs/guide_{index}.md"] = f"# {index}"
+
+            def reader():
+                context_reader = MultiRepositoryContextReader(bench.config)
+                bench.prepare(context_reader.github_handler)
+                return context_reader
+
+            first = await reader().get_repository_context(key)
+            assert len(first.key_files) == 4
+
+            # After a restart only the branch head is resolved
+            fake.reset_metrics()
+            restarted = await reader().get_repository_context(key)
+            assert fake.snapshot_calls() == {"repos.get": 1, "branches.get": 1}
+            assert [f.content for f in restarted.key_files] == [
+                f.content for f in first.key_files
+            ]
+
+            # A commit touching one file costs the tree and that one blob
+            fake.repositories[name].files["README.md"] = "# Changed\n"
+            context_reader = reader()
+            fake.reset_metrics()
+            changed = await context_reader.get_repository_context(key)
+            assert fake.snapshot_calls() == {
+                "repos.get": 1,
+                "branches.get": 1,
+                "git.trees.get": 1,
+                "graphql": 1,
+            }
+            assert context_reader.context_store.stats["blob_misses"] == 1
+            readme = next(f for f in changed.key_files if f.path == "README.md")
+            assert readme.content == "# Changed\n"
+            assert changed.structure["languages"] == first.structure["languages"]
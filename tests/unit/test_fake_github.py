@@ -0,0 +1,135 @@
+"""Tests for the local GitHub stand-in and the benchmark harness."""
+
+import asyncio
+import time
+
+import pytest
+import requests
+from config import Config
+from fake_github import FakeGitHub
+from github_benchmark import run_benchmarks
+from github_handler import GitHubHandler, IssueData
+
+
+@pytest.fixture
+def fake():
+    with FakeGitHub() as server:
+        server.add_repository(
+            "org/app",
+            files={"README.md": "# App\n", "src/app.py": "print('hi')\n"},
+        )
+        yield server
+
+
+@pytest.fixture
+def handler(fake):
+    return GitHubHandler(Config(github_token="token", github_api_url=fake.url))
+
+
+class TestFakeGitHub:
+    """Test cases for FakeGitHub driven through GitHubHandler."""
+
+    @pytest.mark.asyncio
+    async def test_issue_lifecycle(self, fake, handler):
+        issue = await handler.create_issue(
+            IssueData(title="Story", body="Body", labels=["epic"], assignees=[]),
+            "org/app",
+        )
+        await handler.add_issue_comment("org/app", issue.number, "Hello")
+
+        assert fake.repositories["org/app"].issues[1]["labels"] == ["epic"]
+        assert fake.repositories["org/app"].comments[1][0]["body"] == "Hello"
+        assert fake.calls["issues.create"] == 1
+        assert fake.calls["issues.comments.create"] == 1
+
+    @pytest.mark.asyncio
+    async def test_trees_contents_and_graphql(self, fake, handler):
+        files = await handler.list_repository_files("org/app", recursive=True)
+        contents = await handler.get_file_contents(
+            "org/app", ["README.md", "missing.md"]
+        )
+
+        assert files == [("README.md", "file"), ("src/app.py", "file")]
+        assert contents == {"README.md": "# App\n", "missing.md": None}
+        assert fake.calls["graphql"] == 1
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_headers_reach_scheduler(self, handler):
+        await handler.get_file_content("org/app", "README.md")
+
+        budget = handler.get_rate_limit_metrics()["budgets"]["core"]
+        assert budget["limit"] == 5000
+        assert budget["remaining"] < 5000
+
+    @pytest.mark.asyncio
+    async def test_secondary_rate_limit_pauses_all_lanes(self, fake, handler):
+        await handler.get_file_content("org/app", "README.md")
+        fake.reset_metrics()
+        fake.trigger_secondary_rate_limit(retry_after=1)
+
+        started = time.perf_counter()
+        with handler.request_priority("background"):
+            background = asyncio.create_task(
+                handler.get_file_content("org/app", "README.md")
+            )
+        # PyGithub hands the 403 to the scheduler instead of retrying it
+        while not handler.scheduler.paused_until:
+            await asyncio.sleep(0.01)
+        assert time.perf_counter() - started < 0.5
+
+        with handler.request_priority("critical"):
+            assert await handler.get_file_content("org/app", "README.md") == "# App\n"
+        assert time.perf_counter() - started >= 0.9
+        assert await background == "# App\n"
+
+        assert fake.calls["contents.get"] == 3
+        assert handler.get_rate_limit_metrics()["secondary_limit_hits"] == 1
+
+    def test_rate_limit_exhaustion_and_conditional_requests(self):
+        with FakeGitHub(rate_limit=2) as fake:
+            fake.add_repository("org/app")
+            url = f"{fake.url}/repos/org/app"
+
+            first = requests.get(url)
+            revalidated = requests.get(
+                url, headers={"If-None-Match": first.headers["ETag"]}
+            )
+            second = requests.get(url)
+            exhausted = requests.get(url)
+
+        assert revalidated.status_code == 304
+        assert second.headers["X-RateLimit-Remaining"] == "0"
+        assert exhausted.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_failure_injection(self, fake, handler):
+        fake.fail_next("graphql", status=502)
+
+        contents = await handler.get_file_contents("org/app", ["README.md"])
+
+        # The failed batch falls back to REST
+        assert contents == {"README.md": "# App\n"}
+        assert fake.calls["contents.get"] == 1
+
+
+class TestGitHubBenchmark:
+    """Test cases for the benchmark harness."""
+
+    def test_reports_calls_per_scenario(self):
+        results = run_benchmarks(
+            ["project_sync", "project_sync_unchanged", "storage_save_epic"],
+            repositories=2,
+            files_per_repository=2,
+            issues_per_repository=8,
+        )
+
+        by_name = {result.name: result for result in results}
+        assert all(result.error is None for result in results)
+        assert by_name["project_sync"].calls_by_route == {"graphql": 4}
+        # An unchanged re-sync only checks its items still exist
+        assert by_name["project_sync_unchanged"].calls_by_route == {"graphql": 1}
+        assert by_name["storage_save_epic"].calls_by_route["issues.create"] == 1
+
+    def test_unknown_scenario(self):
+        with pytest.raises(ValueError):
+            run_benchmarks(["nope"])
@@ -0,0 +1,125 @@
+"""Tests for the conditional-request GitHub HTTP cache."""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+import requests
+from config import Config, GitHubCacheConfig
+from github_cache import ConditionalCacheAdapter, GitHubHTTPCache
+from github_handler import GitHubHandler
+from requests.structures import CaseInsensitiveDict
+
+REPO_JSON = {"id": 1, "name": "repo", "full_name": "owner/repo"}
+
+
+def _response(request, status, body=b"", headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.url = request.url
+    response.request = request
+    return response
+
+
+class FakeGitHub:
+    """Stand-in for the network that honours If-None-Match."""
+
+    def __init__(self):
+        self.requests = []
+        self.etag = '"v1"'
+        self.body = REPO_JSON
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        if request.headers.get("If-None-Match") == self.etag:
+            return _response(request, 304, headers={"X-RateLimit-Remaining": "4999"})
+        return _response(
+            request,
+            200,
+            json.dumps(self.body).encode(),
+            {"ETag": self.etag, "Content-Type": "application/json"},
+        )
+
+
+@pytest.fixture
+def fake_github():
+    server = FakeGitHub()
+    with patch.object(
+        requests.adapters.HTTPAdapter,
+        "send",
+        lambda adapter, request, **kwargs: server.send(request, **kwargs),
+    ):
+        yield server
+
+
+@pytest.fixture
+def handler(tmp_path):
+    config = Config(
+        github_token="test_token",
+        github_cache=GitHubCacheConfig(enabled=True, path=tmp_path / "cache.db"),
+    )
+    return GitHubHandler(config)
+
+
+class TestGitHubHTTPCache:
+    """Test cases for ETag revalidation through PyGithub."""
+
+    def test_unchanged_resource_is_served_from_304(self, handler, fake_github):
+        first = handler.github.get_repo("owner/repo")
+        second = handler.github.get_repo("owner/repo")
+
+        assert first.full_name == second.full_name == "owner/repo"
+        assert "If-None-Match" not in fake_github.requests[0].headers
+        assert fake_github.requests[1].headers["If-None-Match"] == '"v1"'
+        stats = handler.get_http_cache_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_counters_are_exact_under_concurrent_requests(self, tmp_path, fake_github):
+        cache = GitHubHTTPCache(tmp_path / "cache.db")
+        session = requests.Session()
+        session.mount("https://", ConditionalCacheAdapter(cache))
+        url = "https://api.github.com/repos/owner/repo"
+        session.get(url)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: session.get(url), range(200)))
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 200
+        assert stats["misses"] == 1
+        cache.close()
+
+    def test_changed_resource_replaces_cached_body(self, handler, fake_github):
+        handler.github.get_repo("owner/repo")
+        fake_github.etag = '"v2"'
+        fake_github.body = {**REPO_JSON, "full_name": "owner/renamed"}
+
+        assert handler.github.get_repo("owner/repo").full_name == "owner/renamed"
+        assert handler.github.get_repo("owner/repo").full_name == "owner/renamed"
+        assert handler.get_http_cache_stats()["hits"] == 1
+
+    def test_cache_disabled_by_default(self):
+        handler = GitHubHandler(Config(github_token="test_token"))
+
+        assert handler.get_http_cache_stats() == {"enabled": False}
+
+
+def test_lru_eviction_respects_entry_and_size_limits(tmp_path):
+    cache = GitHubHTTPCache(tmp_path / "cache.db", max_entries=2, max_size_bytes=10)
+    headers = {"ETag": '"x"'}
+
+    cache.put("a", "https://api.github.com/a", 200, headers, b"1234")
+    cache.put("b", "https://api.github.com/b", 200, headers, b"1234")
+    cache.touch("a")
+    cache.put("c", "https://api.github.com/c", 200, headers, b"1234")
+
+    assert cache.get("b") is None
+    assert cache.get("a")["body"] == b"1234"
+    assert not cache.put("d", "https://api.github.com/d", 200, headers, b"x" * 11)
+    assert not cache.put("e", "https://api.github.com/e", 200, {}, b"1")
+    assert cache.get_stats()["evictions"] == 1
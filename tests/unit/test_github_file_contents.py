@@ -0,0 +1,102 @@
+"""Tests for batched file-content fetching in GitHubHandler."""
+
+import base64
+from unittest.mock import MagicMock, patch
+
+import pytest
+from config import Config
+from github_handler import GitHubHandler, decode_base64_text
+
+
+@pytest.fixture
+def handler():
+    with patch("github_handler.Github"):
+        yield GitHubHandler(Config(github_token="test_token"))
+
+
+def _blob(text, byte_size=None, truncated=False, binary=False):
+    return {
+        "object": {
+            "byteSize": byte_size if byte_size is not None else len(text or ""),
+            "isBinary": binary,
+            "isTruncated": truncated,
+            "text": text,
+        }
+    }
+
+
+class TestDecodeBase64Text:
+    """Test cases for decode_base64_text."""
+
+    def test_decodes_in_chunks(self):
+        text = "héllo wörld\n" * 500
+        encoded = base64.encodebytes(text.encode("utf-8")).decode("ascii")
+
+        assert decode_base64_text(encoded, chunk_size=61) == text
+
+    def test_stops_at_max_bytes_on_character_boundary(self):
+        encoded = base64.b64encode(("aé" * 100).encode("utf-8")).decode("ascii")
+
+        assert decode_base64_text(encoded, max_bytes=3) == "aé"
+        assert decode_base64_text(encoded, max_bytes=5) == "aéa"
+
+
+class TestGetFileContents:
+    """Test cases for GitHubHandler.get_file_contents."""
+
+    @pytest.mark.asyncio
+    async def test_single_graphql_request(self, handler):
+        handler._execute_graphql_request = MagicMock(
+            return_value={
+                "data": {
+                    "op0": _blob("print('a')"),
+                    "op1": {"object": None},
+                    "op2": _blob(None, binary=True),
+                }
+            }
+        )
+        handler.get_file_content = MagicMock()
+
+        contents = await handler.get_file_contents(
+            "owner/repo", ["a.py", "missing.py", "logo.png"]
+        )
+
+        assert contents == {"a.py": "print('a')", "missing.py": None, "logo.png": None}
+        handler._execute_graphql_request.assert_called_once()
+        document, variables = handler._execute_graphql_request.call_args[0]
+        assert 'object(expression: "HEAD:a.py")' in document
+        assert variables["owner0"] == "owner"
+        handler.get_file_content.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_caps_file_size(self, handler):
+        handler._execute_graphql_request = MagicMock(
+            return_value={"data": {"op0": _blob("x" * 50)}}
+        )
+
+        contents = await handler.get_file_contents(
+            "owner/repo", ["big.txt"], max_file_size=10
+        )
+
+        assert contents == {"big.txt": "x" * 10}
+
+    @pytest.mark.asyncio
+    async def test_truncated_and_failed_files_use_rest(self, handler):
+        handler._execute_graphql_request = MagicMock(
+            return_value={
+                "data": {"op0": _blob("partial", byte_size=500, truncated=True)},
+                "errors": [{"path": ["op1"], "message": "boom"}],
+            }
+        )
+        content_file = MagicMock(
+            encoding="base64",
+            content=base64.b64encode(b"full content").decode("ascii"),
+        )
+        repo = MagicMock()
+        repo.get_contents.return_value = content_file
+        handler.get_repository = MagicMock(return_value=repo)
+
+        contents = await handler.get_file_contents("owner/repo", ["big.md", "b.py"])
+
+        assert contents == {"big.md": "full content", "b.py": "full content"}
+        assert repo.get_contents.call_count == 2
@@ -0,0 +1,105 @@
+"""Tests for non-blocking GitHub calls in GitHubHandler."""
+
+import asyncio
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from config import Config, RepositoryConfig
+from github_handler import GitHubHandler
+
+
+def _slow(result, delay=0.2):
+    def _call(*args, **kwargs):
+        time.sleep(delay)
+        return result
+
+    return _call
+
+
+@pytest.fixture
+def handler():
+    with patch("github_handler.Github"):
+        yield GitHubHandler(Config(github_token="test_token"))
+
+
+class TestNonBlockingGitHubHandler:
+    """Test cases for thread-pool offloading of blocking GitHub calls."""
+
+    @pytest.mark.asyncio
+    async def test_file_fetches_overlap(self, handler):
+        """Concurrent file fetches run in parallel instead of serially."""
+        content_file = MagicMock(encoding=None, content="print('hi')")
+        repo = MagicMock()
+        repo.get_contents.side_effect = _slow(content_file)
+        handler.get_repository = MagicMock(return_value=repo)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *[handler.get_file_content("owner/repo", f"f{i}.py") for i in range(4)]
+        )
+        elapsed = time.perf_counter() - started
+
+        assert results == ["print('hi')"] * 4
+        assert elapsed < 0.6  # Serial execution would take at least 0.8s
+
+    @pytest.mark.asyncio
+    async def test_event_loop_stays_responsive(self, handler):
+        """A blocking GraphQL request does not freeze other coroutines."""
+        handler._execute_graphql_query = MagicMock(side_effect=_slow({"ok": True}))
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.02)
+
+        result, _ = await asyncio.gather(
+            handler._execute_graphql_query_async("query { viewer { login } }"),
+            ticker(),
+        )
+
+        assert result == {"ok": True}
+        assert len(ticks) == 5
+        assert ticks[-1] - ticks[0] < 0.15
+
+    @pytest.mark.asyncio
+    async def test_update_issue_sends_single_edit(self, handler):
+        """All changed fields are applied with one edit request."""
+        issue = MagicMock()
+        repo = MagicMock()
+        repo.get_issue.return_value = issue
+        handler.get_repository = MagicMock(return_value=repo)
+
+        await handler.update_issue(
+            "owner/repo", 7, title="New", labels=["bug"], state="Closed"
+        )
+
+        issue.edit.assert_called_once_with(title="New", labels=["bug"], state="closed")
+
+    @pytest.mark.asyncio
+    async def test_cross_references_one_comment_per_issue(self, handler):
+        """Cross-repository stories are linked with O(n) comments."""
+        repos = ["backend", "frontend", "storyteller", "docs"]
+        handler.config.repositories = {
+            key: RepositoryConfig(name=f"owner/{key}", type="backend", description="")
+            for key in repos
+        }
+        issues = {}
+        for number, key in enumerate(repos, start=1):
+            issues[key] = MagicMock(number=number)
+            issues[key].repository.full_name = f"owner/{key}"
+
+        async def create_story_issue(repository_key, **kwargs):
+            return issues[repository_key]
+
+        handler.create_story_issue = create_story_issue
+
+        created = await handler.create_cross_repository_stories("story", "", repos)
+
+        assert len(created) == 4
+        for issue in issues.values():
+            issue.create_comment.assert_called_once()
+            comment = issue.create_comment.call_args[0][0]
+            assert comment.count("\n- ") == 3
+            assert f"{issue.repository.full_name}#" not in comment
@@ -0,0 +1,231 @@
+"""Tests for the rate-limit-aware GitHub request scheduler."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import github_scheduler
+import pytest
+from config import Config
+from github.GithubException import GithubException
+from github_handler import GitHubHandler
+from github_scheduler import GitHubRequestScheduler, request_priority
+
+
+def _rate_headers(remaining, reset_in=60.0, resource="core", limit=5000):
+    return {
+        "X-RateLimit-Resource": resource,
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(time.time() + reset_in),
+    }
+
+
+class TestGitHubRequestScheduler:
+    """Test cases for GitHubRequestScheduler."""
+
+    @pytest.mark.asyncio
+    async def test_critical_lane_runs_before_queued_background_work(self):
+        scheduler = GitHubRequestScheduler(max_concurrency=1)
+        release = asyncio.Event()
+        order = []
+
+        async def blocker():
+            await release.wait()
+
+        async def record(name):
+            order.append(name)
+
+        running = asyncio.create_task(scheduler.run(blocker))
+        await asyncio.sleep(0)
+        background = asyncio.create_task(
+            scheduler.run(lambda: record("background"), priority="background")
+        )
+        await asyncio.sleep(0)
+        with request_priority("critical"):
+            critical = asyncio.create_task(scheduler.run(lambda: record("critical")))
+        await asyncio.sleep(0)
+
+        assert scheduler.get_metrics()["queued"] == {
+            "critical": 1,
+            "normal": 0,
+            "background": 1,
+        }
+        release.set()
+        await asyncio.gather(running, background, critical)
+
+        assert order == ["critical", "background"]
+        assert scheduler.get_metrics()["completed"]["background"] == 1
+
+    @pytest.mark.asyncio
+    async def test_background_waits_for_reset_when_budget_is_reserved(self):
+        scheduler = GitHubRequestScheduler(critical_reserve=5, background_reserve=100)
+        scheduler.update_from_headers(_rate_headers(remaining=50, reset_in=0.3))
+        finished = {}
+
+        async def record(name):
+            finished[name] = time.perf_counter()
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            scheduler.run(lambda: record("background"), priority="background"),
+            scheduler.run(lambda: record("normal"), priority="normal"),
+        )
+
+        assert finished["normal"] - started < 0.1
+        assert finished["background"] - started >= 0.25
+        assert scheduler.get_metrics()["deferred"] == 1
+
+    def test_malformed_headers_are_ignored(self):
+        scheduler = GitHubRequestScheduler()
+        scheduler.update_from_headers(_rate_headers(remaining=100))
+
+        scheduler.update_from_headers(MagicMock())
+        scheduler.update_from_headers({"X-RateLimit-Remaining": MagicMock()})
+        scheduler.update_from_headers({"X-RateLimit-Remaining": "lots"})
+
+        budgets = scheduler.get_metrics()["budgets"]
+        assert set(budgets) == {"core", "graphql"}
+        assert budgets["core"]["remaining"] == 100
+
+    @pytest.mark.asyncio
+    async def test_reserved_budget_without_reset_is_rechecked(self, monkeypatch):
+        monkeypatch.setattr(github_scheduler, "BUDGET_RECHECK_SECONDS", 0.2)
+        scheduler = GitHubRequestScheduler(critical_reserve=5, background_reserve=100)
+        scheduler.update_from_headers({"X-RateLimit-Remaining": "50"})
+
+        async def scan():
+            return "scanned"
+
+        # Nothing is in flight, so no release would ever wake the lane
+        started = time.perf_counter()
+        result = await asyncio.wait_for(
+            scheduler.run(scan, priority="background"), timeout=2
+        )
+
+        assert result == "scanned"
+        assert time.perf_counter() - started >= 0.15
+        assert scheduler.get_metrics()["deferred"] == 1
+
+    @pytest.mark.asyncio
+    async def test_secondary_rate_limit_backs_off_and_retries(self):
+        scheduler = GitHubRequestScheduler()
+        attempts = []
+
+        async def call():
+            attempts.append(time.perf_counter())
+            if len(attempts) == 1:
+                raise GithubException(
+                    403,
+                    {"message": "You have exceeded a secondary rate limit"},
+                    {"retry-after": "0.1"},
+                )
+            return "ok"
+
+        assert await scheduler.run(call) == "ok"
+        assert attempts[1] - attempts[0] >= 0.09
+        assert scheduler.get_metrics()["secondary_limit_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_other_errors_are_not_retried(self):
+        scheduler = GitHubRequestScheduler()
+
+        async def call():
+            raise GithubException(404, {"message": "Not Found"}, {})
+
+        with pytest.raises(GithubException):
+            await scheduler.run(call)
+        assert scheduler.get_metrics()["secondary_limit_hits"] == 0
+
+
+class TestGitHubHandlerScheduling:
+    """Test cases for rate-limit tracking in GitHubHandler."""
+
+    @pytest.fixture
+    def handler(self):
+        with patch("github_handler.Github"):
+            yield GitHubHandler(Config(github_token="test_token"))
+
+    @pytest.mark.asyncio
+    async def test_graphql_budget_is_tracked_separately(self, handler):
+        response = MagicMock(status_code=200, text="{}")
+        response.headers = _rate_headers(remaining=42, resource="graphql")
+        response.json.return_value = {"data": {"viewer": {"login": "me"}}}
+
+        with patch("github_handler.requests.post", return_value=response):
+            data = await handler._execute_graphql_query_async("query { viewer }")
+
+        budgets = handler.get_rate_limit_metrics()["budgets"]
+        assert data == {"viewer": {"login": "me"}}
+        assert budgets["graphql"]["remaining"] == 42
+        assert budgets["core"]["remaining"] is None
+
+    def test_rest_budget_is_read_from_response_headers(self):
+        handler = GitHubHandler(Config(github_token="test_token"))
+        response = MagicMock(headers=_rate_headers(remaining=4321))
+
+        for hook in handler.github.requester._Requester__connectionClass(
+            "api.github.com"
+        ).session.hooks["response"]:
+            hook(response)
+
+        assert handler.get_rate_limit_metrics()["budgets"]["core"]["remaining"] == 4321
+
+    def test_handlers_of_a_token_share_one_budget(self):
+        with patch("github_handler.Github"):
+            webhooks = GitHubHandler(Config(github_token="test_token"))
+            context_scan = GitHubHandler(Config(github_token="test_token"))
+            other_token = GitHubHandler(Config(github_token="other_token"))
+
+        assert webhooks.scheduler is context_scan.scheduler
+        assert other_token.scheduler is not webhooks.scheduler
+
+        context_scan.scheduler.update_from_headers(_rate_headers(remaining=120))
+        budget = webhooks.get_rate_limit_metrics()["budgets"]["core"]
+        assert budget["remaining"] == 120
+
+    @pytest.mark.asyncio
+    async def test_handlers_of_a_token_share_one_thread_pool(self):
+        with patch("github_handler.Github"):
+            handlers = [
+                GitHubHandler(
+                    Config(github_token="test_token", github_max_concurrency=2)
+                )
+                for _ in range(6)
+            ]
+
+        threads = await asyncio.gather(
+            *(
+                handler._run_blocking(lambda: (time.sleep(0.01), threading.get_ident()))
+                for handler in handlers
+                for _ in range(4)
+            )
+        )
+
+        assert len({thread for _, thread in threads}) <= 2
+        executor = handlers[0].scheduler.executor
+        handlers[0].scheduler.close()
+        assert executor._shutdown
+        assert handlers[1].scheduler.executor is not executor
+
+    @pytest.mark.asyncio
+    async def test_shared_budget_reserve_holds_background_of_other_handler(self):
+        with patch("github_handler.Github"):
+            webhooks = GitHubHandler(
+                Config(github_token="test_token", github_background_reserve=100)
+            )
+            context_scan = GitHubHandler(Config(github_token="test_token"))
+        webhooks.scheduler.update_from_headers(_rate_headers(remaining=80, reset_in=30))
+
+        with context_scan.request_priority("background"):
+            background = asyncio.create_task(
+                context_scan._run_blocking(lambda: "scanned")
+            )
+        with webhooks.request_priority("critical"):
+            assert await webhooks._run_blocking(lambda: "notified") == "notified"
+        await asyncio.sleep(0.05)
+
+        assert not background.done()
+        assert webhooks.get_rate_limit_metrics()["queued"]["background"] == 1
+        background.cancel()
@@ -6,15 +6,14 @@ from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+import yaml
 from config import Config, StorageConfig
 from github_storage import (
     GitHubIssueMetadata,
     GitHubStorageManager,
 )
 from github_storage import StorageConfig as GSStorageConfig
-from github_storage import (
-    YAMLFrontmatterParser,
-)
+from github_storage import YAMLFrontmatterParser, parse_flat_yaml
 from models import Epic, StoryStatus, StoryType, SubStory, UserStory
 from story_manager import StoryAnalysis
 
@@ -93,6 +92,83 @@ invalid: yaml: content[
 
         self.assertEqual(result, content)
 
+    def test_flat_fast_path_matches_yaml(self):
+        """Test the fast path parses storyteller's frontmatter like PyYAML."""
+        metadata = {
+            "user_story_id": "story_001",
+            "story_type": "user_story",
+            "epic_id": "epic_001",
+            "status": "in_progress",
+            "user_persona": "",
+            "user_goal": "Log in: quickly",
+            "acceptance_criteria": ["It's fast", "yes", "42", "Works (mostly)"],
+            "target_repositories": [],
+            "story_points": 5,
+            "estimated_hours": 2.5,
+            "assignee": None,
+            "created_at": "2024-01-01T00:00:00+00:00",
+            "metadata": {},
+        }
+        text = yaml.dump(metadata, default_flow_style=False).rstrip("\n")
+
+        parsed = parse_flat_yaml(text)
+
+        self.assertEqual(parsed, yaml.safe_load(text))
+        self.assertEqual(parsed["acceptance_criteria"][2], "42")
+
+        # Published stories carry scalar metadata such as the parent issue
+        metadata["metadata"] = {
+            "parent_issue_number": 12,
+            "github_url": "https://github.com/owner/repo/issues/13",
+            "source": None,
+            "extra": {},
+        }
+        text = yaml.dump(metadata, default_flow_style=False).rstrip("\n")
+
+        parsed = parse_flat_yaml(text)
+
+        self.assertEqual(parsed, yaml.safe_load(text))
+        self.assertEqual(parsed["metadata"]["parent_issue_number"], 12)
+
+    def test_flat_fast_path_defers_to_yaml(self):
+        """Test YAML outside the flat subset is left to PyYAML."""
+        for text in [
+            "metadata:\n  priority:\n    level: high",
+            "metadata:\n  tags:\n  - backend",
+            "metadata:\n  priority: yes",
+            "status: yes",
+            "created_at: 2024-01-01",
+            "target_repositories:\n  - backend",
+            "description: |\n  multi-line",
+        ]:
+            self.assertIsNone(parse_flat_yaml(text), text)
+
+        frontmatter, _ = self.parser.extract_frontmatter(
+            "---\nstatus: draft\nmetadata:\n  tags:\n  - backend\n---\n\n# Title"
+        )
+        self.assertEqual(frontmatter["metadata"], {"tags": ["backend"]})
+
+    def test_issue_frontmatter_parsed_once_per_version(self):
+        """Test issue bodies are parsed once per (issue id, updated_at)."""
+        issue = MagicMock(
+            id=1,
+            updated_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            body="---\nstory_type: epic\nmetadata: {}\n---\n\n# Epic",
+        )
+
+        with patch.object(
+            self.parser, "extract_frontmatter", wraps=self.parser.extract_frontmatter
+        ) as extract:
+            first, _ = self.parser.extract_issue_frontmatter(issue)
+            first["metadata"]["github_issue_number"] = 1
+            second, _ = self.parser.extract_issue_frontmatter(issue)
+            self.assertEqual(extract.call_count, 1)
+            self.assertEqual(second["metadata"], {})
+
+            issue.updated_at = datetime(2024, 1, 2, tzinfo=timezone.utc)
+            self.parser.extract_issue_frontmatter(issue)
+            self.assertEqual(extract.call_count, 2)
+
 
 class TestGitHubStorageManager(unittest.TestCase):
     """Test GitHub storage manager functionality."""
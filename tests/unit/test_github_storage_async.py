@@ -9,7 +9,14 @@ from github_storage import (
     GitHubStorageManager,
 )
 from github_storage import StorageConfig as GSStorageConfig
-from models import Epic, StoryStatus, StoryType, SubStory, UserStory
+from models import (
+    Epic,
+    StoryHierarchy,
+    StoryStatus,
+    StoryType,
+    SubStory,
+    UserStory,
+)
 from story_manager import StoryAnalysis
 
 
@@ -219,3 +226,226 @@ async def test_parse_epic_from_issue_invalid(mock_github_handler_class, config):
     epic = await manager._parse_epic_from_issue(mock_issue)
 
     assert epic is None
+
+
+@pytest.mark.asyncio
+async def test_reconstruct_story_hierarchy_lists_once_per_story_type():
+    """Reconstruction cost does not grow with the number of stories."""
+    from fake_github import FakeGitHub
+    from github_benchmark import GitHubBenchmark
+
+    with FakeGitHub() as fake:
+        bench = GitHubBenchmark(
+            fake, repositories=1, files_per_repository=0, issues_per_repository=0
+        )
+        epic_number = bench.stored_hierarchy(user_stories=6, sub_stories=3)
+        # Sub-stories of another epic are left out
+        fake.add_issue(
+            bench.repository_names[0],
+            "Sub-Story: other",
+            body="---\nsub_story_id: sub_other\nstory_type: sub_story\n"
+            "user_story_id: story_other\n---\n\n# Other",
+            labels=["storyteller", "sub-story"],
+        )
+        manager = GitHubStorageManager(bench.config, bench.config.storage)
+        bench.prepare(manager.github_handler)
+        fake.reset_metrics()
+
+        hierarchy = await manager.reconstruct_story_hierarchy(
+            epic_number, bench.repository_names[0]
+        )
+
+        assert hierarchy.epic.id == "epic_stored"
+        assert len(hierarchy.user_stories) == 6
+        assert sorted(len(subs) for subs in hierarchy.sub_stories.values()) == [3] * 6
+        assert "story_other" not in hierarchy.sub_stories
+        calls = fake.snapshot_calls()
+        assert calls["issues.list"] == 2
+        assert calls["issues.get"] == 1
+        assert "search.issues" not in calls
+
+
+@pytest.mark.asyncio
+async def test_story_cache_read_through_invalidation_and_reconcile(
+    tmp_path, monkeypatch
+):
+    """Cached stories are served locally until webhooks or reconciliation."""
+    from fake_github import FakeGitHub
+    from github_benchmark import GitHubBenchmark
+
+    monkeypatch.chdir(tmp_path)
+    with FakeGitHub() as fake:
+        bench = GitHubBenchmark(
+            fake, repositories=1, files_per_repository=0, issues_per_repository=0
+        )
+        repository = bench.repository_names[0]
+        manager = GitHubStorageManager(
+            bench.config,
+            GSStorageConfig(
+                cache_enabled=True,
+                deployment_context="mcp",
+                cache_reconcile_interval_seconds=0,
+            ),
+        )
+        bench.prepare(manager.github_handler)
+
+        issue = await manager.save_epic(
+            Epic(id="epic_cached", title="Cached", description="Original"),
+            repository,
+        )
+        fake.reset_metrics()
+
+        epic = await manager.get_epic("epic_cached", repository)
+        assert epic.description == "Original"
+        assert fake.total_calls == 0
+
+        # An edit GitHub did not tell us about is picked up by reconciliation
+        await manager.github_handler.update_issue(
+            repository,
+            issue.number,
+            body=issue.body.replace("status: draft", "status: in_progress"),
+        )
+        fake.repositories[repository].issues[issue.number][
+            "updated_at"
+        ] = "2099-01-01T00:00:00Z"
+        assert await manager.reconcile_cache() == 1
+        fake.reset_metrics()
+        epic = await manager.get_epic("epic_cached", repository)
+        assert epic.status == StoryStatus.IN_PROGRESS
+        assert fake.total_calls == 0
+
+        # After an issues.edited webhook the next read goes to GitHub
+        assert manager.invalidate_cached_issue(repository, issue.number) == 1
+        epic = await manager.get_epic("epic_cached", repository)
+        assert epic.status == StoryStatus.IN_PROGRESS
+        assert fake.snapshot_calls()["search.issues"] == 1
+
+
+@pytest.mark.asyncio
+async def test_save_hierarchy_links_parents_and_resumes():
+    """Hierarchies are published level by level and resume after failures."""
+    from fake_github import FakeGitHub
+    from github_benchmark import GitHubBenchmark
+
+    with FakeGitHub() as fake:
+        bench = GitHubBenchmark(
+            fake, repositories=1, files_per_repository=0, issues_per_repository=0
+        )
+        repository = bench.repository_names[0]
+        manager = GitHubStorageManager(bench.config, bench.config.storage)
+        bench.prepare(manager.github_handler)
+
+        epic = Epic(id="epic_pub", title="Published", description="Epic")
+        user_stories = [
+            UserStory(id=f"story_pub_{i}", epic_id=epic.id, title=f"Story {i}")
+            for i in range(3)
+        ]
+        hierarchy = StoryHierarchy(
+            epic=epic,
+            user_stories=user_stories,
+            sub_stories={
+                user_story.id: [
+                    SubStory(
+                        id=f"{user_story.id}_sub_{j}",
+                        user_story_id=user_story.id,
+                        department="backend",
+                        title=f"Sub {j}",
+                    )
+                    for j in range(2)
+                ]
+                for user_story in user_stories
+            },
+        )
+
+        # The first attempt fails on one sub-story
+        create_issue = manager.github_handler.create_issue
+
+        async def flaky_create_issue(issue_data, repository_name=None):
+            if issue_data.title.endswith("Sub 1") and not flaky_create_issue.failed:
+                flaky_create_issue.failed = True
+                raise Exception("GitHub API error: 502")
+            return await create_issue(issue_data, repository_name)
+
+        flaky_create_issue.failed = False
+        manager.github_handler.create_issue = flaky_create_issue
+        fake.reset_metrics()
+        with pytest.raises(Exception, match="502"):
+            await manager.save_hierarchy(hierarchy, repository)
+        assert len(fake.repositories[repository].issues) == 9
+        # A first save does not list the stored issues
+        assert "issues.list" not in fake.snapshot_calls()
+
+        issues = await manager.save_hierarchy(hierarchy, repository)
+
+        assert len(fake.repositories[repository].issues) == 10
+        assert fake.snapshot_calls()["issues.list"] == 1
+        assert set(issues) == {story.id for story in hierarchy.get_all_stories()}
+        reconstructed = await manager.reconstruct_story_hierarchy(
+            issues[epic.id].number, repository
+        )
+        assert len(reconstructed.user_stories) == 3
+        for user_story in reconstructed.user_stories:
+            assert user_story.metadata["parent_issue_number"] == issues[epic.id].number
+            for sub_story in reconstructed.sub_stories[user_story.id]:
+                assert (
+                    sub_story.metadata["parent_issue_number"]
+                    == issues[user_story.id].number
+                )
+
+
+@pytest.mark.asyncio
+async def test_save_hierarchy_rejects_unknown_parents():
+    """Sub-Stories of User Stories that exist nowhere fail before any creation."""
+    from fake_github import FakeGitHub
+    from github_benchmark import GitHubBenchmark
+
+    with FakeGitHub() as fake:
+        bench = GitHubBenchmark(
+            fake, repositories=1, files_per_repository=0, issues_per_repository=0
+        )
+        repository = bench.repository_names[0]
+        manager = GitHubStorageManager(bench.config, bench.config.storage)
+        bench.prepare(manager.github_handler)
+
+        epic = Epic(id="epic_orphan", title="Orphans", description="Epic")
+        hierarchy = StoryHierarchy(
+            epic=epic,
+            user_stories=[UserStory(id="story_kept", epic_id=epic.id, title="Kept")],
+            sub_stories={
+                "story_missing": [
+                    SubStory(
+                        id="story_missing_sub",
+                        user_story_id="story_missing",
+                        department="backend",
+                        title="Orphan",
+                    )
+                ]
+            },
+        )
+
+        with pytest.raises(ValueError, match="story_missing"):
+            await manager.save_hierarchy(hierarchy, repository)
+        assert fake.repositories[repository].issues == {}
+
+
+@pytest.mark.asyncio
+async def test_labeled_issues_listed_in_pages_of_100():
+    """Label listings request GitHub's largest page size."""
+    from fake_github import FakeGitHub
+    from github_benchmark import GitHubBenchmark
+
+    with FakeGitHub() as fake:
+        bench = GitHubBenchmark(
+            fake, repositories=1, files_per_repository=0, issues_per_repository=0
+        )
+        repository = bench.repository_names[0]
+        manager = GitHubStorageManager(bench.config, bench.config.storage)
+        bench.prepare(manager.github_handler)
+        for index in range(150):
+            fake.add_issue(repository, f"Story {index}", labels=["user-story"])
+        fake.reset_metrics()
+
+        issues = await manager._list_labeled_issues(repository, "user-story")
+
+        assert len(issues) == 150
+        assert fake.snapshot_calls()["issues.list"] == 2
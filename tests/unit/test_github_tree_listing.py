@@ -0,0 +1,161 @@
+"""Tests for repository listings built on the Git Trees API."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from config import Config
+from github.GithubException import GithubException
+from github_handler import GitHubHandler
+
+
+def _tree(sha, entries, truncated=False):
+    return SimpleNamespace(
+        sha=sha,
+        truncated=truncated,
+        tree=[
+            SimpleNamespace(path=path, type=entry_type, sha=f"{path}-sha", size=None)
+            for path, entry_type in entries
+        ],
+    )
+
+
+@pytest.fixture
+def handler():
+    with patch("github_handler.Github"):
+        yield GitHubHandler(Config(github_token="test_token"))
+
+
+def _repo(trees):
+    """Mock repository serving trees keyed by (sha, recursive)."""
+    repo = MagicMock(full_name="owner/repo")
+    repo.get_git_tree.side_effect = lambda sha, recursive=False: trees[(sha, recursive)]
+    return repo
+
+
+class TestTreeListing:
+    """Test cases for GitHubHandler.list_repository_files(recursive=True)."""
+
+    @pytest.mark.asyncio
+    async def test_single_recursive_request_and_cache(self, handler):
+        root = _tree("root", [("src", "tree"), ("README.md", "blob")])
+        full = _tree(
+            "root",
+            [
+                ("README.md", "blob"),
+                ("src", "tree"),
+                ("src/app.py", "blob"),
+                ("src/lib/util.py", "blob"),
+                ("vendor", "commit"),
+            ],
+        )
+        repo = _repo({("main", False): root, ("root", True): full})
+        handler.get_repository = MagicMock(return_value=repo)
+
+        files = await handler.list_repository_files("owner/repo", recursive=True)
+        py_files = await handler.list_repository_files(
+            "owner/repo", path="src", recursive=True, file_extensions=[".py"]
+        )
+
+        assert files == [
+            ("README.md", "file"),
+            ("src/app.py", "file"),
+            ("src/lib/util.py", "file"),
+        ]
+        assert py_files == [("src/app.py", "file"), ("src/lib/util.py", "file")]
+        # Second listing only resolves the ref; the recursive tree is cached
+        assert repo.get_git_tree.call_count == 3
+        repo.get_contents.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_truncated_tree_is_walked_by_subtree(self, handler):
+        root = _tree("root", [("src", "tree"), ("setup.py", "blob")])
+        repo = _repo(
+            {
+                ("main", False): root,
+                ("root", True): _tree("root", [("setup.py", "blob")], True),
+                ("root", False): root,
+                ("src-sha", True): _tree("src-sha", [("a.py", "blob")]),
+            }
+        )
+        handler.get_repository = MagicMock(return_value=repo)
+
+        files = await handler.list_repository_files("owner/repo", recursive=True)
+
+        assert files == [("src/a.py", "file"), ("setup.py", "file")]
+
+
+class TestRepositoryStructure:
+    """Test cases for GitHubHandler.get_repository_structure."""
+
+    @staticmethod
+    def _structure_repo(tree_sha="root"):
+        repo = MagicMock(default_branch="main", language="Python")
+        repo.get_git_tree.return_value = SimpleNamespace(
+            sha=tree_sha,
+            truncated=False,
+            tree=[
+                SimpleNamespace(path="README.md", type="blob", size=120),
+                SimpleNamespace(path="setup.py", type="blob", size=80),
+                SimpleNamespace(path="src", type="tree", size=None),
+                SimpleNamespace(path="vendor", type="commit", size=None),
+            ],
+        )
+        repo.get_languages.return_value = {"Python": 2000}
+        return repo
+
+    @pytest.mark.asyncio
+    async def test_built_from_single_root_tree(self, handler):
+        repo = self._structure_repo()
+        handler.get_repository = MagicMock(return_value=repo)
+
+        structure = await handler.get_repository_structure("owner/repo")
+
+        assert structure == {
+            "name": "owner/repo",
+            "default_branch": "main",
+            "language": "Python",
+            "languages": {"Python": 2000},
+            "key_files": [{"name": "README.md", "path": "README.md", "size": 120}],
+            "directories": ["src"],
+            "file_count": 2,
+            "total_size": 200,
+        }
+        repo.get_git_tree.assert_called_once_with("main")
+        repo.get_contents.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cached_per_tree_sha(self, handler):
+        repo = self._structure_repo()
+        handler.get_repository = MagicMock(return_value=repo)
+
+        first = await handler.get_repository_structure("owner/repo")
+        first["directories"].append("mutated")
+        second = await handler.get_repository_structure("owner/repo")
+
+        assert second["directories"] == ["src"]
+        assert repo.get_git_tree.call_count == 2
+        repo.get_languages.assert_called_once()
+
+        repo.get_git_tree.return_value.sha = "changed"
+        await handler.get_repository_structure("owner/repo")
+        assert repo.get_languages.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_default_branch(self, handler):
+        repo = self._structure_repo()
+        repo.default_branch = "master"
+        tree = repo.get_git_tree.return_value
+
+        def get_git_tree(ref):
+            if ref != "master":
+                raise GithubException(404, {"message": "Not Found"}, None)
+            return tree
+
+        repo.get_git_tree.side_effect = get_git_tree
+        handler.get_repository = MagicMock(return_value=repo)
+
+        structure = await handler.get_repository_structure("owner/repo")
+
+        assert structure["default_branch"] == "master"
+        assert structure["directories"] == ["src"]
@@ -0,0 +1,291 @@
+"""Tests for batched GraphQL project operations."""
+
+import re
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from config import Config
+from database import DatabaseManager
+from github_handler import GitHubHandler
+from graphql_batch import (
+    GraphQLOperation,
+    build_batch_document,
+    split_batch_response,
+)
+from models import (
+    Epic,
+    ProjectField,
+    StoryHierarchy,
+    StoryStatus,
+    SubStory,
+    UserStory,
+)
+
+
+def _add_operation(key):
+    return GraphQLOperation(
+        field="addProjectV2ItemById",
+        selection="item { id }",
+        arguments={"input": {"projectId": "P", "contentId": key}},
+        argument_types={"input": "AddProjectV2ItemByIdInput!"},
+        key=key,
+    )
+
+
+class TestBatchDocuments:
+    """Test cases for aliased document building and error mapping."""
+
+    def test_build_batch_document_aliases_operations(self):
+        document, variables = build_batch_document(
+            [_add_operation("I_1"), _add_operation("I_2")]
+        )
+
+        assert document.startswith(
+            "mutation($input0: AddProjectV2ItemByIdInput!, "
+            "$input1: AddProjectV2ItemByIdInput!)"
+        )
+        assert "op0: addProjectV2ItemById(input: $input0) { item { id } }" in document
+        assert variables["input1"]["contentId"] == "I_2"
+
+    def test_split_batch_response_reports_errors_per_alias(self):
+        operations = [_add_operation("I_1"), _add_operation("I_2")]
+
+        results = split_batch_response(
+            operations,
+            {"op0": {"item": {"id": "PVTI_1"}}, "op1": None},
+            [{"path": ["op1"], "message": "Content already exists"}],
+        )
+
+        assert results[0].success and results[0].data == {"item": {"id": "PVTI_1"}}
+        assert results[1].key == "I_2"
+        assert results[1].error == "Content already exists"
+
+
+class FakeGraphQL:
+    """Answers batched issue lookups and project mutations by alias."""
+
+    def __init__(self, failing_issue=None, removed_items=()):
+        self.documents = []
+        self.failing_issue = failing_issue
+        self.removed_items = set(removed_items)
+
+    def __call__(self, document, variables):
+        self.documents.append(document)
+        data, errors = {}, []
+        for alias, field, arguments in re.findall(
+            r"(op\d+): (\w+)\(([^)]*)\)", document
+        ):
+            index = alias[2:]
+            if field == "repository":
+                number = int(
+                    re.search(rf"{alias}: .*?issue\(number: (\d+)\)", document).group(1)
+                )
+                if number == self.failing_issue:
+                    data[alias] = {"issue": None}
+                else:
+                    data[alias] = {"issue": {"id": f"I_{number}"}}
+            elif field == "node":
+                item_id = variables[f"id{index}"]
+                data[alias] = None if item_id in self.removed_items else {"id": item_id}
+            elif field == "addProjectV2ItemById":
+                content_id = variables[f"input{index}"]["contentId"]
+                data[alias] = {"item": {"id": f"PVTI_{content_id}"}}
+            else:
+                data[alias] = {"projectV2Item": {"id": "PVTI"}}
+        return {"data": data, "errors": errors}
+
+
+@pytest.fixture
+def handler():
+    with patch("github_handler.Github"):
+        yield GitHubHandler(Config(github_token="test_token"))
+
+
+class TestBatchedProjectSync:
+    """Test cases for batched project operations in GitHubHandler."""
+
+    @staticmethod
+    def _hierarchy(sub_story_count):
+        epic = Epic(title="Epic", target_repositories=["org/backend"])
+        epic.github_issue_number = 1
+        user_story = UserStory(title="Story", target_repositories=["org/backend"])
+        user_story.github_issue_number = 2
+        sub_stories = []
+        for number in range(sub_story_count):
+            sub_story = SubStory(title=f"Task {number}", target_repository="org/web")
+            sub_story.github_issue_number = 100 + number
+            sub_stories.append(sub_story)
+        return StoryHierarchy(
+            epic=epic,
+            user_stories=[user_story],
+            sub_stories={user_story.id: sub_stories},
+        )
+
+    @pytest.mark.asyncio
+    async def test_hierarchy_syncs_in_a_handful_of_requests(self, handler):
+        fake = FakeGraphQL()
+        handler._execute_graphql_request = fake
+        handler.get_project_fields = AsyncMock(
+            return_value=[ProjectField(id="F_status", name="Status", data_type="TEXT")]
+        )
+
+        result = await handler.sync_story_to_project(self._hierarchy(60), "P")
+
+        assert result["epic"] == {"id": "PVTI_I_1"}
+        assert len(result["user_stories"]) == 1
+        assert len(result["sub_stories"]) == 60
+        assert result["errors"] == []
+        # 62 lookups (1 query), 62 adds (3 mutations), 1 field update
+        assert len(fake.documents) == 5
+
+    @pytest.mark.asyncio
+    async def test_bulk_add_reports_failures_per_issue(self, handler):
+        handler._execute_graphql_request = FakeGraphQL(failing_issue=7)
+
+        results = await handler.bulk_add_issues_to_project(
+            "P", [(5, "org/web"), (7, "org/web"), (9, "not-a-repo")]
+        )
+
+        assert [r["success"] for r in results] == [True, False, False]
+        assert results[0]["data"] == {"id": "PVTI_I_5"}
+        assert results[1]["error"] == "Issue not found"
+        assert "Invalid repository" in results[2]["error"]
+
+    @pytest.mark.asyncio
+    async def test_bulk_add_falls_back_when_batch_request_fails(self, handler):
+        def unavailable(document, variables):
+            raise Exception("GraphQL request failed: 502")
+
+        handler._execute_graphql_request = unavailable
+        handler.add_issue_to_project = AsyncMock(
+            side_effect=[{"id": "PVTI_5"}, Exception("Issue 7 not found")]
+        )
+
+        results = await handler.bulk_add_issues_to_project(
+            "P", [(5, "org/web"), (7, "org/web"), (9, "not-a-repo")]
+        )
+
+        assert [r["success"] for r in results] == [True, False, False]
+        assert results[0]["data"] == {"id": "PVTI_5"}
+        assert results[1]["error"] == "Issue 7 not found"
+        # Invalid references never reached the request, so are not retried
+        assert handler.add_issue_to_project.await_count == 2
+
+
+class TestDiffProjectSync:
+    """Test cases for cached project schemas and diff-based project sync."""
+
+    @staticmethod
+    def _fields_response():
+        return {
+            "node": {
+                "fields": {
+                    "nodes": [{"id": "F_status", "name": "Status", "dataType": "TEXT"}]
+                }
+            }
+        }
+
+    @pytest.mark.asyncio
+    async def test_project_fields_are_cached(self, handler):
+        handler._execute_graphql_query_async = AsyncMock(
+            return_value=self._fields_response()
+        )
+
+        await handler.get_project_fields("P")
+        await handler.get_project_fields("P")
+        assert handler._execute_graphql_query_async.await_count == 1
+
+        handler.invalidate_project_fields("P")
+        await handler.get_project_fields("P")
+        assert handler._execute_graphql_query_async.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_unchanged_hierarchy_sends_no_mutations(self, tmp_path):
+        database = DatabaseManager(str(tmp_path / "sync.db"))
+        hierarchy = TestBatchedProjectSync._hierarchy(3)
+
+        with patch("github_handler.Github"):
+            handler = GitHubHandler(Config(github_token="t"), database=database)
+        handler._execute_graphql_query_async = AsyncMock(
+            return_value=self._fields_response()
+        )
+        handler._execute_graphql_request = first = FakeGraphQL()
+        await handler.sync_story_to_project(hierarchy, "P")
+        assert len(first.documents) == 3  # lookups, adds, field update
+
+        # A new handler picks the state up from the database
+        with patch("github_handler.Github"):
+            handler = GitHubHandler(Config(github_token="t"), database=database)
+        handler._execute_graphql_query_async = AsyncMock(
+            return_value=self._fields_response()
+        )
+        handler._execute_graphql_request = second = FakeGraphQL()
+
+        result = await handler.sync_story_to_project(hierarchy, "P")
+
+        # Only the stored items are looked up
+        assert len(second.documents) == 1
+        assert second.documents[0].startswith("query")
+        assert result["unchanged"] == 5
+        assert result["epic"] == {"id": "PVTI_I_1"}
+        assert len(result["sub_stories"]) == 3
+
+        hierarchy.epic.status = StoryStatus.IN_PROGRESS
+        result = await handler.sync_story_to_project(hierarchy, "P")
+
+        assert len(second.documents) == 3
+        assert "updateProjectV2ItemFieldValue" in second.documents[2]
+        assert result["unchanged"] == 4
+
+    @pytest.mark.asyncio
+    async def test_removed_items_are_added_again(self, handler):
+        hierarchy = TestBatchedProjectSync._hierarchy(2)
+        handler.get_project_fields = AsyncMock(return_value=[])
+        handler._execute_graphql_request = FakeGraphQL()
+        await handler.sync_story_to_project(hierarchy, "P")
+
+        # The user story's item was removed from the project
+        handler._execute_graphql_request = fake = FakeGraphQL(
+            removed_items={"PVTI_I_2"}
+        )
+        result = await handler.sync_story_to_project(hierarchy, "P")
+
+        assert result["user_stories"] == [{"id": "PVTI_I_2"}]
+        assert result["unchanged"] == 3
+        # Item lookups, the issue lookup and the add
+        assert len(fake.documents) == 3
+        assert "addProjectV2ItemById" in fake.documents[2]
+
+    @pytest.mark.asyncio
+    async def test_story_processor_persists_sync_state(self, tmp_path):
+        from story_manager import StoryProcessor
+
+        database = DatabaseManager(str(tmp_path / "stories.db"))
+        hierarchy = TestBatchedProjectSync._hierarchy(2)
+
+        def processor():
+            with (
+                patch("story_manager.LLMHandler"),
+                patch("story_manager.DatabaseManager", return_value=database),
+                patch("story_manager.RoleAssignmentEngine"),
+                patch("story_manager.MultiRepositoryContextReader"),
+                patch("story_manager.load_role_files", return_value={}),
+                patch("github_handler.Github"),
+            ):
+                story_processor = StoryProcessor(Config(github_token="t"))
+            handler = story_processor.github_handler
+            handler._execute_graphql_query_async = AsyncMock(
+                return_value=self._fields_response()
+            )
+            handler._execute_graphql_request = FakeGraphQL()
+            return handler
+
+        first = processor()
+        assert first.database is database
+        await first.sync_story_to_project(hierarchy, "P")
+
+        # After a restart the story-to-item map comes from the database
+        restarted = processor()
+        result = await restarted.sync_story_to_project(hierarchy, "P")
+        assert len(restarted._execute_graphql_request.documents) == 1
+        assert result["unchanged"] == 4
@@ -0,0 +1,155 @@
+"""Tests for the local GitHub issue mirror."""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from config import Config, IssueMirrorConfig
+from database import DatabaseManager
+from github_handler import GitHubHandler
+from issue_mirror import IssueMirror, extract_references
+
+
+def _issue(number, title, state="open", updated_day=1, body=None):
+    return SimpleNamespace(
+        number=number,
+        title=title,
+        body=body,
+        state=state,
+        pull_request=None,
+        labels=[SimpleNamespace(name="story")],
+        assignee=None,
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        updated_at=datetime(2024, 1, updated_day, tzinfo=timezone.utc),
+        closed_at=None,
+    )
+
+
+@pytest.fixture
+def handler(tmp_path):
+    with patch("github_handler.Github"):
+        github_handler = GitHubHandler(Config(github_token="test_token"))
+    github_handler.issue_mirror = IssueMirror(
+        github_handler, DatabaseManager(str(tmp_path / "mirror.db"))
+    )
+    repo = MagicMock()
+    github_handler.get_repository = MagicMock(return_value=repo)
+    return github_handler
+
+
+class TestIssueMirror:
+    """Test cases for IssueMirror syncing and webhook updates."""
+
+    def test_extract_references(self):
+        assert extract_references("Login (epic_abc123)", "See story-42 and x") == [
+            "epic_abc123",
+            "story-42",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_bootstrap_then_incremental_sync(self, handler):
+        repo = handler.get_repository.return_value
+        mirror = handler.issue_mirror
+        repo.get_issues.return_value = [
+            _issue(1, "Auth epic_abc123", updated_day=2),
+            _issue(2, "Unrelated", updated_day=3),
+        ]
+        await mirror.sync_repository("org/backend")
+
+        repo.get_issues.return_value = [
+            _issue(1, "Auth epic_abc123", state="closed", updated_day=5)
+        ]
+        await mirror.sync_repository("org/backend")
+
+        first_call, second_call = repo.get_issues.call_args_list
+        assert "since" not in first_call.kwargs
+        assert second_call.kwargs["since"] == datetime(2024, 1, 3, tzinfo=timezone.utc)
+        issues = mirror.get_epic_issues("org/backend", "epic_abc123")
+        assert [(i["number"], i["state"]) for i in issues] == [(1, "closed")]
+
+    def test_webhook_updates_mirror_and_ignores_stale_snapshots(self, handler):
+        mirror = handler.issue_mirror
+
+        def payload(state, updated_at):
+            return {
+                "action": state,
+                "repository": {"full_name": "org/backend"},
+                "issue": {
+                    "number": 7,
+                    "title": "Fix login epic_abc123",
+                    "state": state,
+                    "labels": [{"name": "bug"}],
+                    "created_at": "2024-01-01T00:00:00Z",
+                    "updated_at": updated_at,
+                },
+            }
+
+        assert mirror.apply_webhook(payload("closed", "2024-02-02T00:00:00Z"))
+        assert not mirror.apply_webhook(payload("open", "2024-02-01T00:00:00Z"))
+
+        (issue,) = mirror.get_issues("org/backend", state=None)
+        assert issue["state"] == "closed"
+        assert issue["labels"] == ["bug"]
+
+    @pytest.mark.parametrize("action", ["deleted", "transferred"])
+    def test_deleted_and_transferred_issues_leave_mirror(self, handler, action):
+        mirror = handler.issue_mirror
+        issue = {
+            "number": 7,
+            "title": "Fix login epic_abc123",
+            "state": "open",
+            "created_at": "2024-01-01T00:00:00Z",
+            "updated_at": "2024-01-02T00:00:00Z",
+        }
+        repository = {"full_name": "org/backend"}
+        mirror.apply_webhook(
+            {"action": "opened", "repository": repository, "issue": issue}
+        )
+        assert mirror.get_epic_issues("org/backend", "epic_abc123")
+
+        assert mirror.apply_webhook(
+            {"action": action, "repository": repository, "issue": issue}
+        )
+
+        assert mirror.get_epic_issues("org/backend", "epic_abc123") == []
+        assert mirror.get_issues("org/backend", state=None) == []
+        with mirror.database.get_connection() as conn:
+            references = conn.execute("SELECT * FROM issue_mirror_references")
+            assert references.fetchall() == []
+
+    @pytest.mark.asyncio
+    async def test_progress_is_served_from_mirror(self, handler):
+        repo = handler.get_repository.return_value
+        repo.get_issues.return_value = [
+            _issue(1, "Auth", state="closed", body="Part of epic_abc123"),
+            _issue(2, "Login epic_abc123"),
+            _issue(3, "Other epic_abc1234"),
+        ]
+
+        first = await handler.get_cross_repository_progress_data(
+            "epic_abc123", ["org/backend"]
+        )
+        second = await handler.get_cross_repository_progress_data(
+            "epic_abc123", ["org/backend"]
+        )
+
+        progress = second["repositories"]["org/backend"]
+        assert first["repositories"]["org/backend"]["total_issues"] == 2
+        assert progress["closed_issues"] == 1
+        assert progress["progress_percentage"] == 50.0
+        assert progress["issues"][0]["labels"] == ["story"]
+        # The second update is answered locally without listing issues again
+        assert repo.get_issues.call_count == 1
+
+    def test_mirror_uses_the_database_of_its_handler(self, tmp_path):
+        database = DatabaseManager(str(tmp_path / "owner.db"))
+        config = Config(
+            github_token="test_token", issue_mirror=IssueMirrorConfig(enabled=True)
+        )
+        with patch("github_handler.Github"):
+            owned = GitHubHandler(config, database)
+            unowned = GitHubHandler(config)
+
+        assert owned.issue_mirror.database is database
+        assert unowned.issue_mirror is None
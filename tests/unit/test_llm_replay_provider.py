@@ -0,0 +1,171 @@
+"""Tests for the record/replay LLM provider."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from config import Config, LLMReplayConfig
+from llm_handler import LLMHandler, LLMResponse, ReplayMissError, ReplayProvider
+
+
+def _upstream(content: str = "Recorded answer") -> MagicMock:
+    upstream = MagicMock()
+    upstream.generate_response = AsyncMock(
+        return_value=LLMResponse(
+            content=content, model="gpt-test", provider="github", usage={"t": 1}
+        )
+    )
+    return upstream
+
+
+class TestReplayProvider:
+    """Test cases for ReplayProvider."""
+
+    @pytest.mark.asyncio
+    async def test_record_then_replay_roundtrip(self, tmp_path):
+        """A recorded response is replayed verbatim without the upstream."""
+        upstream = _upstream()
+        recorder = ReplayProvider(
+            mode="record", fixtures_dir=tmp_path, upstream=upstream
+        )
+
+        recorded = await recorder.generate_response("prompt", system_prompt="system")
+        assert recorded.content == "Recorded answer"
+        assert len(list(tmp_path.glob("*.json"))) == 1
+
+        replayer = ReplayProvider(mode="replay", fixtures_dir=tmp_path)
+        replayed = await replayer.generate_response("prompt", system_prompt="system")
+
+        assert replayed.content == "Recorded answer"
+        assert replayed.provider == "replay"
+        assert replayed.usage == {"t": 1}
+        assert replayer.stats["replayed"] == 1
+        upstream.generate_response.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_replay_miss_raises_by_default(self, tmp_path):
+        """Missing fixtures fail loudly unless synthetic fallback is enabled."""
+        provider = ReplayProvider(mode="replay", fixtures_dir=tmp_path)
+
+        with pytest.raises(ReplayMissError, match="No recorded LLM fixture"):
+            await provider.generate_response("unknown prompt")
+
+        fallback = ReplayProvider(
+            mode="replay", fixtures_dir=tmp_path, on_miss="synthetic"
+        )
+        response = await fallback.generate_response("unknown prompt")
+        assert response.content
+        assert fallback.stats["misses"] == 1
+        assert fallback.stats["synthetic"] == 1
+
+    @pytest.mark.asyncio
+    async def test_synthetic_responses_match_expected_schemas(self, tmp_path):
+        """Synthetic output parses for story analysis and batched role prompts."""
+        provider = ReplayProvider(mode="synthetic", fixtures_dir=tmp_path, seed=1)
+
+        analysis = await provider.generate_response(
+            "Story",
+            system_prompt=(
+                "Available expert roles include: system-architect, qa-engineer.\n\n"
+                '{"recommended_roles": []}'
+            ),
+        )
+        data = json.loads(analysis.content)
+        assert set(data["recommended_roles"]) <= {"system-architect", "qa-engineer"}
+
+        batched = await provider.generate_response(
+            "Story",
+            system_prompt='{"analyses": [{"role_name": "one of: a-role, b-role"}]}',
+        )
+        roles = [a["role_name"] for a in json.loads(batched.content)["analyses"]]
+        assert roles == ["a-role", "b-role"]
+
+        breakdown = await provider.generate_response(
+            "Epic: Checkout",
+            system_prompt=(
+                "create 2 focused, actionable user stories.\n"
+                "Consider these target repositories: ['backend', 'frontend']\n"
+                '"user_stories"'
+            ),
+        )
+        stories = json.loads(breakdown.content)["user_stories"]
+        assert len(stories) == 2
+        assert stories[0]["target_repositories"] == ["backend", "frontend"]
+
+    @pytest.mark.asyncio
+    async def test_synthetic_output_is_deterministic(self, tmp_path):
+        """The same seed and prompt always produce the same response."""
+        first = ReplayProvider(mode="synthetic", fixtures_dir=tmp_path, seed=7)
+        second = ReplayProvider(mode="synthetic", fixtures_dir=tmp_path, seed=7)
+
+        a = await first.generate_response("Discuss", system_prompt="You are QA")
+        b = await second.generate_response("Discuss", system_prompt="You are QA")
+
+        assert a.content == b.content
+
+    def test_latency_distributions_are_seeded(self, tmp_path):
+        """Latency sampling is reproducible and never negative."""
+        samples = []
+        for _ in range(2):
+            provider = ReplayProvider(
+                mode="synthetic",
+                fixtures_dir=tmp_path,
+                latency_distribution="normal",
+                latency_params=[0.01, 0.05],
+                seed=3,
+            )
+            samples.append([provider.sample_latency() for _ in range(20)])
+
+        assert samples[0] == samples[1]
+        assert all(s >= 0 for s in samples[0])
+
+        fixed = ReplayProvider(
+            mode="synthetic",
+            fixtures_dir=tmp_path,
+            latency_distribution="fixed",
+            latency_params=[0.25],
+        )
+        assert fixed.sample_latency() == 0.25
+
+        recorded = ReplayProvider(
+            mode="replay", fixtures_dir=tmp_path, latency_distribution="recorded"
+        )
+        assert recorded.sample_latency(1.5) == 1.5
+
+    def test_invalid_configuration_rejected(self, tmp_path):
+        """Unknown modes and record without upstream are configuration errors."""
+        with pytest.raises(ValueError):
+            ReplayProvider(mode="bogus", fixtures_dir=tmp_path)
+        with pytest.raises(ValueError):
+            ReplayProvider(mode="record", fixtures_dir=tmp_path)
+
+    def test_handler_registers_replay_provider(self, tmp_path):
+        """LLMHandler exposes the replay provider when a mode is configured."""
+        config = Config(
+            github_token="test_token",
+            default_llm_provider="replay",
+            llm_replay=LLMReplayConfig(mode="synthetic", fixtures_dir=tmp_path),
+        )
+
+        handler = LLMHandler(config)
+
+        assert isinstance(handler.get_provider(), ReplayProvider)
+
+    @pytest.mark.asyncio
+    async def test_handler_does_not_retry_replay_miss(self, tmp_path):
+        """A replay miss fails at once instead of backing off and retrying."""
+        config = Config(
+            github_token="test_token",
+            default_llm_provider="replay",
+            llm_replay=LLMReplayConfig(mode="replay", fixtures_dir=tmp_path),
+        )
+        handler = LLMHandler(config)
+
+        with (
+            patch("llm_handler.asyncio.sleep", new=AsyncMock()) as sleep,
+            pytest.raises(ReplayMissError),
+        ):
+            await handler.generate_response("unknown prompt")
+
+        sleep.assert_not_awaited()
+        assert handler.get_provider().stats["misses"] == 1
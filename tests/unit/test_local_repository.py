@@ -0,0 +1,141 @@
+"""Tests for reading repository context from local checkouts and mirrors."""
+
+import os
+import subprocess
+import time
+
+import pytest
+from config import RepositoryConfig
+from local_repository import LocalRepository
+from multi_repo_context import MultiRepositoryContextReader
+
+FILES = {
+    "README.md": "# Service\n\nLocal repository.\n",
+    "requirements.txt": "fastapi\n",
+    "Dockerfile": "FROM python:3.11\n",
+    "docs/guide.md": "# Guide\n",
+    "docs/api.md": "# API ✓\n",
+    "src/app.py": "def main():\n    return 1\n",
+}
+
+
+def _git(path, *args):
+    subprocess.run(
+        ["git", "-C", str(path), "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        check=True,
+        capture_output=True,
+    )
+
+
+def _write(path, files):
+    for name, text in files.items():
+        (path / name).parent.mkdir(parents=True, exist_ok=True)
+        (path / name).write_text(text, encoding="utf-8")
+
+
+@pytest.fixture
+def checkout(tmp_path):
+    path = tmp_path / "checkout"
+    path.mkdir()
+    _git(path, "init", "-q", "-b", "main")
+    _write(path, FILES)
+    _git(path, "add", "-A")
+    _git(path, "commit", "-q", "-m", "Initial")
+    return path
+
+
+class TestLocalRepository:
+    """Test cases for LocalRepository."""
+
+    def test_checkout_mirror_and_directory_read_alike(self, checkout, tmp_path):
+        mirror = tmp_path / "mirror.git"
+        _git(tmp_path, "clone", "-q", "--mirror", str(checkout), str(mirror))
+        plain = tmp_path / "plain"
+        plain.mkdir()
+        _write(plain, FILES)
+
+        for path in (checkout, mirror, plain):
+            local = LocalRepository(path)
+            assert sorted(p for p, _ in local.list_files()) == sorted(FILES)
+            assert local.read_files(list(FILES) + ["missing.md"]) == {
+                **FILES,
+                "missing.md": None,
+            }
+        assert LocalRepository(mirror).is_bare
+        assert LocalRepository(mirror).get_default_branch() == "main"
+
+    def test_large_files_capped(self, checkout, tmp_path):
+        large = "é" * LocalRepository.MMAP_THRESHOLD_BYTES
+        _write(checkout, {"large.md": large})
+        (checkout / "binary.bin").write_bytes(b"\0\1\2" * 10)
+        _git(checkout, "add", "-A")
+        _git(checkout, "commit", "-q", "-m", "Large")
+        mirror = tmp_path / "mirror.git"
+        _git(tmp_path, "clone", "-q", "--mirror", str(checkout), str(mirror))
+
+        for path in (checkout, mirror):
+            contents = LocalRepository(path).read_files(
+                ["large.md", "binary.bin", "README.md"], max_bytes=1001
+            )
+            # The character cut in half at the cap is dropped
+            assert contents["large.md"] == "é" * 500
+            assert contents["binary.bin"] is None
+            assert contents["README.md"] == FILES["README.md"]
+
+    def test_stale_mirror_fetched(self, checkout, tmp_path):
+        mirror = tmp_path / "mirror.git"
+        _git(tmp_path, "clone", "-q", "--mirror", str(checkout), str(mirror))
+        _write(checkout, {"NEW.md": "new\n"})
+        _git(checkout, "add", "-A")
+        _git(checkout, "commit", "-q", "-m", "New")
+
+        local = LocalRepository(mirror, fetch_after_seconds=60)
+        assert not local.refresh_if_stale()
+        old = time.time() - 120
+        os.utime(
+            mirror / "FETCH_HEAD" if (mirror / "FETCH_HEAD").exists() else mirror,
+            (old, old),
+        )
+
+        assert local.refresh_if_stale()
+        assert "NEW.md" in dict(local.list_files())
+        assert not local.refresh_if_stale()
+
+
+class TestLocalRepositoryContext:
+    """Test cases for MultiRepositoryContextReader with local repositories."""
+
+    @pytest.mark.asyncio
+    async def test_same_context_as_api_without_calls(self, checkout):
+        from fake_github import FakeGitHub
+        from github_benchmark import GitHubBenchmark
+
+        with FakeGitHub() as fake:
+            bench = GitHubBenchmark(
+                fake, repositories=1, files_per_repository=0, issues_per_repository=0
+            )
+            name = bench.repository_names[0]
+            fake.repositories[name].files = dict(FILES)
+            bench.config.repositories["local"] = RepositoryConfig(
+                name=name,
+                type="backend",
+                description="Local",
+                local_path=str(checkout),
+            )
+            reader = MultiRepositoryContextReader(bench.config)
+            bench.prepare(reader.github_handler)
+
+            remote = await reader.get_repository_context(bench.repository_keys[0])
+            fake.reset_metrics()
+            local = await reader.get_repository_context("local")
+
+            assert fake.total_calls == 0
+            assert local.repo_type == remote.repo_type
+            assert local.languages == remote.languages
+            assert local.file_count == remote.file_count
+            assert [(f.path, f.content) for f in local.key_files] == [
+                (f.path, f.content) for f in remote.key_files
+            ]
+            for key in ("key_files", "directories", "file_count", "total_size"):
+                assert local.structure[key] == remote.structure[key]
+            assert local.structure["default_branch"] == "main"
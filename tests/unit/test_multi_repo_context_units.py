@@ -1,6 +1,7 @@
 """Unit tests for multi-repository context components that don't require external API calls."""
 
 import os
+from unittest.mock import patch
 
 from multi_repo_context import (
     ContextCache,
@@ -190,6 +191,20 @@ def test_context_cache():
     assert cache.get("nonexistent") is None
 
 
+def test_context_cache_expiry():
+    """Test items expire ttl_seconds after they were set."""
+    cache = ContextCache(ttl_seconds=60)
+
+    with patch("multi_repo_context.time.monotonic", return_value=1000.0):
+        cache.set("key1", "value1")
+    with patch("multi_repo_context.time.monotonic", return_value=1059.0):
+        assert cache.get("key1") == "value1"
+    with patch("multi_repo_context.time.monotonic", return_value=1060.0):
+        assert cache.get("key1") is None
+        cache.set("key1", "value2")
+        assert cache.get("key1") == "value2"
+
+
 def test_file_selector_priority_scoring():
     """Test file priority scoring logic."""
     selector = IntelligentFileSelector()
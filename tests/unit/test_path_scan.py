@@ -0,0 +1,112 @@
+"""Tests for precompiled path matching and vectorized file scoring."""
+
+import pytest
+from multi_repo_context import IntelligentFileSelector, RepositoryTypeDetector
+from path_scan import NUMPY_AVAILABLE, PathScan, basename_regex
+
+FILES = [
+    ("README.md", "file"),
+    ("package.json", "file"),
+    ("src", "dir"),
+    ("src/components/Button.tsx", "file"),
+    ("src/components/forms/inputs/deep/TextInput.tsx", "file"),
+    ("src/pages/index.tsx", "file"),
+    ("src/api/client.ts", "file"),
+    ("docs/README.md", "file"),
+    ("scripts/build.py", "file"),
+    ("node_modules/react/index.js", "file"),
+    ("public/favicon.ico", "file"),
+]
+
+KEY_FILES = ["readme.md", "package.json", "requirements.txt", "dockerfile"]
+
+USE_NUMPY = [
+    False,
+    pytest.param(
+        True, marks=pytest.mark.skipif(not NUMPY_AVAILABLE, reason="needs numpy")
+    ),
+]
+
+
+def _naive_scores(selector, repo_type, files):
+    """Score files one by one, as the selector did before scanning paths."""
+    scored = []
+    for path, file_type in files:
+        if file_type != "file":
+            continue
+        score = 10 * sum(p in path for p in selector.IMPORTANT_FILES[repo_type])
+        score += 5 * sum(
+            path.endswith(e) for e in selector.IMPORTANT_EXTENSIONS[repo_type]
+        )
+        score += 3 if "/" not in path.strip("/") else 0
+        score -= path.count("/") if path.count("/") > 3 else 0
+        if path.rsplit("/", 1)[-1].lower() in KEY_FILES:
+            score += 15
+        if score > 0:
+            scored.append((path, score))
+    scored.sort(key=lambda item: item[1], reverse=True)
+    return [path for path, _ in scored]
+
+
+class TestPathScan:
+    """Test cases for PathScan."""
+
+    @pytest.mark.parametrize("use_numpy", USE_NUMPY)
+    def test_matches(self, use_numpy):
+        scan = PathScan([path for path, _ in FILES], use_numpy=use_numpy)
+
+        assert list(scan.containing("README")) == [0, 7]
+        assert list(scan.containing("src/")) == [3, 4, 5, 6]
+        assert list(scan.ending_with(".tsx")) == [3, 4, 5]
+        assert list(scan.ending_with("src")) == [2]
+        assert list(scan.matching(basename_regex(["readme.md"]))) == [0, 7]
+        assert scan.any_endswith(".ico")
+        assert not scan.any_endswith(".ic")
+
+    @pytest.mark.skipif(NUMPY_AVAILABLE, reason="needs numpy to be missing")
+    def test_numpy_requested_without_numpy(self):
+        with pytest.raises(ImportError, match="pip install numpy"):
+            PathScan(["README.md"], use_numpy=True)
+
+    @pytest.mark.parametrize("use_numpy", USE_NUMPY)
+    def test_top_keeps_listing_order_for_ties(self, use_numpy):
+        scan = PathScan(["a", "b", "c", "d", "e"], use_numpy=use_numpy)
+        scores = scan.zeros()
+        scan.add(scores, [0, 1, 2, 3], 5)
+        scan.add(scores, [2, 4], [3, -1])
+
+        assert scan.top(scores, [True] * 5, 3) == [2, 0, 1]
+        assert scan.top(scores, [True, False, True, True, True], 10) == [2, 0, 3]
+
+
+class TestVectorizedSelection:
+    """Test cases for detection and selection on a shared PathScan."""
+
+    @pytest.mark.parametrize("use_numpy", USE_NUMPY)
+    def test_matches_per_file_scoring(self, use_numpy):
+        selector = IntelligentFileSelector()
+        scan = PathScan([path for path, _ in FILES], use_numpy=use_numpy)
+
+        for repo_type in selector.IMPORTANT_FILES:
+            expected = _naive_scores(selector, repo_type, FILES)
+            assert (
+                selector.select_important_files(repo_type, FILES, 20, scan) == expected
+            )
+            assert (
+                selector.select_important_files(repo_type, FILES, 2, scan)
+                == expected[:2]
+            )
+
+    @pytest.mark.parametrize("use_numpy", USE_NUMPY)
+    def test_detection(self, use_numpy):
+        detector = RepositoryTypeDetector()
+        paths = [path for path, _ in FILES]
+        scan = PathScan(paths, use_numpy=use_numpy)
+
+        assert detector.detect_repository_type({}, paths, scan) == "frontend"
+        # A file counts for each language it matches, in order of first file
+        assert detector.detect_languages(paths, scan) == {
+            "javascript": 6,
+            "python": 1,
+        }
+        assert list(detector.detect_languages(paths, scan)) == ["javascript", "python"]
@@ -0,0 +1,175 @@
+"""Tests for single-flight coalescing of concurrent identical calls."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from config import Config, RepositoryConfig
+from github_handler import GitHubHandler
+from github_scheduler import current_priority, request_priority
+from multi_repo_context import MultiRepositoryContextReader
+from single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test cases for SingleFlight."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_flight(self):
+        single_flight = SingleFlight()
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"files": ["a.py"]}
+
+        results = await asyncio.gather(
+            *[single_flight.run("repo", fetch) for _ in range(5)]
+        )
+
+        assert calls == 1
+        assert all(result == {"files": ["a.py"]} for result in results)
+        # Each caller got its own copy
+        results[0]["files"].append("mutated.py")
+        assert results[1] == {"files": ["a.py"]}
+        assert not single_flight.in_flight("repo")
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_and_other_keys_run_separately(self):
+        single_flight = SingleFlight()
+        fetch = AsyncMock(side_effect=lambda: ["value"])
+
+        await single_flight.run("a", fetch)
+        await single_flight.run("a", fetch)
+        await asyncio.gather(
+            single_flight.run("b", fetch), single_flight.run("c", fetch)
+        )
+
+        assert fetch.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_exception_reaches_every_caller_and_releases_key(self):
+        single_flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            single_flight.run("key", fail),
+            single_flight.run("key", fail),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert not single_flight.in_flight("key")
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_flight(self):
+        single_flight = SingleFlight()
+        started = asyncio.Event()
+
+        async def fetch():
+            started.set()
+            await asyncio.sleep(0.02)
+            return "done"
+
+        first = asyncio.ensure_future(single_flight.run("key", fetch))
+        await started.wait()
+        second = asyncio.ensure_future(single_flight.run("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "done"
+
+    @pytest.mark.asyncio
+    async def test_urgent_caller_does_not_join_background_flight(self):
+        single_flight = SingleFlight()
+        lanes = []
+
+        async def fetch():
+            lanes.append(current_priority())
+            await asyncio.sleep(0.02)
+            return "done"
+
+        with request_priority("background"):
+            background = asyncio.ensure_future(single_flight.run("key", fetch))
+        await asyncio.sleep(0)
+        with request_priority("critical"):
+            critical = asyncio.ensure_future(single_flight.run("key", fetch))
+        await asyncio.sleep(0)
+        with request_priority("background"):
+            joiner = asyncio.ensure_future(single_flight.run("key", fetch))
+
+        assert await asyncio.gather(background, critical, joiner) == ["done"] * 3
+        # The later background caller joined the critical call
+        assert lanes == ["background", "critical"]
+
+
+class TestCoalescedReads:
+    """Test cases for coalesced GitHubHandler and context reader reads."""
+
+    @pytest.mark.asyncio
+    async def test_repository_structure_fetched_once(self):
+        with patch("github_handler.Github"):
+            handler = GitHubHandler(Config(github_token="test_token"))
+        calls = 0
+
+        async def build(repository_name, ref):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"name": repository_name, "key_files": []}
+
+        handler._get_repository_structure = build
+        results = await asyncio.gather(
+            *[handler.get_repository_structure("owner/repo") for _ in range(3)]
+        )
+
+        assert calls == 1
+        results[0]["key_files"].append({"name": "README.md"})
+        assert results[1]["key_files"] == []
+
+    @pytest.mark.asyncio
+    async def test_repository_context_scanned_once(self):
+        config = Config(
+            github_token="test_token",
+            repositories={
+                "backend": RepositoryConfig(
+                    name="owner/backend", type="backend", description="API"
+                )
+            },
+        )
+        with patch("github_handler.Github"):
+            reader = MultiRepositoryContextReader(config)
+
+        async def structure(repository_name):
+            await asyncio.sleep(0.01)
+            return {"name": repository_name}
+
+        reader.github_handler = MagicMock()
+        reader.github_handler.get_repository_structure = AsyncMock(
+            side_effect=structure
+        )
+        reader.github_handler.list_repository_files = AsyncMock(
+            return_value=[("README.md", "file")]
+        )
+        reader.github_handler.get_file_contents = AsyncMock(
+            return_value={"README.md": "# Backend"}
+        )
+
+        contexts = await asyncio.gather(
+            *[reader.get_repository_context("backend") for _ in range(4)]
+        )
+
+        assert reader.github_handler.get_repository_structure.await_count == 1
+        assert all(context.repository == "owner/backend" for context in contexts)
+        contexts[0].key_files.clear()
+        assert len(contexts[1].key_files) == 1
+
+        # Later callers are served copies from the cache
+        cached = await reader.get_repository_context("backend")
+        assert reader.github_handler.get_repository_structure.await_count == 1
+        assert len(cached.key_files) == 1
@@ -0,0 +1,245 @@
+"""Tests for near-duplicate story detection and analysis reuse."""
+
+import random
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from config import Config, StoryReuseConfig
+from database import DatabaseManager
+from story_manager import StoryAnalysis, StoryProcessor, StoryRequest
+from story_similarity import (
+    StorySimilarityIndex,
+    compute_simhash,
+    hamming_distance,
+    normalize_story_text,
+    simhash_bands,
+)
+
+STORY = (
+    "As a home cook, I want to save my favourite recipes to a personal "
+    "collection so that I can quickly find them again when planning the "
+    "weekly menu, share them with my family and print a shopping list."
+)
+REWORDED_STORY = (
+    "As a home cook I want to save my favourite recipes to a personal "
+    "collection, so that I can quickly find them again when planning the "
+    "weekly menu, share them with my family and print a shopping list!"
+)
+NEAR_STORY = STORY.replace("print a shopping list", "export a shopping list")
+OTHER_STORY = (
+    "As an administrator, I want to audit failed login attempts across all "
+    "tenants so that suspicious activity is detected and reported early."
+)
+
+
+class TestSimHash:
+    """Test cases for the SimHash helpers."""
+
+    def test_normalization_ignores_case_and_punctuation(self):
+        assert normalize_story_text(STORY) == normalize_story_text(REWORDED_STORY)
+
+    def test_similar_texts_have_close_hashes(self):
+        base = compute_simhash(normalize_story_text(STORY))
+        near = compute_simhash(normalize_story_text(NEAR_STORY))
+        other = compute_simhash(normalize_story_text(OTHER_STORY))
+
+        assert hamming_distance(base, near) < hamming_distance(base, other)
+
+    def test_hashes_within_distance_share_a_band(self):
+        rng = random.Random(7)
+        for max_distance in (0, 3, 10, 20):
+            for _ in range(200):
+                fingerprint = rng.getrandbits(64)
+                near = fingerprint
+                for bit in rng.sample(range(64), max_distance):
+                    near ^= 1 << bit
+
+                bands = simhash_bands(fingerprint, max_distance)
+                assert len(bands) == max_distance + 1
+                assert any(
+                    a == b for a, b in zip(bands, simhash_bands(near, max_distance))
+                )
+
+
+class TestStorySimilarityIndex:
+    """Test cases for StorySimilarityIndex."""
+
+    @pytest.fixture
+    def index(self, tmp_path):
+        database = DatabaseManager(str(tmp_path / "similarity.db"))
+        return StorySimilarityIndex(
+            database,
+            StoryReuseConfig(enabled=True),
+        )
+
+    def test_finds_near_duplicate_for_same_repositories(self, index):
+        analyses = [{"role_name": "qa-engineer", "analysis": "Test it"}]
+        index.add("story_1", STORY, ["backend", "frontend"], analyses, "Synth")
+
+        match = index.find_similar(REWORDED_STORY, ["frontend", "backend"])
+
+        assert match.story_id == "story_1"
+        assert match.is_exact
+        assert match.expert_analyses == analyses
+        assert match.synthesized_analysis == "Synth"
+
+    def test_ignores_other_repositories_and_dissimilar_stories(self, index):
+        index.add("story_1", STORY, ["backend"], [], "Synth")
+
+        assert index.find_similar(STORY, ["frontend"]) is None
+        assert index.find_similar(OTHER_STORY, ["backend"]) is None
+
+    def test_threshold_rejects_partial_matches(self, tmp_path):
+        database = DatabaseManager(str(tmp_path / "strict.db"))
+        index = StorySimilarityIndex(
+            database, StoryReuseConfig(enabled=True, min_similarity=0.99)
+        )
+        index.add("story_1", STORY, ["backend"], [], "Synth")
+
+        assert index.find_similar(NEAR_STORY, ["backend"]) is None
+
+    def test_default_distance_uses_band_index(self, index):
+        assert index.config.max_hamming_distance == 10
+        index.add("story_1", STORY, ["backend"], [], "Synth")
+        index.add("story_2", OTHER_STORY, ["backend"], [], "Other")
+        lookups = []
+        get_candidates = index.database.get_story_fingerprint_candidates
+
+        def lookup(*args, **kwargs):
+            lookups.append((kwargs["bands"], get_candidates(*args, **kwargs)))
+            return lookups[-1][1]
+
+        index.database.get_story_fingerprint_candidates = lookup
+
+        assert index.find_similar(NEAR_STORY, ["backend"]).story_id == "story_1"
+
+        bands, candidates = lookups[0]
+        assert len(bands) == 11
+        assert [c["story_id"] for c in candidates] == ["story_1"]
+
+    def test_band_lookup_finds_hashes_at_the_distance_limit(self, tmp_path):
+        database = DatabaseManager(str(tmp_path / "bands.db"))
+        stored = 0x0123456789ABCDEF
+        database.save_story_fingerprint(
+            "story_1", stored, ["backend"], "text", [], "", simhash_bands(stored, 10)
+        )
+        inverted = ~stored & (2**64 - 1)
+        database.save_story_fingerprint(
+            "story_2",
+            inverted,
+            ["backend"],
+            "text",
+            [],
+            "",
+            simhash_bands(inverted, 10),
+        )
+
+        # One differing bit in each of ten of the eleven bands
+        query = stored
+        for bit in range(0, 60, 6):
+            query ^= 1 << bit
+        candidates = database.get_story_fingerprint_candidates(
+            query, ["backend"], bands=simhash_bands(query, 10), max_distance=10
+        )
+        assert [c["story_id"] for c in candidates] == ["story_1"]
+
+    def test_stories_banded_for_another_distance_are_found(self, tmp_path):
+        database = DatabaseManager(str(tmp_path / "rebanded.db"))
+        strict = StorySimilarityIndex(
+            database, StoryReuseConfig(enabled=True, max_hamming_distance=3)
+        )
+        strict.add("story_1", STORY, ["backend"], [], "Synth")
+
+        index = StorySimilarityIndex(database, StoryReuseConfig(enabled=True))
+        assert index.find_similar(REWORDED_STORY, ["backend"]).story_id == "story_1"
+
+
+@pytest.fixture
+def processor(tmp_path):
+    """Create a story processor with a real similarity database."""
+    config = Config(
+        github_token="test_token",
+        story_reuse=StoryReuseConfig(enabled=True),
+    )
+    database = DatabaseManager(str(tmp_path / "stories.db"))
+    with (
+        patch("story_manager.LLMHandler") as mock_llm,
+        patch("story_manager.GitHubHandler"),
+        patch("story_manager.DatabaseManager", return_value=database),
+        patch("story_manager.RoleAssignmentEngine"),
+        patch("story_manager.MultiRepositoryContextReader"),
+        patch(
+            "story_manager.load_role_files",
+            return_value={
+                "system-architect": "Architecture role",
+                "qa-engineer": "QA role",
+            },
+        ),
+    ):
+        mock_llm.return_value = MagicMock()
+        story_processor = StoryProcessor(config)
+        story_processor.analyze_story_content = AsyncMock(
+            return_value={"recommended_roles": []}
+        )
+        story_processor.synthesize_analyses = AsyncMock(return_value="Synthesis")
+        story_processor.process_story_with_experts = AsyncMock(
+            side_effect=lambda story_content, expert_roles, context=None: [
+                StoryAnalysis(role_name=role, analysis=f"{role} analysis")
+                for role in expert_roles
+            ]
+        )
+        yield story_processor
+
+
+class TestStoryProcessorReuse:
+    """Test cases for analysis reuse in StoryProcessor.process_story."""
+
+    @staticmethod
+    def _request(content: str, roles=None) -> StoryRequest:
+        return StoryRequest(
+            content=content,
+            target_repositories=["backend"],
+            required_roles=roles or ["system-architect", "qa-engineer"],
+        )
+
+    @pytest.mark.asyncio
+    async def test_identical_story_reuses_analyses_and_synthesis(self, processor):
+        first = await processor.process_story(self._request(STORY))
+        second = await processor.process_story(self._request(REWORDED_STORY))
+
+        reuse = second.metadata["analysis_reuse"]
+        assert first.metadata["analysis_reuse"]["reused"] is False
+        assert reuse["reused"] is True
+        assert reuse["source_story_id"] == first.story_id
+        assert reuse["reused_synthesis"] is True
+        assert second.synthesized_analysis == "Synthesis"
+        assert second.expert_analyses[0].metadata["reused_from"] == first.story_id
+        assert processor.process_story_with_experts.await_count == 1
+        assert processor.synthesize_analyses.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_near_duplicate_regenerates_missing_roles_and_synthesis(
+        self, processor
+    ):
+        await processor.process_story(self._request(STORY, ["system-architect"]))
+        result = await processor.process_story(self._request(NEAR_STORY))
+
+        reuse = result.metadata["analysis_reuse"]
+        assert reuse["reused_roles"] == ["system-architect"]
+        assert reuse["generated_roles"] == ["qa-engineer"]
+        assert reuse["reused_synthesis"] is False
+        assert [a.role_name for a in result.expert_analyses] == [
+            "system-architect",
+            "qa-engineer",
+        ]
+        assert processor.synthesize_analyses.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_reuse_disabled(self, processor):
+        processor.similarity_index.config = StoryReuseConfig()
+
+        await processor.process_story(self._request(STORY))
+        result = await processor.process_story(self._request(STORY))
+
+        assert result.metadata["analysis_reuse"]["reused"] is False
+        assert processor.process_story_with_experts.await_count == 2
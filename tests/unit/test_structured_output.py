@@ -0,0 +1,182 @@
+"""Tests for structured LLM output parsing, repair and targeted re-asks."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from config import Config
+from llm_handler import LLMResponse
+from story_manager import STORY_ANALYSIS_SCHEMA, StoryProcessor
+from structured_output import (
+    StructuredOutputError,
+    extract_json,
+    generate_structured_response,
+    parse_structured_output,
+    validate_structured_data,
+)
+
+
+def _response(content: str) -> LLMResponse:
+    return LLMResponse(content=content, model="test-model", provider="test")
+
+
+class TestExtractJson:
+    """Test cases for JSON extraction and local repair."""
+
+    def test_plain_json_needs_no_repair(self):
+        assert extract_json('{"a": 1}') == ({"a": 1}, False)
+
+    @pytest.mark.parametrize(
+        "content,expected",
+        [
+            ('```json\n{"a": [1, 2]}\n```', {"a": [1, 2]}),
+            ('Here you go:\n{"a": "x"}\nLet me know!', {"a": "x"}),
+            ('{"a": [1, 2,],}', {"a": [1, 2]}),
+            ("{'a': True, 'b': None}", {"a": True, "b": None}),
+            ('{"a": 1, "b": ["x", "y', {"a": 1, "b": ["x", "y"]}),
+            ('{"a": 1, "unfinished', {"a": 1}),
+        ],
+    )
+    def test_repairs_common_model_output(self, content, expected):
+        value, repaired = extract_json(content)
+
+        assert value == expected
+        assert repaired is True
+
+    def test_no_json_raises(self):
+        with pytest.raises(StructuredOutputError):
+            extract_json("I cannot help with that.")
+
+
+class TestValidation:
+    """Test cases for schema validation and coercion."""
+
+    def test_coerces_cheap_type_mismatches(self):
+        data, errors = validate_structured_data(
+            {
+                "recommended_roles": "qa-engineer, system-architect",
+                "target_repositories": "backend",
+                "complexity": "High",
+            },
+            STORY_ANALYSIS_SCHEMA,
+        )
+
+        assert errors == []
+        assert data["recommended_roles"] == ["qa-engineer", "system-architect"]
+        assert data["target_repositories"] == ["backend"]
+        assert data["complexity"] == "high"
+
+    def test_reports_missing_and_invalid_fields(self):
+        data, errors = validate_structured_data(
+            {"recommended_roles": ["qa-engineer"], "complexity": "extreme"},
+            STORY_ANALYSIS_SCHEMA,
+        )
+
+        assert sorted(errors) == ["complexity", "target_repositories"]
+        assert "complexity" not in data
+
+    def test_invalid_array_items_are_dropped(self):
+        schema = {
+            "type": "array",
+            "items": {"type": "object", "required": ["department"]},
+        }
+
+        data, errors, _ = parse_structured_output(
+            json.dumps({"departments": [{"department": "backend"}, {"title": "x"}]}),
+            schema,
+        )
+
+        assert errors == []
+        assert data == [{"department": "backend"}]
+
+
+class TestGenerateStructuredResponse:
+    """Test cases for JSON mode and targeted re-asks."""
+
+    @pytest.mark.asyncio
+    async def test_reasks_only_for_missing_fields(self):
+        handler = MagicMock()
+        handler.generate_response = AsyncMock(
+            side_effect=[
+                _response('```json\n{"recommended_roles": ["qa-engineer"]}\n```'),
+                _response('{"target_repositories": ["backend"], "complexity": "low"}'),
+            ]
+        )
+
+        result = await generate_structured_response(
+            handler, "Story", "System", STORY_ANALYSIS_SCHEMA
+        )
+
+        assert result.reasks == 1
+        assert result.data == {
+            "recommended_roles": ["qa-engineer"],
+            "target_repositories": ["backend"],
+            "complexity": "low",
+        }
+        first_call, reask_call = handler.generate_response.await_args_list
+        assert first_call.kwargs["json_mode"] is True
+        assert "complexity, target_repositories" in reask_call.kwargs["prompt"]
+
+    @pytest.mark.asyncio
+    async def test_raises_with_partial_data_after_reasks(self):
+        handler = MagicMock()
+        handler.generate_response = AsyncMock(
+            return_value=_response('{"recommended_roles": ["qa-engineer"]}')
+        )
+
+        with pytest.raises(StructuredOutputError) as exc_info:
+            await generate_structured_response(
+                handler, "Story", None, STORY_ANALYSIS_SCHEMA, max_reasks=1
+            )
+
+        assert exc_info.value.data == {"recommended_roles": ["qa-engineer"]}
+        assert handler.generate_response.await_count == 2
+
+
+class TestStoryAnalysisParsing:
+    """Test cases for structured parsing in StoryProcessor.analyze_story_content."""
+
+    @pytest.fixture
+    def processor(self):
+        config = Config(github_token="test_token")
+        with (
+            patch("story_manager.LLMHandler") as mock_llm,
+            patch("story_manager.GitHubHandler"),
+            patch("story_manager.DatabaseManager"),
+            patch("story_manager.RoleAssignmentEngine"),
+            patch("story_manager.MultiRepositoryContextReader"),
+            patch(
+                "story_manager.load_role_files",
+                return_value={"qa-engineer": "QA role"},
+            ),
+        ):
+            mock_llm.return_value = MagicMock()
+            yield StoryProcessor(config)
+
+    @pytest.mark.asyncio
+    async def test_fenced_response_is_not_discarded(self, processor):
+        processor.llm_handler.generate_response = AsyncMock(
+            return_value=_response(
+                "Here is my analysis:\n```json\n"
+                '{"recommended_roles": ["qa-engineer"], "target_repositories": [],'
+                ' "complexity": "high", "themes": ["auth"]}\n```'
+            )
+        )
+
+        analysis = await processor.analyze_story_content("Story")
+
+        assert analysis["recommended_roles"] == ["qa-engineer"]
+        assert analysis["complexity"] == "high"
+        assert analysis["themes"] == ["auth"]
+        processor.llm_handler.generate_response.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_partial_response_keeps_valid_fields(self, processor):
+        processor.llm_handler.generate_response = AsyncMock(
+            return_value=_response('{"recommended_roles": ["qa-engineer"]}')
+        )
+
+        analysis = await processor.analyze_story_content("Story")
+
+        assert analysis["recommended_roles"] == ["qa-engineer"]
+        assert analysis["complexity"] == "medium"
@@ -165,6 +165,39 @@ class TestSubStoryGeneration(unittest.TestCase):
 
             asyncio.run(run_test())
 
+    def test_analyze_user_story_for_departments_no_valid_items(self):
+        """Test fallback when every department in the reply is invalid."""
+
+        with patch.object(
+            self.story_manager.processor.llm_handler, "generate_response"
+        ) as mock_llm:
+            mock_response = MagicMock()
+            mock_response.content = json.dumps([{"dept": "backend"}])
+            mock_llm.return_value = mock_response
+
+            user_story = UserStory(
+                epic_id="test_epic",
+                title="User Login Feature",
+                description="As a user, I want to log in",
+                target_repositories=["backend"],
+            )
+
+            async def run_test():
+                departments = (
+                    await self.story_manager._analyze_user_story_for_departments(
+                        user_story, ["backend", "frontend", "testing", "devops"]
+                    )
+                )
+
+                dept_names = [d["department"] for d in departments]
+                self.assertIn("backend", dept_names)
+                self.assertEqual(
+                    departments[0]["title"],
+                    "Backend Implementation: User Login Feature",
+                )
+
+            asyncio.run(run_test())
+
     def test_generate_sub_stories_for_departments_success(self):
         """Test successful sub-story generation."""
 
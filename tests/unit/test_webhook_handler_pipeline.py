@@ -330,3 +330,23 @@ class TestWebhookHandlerPipeline:
         assert result["notification_sent"] == False
         assert result["retry_attempts"] == 0
         assert result["escalation_triggered"] == False
+
+    @pytest.mark.asyncio
+    async def test_issue_edits_invalidate_cached_stories(self):
+        """Test that issue edits drop cached copies of GitHub-stored stories."""
+        self.handler._find_stories_for_issue = AsyncMock(return_value=[])
+        payload = {
+            "action": "edited",
+            "issue": {"number": 7, "title": "Epic: Cached"},
+            "repository": {"full_name": "test/repo"},
+        }
+
+        await self.handler.handle_webhook(payload)
+        self.mock_db.invalidate_github_story_cache.assert_called_once_with(
+            "test/repo", 7
+        )
+
+        self.mock_db.invalidate_github_story_cache.reset_mock()
+        payload["action"] = "opened"
+        await self.handler.handle_webhook(payload)
+        self.mock_db.invalidate_github_story_cache.assert_not_called()